@@ -0,0 +1,127 @@
+import argparse
+import math
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Tuple, Union
+
+from astragateway.utils.block_trace import BlockTraceRecord, BlockTraceError, read_block_trace
+
+StageName = str
+
+
+def main() -> None:
+    parser = get_argument_parser()
+    args = parser.parse_args()
+    try:
+        records = read_block_trace(args.trace_file)
+    except (OSError, BlockTraceError) as e:
+        print(f"Could not read block trace {args.trace_file}: {e}")
+        sys.exit(1)
+
+    timelines = group_by_block(records)
+    if args.block_hash:
+        block_hash = args.block_hash.lower()
+        timelines = {key: timeline for key, timeline in timelines.items() if key == block_hash}
+        if not timelines:
+            print(f"Block {args.block_hash} is not in the trace.")
+            sys.exit(1)
+
+    print(f"{len(records)} records of {len(timelines)} blocks.")
+    for block_hash, timeline in list(timelines.items())[-args.limit:]:
+        print_timeline(block_hash, timeline)
+
+    percentiles = [float(percentile) for percentile in args.percentiles.split(",")]
+    print_stage_percentiles(timelines, percentiles)
+
+
+def group_by_block(records: List[BlockTraceRecord]) -> Dict[str, List[BlockTraceRecord]]:
+    """
+    Groups records by block hash, in order of the first record of each block. Records only known by the
+    cipher hash of an encrypted block are attributed to the block recorded with the same cipher hash.
+    """
+    block_hash_by_cipher_hash = {}
+    for record in records:
+        if record.block_hash is not None and record.cipher_hash is not None:
+            block_hash_by_cipher_hash[record.cipher_hash] = record.block_hash
+
+    timelines = defaultdict(list)
+    for record in records:
+        block_hash = record.block_hash
+        if block_hash is None:
+            block_hash = block_hash_by_cipher_hash.get(record.cipher_hash, record.cipher_hash)
+        if block_hash is not None:
+            timelines[block_hash.hex()].append(record)
+    return dict(timelines)
+
+
+def stage_name(stage: Union[int, object]) -> StageName:
+    return getattr(stage, "name", None) or f"STAGE_{stage}"
+
+
+def print_timeline(block_hash: str, timeline: List[BlockTraceRecord]) -> None:
+    start = timeline[0].timestamp
+    print(f"\nBlock {block_hash} ({datetime.utcfromtimestamp(start)})")
+    for record in timeline:
+        print(f"  {(record.timestamp - start) * 1000:>10.3f} ms  {stage_name(record.stage):<20} {record.value}")
+
+
+def stage_deltas(timelines: Dict[str, List[BlockTraceRecord]]) -> Dict[Tuple[StageName, StageName], List[float]]:
+    """
+    Collects the durations in milliseconds between consecutive stages of each block, by pair of stages.
+    Only the first record of each stage of a block is used.
+    """
+    deltas = defaultdict(list)
+    for timeline in timelines.values():
+        first_records = {}
+        for record in timeline:
+            first_records.setdefault(record.stage, record)
+        ordered = sorted(first_records.values(), key=lambda record: record.sequence)
+        for previous, current in zip(ordered, ordered[1:]):
+            deltas[(stage_name(previous.stage), stage_name(current.stage))].append(
+                (current.timestamp - previous.timestamp) * 1000
+            )
+        if len(ordered) > 2:
+            # end to end duration, unless already covered by the consecutive stages
+            deltas[(stage_name(ordered[0].stage), stage_name(ordered[-1].stage))].append(
+                (ordered[-1].timestamp - ordered[0].timestamp) * 1000
+            )
+    return dict(deltas)
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    # nearest rank
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def print_stage_percentiles(timelines: Dict[str, List[BlockTraceRecord]], percentiles: List[float]) -> None:
+    deltas = stage_deltas(timelines)
+    if not deltas:
+        return
+    print("\nStage durations (ms):")
+    header = "".join(f"{'p' + format(percent, 'g'):>12}" for percent in percentiles)
+    print(f"  {'from':<20} {'to':<20} {'count':>8}{header}")
+    for (from_stage, to_stage), values in sorted(deltas.items(), key=lambda item: -len(item[1])):
+        values.sort()
+        columns = "".join(f"{percentile(values, percent):>12.3f}" for percent in percentiles)
+        print(f"  {from_stage:<20} {to_stage:<20} {len(values):>8}{columns}")
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Prints per-block stage timelines and stage duration percentiles of a gateway block trace "
+                    "file, recorded with the gateway --block-trace-file option."
+    )
+    parser.add_argument("trace_file", type=str, help="Block trace file.")
+    parser.add_argument("--block-hash", type=str, default=None,
+                        help="Only print the timeline of this block, as a hex string.")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Number of most recent block timelines to print.")
+    parser.add_argument("--percentiles", type=str, default="50,90,99",
+                        help="Comma separated percentiles of stage durations to print.")
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -56,3 +56,11 @@ BTC_COMPACT_BLOCK_DECOMPRESS_MIN_TX_COUNT = 10000
 
 BTC_DEFAULT_BLOCK_SIZE = 621000
 BTC_MINIMAL_SUB_TASK_TX_COUNT = 2500
+
+# bitcoind rejects inventory messages with more entries (MAX_INV_SZ)
+BTC_MAX_INV_ENTRIES = 50000
+# transactions requested from a blockchain node per second, with bursts of up to a second's worth
+BTC_MAX_TX_REQUESTS_PER_S = 5000
+# transactions announced over the request rate limit, queued until they can be requested
+BTC_MAX_QUEUED_TX_REQUESTS = 100000
+BTC_QUEUED_TX_REQUESTS_INTERVAL_S = 0.1
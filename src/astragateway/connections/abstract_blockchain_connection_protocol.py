@@ -126,7 +126,9 @@ class AbstractBlockchainConnectionProtocol:
                     self.connection.network_num,
                     peers=[self.connection]
                 )
-                gateway_transaction_stats_service.log_duplicate_transaction_from_blockchain()
+                gateway_transaction_stats_service.log_duplicate_transaction_from_blockchain(
+                    tx_result.transaction_hash
+                )
                 gateway_bdn_performance_stats_service.log_duplicate_tx_from_node(self.connection.endpoint)
                 continue
 
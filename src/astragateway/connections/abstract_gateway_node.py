@@ -20,10 +20,13 @@ try:
 except ImportError:
     from asyncio.futures import CancelledError
 
+import os
+import struct
+import subprocess
 import time
 from abc import ABCMeta, abstractmethod
 from concurrent.futures import Future
-from typing import Tuple, Optional, ClassVar, Type, Set, List, Iterable, Union, cast, Dict, Deque
+from typing import Tuple, Optional, ClassVar, Type, Set, List, Iterable, Union, cast, Dict, Deque, Callable
 from prometheus_client import Gauge
 
 from astracommon import constants
@@ -45,7 +48,7 @@ from astracommon.network.peer_info import ConnectionPeerInfo
 from astracommon.services import sdn_http_service
 from astracommon.services.broadcast_service import BroadcastService
 from astracommon.storage.block_encrypted_cache import BlockEncryptedCache
-from astracommon.utils import network_latency, memory_utils, convert, node_cache
+from astracommon.utils import network_latency, memory_utils, convert, node_cache, config
 from astracommon.utils.alarm_queue import AlarmId
 from astracommon.utils.expiring_dict import ExpiringDict
 from astracommon.utils.expiring_set import ExpiringSet
@@ -72,11 +75,23 @@ from astragateway.services.block_recovery_service import BlockRecoveryService, R
 from astragateway.services.gateway_broadcast_service import GatewayBroadcastService
 from astragateway.services.gateway_transaction_service import GatewayTransactionService
 from astragateway.services.neutrality_service import NeutralityService
+from astragateway.services.relay_quality_service import RelayQualityService
+from astragateway.feed.feed_worker_client import FeedWorkerClient, FeedWorkerFeedManager, start_feed_worker_process, \
+    stop_feed_worker_process
+from astragateway.services import transaction_service_snapshot
+from astragateway.services.transaction_service_snapshot import SnapshotCollection, SnapshotEntry, \
+    TransactionServiceSnapshotError
 from astragateway.utils import configuration_utils
 from astragateway.utils.blockchain_message_queue import BlockchainMessageQueue
+from astragateway.utils.generational_expiring import GenerationalExpiringDict
 from astragateway.utils.logging.status import status_log
+from astragateway.utils.stats.event_loop_stats_service import event_loop_stats_service
 from astragateway.utils.stats.gateway_bdn_performance_stats_service import gateway_bdn_performance_stats_service
 from astragateway.utils.stats.gateway_transaction_stats_service import gateway_transaction_stats_service
+from astragateway.utils.stats.latency_histograms import latency_histograms
+from astragateway.utils.stats.stat_event_pipeline import stat_event_pipeline
+from astragateway.utils.traffic_capture import TrafficRecorder
+from astragateway.utils.block_trace import block_trace
 from astragateway.rpc.ws.ws_server import WsServer
 from astragateway.rpc.ipc.ipc_server import IpcServer
 from astrautils import logging
@@ -87,6 +102,12 @@ from astrautils.ssl.ssl_certificate_type import SSLCertificateType
 logger = logging.get_logger(__name__)
 
 
+def _block_message_size(block_message: Optional[AbstractBlockMessage]) -> int:
+    if block_message is None:
+        return 0
+    return len(block_message.rawbytes())
+
+
 class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
     """
     astra gateway node. Middlemans messages between blockchain nodes and the astra
@@ -95,6 +116,8 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
     NODE_TYPE = NodeType.EXTERNAL_GATEWAY
     # pyre-fixme[8]: Attribute has type `Type[AbstractRelayConnection]`; used as `None`.
     RELAY_CONNECTION_CLS: ClassVar[Type[AbstractRelayConnection]] = None
+    # if transactions messages from the blockchain node can be processed by the transaction service extension
+    EXTENSION_PROCESSES_NODE_TXS: ClassVar[bool] = False
 
     remote_blockchain_ip: Optional[str] = None
     remote_blockchain_port: Optional[int] = None
@@ -119,7 +142,7 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
     in_progress_blocks: BlockEncryptedCache
     block_recovery_service: BlockRecoveryService
     blockchain_peer_to_block_queuing_service: Dict[AbstractGatewayBlockchainConnection, AbstractBlockQueuingService]
-    block_storage: ExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]]
+    block_storage: GenerationalExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]]
     block_queuing_service_manager: BlockQueuingServiceManager
     block_processing_service: BlockProcessingService
     block_cleanup_service: AbstractBlockCleanupService
@@ -146,6 +169,11 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
             opts, node_ssl_service
         )
         self.opts: GatewayOpts = opts
+        event_loop_stats_service.configure(
+            opts.event_loop_lag_sample_interval_s, opts.event_loop_slow_callback_threshold_s
+        )
+        if event_loop_stats_service.enabled:
+            event_loop_stats_service.instrument_alarm_queue(self.alarm_queue)
 
         if opts.account_model:
             self.account_model = opts.account_model
@@ -189,12 +217,17 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         self.block_recovery_service = BlockRecoveryService(self.alarm_queue)
         self.neutrality_service = NeutralityService(self)
         self.block_processing_service = BlockProcessingService(self)
+        self.relay_quality_service: Optional[RelayQualityService] = None
+        if opts.relay_probe_interval_s > 0:
+            self.relay_quality_service = RelayQualityService(self)
+            self.relay_quality_service.start()
         self.block_cleanup_service = self.build_block_cleanup_service()
 
-        self.block_storage = ExpiringDict(
+        self.block_storage = GenerationalExpiringDict(
             self.alarm_queue,
             gateway_constants.MAX_BLOCK_CACHE_TIME_S,
-            "block_queuing_service_blocks"
+            "block_queuing_service_blocks",
+            size_of=_block_message_size
         )
         self.blockchain_peer_to_block_queuing_service = {}
         self.block_queuing_service_manager = BlockQueuingServiceManager(
@@ -237,10 +270,31 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         else:
             self._tx_service = GatewayTransactionService(self, self.network_num)
 
+        self.traffic_recorder: Optional[TrafficRecorder] = None
+        if opts.capture_traffic_file:
+            self.traffic_recorder = TrafficRecorder(opts.capture_traffic_file, str(opts.blockchain_protocol))
+        if opts.block_trace_file:
+            block_trace.open(opts.block_trace_file, opts.block_trace_capacity)
+
+        self._tx_service_warm_started = False
+        self._tx_service_snapshot_collection: Optional[SnapshotCollection] = None
+        self._tx_service_snapshot_future: Optional[asyncio.Future] = None
+        if opts.tx_service_snapshot_file and opts.use_extensions:
+            logger.warning(log_messages.TX_SERVICE_SNAPSHOT_UNSUPPORTED)
+        elif opts.tx_service_snapshot_file:
+            self._load_tx_service_snapshot()
+            self.alarm_queue.register_alarm(
+                opts.tx_service_snapshot_interval_s,
+                self._save_tx_service_snapshot,
+                alarm_name="save_tx_service_snapshot"
+            )
+
+        self.init_stat_event_pipeline()
         self.init_transaction_stat_logging()
         self.init_bdn_performance_stats_logging()
         self.init_node_config_update()
         self.init_transaction_feed_stat_logging()
+        self.init_event_loop_stat_logging()
 
         self._block_from_node_handling_times = ExpiringDict(
             self.alarm_queue,
@@ -277,7 +331,18 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
             self.default_tx_flag = TransactionFlag.NO_FLAGS
 
         self.has_feed_subscribers = False
-        self.feed_manager = FeedManager(self)
+        self.feed_worker_client: Optional[FeedWorkerClient] = None
+        self._feed_worker_process: Optional[subprocess.Popen] = None
+        if opts.feed_worker:
+            self.feed_worker_client = FeedWorkerClient(
+                config.get_data_file(gateway_constants.FEED_WORKER_SOCKET_FILE),
+                self.reevaluate_transaction_streamer_connection
+            )
+            self.feed_worker_client.set_account_model(self.account_model)
+            self.feed_manager = FeedWorkerFeedManager(self, self.feed_worker_client)
+        else:
+            self.feed_manager = FeedManager(self)
+        self.init_latency_histograms()
         self._rpc_server = self.build_rpc_server()
         self._ws_server = self.build_ws_server()
         self._ipc_server = IpcServer(opts.ipc_file, self.feed_manager, self)
@@ -296,6 +361,13 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         self.quota_gauge.labels("tx").set_function(
             functools.partial(lambda: int(self.quota_level))
         )
+        self.memory_gauge = Gauge(
+            "gateway_memory_bytes",
+            "Bytes held by gateway data structures, tracked incrementally",
+            ("component",)
+        )
+        for component, get_size in self._get_memory_accounting().items():
+            self.memory_gauge.labels(component).set_function(get_size)
         self.additional_servers = Gauge(
             "additional_servers",
             "Status of additional servers",
@@ -376,7 +448,17 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
     def get_broadcast_service(self) -> BroadcastService:
         return GatewayBroadcastService(self.connection_pool)
 
+    def init_stat_event_pipeline(self) -> None:
+        for event_name, rate in self.opts.stat_event_sampling_rates.items():
+            stat_event_pipeline.set_sampling_rate(event_name, rate)
+        self.alarm_queue.register_alarm(
+            gateway_constants.STAT_EVENTS_FLUSH_INTERVAL_S,
+            stat_event_pipeline.flush,
+            alarm_name="flush_stat_events"
+        )
+
     def init_transaction_stat_logging(self) -> None:
+        gateway_transaction_stats_service.configure_sketches(self.opts.enable_stats_sketches)
         gateway_transaction_stats_service.set_node(self)
         self.alarm_queue.register_alarm(gateway_transaction_stats_service.interval,
                                         gateway_transaction_stats_service.flush_info)
@@ -388,12 +470,38 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         )
 
     def init_transaction_feed_stat_logging(self) -> None:
+        transaction_feed_stats_service.configure_sketches(self.opts.enable_stats_sketches)
         transaction_feed_stats_service.set_node(self)
         self.alarm_queue.register_alarm(
             transaction_feed_stats_service.interval,
             transaction_feed_stats_service.flush_info
         )
 
+    def init_event_loop_stat_logging(self) -> None:
+        if not event_loop_stats_service.enabled:
+            return
+        event_loop_stats_service.set_node(self)
+        self.alarm_queue.register_alarm(
+            event_loop_stats_service.interval,
+            event_loop_stats_service.flush_info
+        )
+        self.alarm_queue.register_alarm(
+            event_loop_stats_service.sample_interval_s,
+            event_loop_stats_service.sample_lag,
+            alarm_name="sample_event_loop_lag"
+        )
+
+    def init_latency_histograms(self) -> None:
+        latency_histograms.enabled = self.opts.enable_latency_histograms
+        if not self.opts.enable_latency_histograms:
+            return
+        latency_histograms.instrument_feed_manager(self.feed_manager)
+        self.alarm_queue.register_alarm(
+            gateway_constants.LATENCY_HISTOGRAM_INTERVAL_S,
+            self._rotate_latency_histograms,
+            alarm_name="rotate_latency_histograms"
+        )
+
     def init_authorized_live_feeds(self) -> None:
         new_transaction_streaming_valid = False
         account_model = self.account_model
@@ -449,6 +557,28 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
             for block_queuing_service in self.block_queuing_service_manager:
                 block_queuing_service.log_memory_stats()
 
+    def get_memory_breakdown(self) -> Dict[str, int]:
+        """
+        Returns bytes held per major data structure, cheap enough to call frequently, unlike `_record_mem_stats`.
+
+        Transaction contents, block storage and block recovery sizes are running totals maintained as entries are
+        added and removed. Short id mappings are estimated from the short id count. Input and output buffer sizes
+        are summed over the open connections on each call.
+        """
+        return {component: get_size() for component, get_size in self._get_memory_accounting().items()}
+
+    def _get_memory_accounting(self) -> Dict[str, Callable[[], int]]:
+        return {
+            "tx_contents": self._tx_service.get_total_tx_contents_size,
+            "short_id_mappings": lambda: (
+                self._tx_service.get_short_id_count() * gateway_constants.SHORT_ID_MAPPING_ENTRY_SIZE_BYTES
+            ),
+            "block_storage": lambda: self.block_storage.total_bytes,
+            "block_recovery": lambda: self.block_recovery_service.total_block_bytes,
+            "input_buffers": lambda: sum(connection.inputbuf.length for connection in self.connection_pool),
+            "output_buffers": lambda: sum(connection.outputbuf.length for connection in self.connection_pool),
+        }
+
     def get_tx_service(self, network_num=None) -> GatewayTransactionService:
         if network_num is not None and network_num != self.opts.blockchain_network_num:
             raise ValueError("Gateway is running with network number '{}' but tx service for '{}' was requested"
@@ -520,6 +650,22 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
             except Exception as e:
                 logger.error(log_messages.RPC_INITIALIZATION_FAIL, e, exc_info=True)
 
+        account_model_revalidation = self.opts.account_model_revalidation
+        if account_model_revalidation is not None:
+            loop = asyncio.get_event_loop()
+            account_model_revalidation.add_done_callback(
+                lambda revalidation: loop.call_soon_threadsafe(self._on_account_model_revalidated, revalidation)
+            )
+
+        feed_worker_client = self.feed_worker_client
+        if feed_worker_client is not None:
+            self._feed_worker_process = start_feed_worker_process(
+                self.opts, feed_worker_client.socket_path, self.network_num
+            )
+            self.alarm_queue.register_alarm(
+                gateway_constants.FEED_WORKER_POLL_INTERVAL_S, feed_worker_client.poll, alarm_name="poll_feed_worker"
+            )
+
         if self.opts.ws:
             try:
                 await asyncio.wait_for(
@@ -549,6 +695,27 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
             await asyncio.wait_for(self._ipc_server.stop(), rpc_constants.RPC_SERVER_STOP_TIMEOUT_S)
         except (Exception, CancelledError) as e:
             logger.error(log_messages.IPC_CLOSE_FAIL, e, exc_info=True)
+        if self.feed_worker_client is not None:
+            self.feed_worker_client.close()
+        if self._feed_worker_process is not None:
+            await asyncio.get_event_loop().run_in_executor(None, stop_feed_worker_process, self._feed_worker_process)
+            self._feed_worker_process = None
+        self.block_processing_service.close()
+        self.neutrality_service.close()
+        if self.opts.tx_service_snapshot_file and not self.opts.use_extensions:
+            # a periodic snapshot still being collected is superseded by the final snapshot
+            self._tx_service_snapshot_collection = None
+            pending_snapshot = self._tx_service_snapshot_future
+            if pending_snapshot is not None and not pending_snapshot.done():
+                await asyncio.wait([pending_snapshot])
+            await asyncio.wait([
+                self._write_tx_service_snapshot(transaction_service_snapshot.collect_snapshot_entries(self._tx_service))
+            ])
+        if self.traffic_recorder is not None:
+            self.traffic_recorder.close()
+        block_trace.close()
+        status_log.flush()
+        stat_event_pipeline.flush()
 
         await super(AbstractGatewayNode, self).close()
 
@@ -665,6 +832,12 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         self, socket_connection: AbstractSocketConnectionProtocol
     ) -> Optional[AbstractConnection]:
         conn = super().on_connection_added(socket_connection)
+        if conn is not None and self.opts.enable_latency_histograms:
+            latency_histograms.instrument_message_handlers(conn)
+        if conn is not None and event_loop_stats_service.enabled:
+            event_loop_stats_service.instrument_message_handlers(conn)
+        if conn is not None and self.traffic_recorder is not None:
+            self.traffic_recorder.attach(conn)
         streaming_peer = self.opts.stream_to_peer_gateway
         if (
             conn is None
@@ -1088,7 +1261,12 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
                         constants.TX_SERVICE_CHECK_NETWORKS_SYNCED_S, self._transaction_sync_timeout
                     )
                     relay_connection.tx_sync_service.send_tx_service_sync_req(self.network_num)
-                    self._clear_transaction_service()
+                    if self._tx_service_warm_started:
+                        # transactions restored from the snapshot are kept, the sync only fills in the gaps
+                        logger.info("Keeping transactions restored from snapshot while syncing with BDN.")
+                        self._tx_service_warm_started = False
+                    else:
+                        self._clear_transaction_service()
                     retry = False
             if retry:
                 logger.info("Relay connection is not ready to sync transaction state with BDN. Scheduling retry.")
@@ -1142,6 +1320,9 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
                 else:
                     logger.info("Loaded potential relays from cache.")
 
+            if self.relay_quality_service is not None:
+                self.relay_quality_service.update_candidates(potential_relay_peers)
+
             # check the network latency using the thread pool
             self.requester.send_threaded_request(
                 self._find_best_relay_peers,
@@ -1445,10 +1626,76 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         logger.debug("Clearing all data in transaction service.")
         self._tx_service.clear()
 
+    def _load_tx_service_snapshot(self) -> None:
+        path = self.opts.tx_service_snapshot_file
+        if not os.path.exists(path):
+            logger.info("No transaction service snapshot found at {}.", path)
+            return
+        try:
+            restored_count = transaction_service_snapshot.load_snapshot(
+                self._tx_service, path, self.opts.sid_expire_time
+            )
+        except (OSError, struct.error, TransactionServiceSnapshotError) as e:
+            logger.warning(log_messages.TX_SERVICE_SNAPSHOT_LOAD_FAIL, path, e)
+            self._tx_service.clear()
+            return
+
+        logger.info("Restored {} transactions from transaction service snapshot {}.", restored_count, path)
+        self._tx_service_warm_started = restored_count > 0
+
+    def _save_tx_service_snapshot(self) -> int:
+        pending_snapshot = self._tx_service_snapshot_future
+        if self._tx_service_snapshot_collection is None and (pending_snapshot is None or pending_snapshot.done()):
+            collection = SnapshotCollection(self._tx_service)
+            self._tx_service_snapshot_collection = collection
+            self._collect_tx_service_snapshot_slice(collection)
+        else:
+            logger.debug("Skipping transaction service snapshot, the previous snapshot is still being saved.")
+        return self.opts.tx_service_snapshot_interval_s
+
+    def _collect_tx_service_snapshot_slice(self, collection: SnapshotCollection) -> None:
+        """
+        Reads a slice of the transaction service on the event loop, and defers the rest of the snapshot to the next
+        loop iteration. Once complete, the snapshot is written.
+        """
+        if collection is not self._tx_service_snapshot_collection:
+            return
+
+        if collection.collect(self._tx_service, gateway_constants.TX_SERVICE_SNAPSHOT_SLICE_SIZE):
+            self._tx_service_snapshot_collection = None
+            self._write_tx_service_snapshot(collection.entries)
+        else:
+            self.alarm_queue.register_alarm(
+                constants.MIN_SLEEP_TIMEOUT, self._collect_tx_service_snapshot_slice, collection
+            )
+
+    def _write_tx_service_snapshot(self, entries: List[SnapshotEntry]) -> asyncio.Future:
+        """
+        Encodes and writes the collected snapshot entries on an executor thread.
+        """
+        path = self.opts.tx_service_snapshot_file
+        snapshot_future = asyncio.get_event_loop().run_in_executor(
+            None, transaction_service_snapshot.write_snapshot, entries, self.network_num, path
+        )
+        snapshot_future.add_done_callback(self._on_tx_service_snapshot_written)
+        self._tx_service_snapshot_future = snapshot_future
+        return snapshot_future
+
+    def _on_tx_service_snapshot_written(self, snapshot_future: asyncio.Future) -> None:
+        try:
+            snapshot_future.result()
+        except OSError as e:
+            logger.warning(log_messages.TX_SERVICE_SNAPSHOT_SAVE_FAIL, self.opts.tx_service_snapshot_file, e)
+
+    def _rotate_latency_histograms(self) -> int:
+        latency_histograms.rotate()
+        return gateway_constants.LATENCY_HISTOGRAM_INTERVAL_S
+
     def _check_memory_threshold(self):
         if self.opts.should_restart_on_high_memory and \
                 memory_utils.get_app_memory_usage() > gateway_constants.CHECK_MEMORY_THRESHOLD_LIMIT:
             logger.warning(log_messages.NODE_EXCEEDS_MEMORY)
+            logger.info("Memory held by gateway data structures: {}", self.get_memory_breakdown())
             self.should_force_exit = True
             self.should_restart_on_high_memory = True
         return gateway_constants.CHECK_MEMORY_THRESHOLD_INTERVAL_S
@@ -1466,18 +1713,13 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
         account_model = account_model_future.result()
         if account_model:
             if account_model.is_account_valid():
-                self.account_model = account_model
+                self._set_account_model(account_model)
                 now = datetime.utcnow()
                 expire_date = datetime.fromisoformat(account_model.expire_date)
                 trigger_alarm = max(
                     int((expire_date - now).total_seconds()) - gateway_constants.ONE_HOUR_INTERVAL_S,
                     gateway_constants.ONE_HOUR_INTERVAL_S
                 )
-                node_cache.update_cache_file(
-                    self.opts,
-                    # pyre-fixme[16]: `Optional` has no attribute `account_id`
-                    accounts={self.account_model.account_id: self.account_model},
-                )
             else:
                 trigger_alarm = gateway_constants.ONE_DAY_INTERVAL_S
 
@@ -1486,3 +1728,19 @@ class AbstractGatewayNode(AbstractNode, metaclass=ABCMeta):
                 self._get_account_record,
                 alarm_name="get_count_model"
             )
+
+    def _on_account_model_revalidated(self, revalidation: Future) -> None:
+        """
+        Applies the account fetched from the SDN in the background on startup, while the gateway started with the
+        cached account.
+        """
+        account_model = revalidation.result()
+        if account_model and account_model.is_account_valid():
+            self.opts.set_account_options(account_model)
+            self._set_account_model(account_model)
+
+    def _set_account_model(self, account_model: BdnAccountModelBase) -> None:
+        self.account_model = account_model
+        if self.feed_worker_client is not None:
+            self.feed_worker_client.set_account_model(account_model)
+        node_cache.update_cache_file(self.opts, accounts={account_model.account_id: account_model})
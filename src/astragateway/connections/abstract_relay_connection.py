@@ -279,10 +279,9 @@ class AbstractRelayConnection(InternalNodeConnection["AbstractGatewayNode"]):
                                 )
         )
 
-        for (short_id, transaction_hash) in missing_txs:
-            self.node.block_recovery_service.check_missing_sid(short_id, recovered_txs_source)
-            self.node.block_recovery_service.check_missing_tx_hash(transaction_hash, recovered_txs_source)
+        self.node.block_recovery_service.check_missing_transactions(missing_txs, recovered_txs_source)
 
+        for (short_id, transaction_hash) in missing_txs:
             tx_stats.add_tx_by_hash_event(
                 transaction_hash,
                 TransactionStatEventType.TX_UNKNOWN_TRANSACTION_RECEIVED_BY_GATEWAY_FROM_RELAY,
@@ -1,6 +1,8 @@
 import time
-from typing import List, TYPE_CHECKING
+from collections import OrderedDict
+from typing import List, TYPE_CHECKING, Tuple
 
+from astracommon import constants
 from astracommon.connections.connection_type import ConnectionType
 from astracommon.messages.abstract_message import AbstractMessage
 from astracommon.utils import convert
@@ -8,6 +10,7 @@ from astracommon.utils.blockchain_utils.btc.btc_object_hash import NULL_BTC_BLOC
 from astracommon.utils.expiring_dict import ExpiringDict
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
+from astracommon.utils.stats import stats_format
 from astracommon.utils.stats.block_statistics_service import block_stats
 from astragateway import gateway_constants, btc_constants
 from astragateway.btc_constants import NODE_WITNESS_SERVICE_FLAG
@@ -52,6 +55,11 @@ class BtcNodeConnectionProtocol(BtcBaseConnectionProtocol):
             f"{str(self)}_compact_btc_recoveries"
         )
         self.ping_interval_s: int = gateway_constants.BLOCKCHAIN_PING_INTERVAL_S
+        self._tx_request_allowance: float = btc_constants.BTC_MAX_TX_REQUESTS_PER_S
+        self._tx_request_allowance_time = time.time()
+        # transactions announced over the rate limit, requested as the allowance refills
+        self._queued_tx_requests: "OrderedDict[Sha256Hash, int]" = OrderedDict()
+        self._queued_tx_requests_alarm_scheduled = False
         self.connection.node.alarm_queue.register_alarm(
             self.block_cleanup_poll_interval_s,
             self._request_blocks_confirmation
@@ -89,56 +97,103 @@ class BtcNodeConnectionProtocol(BtcBaseConnectionProtocol):
         """
         Handle an inventory message.
 
-        Requests all transactions and blocks that haven't been previously seen.
+        Requests the blocks that haven't been previously seen and the transactions that aren't known to the
+        transaction service, deduplicating the inventory in a single pass. Transaction requests are rate limited,
+        so that the whole mempool being announced again after the node reconnects is requested gradually: the node
+        does not announce transactions twice, so transactions over the rate limit are queued and requested from an
+        alarm as the allowance refills.
         :param msg: INV message
         """
+        start_time = time.time()
+        node = self.node
+        blocks_seen = node.blocks_seen.contents
+        tx_service = self.tx_service
+        tx_request_allowance = self._get_tx_request_allowance(start_time)
+        process_blocks = None
         contains_block = False
         inventory_requests = []
         block_hashes = []
+        tx_hashes = set()
+        item_count = 0
+        tx_request_count = 0
+        rate_limited_count = 0
+        queued_tx_requests = self._queued_tx_requests
+        max_queued_tx_requests = btc_constants.BTC_MAX_QUEUED_TX_REQUESTS
+
         for inventory_type, item_hash in msg:
+            item_count += 1
             if InventoryType.is_block(inventory_type):
-                if not self.node.should_process_block_hash(item_hash):
+                if process_blocks is None:
+                    process_blocks = node.should_process_block_hash(item_hash)
+                if not process_blocks or item_hash in block_hashes:
                     continue
                 block_hashes.append(item_hash)
-                if item_hash not in self.node.blocks_seen.contents:
+                if item_hash not in blocks_seen:
                     contains_block = True
                     inventory_requests.append((inventory_type, item_hash))
-            else:
-                inventory_requests.append((inventory_type, item_hash))
-
-        self.node.block_cleanup_service.mark_blocks_and_request_cleanup(block_hashes)
-
-        if inventory_requests:
-            get_data = GetDataBtcMessage(
-                magic=msg.magic(),
-                inv_vects=inventory_requests,
-                request_witness_data=self.request_witness_data
+            elif item_hash not in tx_hashes and item_hash not in queued_tx_requests:
+                tx_hashes.add(item_hash)
+                transaction_key = tx_service.get_transaction_key(item_hash)
+                if (
+                    tx_service.has_transaction_contents_by_key(transaction_key)
+                    or tx_service.removed_transaction_by_key(transaction_key)
+                ):
+                    continue
+                if tx_request_count < tx_request_allowance:
+                    tx_request_count += 1
+                    inventory_requests.append((inventory_type, item_hash))
+                elif len(queued_tx_requests) < max_queued_tx_requests:
+                    rate_limited_count += 1
+                    queued_tx_requests[item_hash] = inventory_type
+
+        self._tx_request_allowance = tx_request_allowance - tx_request_count
+        node.block_cleanup_service.mark_blocks_and_request_cleanup(block_hashes)
+
+        self._send_get_data(inventory_requests, contains_block)
+        if rate_limited_count and not self._queued_tx_requests_alarm_scheduled:
+            self._queued_tx_requests_alarm_scheduled = True
+            node.alarm_queue.register_alarm(
+                btc_constants.BTC_QUEUED_TX_REQUESTS_INTERVAL_S, self._request_queued_transactions
             )
-            self.connection.enqueue_msg(get_data, prepend=contains_block)
 
-        block_queuing_service = self.node.block_queuing_service_manager.get_block_queuing_service(self.connection)
+        block_queuing_service = node.block_queuing_service_manager.get_block_queuing_service(self.connection)
         if block_queuing_service is not None:
             block_queuing_service.mark_blocks_seen_by_blockchain_node(block_hashes)
 
+        if rate_limited_count or item_count >= btc_constants.BTC_MAX_INV_ENTRIES:
+            self.connection.log_debug(
+                "Processed inventory of {} items in {}: requested {}, queued {} transactions over the rate limit.",
+                item_count,
+                stats_format.duration((time.time() - start_time) * 1000),
+                len(inventory_requests),
+                rate_limited_count
+            )
+
     def msg_get_data(self, msg: GetDataBtcMessage) -> None:
         """
         Handle GETDATA message from Bitcoin node.
         :param msg: GETDATA message
         """
-
+        block_request_info = None
+        inv_vects = []
         for inv_type, object_hash in msg:
             if InventoryType.is_block(inv_type):
+                if block_request_info is None:
+                    block_request_info = "Protocol: {}, Network: {}".format(
+                        self.node.opts.blockchain_protocol,
+                        self.node.opts.blockchain_network
+                    )
                 block_stats.add_block_event_by_block_hash(
                     object_hash,
                     BlockStatEventType.REMOTE_BLOCK_REQUESTED_BY_GATEWAY,
                     network_num=self.connection.network_num,
-                    more_info="Protocol: {}, Network: {}".format(
-                        self.node.opts.blockchain_protocol,
-                        self.node.opts.blockchain_network
-                    )
+                    more_info=block_request_info
                 )
+            inv_vects.append((InventoryType.MSG_BLOCK, object_hash))
+
+        for chunk_start in range(0, len(inv_vects), btc_constants.BTC_MAX_INV_ENTRIES):
             inv_msg = InvBtcMessage(
-                magic=self.magic, inv_vects=[(InventoryType.MSG_BLOCK, object_hash)]
+                magic=self.magic, inv_vects=inv_vects[chunk_start:chunk_start + btc_constants.BTC_MAX_INV_ENTRIES]
             )
             self.connection.enqueue_msg(inv_msg)
         return self.msg_proxy_request(msg, self.connection)
@@ -283,3 +338,60 @@ class BtcNodeConnectionProtocol(BtcBaseConnectionProtocol):
             hashes=hashes,
             hash_stop=NULL_BTC_BLOCK_HASH
         )
+
+    def _request_queued_transactions(self) -> float:
+        """
+        Requests the queued transactions the rate limit allows, skipping the ones received in the meantime.
+        """
+        queued_tx_requests = self._queued_tx_requests
+        if not self.connection.is_alive():
+            queued_tx_requests.clear()
+        tx_request_allowance = self._get_tx_request_allowance(time.time())
+        tx_service = self.tx_service
+        inventory_requests = []
+        while queued_tx_requests and len(inventory_requests) < tx_request_allowance:
+            tx_hash, inventory_type = queued_tx_requests.popitem(last=False)
+            transaction_key = tx_service.get_transaction_key(tx_hash)
+            if not (
+                tx_service.has_transaction_contents_by_key(transaction_key)
+                or tx_service.removed_transaction_by_key(transaction_key)
+            ):
+                inventory_requests.append((inventory_type, tx_hash))
+        self._tx_request_allowance = tx_request_allowance - len(inventory_requests)
+        self._send_get_data(inventory_requests, False)
+
+        if queued_tx_requests:
+            return btc_constants.BTC_QUEUED_TX_REQUESTS_INTERVAL_S
+        self._queued_tx_requests_alarm_scheduled = False
+        return constants.CANCEL_ALARMS
+
+    def _send_get_data(self, inventory_requests: List[Tuple[int, Sha256Hash]], contains_block: bool) -> None:
+        """
+        Requests the inventory in GETDATA messages of up to BTC_MAX_INV_ENTRIES entries, prepending the ones
+        requesting blocks.
+        """
+        max_inv_entries = btc_constants.BTC_MAX_INV_ENTRIES
+        for chunk_start in range(0, len(inventory_requests), max_inv_entries):
+            chunk = inventory_requests[chunk_start:chunk_start + max_inv_entries]
+            if len(chunk) < len(inventory_requests):
+                chunk_contains_block = any(InventoryType.is_block(inventory_type) for inventory_type, _ in chunk)
+            else:
+                chunk_contains_block = contains_block
+            get_data = GetDataBtcMessage(
+                magic=self.magic,
+                inv_vects=chunk,
+                request_witness_data=self.request_witness_data
+            )
+            self.connection.enqueue_msg(get_data, prepend=chunk_contains_block)
+
+    def _get_tx_request_allowance(self, current_time: float) -> float:
+        """
+        Returns how many transactions can be requested from the node within its rate limit.
+        """
+        max_allowance = btc_constants.BTC_MAX_TX_REQUESTS_PER_S
+        allowance = min(
+            max_allowance,
+            self._tx_request_allowance + (current_time - self._tx_request_allowance_time) * max_allowance
+        )
+        self._tx_request_allowance_time = current_time
+        return allowance
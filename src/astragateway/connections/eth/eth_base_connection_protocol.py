@@ -41,6 +41,7 @@ from astragateway.messages.eth.serializers.transient_block_body import Transient
 from astragateway.utils.eth import frame_utils
 from astragateway.utils.eth.rlpx_cipher import RLPxCipher
 from astragateway.utils.stats.eth.eth_gateway_stats_service import eth_gateway_stats_service
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 from astrautils import logging
 
 if TYPE_CHECKING:
@@ -273,7 +274,9 @@ class EthBaseConnectionProtocol(AbstractBlockchainConnectionProtocol, metaclass=
             encryption_start_time = time.time()
             for frame in frames:
                 yield self.rlpx_cipher.encrypt_frame(frame)
-            eth_gateway_stats_service.log_encrypted_message(time.time() - encryption_start_time)
+            encryption_time = time.time() - encryption_start_time
+            eth_gateway_stats_service.log_encrypted_message(encryption_time)
+            latency_histograms.record(LatencyOperation.ENCRYPTION, "rlpx", encryption_time)
 
     def _enqueue_auth_message(self):
         auth_msg_bytes = self._get_auth_msg_bytes()
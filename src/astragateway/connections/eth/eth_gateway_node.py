@@ -85,6 +85,7 @@ class EthGatewayNode(AbstractGatewayNode):
         5: "Verify that another instance of the gateway is not already running.",
         16: "Verify that '--blockchain-network' and other blockchain network parameters are correct."
     }
+    EXTENSION_PROCESSES_NODE_TXS = True
 
     def __init__(self, opts, node_ssl_service: NodeSSLService) -> None:
         super(EthGatewayNode, self).__init__(opts, node_ssl_service,
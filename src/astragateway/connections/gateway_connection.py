@@ -1,5 +1,5 @@
 import random
-from typing import TYPE_CHECKING, cast, Optional
+from typing import TYPE_CHECKING, cast, Optional, List, Tuple
 
 from astracommon import constants
 from astracommon.connections.connection_type import ConnectionType
@@ -11,6 +11,7 @@ from astracommon.messages.astra.astra_message_type import BloxrouteMessageType
 from astracommon.network.abstract_socket_connection_protocol import AbstractSocketConnectionProtocol
 from astracommon.services import sdn_http_service
 from astracommon.utils import crypto
+from astracommon.utils.object_hash import Sha256Hash
 from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
 from astracommon.utils.stats.block_statistics_service import block_stats
 from astracommon.feed.feed_source import FeedSource
@@ -19,6 +20,7 @@ from astragateway import log_messages
 from astracommon.feed.eth.eth_pending_transaction_feed import EthPendingTransactionFeed
 from astracommon.feed.eth.eth_raw_transaction import EthRawTransaction
 from astragateway.messages.gateway.confirmed_block_message import ConfirmedBlockMessage
+from astragateway.messages.gateway.confirmed_tx_batch_message import ConfirmedTxBatchMessage
 from astragateway.messages.gateway.confirmed_tx_message import ConfirmedTxMessage
 from astragateway.messages.gateway.gateway_hello_message import GatewayHelloMessage
 from astragateway.messages.gateway.gateway_message_factory import gateway_message_factory
@@ -54,6 +56,7 @@ class GatewayConnection(InternalNodeConnection["AbstractGatewayNode"]):
             BloxrouteMessageType.BLOCK_HOLDING: self.msg_block_holding,
             BloxrouteMessageType.KEY: self.msg_key,
             GatewayMessageType.CONFIRMED_TX: self.msg_confirmed_tx,
+            GatewayMessageType.CONFIRMED_TX_BATCH: self.msg_confirmed_tx_batch,
             GatewayMessageType.CONFIRMED_BLOCK: self.msg_confirmed_block,
             GatewayMessageType.REQUEST_TX_STREAM: self.msg_request_tx_stream,
         }
@@ -200,28 +203,38 @@ class GatewayConnection(InternalNodeConnection["AbstractGatewayNode"]):
         self.node.block_processing_service.process_block_key(msg, self)
 
     def msg_confirmed_tx(self, msg: ConfirmedTxMessage) -> None:
-        tx_hash = msg.tx_hash()
-        transaction_key = self.node.get_tx_service().get_transaction_key(tx_hash)
-        tx_contents = msg.tx_val()
-
-        # shouldn't ever happen, but just in case
-        if tx_contents == ConfirmedTxMessage.EMPTY_TX_VAL:
-            tx_contents = cast(
-                Optional[memoryview],
-                self.node.get_tx_service().get_transaction_by_key(transaction_key)
-            )
-            if tx_contents is None:
-                transaction_feed_stats_service.log_pending_transaction_missing_contents()
-                return
+        self._publish_confirmed_transactions([(msg.tx_hash(), msg.tx_val())])
+
+    def msg_confirmed_tx_batch(self, msg: ConfirmedTxBatchMessage) -> None:
+        self._publish_confirmed_transactions(msg.transactions())
+
+    def supports_confirmed_tx_batches(self) -> bool:
+        return self.protocol_version >= ConfirmedTxBatchMessage.MIN_PROTOCOL_VERSION
 
-        self.node.feed_manager.publish_to_feed(
-            FeedKey(EthPendingTransactionFeed.NAME, self.network_num),
-            EthRawTransaction(
-                tx_hash, tx_contents, FeedSource.BDN_SOCKET, local_region=True
+    def _publish_confirmed_transactions(self, transactions: List[Tuple[Sha256Hash, memoryview]]) -> None:
+        tx_service = self.node.get_tx_service()
+        feed_manager = self.node.feed_manager
+        feed_key = FeedKey(EthPendingTransactionFeed.NAME, self.network_num)
+
+        for tx_hash, tx_contents in transactions:
+            # shouldn't ever happen, but just in case
+            if tx_contents == ConfirmedTxMessage.EMPTY_TX_VAL:
+                tx_contents = cast(
+                    Optional[memoryview],
+                    tx_service.get_transaction_by_key(tx_service.get_transaction_key(tx_hash))
+                )
+                if tx_contents is None:
+                    transaction_feed_stats_service.log_pending_transaction_missing_contents()
+                    continue
+
+            feed_manager.publish_to_feed(
+                feed_key,
+                EthRawTransaction(
+                    tx_hash, tx_contents, FeedSource.BDN_SOCKET, local_region=True
+                )
             )
-        )
 
-        transaction_feed_stats_service.log_pending_transaction_from_internal(tx_hash)
+            transaction_feed_stats_service.log_pending_transaction_from_internal(tx_hash)
 
     def msg_request_tx_stream(self, msg: RequestTxStreamMessage) -> None:
         pass
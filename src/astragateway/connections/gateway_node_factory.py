@@ -1,18 +1,39 @@
+import importlib
+import sys
+import time
+from typing import Dict, Type, TYPE_CHECKING
+
 from astracommon.models.blockchain_protocol import BlockchainProtocol
-from astragateway.connections.btc.btc_gateway_node import BtcGatewayNode
-from astragateway.connections.eth.eth_gateway_node import EthGatewayNode
+from astracommon.utils import memory_utils
+from astracommon.utils.stats import stats_format
 from astrautils import logging
 
+if TYPE_CHECKING:
+    from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
+
 logger = logging.get_logger(__name__)
 
+# gateway node classes by blockchain protocol, as `module:class`. Only the module of the protocol the gateway
+# runs is imported, so that the other protocol stacks are not loaded.
+GATEWAY_NODE_CLASSES: Dict[str, str] = {
+    BlockchainProtocol.ETHEREUM.value: "astragateway.connections.eth.eth_gateway_node:EthGatewayNode",
+    BlockchainProtocol.ONTOLOGY.value: "astragateway.connections.ont.ont_gateway_node:OntGatewayNode",
+}
+DEFAULT_GATEWAY_NODE_CLASS = "astragateway.connections.btc.btc_gateway_node:BtcGatewayNode"
 
-def get_gateway_node_type(blockchain_protocol):
-    # TODO: This is temporary logic that will be replaced with list of valid protocols and networks from SDN
-    if blockchain_protocol == BlockchainProtocol.ETHEREUM.value:
-        return EthGatewayNode
 
-    if blockchain_protocol == BlockchainProtocol.ONTOLOGY.value:
-        from astragateway.connections.ont.ont_gateway_node import OntGatewayNode
-        return OntGatewayNode
+def get_gateway_node_type(blockchain_protocol) -> Type["AbstractGatewayNode"]:
+    # TODO: This is temporary logic that will be replaced with list of valid protocols and networks from SDN
+    module_name, class_name = GATEWAY_NODE_CLASSES.get(blockchain_protocol, DEFAULT_GATEWAY_NODE_CLASS).split(":")
+    if module_name in sys.modules:
+        return getattr(sys.modules[module_name], class_name)
 
-    return BtcGatewayNode
+    start_time = time.time()
+    node_class = getattr(importlib.import_module(module_name), class_name)
+    logger.info(
+        "Loaded {} modules in {}. Memory usage: {}.",
+        class_name,
+        stats_format.duration((time.time() - start_time) * 1000),
+        stats_format.byte_count(memory_utils.get_app_memory_usage())
+    )
+    return node_class
@@ -20,6 +20,8 @@ import astragateway.messages.ont.ont_consensus_message_converter_factory as cons
 
 
 class OntGatewayNode(AbstractGatewayNode):
+    EXTENSION_PROCESSES_NODE_TXS = True
+
     def __init__(self, opts, node_ssl_service: NodeSSLService):
         super(OntGatewayNode, self).__init__(opts, node_ssl_service, ont_constants.TRACKED_BLOCK_CLEANUP_INTERVAL_S)
 
@@ -1,7 +1,6 @@
 from typing import Set, TYPE_CHECKING, cast
 
 from astracommon import constants
-from astracommon.utils.expiring_set import ExpiringSet
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon.feed.feed import Feed
 from astracommon.feed.feed_source import FeedSource
@@ -13,6 +12,7 @@ from astragateway.feed.eth.eth_raw_block import EthRawBlock
 from astragateway.messages.eth.internal_eth_block_info import InternalEthBlockInfo
 from astragateway.messages.gateway.confirmed_block_message import ConfirmedBlockMessage
 from astragateway.services.eth.eth_block_queuing_service import EthBlockQueuingService
+from astragateway.utils.generational_expiring import GenerationalExpiringSet
 from astrautils import logging
 
 if TYPE_CHECKING:
@@ -31,18 +31,18 @@ class EthNewBlockFeed(Feed[EthBlockFeedEntry, EthRawBlock]):
     VALID_SOURCES = {
         FeedSource.BLOCKCHAIN_SOCKET, FeedSource.BLOCKCHAIN_RPC, FeedSource.BDN_SOCKET, FeedSource.BDN_INTERNAL
     }
-    published_blocks: ExpiringSet[Sha256Hash]
-    published_blocks_height: ExpiringSet[int]
+    published_blocks: GenerationalExpiringSet[Sha256Hash]
+    published_blocks_height: GenerationalExpiringSet[int]
 
     def __init__(self, node: "EthGatewayNode", network_num: int = constants.ALL_NETWORK_NUM,) -> None:
         super().__init__(self.NAME, network_num=network_num)
         self.last_block_number = 0
         self.hash_for_last_block_number = set()
         self.node = node
-        self.published_blocks = ExpiringSet(
+        self.published_blocks = GenerationalExpiringSet(
             node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, name="published_blocks"
         )
-        self.published_blocks_height = ExpiringSet(
+        self.published_blocks_height = GenerationalExpiringSet(
             node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, name="published_blocks_height"
         )
 
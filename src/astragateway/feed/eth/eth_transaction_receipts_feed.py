@@ -8,11 +8,11 @@ from astracommon.feed.feed import Feed
 from astracommon.feed.feed_source import FeedSource
 from astracommon.rpc import rpc_constants
 from astracommon.rpc.rpc_errors import RpcError
-from astracommon.utils.expiring_set import ExpiringSet
 from astragateway import gateway_constants
 from astragateway.feed.eth.eth_raw_block import EthRawBlock
 from astragateway.messages.eth.internal_eth_block_info import InternalEthBlockInfo
 from astragateway.services.eth.eth_block_queuing_service import EthBlockQueuingService
+from astragateway.utils.generational_expiring import GenerationalExpiringSet
 from astrautils import logging, utils
 
 if TYPE_CHECKING:
@@ -64,13 +64,13 @@ class EthTransactionReceiptsFeed(Feed[TransactionReceiptsFeedEntry, Union[EthRaw
         super().__init__(self.NAME, network_num)
         self.node = node
         self.last_block_number = 0
-        self.published_blocks = ExpiringSet(
+        self.published_blocks = GenerationalExpiringSet(
             node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, name="receipts_feed_published_blocks"
         )
-        self.published_blocks_height = ExpiringSet(
+        self.published_blocks_height = GenerationalExpiringSet(
             node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, name="receipts_feed_published_blocks_height"
         )
-        self.blocks_confirmed_by_new_heads_notification = ExpiringSet(
+        self.blocks_confirmed_by_new_heads_notification = GenerationalExpiringSet(
             node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, name="receipts_feed_newHeads_confirmed_blocks"
         )
 
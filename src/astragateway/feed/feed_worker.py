@@ -0,0 +1,213 @@
+"""
+Feed worker process, started by gateways running with `--feed-worker True`.
+
+The worker runs websockets and IPC servers of its own, next to the gateway's, serving the transaction feeds. It
+publishes the raw transaction feed entries the gateway forwards over a unix socket, so that filtering, projecting
+and serializing them for each subscriber does not run on the event loop that propagates blocks and transactions.
+Block feeds and the other RPC methods need the gateway node and are served by the gateway servers.
+"""
+import argparse
+import asyncio
+import json
+import os
+from typing import List, Optional, Union
+
+from astracommon.feed.eth.eth_new_transaction_feed import EthNewTransactionFeed
+from astracommon.feed.eth.eth_pending_transaction_feed import EthPendingTransactionFeed
+from astracommon.feed.feed import Feed
+from astracommon.feed.feed_manager import FeedManager
+from astracommon.feed.new_transaction_feed import NewTransactionFeed
+from astracommon.models.bdn_account_model_base import BdnAccountModelBase
+from astracommon.models.blockchain_protocol import BlockchainProtocol
+from astracommon.rpc.astra_json_rpc_request import BxJsonRpcRequest
+from astracommon.rpc.rpc_request_type import RpcRequestType
+from astracommon.rpc.requests.unsubscribe_rpc_request import UnsubscribeRpcRequest
+from astracommon.utils import convert, model_loader
+from astracommon.utils.alarm_queue import AlarmQueue
+from astragateway import gateway_constants
+from astragateway.feed import feed_worker_protocol
+from astragateway.feed.feed_worker_protocol import FeedWorkerFrameType, FrameReader
+from astragateway.rpc.ipc.ipc_server import IpcServer
+from astragateway.rpc.requests.gateway_subscribe_rpc_request import GatewaySubscribeRpcRequest
+from astragateway.rpc.subscription_rpc_handler import SubscriptionRpcHandler
+from astragateway.rpc.ws.ws_server import WsServer
+from astrautils import logging
+from astrautils.encoding.json_encoder import Case
+
+logger = logging.get_logger(__name__)
+
+
+class FeedWorkerNode:
+    """
+    Stands in for the gateway node in the feeds and subscription handlers of the feed worker.
+    """
+    opts: argparse.Namespace
+    network_num: int
+    alarm_queue: AlarmQueue
+    account_model: Optional[BdnAccountModelBase]
+    feed_manager: Optional[FeedManager]
+
+    def __init__(self, opts: argparse.Namespace) -> None:
+        self.opts = opts
+        self.network_num = opts.network_num
+        self.alarm_queue = AlarmQueue()
+        self.account_model = None
+        self.feed_manager = None
+        self.subscribers_changed = asyncio.Event()
+
+    def on_new_subscriber_request(self) -> None:
+        pass
+
+    def reevaluate_transaction_streamer_connection(self) -> None:
+        self.subscribers_changed.set()
+
+    def get_ws_server_status(self) -> bool:
+        return self.opts.ws
+
+
+class FeedWorkerRpcHandler(SubscriptionRpcHandler):
+    """
+    Only handles subscriptions, the other gateway RPC requests need the gateway node and are served by its
+    own servers.
+    """
+
+    def __init__(self, node: FeedWorkerNode, feed_manager: FeedManager, case: Case) -> None:
+        # pyre-fixme[6]: the worker node stands in for the gateway node
+        super().__init__(node, feed_manager, case)
+        self.request_handlers = {
+            RpcRequestType.SUBSCRIBE: GatewaySubscribeRpcRequest,
+            RpcRequestType.UNSUBSCRIBE: UnsubscribeRpcRequest,
+        }
+
+    def serialize_cached_subscription_message(self, message: BxJsonRpcRequest) -> Union[bytes, str]:
+        return message.to_jsons(self.case)
+
+
+def build_feeds(blockchain_protocol: str, node: FeedWorkerNode) -> List[Feed]:
+    if blockchain_protocol == BlockchainProtocol.ETHEREUM.value:
+        return [
+            EthNewTransactionFeed(network_num=node.network_num),
+            EthPendingTransactionFeed(node.alarm_queue, network_num=node.network_num),
+        ]
+    return [NewTransactionFeed(network_num=node.network_num)]
+
+
+class FeedWorker:
+    def __init__(self, opts: argparse.Namespace) -> None:
+        self.opts = opts
+        self.node = FeedWorkerNode(opts)
+        self.feed_manager = FeedManager(self.node)
+        self.node.feed_manager = self.feed_manager
+        for feed in build_feeds(opts.blockchain_protocol, self.node):
+            self.feed_manager.register_feed(feed)
+
+        self.servers: List[Union[WsServer, IpcServer]] = []
+        if opts.ws:
+            self.servers.append(
+                # pyre-fixme[6]: the worker node stands in for the gateway node
+                WsServer(opts.ws_host, opts.ws_port, self.feed_manager, self.node,
+                         rpc_handler_type=FeedWorkerRpcHandler)
+            )
+        if opts.ipc:
+            # pyre-fixme[6]: the worker node stands in for the gateway node
+            self.servers.append(IpcServer(opts.ipc_file, self.feed_manager, self.node,
+                                          rpc_handler_type=FeedWorkerRpcHandler))
+
+        self._gateway_writer: Optional[asyncio.StreamWriter] = None
+        self._has_subscribers = False
+        self._gateway_disconnected = asyncio.Event()
+
+    async def run(self) -> None:
+        if os.path.exists(self.opts.socket_file):
+            os.remove(self.opts.socket_file)
+        gateway_server = await asyncio.start_unix_server(self._handle_gateway, self.opts.socket_file)
+        for server in self.servers:
+            await server.start()
+        alarms_task = asyncio.ensure_future(self._fire_alarms())
+        subscribers_task = asyncio.ensure_future(self._report_subscribers())
+
+        await self._gateway_disconnected.wait()
+
+        alarms_task.cancel()
+        subscribers_task.cancel()
+        for server in self.servers:
+            await server.stop()
+        gateway_server.close()
+        await gateway_server.wait_closed()
+        if os.path.exists(self.opts.socket_file):
+            os.remove(self.opts.socket_file)
+
+    async def _handle_gateway(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        logger.info("Gateway connected to feed worker.")
+        self._gateway_writer = writer
+        self._has_subscribers = False
+        self.node.subscribers_changed.set()
+        frame_reader = FrameReader()
+        feed_manager = self.feed_manager
+
+        while True:
+            data = await reader.read(gateway_constants.FEED_WORKER_READ_SIZE)
+            if not data:
+                break
+            for frame_type, payload in frame_reader.feed(data):
+                if frame_type == FeedWorkerFrameType.FEED_ENTRY:
+                    feed_key, entry = feed_worker_protocol.decode_feed_entry(payload)
+                    feed_manager.publish_to_feed(feed_key, entry)
+                elif frame_type == FeedWorkerFrameType.ACCOUNT_MODEL:
+                    self.node.account_model = model_loader.load_model(
+                        BdnAccountModelBase, json.loads(str(payload, "utf-8"))
+                    )
+
+        logger.info("Gateway disconnected from feed worker, stopping.")
+        self._gateway_writer = None
+        writer.close()
+        self._gateway_disconnected.set()
+
+    async def _fire_alarms(self) -> None:
+        alarm_queue = self.node.alarm_queue
+        while True:
+            alarm_queue.fire_alarms()
+            await asyncio.sleep(gateway_constants.FEED_WORKER_POLL_INTERVAL_S)
+
+    async def _report_subscribers(self) -> None:
+        subscribers_changed = self.node.subscribers_changed
+        while True:
+            try:
+                await asyncio.wait_for(subscribers_changed.wait(), gateway_constants.FEED_WORKER_POLL_INTERVAL_S)
+            except asyncio.TimeoutError:
+                pass
+            subscribers_changed.clear()
+
+            has_subscribers = self.feed_manager.any_subscribers()
+            writer = self._gateway_writer
+            if writer is not None and has_subscribers != self._has_subscribers:
+                self._has_subscribers = has_subscribers
+                writer.write(feed_worker_protocol.encode_frame(
+                    FeedWorkerFrameType.SUBSCRIBERS, bytes([int(has_subscribers)])
+                ))
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(description="Gateway feed worker process")
+    arg_parser.add_argument("--socket-file", help="Unix socket the gateway forwards feed entries to", type=str,
+                            required=True)
+    arg_parser.add_argument("--network-num", type=int, required=True)
+    arg_parser.add_argument("--blockchain-protocol", type=str, required=True)
+    arg_parser.add_argument("--ws", type=convert.str_to_bool, default=False)
+    arg_parser.add_argument("--ws-host", type=str, default=gateway_constants.WS_DEFAULT_HOST)
+    arg_parser.add_argument("--ws-port", type=int, default=gateway_constants.WS_DEFAULT_PORT)
+    arg_parser.add_argument("--ipc", type=convert.str_to_bool, default=False)
+    arg_parser.add_argument("--ipc-file", help="Absolute path of the IPC unix socket", type=str,
+                            default="astragateway.ipc")
+    return arg_parser
+
+
+def main() -> None:
+    opts = get_argument_parser().parse_args()
+    # attributes the subscription requests read from the gateway options
+    opts.eth_ws_uri = None
+    asyncio.get_event_loop().run_until_complete(FeedWorker(opts).run())
+
+
+if __name__ == "__main__":
+    main()
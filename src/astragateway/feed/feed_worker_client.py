@@ -0,0 +1,252 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from astracommon.feed.eth.eth_new_transaction_feed import EthNewTransactionFeed
+from astracommon.feed.eth.eth_pending_transaction_feed import EthPendingTransactionFeed
+from astracommon.feed.feed import FeedKey
+from astracommon.feed.feed_manager import FeedManager
+from astracommon.feed.new_transaction_feed import NewTransactionFeed
+from astracommon.models.bdn_account_model_base import BdnAccountModelBase
+from astracommon.utils import config
+from astragateway import gateway_constants
+from astragateway.feed import feed_worker_protocol
+from astragateway.feed.feed_worker_protocol import FeedWorkerFrameType, FrameReader, RawFeedEntry
+from astrautils import logging
+from astrautils.encoding.json_encoder import EnhancedJSONEncoder
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports,cyclic-import
+    from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
+    from astragateway.gateway_opts import GatewayOpts
+
+logger = logging.get_logger(__name__)
+
+# feeds also served by the feed worker process. Their entries only carry transaction hashes and contents, unlike the
+# block feeds, which look up blocks and receipts from the gateway node and are only served in process.
+FEED_WORKER_FEED_NAMES = {NewTransactionFeed.NAME, EthNewTransactionFeed.NAME, EthPendingTransactionFeed.NAME}
+
+
+class FeedWorkerClient:
+    """
+    Forwards raw feed entries to the feed worker process over a non-blocking unix socket, and tracks whether the
+    worker has any subscribers.
+
+    Entries are only forwarded while the worker has subscribers. Entries published during an event loop iteration
+    are written to the socket together at the end of it, and are dropped, rather than buffered without bound or
+    blocking the event loop, while the worker is not connected or does not keep up.
+    """
+    socket_path: str
+    has_subscribers: bool
+    dropped_entries: int
+    _socket: Optional[socket.socket]
+    _pending: bytearray
+    _reader: FrameReader
+    _account_model_frame: Optional[bytearray]
+    _flush_scheduled: bool
+
+    def __init__(self, socket_path: str, on_subscribers_changed: Callable[[], None]) -> None:
+        self.socket_path = socket_path
+        self.has_subscribers = False
+        self.dropped_entries = 0
+        self._on_subscribers_changed = on_subscribers_changed
+        self._socket = None
+        self._pending = bytearray()
+        self._reader = FrameReader()
+        self._account_model_frame = None
+        self._flush_scheduled = False
+
+    def is_connected(self) -> bool:
+        return self._socket is not None
+
+    def set_account_model(self, account_model: Optional[BdnAccountModelBase]) -> None:
+        if account_model is None:
+            return
+        self._account_model_frame = feed_worker_protocol.encode_frame(
+            FeedWorkerFrameType.ACCOUNT_MODEL,
+            json.dumps(account_model, cls=EnhancedJSONEncoder).encode("utf-8")
+        )
+        if self._socket is not None:
+            self._send(self._account_model_frame)
+
+    def publish(self, feed_key: FeedKey, entry: RawFeedEntry) -> None:
+        if not self.has_subscribers:
+            return
+        if self._socket is None or len(self._pending) > gateway_constants.FEED_WORKER_MAX_PENDING_BYTES:
+            self.dropped_entries += 1
+            return
+        self._pending.extend(feed_worker_protocol.encode_feed_entry(feed_key, entry))
+        self._schedule_flush()
+
+    def poll(self) -> float:
+        """
+        Connects to the worker, reads its subscriber updates and sends the entries the socket did not accept yet.
+        """
+        if self._socket is None:
+            self._connect()
+        else:
+            self._read()
+            self._flush()
+
+        if self.dropped_entries:
+            logger.debug("Dropped {} feed entries not accepted by the feed worker.", self.dropped_entries)
+            self.dropped_entries = 0
+        return gateway_constants.FEED_WORKER_POLL_INTERVAL_S
+
+    def close(self) -> None:
+        sock = self._socket
+        if sock is not None:
+            sock.close()
+        self._socket = None
+        self._pending.clear()
+
+    def _connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return
+        logger.debug("Connected to feed worker at {}.", self.socket_path)
+        self._socket = sock
+        self._reader = FrameReader()
+        if self._account_model_frame is not None:
+            self._send(self._account_model_frame)
+
+    def _send(self, frame: bytearray) -> None:
+        if self._pending:
+            self._pending.extend(frame)
+            self._flush()
+            return
+
+        sock = self._socket
+        assert sock is not None
+        try:
+            sent = sock.send(frame)
+        except BlockingIOError:
+            sent = 0
+        except OSError as e:
+            self._on_disconnect(e)
+            return
+        if sent < len(frame):
+            self._pending.extend(memoryview(frame)[sent:])
+
+    def _schedule_flush(self) -> None:
+        """
+        Coalesces the entries published during an event loop iteration into a single write. Without a running event
+        loop, entries are written immediately.
+        """
+        if self._flush_scheduled:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush()
+            return
+        self._flush_scheduled = True
+        loop.call_soon(self._flush_scheduled_entries)
+
+    def _flush_scheduled_entries(self) -> None:
+        self._flush_scheduled = False
+        self._flush()
+
+    def _flush(self) -> None:
+        sock = self._socket
+        if sock is None or not self._pending:
+            return
+        try:
+            sent = sock.send(self._pending)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_disconnect(e)
+            return
+        del self._pending[:sent]
+
+    def _read(self) -> None:
+        sock = self._socket
+        assert sock is not None
+        while True:
+            try:
+                data = sock.recv(gateway_constants.FEED_WORKER_READ_SIZE)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self._on_disconnect(e)
+                return
+            if not data:
+                self._on_disconnect("connection closed")
+                return
+
+            for frame_type, payload in self._reader.feed(data):
+                if frame_type == FeedWorkerFrameType.SUBSCRIBERS:
+                    self._set_has_subscribers(payload[0] == 1)
+
+    def _on_disconnect(self, reason: Any) -> None:
+        logger.debug("Lost connection to feed worker: {}", reason)
+        self.close()
+        self._set_has_subscribers(False)
+
+    def _set_has_subscribers(self, has_subscribers: bool) -> None:
+        if has_subscribers != self.has_subscribers:
+            self.has_subscribers = has_subscribers
+            self._on_subscribers_changed()
+
+
+class FeedWorkerFeedManager(FeedManager):
+    """
+    Feed manager of gateways running a feed worker process, which forwards the entries of the feeds served by the
+    worker to it. The gateway websockets and IPC servers keep serving all feeds, so these entries are also published
+    in process while the in-process feed has subscribers.
+    """
+
+    def __init__(self, node: "AbstractGatewayNode", feed_worker_client: FeedWorkerClient) -> None:
+        super().__init__(node)
+        self.feed_worker_client = feed_worker_client
+
+    def publish_to_feed(self, feed_key: FeedKey, message: Any) -> None:
+        if feed_key.name in FEED_WORKER_FEED_NAMES:
+            self.feed_worker_client.publish(feed_key, message)
+            feed = self.get_feed(feed_key)
+            if feed is None or feed.subscriber_count() == 0:
+                return
+        super().publish_to_feed(feed_key, message)
+
+    def any_subscribers(self) -> bool:
+        return self.feed_worker_client.has_subscribers or super().any_subscribers()
+
+
+def start_feed_worker_process(opts: "GatewayOpts", socket_path: str, network_num: int) -> subprocess.Popen:
+    args = [
+        sys.executable, "-m", "astragateway.feed.feed_worker",
+        "--socket-file", socket_path,
+        "--network-num", str(network_num),
+        "--blockchain-protocol", str(opts.blockchain_protocol),
+        "--ws", str(opts.ws),
+        "--ws-host", opts.ws_host,
+        "--ws-port", str(opts.feed_worker_ws_port),
+        "--ipc", str(opts.ipc),
+        "--ipc-file", config.get_data_file(opts.feed_worker_ipc_file),
+    ]
+    logger.info("Starting feed worker process serving {}.", ", ".join(sorted(FEED_WORKER_FEED_NAMES)))
+    return subprocess.Popen(args)
+
+
+def stop_feed_worker_process(process: subprocess.Popen) -> None:
+    """
+    Terminates the feed worker process and reaps it, killing it if it does not exit in time. Blocks until the
+    process exits.
+    """
+    process.terminate()
+    try:
+        process.wait(gateway_constants.FEED_WORKER_STOP_TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        logger.debug(
+            "Feed worker process did not exit in {}s, killing it.", gateway_constants.FEED_WORKER_STOP_TIMEOUT_S
+        )
+        process.kill()
+        process.wait()
@@ -0,0 +1,103 @@
+"""
+Framing of the unix socket between the gateway and its feed worker process (see `feed_worker`).
+
+Every frame is a `<IB` header (payload length, frame type) followed by the payload:
+
+* `FEED_ENTRY` (gateway to worker): a raw transaction feed entry, as a `<BBBI` header (feed name length,
+  feed source index or `NO_SOURCE`, local region flag, network number) followed by the 32 byte transaction hash,
+  the feed name and the transaction contents.
+* `ACCOUNT_MODEL` (gateway to worker): the JSON encoded account model, used to authorize subscriptions.
+* `SUBSCRIBERS` (worker to gateway): a single byte, 1 if any feed of the worker has subscribers.
+"""
+import struct
+from enum import IntEnum
+from typing import List, Tuple, Union
+
+from astracommon.feed.eth.eth_raw_transaction import EthRawTransaction
+from astracommon.feed.feed import FeedKey
+from astracommon.feed.feed_source import FeedSource
+from astracommon.feed.new_transaction_feed import RawTransactionFeedEntry
+from astracommon.utils.object_hash import Sha256Hash
+
+FRAME_HEADER = struct.Struct("<IB")
+_ENTRY_HEADER = struct.Struct("<BBBI")
+_HASH_SIZE = 32
+_FEED_SOURCES = list(FeedSource)
+NO_SOURCE = 0xFF
+
+RawFeedEntry = Union[RawTransactionFeedEntry, EthRawTransaction]
+
+
+class FeedWorkerFrameType(IntEnum):
+    FEED_ENTRY = 1
+    ACCOUNT_MODEL = 2
+    SUBSCRIBERS = 3
+
+
+def encode_frame(frame_type: FeedWorkerFrameType, payload: Union[bytes, bytearray, memoryview]) -> bytearray:
+    frame = bytearray(FRAME_HEADER.size + len(payload))
+    FRAME_HEADER.pack_into(frame, 0, len(payload), frame_type)
+    frame[FRAME_HEADER.size:] = payload
+    return frame
+
+
+def encode_feed_entry(feed_key: FeedKey, entry: RawFeedEntry) -> bytearray:
+    feed_name = feed_key.name.encode("utf-8")
+    source = getattr(entry, "source", None)
+    source_index = NO_SOURCE if source is None else _FEED_SOURCES.index(source)
+    tx_contents = entry.tx_contents
+
+    payload_length = _ENTRY_HEADER.size + _HASH_SIZE + len(feed_name) + len(tx_contents)
+    frame = bytearray(FRAME_HEADER.size + payload_length)
+    FRAME_HEADER.pack_into(frame, 0, payload_length, FeedWorkerFrameType.FEED_ENTRY)
+    offset = FRAME_HEADER.size
+    _ENTRY_HEADER.pack_into(frame, offset, len(feed_name), source_index, entry.local_region, feed_key.network_num)
+    offset += _ENTRY_HEADER.size
+    frame[offset:offset + _HASH_SIZE] = entry.tx_hash.binary
+    offset += _HASH_SIZE
+    frame[offset:offset + len(feed_name)] = feed_name
+    offset += len(feed_name)
+    frame[offset:] = tx_contents
+    return frame
+
+
+def decode_feed_entry(payload: memoryview) -> Tuple[FeedKey, RawFeedEntry]:
+    name_length, source_index, local_region, network_num = _ENTRY_HEADER.unpack_from(payload)
+    offset = _ENTRY_HEADER.size
+    tx_hash = bytearray(payload[offset:offset + _HASH_SIZE])
+    offset += _HASH_SIZE
+    feed_key = FeedKey(str(payload[offset:offset + name_length], "utf-8"), network_num)
+    tx_contents = memoryview(bytearray(payload[offset + name_length:]))
+
+    if source_index == NO_SOURCE:
+        return feed_key, RawTransactionFeedEntry(Sha256Hash(tx_hash), tx_contents, local_region=bool(local_region))
+    return feed_key, EthRawTransaction(
+        Sha256Hash(tx_hash), tx_contents, _FEED_SOURCES[source_index], local_region=bool(local_region)
+    )
+
+
+class FrameReader:
+    """
+    Splits a byte stream into frames.
+    """
+    _buffer: bytearray
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[Tuple[FeedWorkerFrameType, memoryview]]:
+        self._buffer.extend(data)
+        buffer = self._buffer
+        offset = 0
+        frames = []
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            payload_length, frame_type = FRAME_HEADER.unpack_from(buffer, offset)
+            frame_end = offset + FRAME_HEADER.size + payload_length
+            if frame_end > len(buffer):
+                break
+            frames.append(
+                (FeedWorkerFrameType(frame_type), memoryview(bytes(buffer[offset + FRAME_HEADER.size:frame_end])))
+            )
+            offset = frame_end
+        del buffer[:offset]
+        return frames
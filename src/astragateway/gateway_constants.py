@@ -16,7 +16,17 @@ BLOCK_RECOVERY_RECOVERY_INTERVAL_S = [0.1, 0.5, 1, 2, 5]
 # BLOCK_RECOVERY_MAX_RETRY_ATTEMPTS = len(BLOCK_RECOVERY_RECOVERY_INTERVAL_S)
 BLOCK_RECOVERY_MAX_RETRY_ATTEMPTS = 1  # for now, since longer retries aren't really worth it
 BLOCK_RECOVERY_MAX_QUEUE_TIME = 15  # slightly more than sum(BLOCK_RECOVERY_RECOVERY_INTERVAL_S)
-CHECK_MEMORY_THRESHOLD_INTERVAL_S = 60 * 60
+CHECK_MEMORY_THRESHOLD_INTERVAL_S = 5 * 60
+# status changes within this delay of each other are written to the status file together
+STATUS_FILE_FLUSH_DELAY_S = 1
+# queued block and transaction stat events are formatted and submitted at this interval
+STAT_EVENTS_FLUSH_INTERVAL_S = 0.5
+STAT_EVENTS_MAX_QUEUED = 10000
+# records kept in the block trace ring file, about 88 bytes each
+BLOCK_TRACE_CAPACITY = 64 * 1024
+# last gateway settings received from the SDN, used on startup while they are revalidated
+GATEWAY_SETTINGS_CACHE_FILE_NAME = "gateway_settings_cache.json"
+MAX_CONCURRENT_IP_RESOLUTIONS = 8
 CHECK_MEMORY_THRESHOLD_LIMIT = 4 * 1024 * 1024 * 1024
 
 # enum for setting Gateway neutrality assertion policy for releasing encryption keys
@@ -42,6 +52,8 @@ NEUTRALITY_EXPECTED_RECEIPT_PERCENT = 50
 MAX_INTERVAL_BETWEEN_BLOCKS_S = 0.6
 NODE_READINESS_FOR_BLOCKS_CHECK_INTERVAL_S = 5
 MAX_BLOCK_CACHE_TIME_S = 20 * 60
+# number of buckets generational expiring containers split their expiration time into
+EXPIRY_GENERATIONS_COUNT = 10
 MAX_BLOCK_BACKLOG_TO_PUBLISH = 10
 
 GATEWAY_TRANSACTION_STATS_INTERVAL_S = 1 * 60
@@ -50,6 +62,29 @@ GATEWAY_BDN_PERFORMANCE_STATS_INTERVAL_S = 15 * 60
 GATEWAY_BDN_PERFORMANCE_STATS_LOOKBACK = 1
 GATEWAY_TRANSACTION_FEED_STATS_INTERVAL_S = 5 * 60
 GATEWAY_TRANSACTION_FEED_STATS_LOOKBACK = 1
+EVENT_LOOP_STATS_INTERVAL_S = 1 * 60
+EVENT_LOOP_STATS_LOOKBACK = 1
+# callbacks running at least this long are reported as event loop blockers
+EVENT_LOOP_SLOW_CALLBACK_THRESHOLD_S = 0.005
+# distinct blockers tracked per stats interval, further ones are grouped together
+EVENT_LOOP_MAX_TRACKED_BLOCKERS = 256
+EVENT_LOOP_TOP_BLOCKERS_COUNT = 10
+
+# sizes of the fixed-size structures used by transaction stats when sketches are enabled
+STATS_SKETCH_HYPERLOGLOG_PRECISION = 12
+STATS_SKETCH_COUNT_MIN_WIDTH = 4096
+STATS_SKETCH_COUNT_MIN_DEPTH = 4
+STATS_SKETCH_TDIGEST_COMPRESSION = 100
+# one in this many transaction hashes has its timestamps tracked for delay statistics
+STATS_SKETCH_SAMPLE_RATE = 16
+STATS_SKETCH_MAX_SAMPLED_TRANSACTIONS = 4096
+
+PROFILER_DEFAULT_INTERVAL_S = 0.005
+PROFILER_MIN_INTERVAL_S = 0.001
+PROFILER_MAX_DURATION_S = 10 * 60
+# bounds the memory of a profiling session
+PROFILER_MAX_STACKS = 10000
+PROFILER_MAX_STACK_DEPTH = 128
 
 MIN_PEER_RELAYS_BY_COUNTRY = defaultdict(lambda: 1)
 MAX_PEER_RELAYS_COUNT = 2
@@ -79,6 +114,18 @@ DEFAULT_REMOTE_BLOCKCHAIN_MESSAGE_TTL_S = 10
 
 BLOCK_CLEANUP_NODE_BLOCK_LIST_POLL_INTERVAL_S = 60
 TRACKED_BLOCK_CLEANUP_INTERVAL_S = 0
+# transactions removed per bulk call when cleaning up a block, and event loop time a cleanup callback may take
+# before the rest of the block is deferred to the next loop iteration
+BLOCK_CLEANUP_TX_SLICE_SIZE = 250
+BLOCK_CLEANUP_SLICE_TIME_BUDGET_S = 0.005
+# interval between periodic transaction service snapshots, when snapshots are enabled
+TX_SERVICE_SNAPSHOT_INTERVAL_S = 5 * 60
+# transactions read per event loop iteration when collecting a periodic transaction service snapshot
+TX_SERVICE_SNAPSHOT_SLICE_SIZE = 5000
+# estimated bytes per short id, covering both directions of the short id to transaction mapping
+SHORT_ID_MAPPING_ENTRY_SIZE_BYTES = 200
+# latency histogram percentiles cover the current and the previous interval
+LATENCY_HISTOGRAM_INTERVAL_S = 60
 
 # ignore last confirmed block and request block confirmation since last tracked block instead
 BLOCK_CLEANUP_REQUEST_EXPECTED_ADDITIONAL_TRACKED_BLOCKS = 1
@@ -93,6 +140,14 @@ BLOCK_CONFIRMATION_EXPIRE_TIME_S = 60 * 60
 LOGGING_LIMIT_ITEM_COUNT = 10
 
 RELAY_CONNECTION_REEVALUATION_INTERVAL_S = 4 * 60 * 60
+RELAY_SWITCH_MARGIN = 0.2
+# weight of the newest sample in the relay latency, jitter and block lag moving averages
+RELAY_QUALITY_EWMA_ALPHA = 0.2
+RELAY_QUALITY_MAX_TRACKED_BLOCKS = 64
+# probes in a row a candidate relay has to be better than a connected one before switching to it
+RELAY_SWITCH_CONSECUTIVE_PROBES = 3
+RELAY_SWITCH_CHECK_INTERVAL_S = 1
+RELAY_SWITCH_TIMEOUT_S = 30
 
 BLOCK_QUEUE_LENGTH_LIMIT = 128
 MSG_PROXY_REQUESTER_QUEUE_LIMIT = 15
@@ -105,9 +160,21 @@ BDN_TX_PROCESSING_TIME_WARNING_THRESHOLD_S = 0.05
 BLOCKCHAIN_TX_PROCESSING_TIME_WARNING_THRESHOLD_S = 0.05
 
 WS_DEFAULT_PORT = 28333
+FEED_WORKER_WS_DEFAULT_PORT = 28335
 WS_DEFAULT_HOST = LOCALHOST
 RPC_SUBSCRIBER_MAX_QUEUE_SIZE = 5000
 
+FEED_WORKER_SOCKET_FILE = "feed_worker.sock"
+FEED_WORKER_POLL_INTERVAL_S = 0.1
+# feed entries are dropped once this many bytes are waiting for the feed worker to read them
+FEED_WORKER_MAX_PENDING_BYTES = 16 * 1024 * 1024
+FEED_WORKER_READ_SIZE = 64 * 1024
+FEED_WORKER_STOP_TIMEOUT_S = 5
+
+# mempool confirmations streamed to peer gateways are sent in batches at this interval, or once this many are queued
+CONFIRMED_TX_BATCH_INTERVAL_S = 0.01
+CONFIRMED_TX_BATCH_MAX_COUNT = 500
+
 ETH_GAS_RUNNING_AVERAGE_SIZE = 10000
 ADDITIONAL_BLOCKCHAIN_RECONNECT_TIMEOUT_S = 3
 CHECK_RELAY_CONNECTIONS_DELAY_S = 5
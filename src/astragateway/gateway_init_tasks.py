@@ -1,18 +1,44 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
+
 from astracommon.services import sdn_http_service
 from astracommon.common_opts import CommonOpts
 from astracommon import common_init_tasks
+from astracommon.utils import config, node_cache
+from astracommon.utils.stats import stats_format
+from astragateway import gateway_constants, log_messages
 from astragateway.gateway_opts import GatewayOpts
 
+from astrautils import logging
 from astrautils.services.node_ssl_service import NodeSSLService
 
+logger = logging.get_logger(__name__)
+
+InitTask = Callable[[Any, NodeSSLService], None]
+
 
 def set_account_info(opts: CommonOpts, node_ssl_service: NodeSSLService) -> None:
     account_id = node_ssl_service.get_account_id()
-    if account_id:
-        # TODO: use local cache for account_model
-        account_model = sdn_http_service.fetch_account_model(account_id)
-        if account_model:
-            opts.set_account_options(account_model)
+    if not account_id:
+        return
+
+    cached_account_model = _read_cached_account_model(opts, account_id)
+    if cached_account_model is not None:
+        opts.set_account_options(cached_account_model)
+        # applied and cached by the gateway node on its event loop
+        opts.account_model_revalidation = _revalidate_in_background(
+            "account", sdn_http_service.fetch_account_model, account_id
+        )
+        return
+
+    account_model = sdn_http_service.fetch_account_model(account_id)
+    if account_model:
+        opts.set_account_options(account_model)
 
 
 def validate_network_opts(opts: CommonOpts, _node_ssl_service: NodeSSLService) -> None:
@@ -20,14 +46,126 @@ def validate_network_opts(opts: CommonOpts, _node_ssl_service: NodeSSLService) -
 
 
 def set_gateway_info(opts: GatewayOpts, _node_ssl_service: NodeSSLService) -> None:
+    cached_settings = _read_cached_gateway_settings(opts)
+    if cached_settings is not None:
+        opts.min_peer_relays_count = cached_settings["min_peer_relays_count"]
+        _revalidate_in_background("gateway settings", _fetch_gateway_info, opts)
+        return
+
+    _fetch_gateway_info(opts)
+
+
+def run_init_tasks(opts: GatewayOpts, node_ssl_service: NodeSSLService) -> None:
+    """
+    Runs the gateway initialization tasks and logs how long each of them took.
+
+    The account is fetched concurrently with the network tasks, unless the blockchain protocol or network
+    is only known from the account. Cached SDN responses are used when available, and revalidated in the
+    background.
+    """
+    start_time = time.time()
+    durations = {}
+    network_tasks = [
+        validate_network_opts,
+        common_init_tasks.set_network_info,
+        common_init_tasks.set_node_model,
+        set_gateway_info,
+    ]
+
+    if opts.blockchain_protocol is None or opts.blockchain_network is None:
+        _run_tasks([set_account_info] + network_tasks, opts, node_ssl_service, durations)
+    else:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="gateway_init") as executor:
+            account_future = executor.submit(_run_tasks, [set_account_info], opts, node_ssl_service, durations)
+            _run_tasks(network_tasks, opts, node_ssl_service, durations)
+            account_future.result()
+
+    logger.info(
+        "Gateway initialization completed in {} ({}).",
+        stats_format.duration((time.time() - start_time) * 1000),
+        ", ".join(f"{name}: {stats_format.duration(duration_ms)}" for name, duration_ms in durations.items())
+    )
+
+
+def _run_tasks(
+    tasks: List[InitTask], opts: GatewayOpts, node_ssl_service: NodeSSLService, durations: Dict[str, float]
+) -> None:
+    for task in tasks:
+        start_time = time.time()
+        task(opts, node_ssl_service)
+        durations[task.__name__] = (time.time() - start_time) * 1000
+
+
+def _revalidate_in_background(name: str, revalidate: Callable[..., Any], *args) -> Future:
+    """
+    Runs `revalidate` on a daemon thread. The returned future resolves to its result, or to None if it fails.
+    """
+    revalidation = Future()
+
+    def run() -> None:
+        result = None
+        try:
+            result = revalidate(*args)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning(log_messages.INIT_CACHE_REVALIDATION_FAIL, name, e)
+        revalidation.set_result(result)
+
+    threading.Thread(target=run, name=f"revalidate_{name.replace(' ', '_')}", daemon=True).start()
+    return revalidation
+
+
+def _read_cached_account_model(opts: CommonOpts, account_id: str):
+    if not opts.enable_node_cache:
+        return None
+    cache_info = node_cache.read(opts)
+    if cache_info is None or not cache_info.accounts:
+        return None
+    account_model = cache_info.accounts.get(account_id)
+    if account_model is None or not account_model.is_account_valid():
+        return None
+    return account_model
+
+
+def _read_cached_gateway_settings(opts: GatewayOpts) -> Optional[Dict[str, Any]]:
+    if not opts.enable_node_cache:
+        return None
+    try:
+        with open(config.get_data_file(gateway_constants.GATEWAY_SETTINGS_CACHE_FILE_NAME), "r") as cache_file:
+            cached_settings = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if cached_settings.get("node_id") != opts.node_id or "min_peer_relays_count" not in cached_settings:
+        return None
+    return cached_settings
+
+
+def _fetch_gateway_info(opts: GatewayOpts) -> None:
     node_config = sdn_http_service.fetch_gateway_settings(opts.node_id)
     opts.min_peer_relays_count = node_config.min_peer_relays_count
+    if opts.enable_node_cache:
+        _write_cached_gateway_settings(
+            {"node_id": opts.node_id, "min_peer_relays_count": node_config.min_peer_relays_count}
+        )
+
+
+def _write_cached_gateway_settings(settings: Dict[str, Any]) -> None:
+    path = config.get_data_file(gateway_constants.GATEWAY_SETTINGS_CACHE_FILE_NAME)
+    try:
+        cache_file = tempfile.NamedTemporaryFile(
+            "w", dir=os.path.dirname(path) or None, prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False
+        )
+    except OSError as e:
+        logger.debug("Failed to cache gateway settings to {}: {}", path, e)
+        return
+    try:
+        with cache_file:
+            json.dump(settings, cache_file)
+        os.replace(cache_file.name, path)
+    except OSError as e:
+        os.unlink(cache_file.name)
+        logger.debug("Failed to cache gateway settings to {}: {}", path, e)
 
 
 init_tasks = [
-    set_account_info,
-    validate_network_opts,
-    common_init_tasks.set_network_info,
-    common_init_tasks.set_node_model,
-    set_gateway_info,
+    run_init_tasks,
 ]
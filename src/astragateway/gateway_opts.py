@@ -1,7 +1,9 @@
+import functools
 import os
 import sys
 
 from argparse import Namespace
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional, Set, Dict
 
@@ -20,7 +22,6 @@ from astracommon.models.outbound_peer_model import OutboundPeerModel
 from astragateway import argument_parsers
 from astragateway import gateway_constants
 from astragateway import log_messages
-from astragateway.utils.eth.eccx import ECCx
 from astrautils import logging
 
 
@@ -67,6 +68,21 @@ class GatewayOpts(CommonOpts):
     compact_block_min_tx_count: int
     dump_short_id_mapping_compression: bool
     dump_short_id_mapping_compression_path: str
+    tx_service_snapshot_file: Optional[str]
+    tx_service_snapshot_interval_s: int
+    capture_traffic_file: Optional[str]
+    block_trace_file: Optional[str]
+    block_trace_capacity: int
+    block_compression_threads: int
+    block_encryption_threads: int
+    relay_probe_interval_s: int
+    relay_switch_margin: float
+    stat_event_sampling_rates: Dict[str, float]
+    enable_stats_sketches: bool
+    enable_latency_histograms: bool
+    event_loop_lag_sample_interval_s: float
+    event_loop_slow_callback_threshold_s: float
+    profiler_dir: Optional[str]
     tune_send_buffer_size: bool
     max_block_interval_s: int
     cookie_file_path: str
@@ -79,6 +95,8 @@ class GatewayOpts(CommonOpts):
     default_tx_flag: TransactionFlag
     should_update_source_version: bool
     account_model: Optional[BdnAccountModelBase]
+    # account fetched from the SDN in the background while the gateway starts with the cached account
+    account_model_revalidation: Optional[Future]
     process_node_txs_in_extension: bool
     enable_eth_extensions: bool     # TODO remove
     request_recovery: bool
@@ -102,6 +120,9 @@ class GatewayOpts(CommonOpts):
     ws: bool
     ws_host: str
     ws_port: int
+    feed_worker: bool
+    feed_worker_ws_port: int
+    feed_worker_ipc_file: str
     eth_ws_uri: Optional[str]
     request_remote_transaction_streaming: bool
     stream_to_peer_gateway: Optional[OutboundPeerModel]
@@ -128,6 +149,7 @@ class GatewayOpts(CommonOpts):
             opts.remote_blockchain_peer = None
 
         opts.account_model = None
+        opts.account_model_revalidation = None
 
         opts.is_docker = os.path.exists("/.dockerenv")
 
@@ -240,11 +262,7 @@ class GatewayOpts(CommonOpts):
             logger.fatal(log_messages.MISSING_BLOCKCHAIN_IP_AND_BLOCKCHAIN_PEERS, exc_info=False)
             sys.exit(1)
 
-        if self.blockchain_ip:
-            self.blockchain_ip = validate_blockchain_ip(self.blockchain_ip, self.is_docker)
-        if self.blockchain_peers:
-            for blockchain_peer in self.blockchain_peers:
-                blockchain_peer.ip = validate_blockchain_ip(blockchain_peer.ip, self.is_docker)
+        self._resolve_blockchain_ips()
         if self.rpc_host == rpc_constants.DEFAULT_RPC_HOST and self.is_docker:
             docker_host = get_docker_host()
             if docker_host:
@@ -253,6 +271,27 @@ class GatewayOpts(CommonOpts):
                 self.rpc_host = rpc_constants.DEFAULT_RPC_HOST
 
 
+    def _resolve_blockchain_ips(self) -> None:
+        blockchain_ips = [blockchain_peer.ip for blockchain_peer in self.blockchain_peers or []]
+        if self.blockchain_ip:
+            blockchain_ips.append(self.blockchain_ip)
+        if len(blockchain_ips) > 1:
+            # host names are resolved concurrently, so startup waits on the slowest lookup instead of all of them
+            with ThreadPoolExecutor(
+                max_workers=min(len(blockchain_ips), gateway_constants.MAX_CONCURRENT_IP_RESOLUTIONS)
+            ) as executor:
+                resolved_ips = list(executor.map(
+                    functools.partial(validate_blockchain_ip, is_docker=self.is_docker), blockchain_ips
+                ))
+        else:
+            resolved_ips = [validate_blockchain_ip(blockchain_ip, self.is_docker) for blockchain_ip in blockchain_ips]
+
+        if self.blockchain_ip:
+            self.blockchain_ip = resolved_ips.pop()
+        for blockchain_peer, resolved_ip in zip(self.blockchain_peers or [], resolved_ips):
+            blockchain_peer.ip = resolved_ip
+
+
 def get_sdn_hostname(sdn_url: str) -> str:
     new_sdn_url = sdn_url
     if "://" in sdn_url:
@@ -280,6 +319,7 @@ def validate_pub_key(key) -> None:
         logger.fatal(log_messages.INVALID_PUBLIC_KEY_LENGTH,
                      len(key), exc_info=False)
         sys.exit(1)
+    from astragateway.utils.eth.eccx import ECCx
     eccx_obj = ECCx()
     if not eccx_obj.is_valid_key(hex_to_bytes(key)):
         logger.fatal(log_messages.INVALID_PUBLIC_KEY, exc_info=False)
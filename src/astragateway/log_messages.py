@@ -497,3 +497,33 @@ ATTEMPTED_FETCH_FOR_NONEXISTENT_QUEUING_SERVICE = LogMessage(
     GENERAL_CATEGORY,
     "Attmepted to fetch queuing service for blockchain node {}, but it was not found."
 )
+TX_SERVICE_SNAPSHOT_LOAD_FAIL = LogMessage(
+    "G-000093",
+    PROCESSING_FAILED_CATEGORY,
+    "Failed to load transaction service snapshot from {}: {}. Starting with an empty transaction service."
+)
+TX_SERVICE_SNAPSHOT_SAVE_FAIL = LogMessage(
+    "G-000094",
+    PROCESSING_FAILED_CATEGORY,
+    "Failed to save transaction service snapshot to {}: {}"
+)
+STATUS_FILE_WRITE_FAIL = LogMessage(
+    "G-000095",
+    GENERAL_CATEGORY,
+    "Failed to write gateway status file to {}: {}"
+)
+INIT_CACHE_REVALIDATION_FAIL = LogMessage(
+    "G-000096",
+    REQUEST_RESPONSE_CATEGORY,
+    "Failed to revalidate cached {} with the SDN: {}. Keeping the cached value."
+)
+BLOCK_ENCRYPTION_FAIL = LogMessage(
+    "G-000097",
+    PROCESSING_FAILED_CATEGORY,
+    "Failed to encrypt block on the encryption threads: {}. Encrypting it on the event loop instead."
+)
+TX_SERVICE_SNAPSHOT_UNSUPPORTED = LogMessage(
+    "G-000098",
+    GENERAL_CATEGORY,
+    "Transaction service snapshots are not supported with extensions, ignoring --tx-service-snapshot-file."
+)
@@ -28,6 +28,7 @@ from astragateway.gateway_opts import GatewayOpts
 from astragateway import argument_parsers
 from astragateway.utils.gateway_start_args import GatewayStartArgs
 from astragateway import gateway_init_tasks
+from astragateway.utils.stats import stat_event_pipeline
 
 MAX_NUM_CONN = 8192
 PID_FILE_NAME = "astragateway.pid"
@@ -88,8 +89,9 @@ def get_argument_parser() -> argparse.ArgumentParser:
     arg_parser.add_argument("--blockchain-protocol", help="Blockchain protocol. e.g BitcoinCash, Ethereum", type=str)
     arg_parser.add_argument("--blockchain-network", help="Blockchain network. e.g Mainnet, Testnet", type=str)
     arg_parser.add_argument("--blockchain-port", help="Blockchain node port", type=int)
+    # resolved with the blockchain peers when validating network options
     arg_parser.add_argument("--blockchain-ip", help="Blockchain node ip",
-                            type=ip_resolver.blocking_resolve_ip,
+                            type=str,
                             default=None)
     arg_parser.add_argument("--peer-gateways",
                             help="Optional gateway peer ip/ports that will always be connected to. "
@@ -214,6 +216,108 @@ def get_argument_parser() -> argparse.ArgumentParser:
         help="Folder to dump compressed short ids to",
         default="/app/astragateway/debug/compressed-short-ids",
     )
+    arg_parser.add_argument(
+        "--tx-service-snapshot-file",
+        help="If set, the gateway periodically saves its transaction service state to this file and restores it "
+             "on startup, so only the transactions missed while offline need to be synced from the BDN",
+        type=str,
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--tx-service-snapshot-interval-s",
+        help="Interval between transaction service snapshots",
+        type=int,
+        default=gateway_constants.TX_SERVICE_SNAPSHOT_INTERVAL_S,
+    )
+    arg_parser.add_argument(
+        "--capture-traffic-file",
+        help="If set, the gateway records all messages received from blockchain nodes and relays to this file, "
+             "for replaying with astragateway.testing.traffic_replay",
+        type=str,
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--block-trace-file",
+        help="If set, the gateway records a timestamp for each block lifecycle stage (received, compressed, "
+             "encrypted, broadcast, ..., sent to node) to this ring file, for astra_cli/block_trace_report.py",
+        type=str,
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--block-trace-capacity",
+        help="Number of records kept in the block trace file before the oldest are overwritten",
+        type=int,
+        default=gateway_constants.BLOCK_TRACE_CAPACITY,
+    )
+    arg_parser.add_argument(
+        "--block-compression-threads",
+        help="Number of threads compressing blocks received from the blockchain node. If set, blocks are compressed "
+             "off the event loop, not supported with extensions (default: 0, blocks are compressed on the event loop)",
+        type=int,
+        default=0,
+    )
+    arg_parser.add_argument(
+        "--block-encryption-threads",
+        help="Number of threads encrypting blocks before they are broadcast to the BDN. If set, blocks are encrypted "
+             "off the event loop (default: 0, blocks are encrypted on the event loop)",
+        type=int,
+        default=0,
+    )
+    arg_parser.add_argument(
+        "--relay-probe-interval-s",
+        help="Interval between latency probes of the connected and candidate relays, e.g. 60. If set, the gateway "
+             "switches to a candidate relay that is consistently better than a connected one (default: disabled)",
+        type=int,
+        default=0,
+    )
+    arg_parser.add_argument(
+        "--relay-switch-margin",
+        help="Fraction by which a candidate relay has to be better than a connected relay to switch to it",
+        type=float,
+        default=gateway_constants.RELAY_SWITCH_MARGIN,
+    )
+    arg_parser.add_argument(
+        "--event-loop-lag-sample-interval-s",
+        help="Interval between event loop scheduling lag samples, e.g. 0.1. If set, message handlers and alarms "
+             "blocking the event loop are also tracked and reported (default: 0, disabled)",
+        type=float,
+        default=0,
+    )
+    arg_parser.add_argument(
+        "--event-loop-slow-callback-threshold-s",
+        help="Message handlers and alarms running at least this long are reported as event loop blockers",
+        type=float,
+        default=gateway_constants.EVENT_LOOP_SLOW_CALLBACK_THRESHOLD_S,
+    )
+    arg_parser.add_argument(
+        "--profiler-dir",
+        help="Directory the /profiler/start endpoint writes sampled stacks to when a file name is requested "
+             "(default: not set, sampled stacks are only returned in the response)",
+        type=str,
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--stat-event-sampling-rates",
+        help="Comma separated sampling rates of block and transaction stat events, by event type name "
+             "(e.g. TxReceivedByGatewayFromPeer=0.1). Can also be changed at runtime on the /stat_events/sampling "
+             "endpoint",
+        type=stat_event_pipeline.parse_sampling_rates,
+        default={},
+    )
+    arg_parser.add_argument(
+        "--enable-stats-sketches",
+        help="If true, transaction stats are kept in fixed-size probabilistic sketches instead of per "
+             "transaction, so that their memory does not grow with transaction volume",
+        type=convert.str_to_bool,
+        default=False,
+    )
+    arg_parser.add_argument(
+        "--enable-latency-histograms",
+        help="If true, the gateway records latency histograms of its hot paths and exports their percentiles "
+             "on the /metrics endpoint",
+        type=convert.str_to_bool,
+        default=True,
+    )
     arg_parser.add_argument(
         "--tune-send-buffer-size",
         help="If true, then the gateway will increase the send buffer's size for the blockchain connection",
@@ -284,6 +388,27 @@ def get_argument_parser() -> argparse.ArgumentParser:
         type=convert.str_to_bool,
         default=False,
     )
+    arg_parser.add_argument(
+        "--feed-worker",
+        help="Also serve the transaction feeds from a separate process, on --feed-worker-ws-port and "
+             "--feed-worker-ipc-file, so that publishing to their subscribers does not delay block and transaction "
+             "propagation. The gateway websockets and IPC servers keep serving all feeds and methods "
+             "(default: False)",
+        type=convert.str_to_bool,
+        default=False,
+    )
+    arg_parser.add_argument(
+        "--feed-worker-ws-port",
+        help=f"Websockets port of the feed worker process (default: {gateway_constants.FEED_WORKER_WS_DEFAULT_PORT})",
+        type=int,
+        default=gateway_constants.FEED_WORKER_WS_DEFAULT_PORT,
+    )
+    arg_parser.add_argument(
+        "--feed-worker-ipc-file",
+        help="IPC filename of the feed worker process",
+        type=str,
+        default="astragateway_feed_worker.ipc",
+    )
     arg_parser.add_argument(
         "--ws-host",
         help=f"Websockets server listening host (default: {gateway_constants.WS_DEFAULT_HOST})",
@@ -1,5 +1,5 @@
 import struct
-from typing import Optional
+from typing import Optional, List
 
 from astrautils.logging.log_level import LogLevel
 
@@ -12,7 +12,7 @@ from astragateway.btc_constants import BTC_HDR_COMMON_OFF, BTC_BLOCK_HDR_SIZE, B
 from astragateway.messages.btc.btc_message import BtcMessage
 from astragateway.messages.btc.btc_message_type import BtcMessageType
 from astragateway.messages.btc.btc_messages_util import get_next_tx_size, pack_int_to_btc_varint, \
-    pack_block_header
+    pack_block_header, get_block_transactions_and_hashes
 
 
 # FIXME, there's a lot of duplicate code between here and BlockHeader
@@ -46,6 +46,7 @@ class BlockBtcMessage(BtcMessage, AbstractBlockMessage):
         self._merkle_root = None
         self._bits = self._nonce = self._txn_count = self._txns = self._hash_val = None
         self._header = self._tx_offset = None
+        self._tx_hashes: Optional[List[BtcObjectHash]] = None
         self._timestamp = 0
 
     def log_level(self):
@@ -129,6 +130,19 @@ class BlockBtcMessage(BtcMessage, AbstractBlockMessage):
 
         return self._txns
 
+    def tx_hashes(self) -> List[BtcObjectHash]:
+        """
+        Hashes of the transactions of `txns()`, indexed along with the transactions in a single pass over the block.
+        """
+        if self._tx_hashes is None:
+            if self._tx_offset is None:
+                self.version()
+            self._txns, self._tx_hashes = get_block_transactions_and_hashes(
+                self._memoryview, self._tx_offset, self.txn_count()
+            )
+        # pyre-fixme[7]: Expected `List[BtcObjectHash]` but got `Optional[List[BtcObjectHash]]`.
+        return self._tx_hashes
+
     def block_hash(self) -> BtcObjectHash:
         if self._hash_val is None:
             header = self._memoryview[BTC_HDR_COMMON_OFF:BTC_HDR_COMMON_OFF + BTC_BLOCK_HDR_SIZE]
@@ -1,5 +1,7 @@
+import hashlib
 import socket
 import struct
+from typing import List, Tuple
 
 from astracommon import constants
 from astracommon.constants import UL_INT_SIZE_IN_BYTES
@@ -122,6 +124,57 @@ def get_next_segwit_tx_size(buf, off, tail=-1):
     return end - off
 
 
+def get_block_transactions_and_hashes(
+    buf: memoryview, off: int, txn_count: int
+) -> Tuple[List[memoryview], List[BtcObjectHash]]:
+    """
+    Indexes the `txn_count` transactions of a block in a single pass over the buffer.
+    Transaction hashes are computed from the ranges found while parsing the transaction boundaries, hashing the
+    witness stripped version, inputs, outputs and lock time of segwit transactions without copying them.
+
+    :param buf: block buffer
+    :param off: offset of the first transaction
+    :param txn_count: number of transactions in the block
+    :return: transactions and their hashes
+    """
+    sha256 = hashlib.sha256
+    is_segwit = btc_common_utils.is_segwit
+    btc_varint_to_int = btc_common_utils.btc_varint_to_int
+    get_tx_io_count_and_size = btc_common_utils.get_tx_io_count_and_size
+
+    txns = []
+    tx_hashes = []
+    for _ in range(txn_count):
+        start = off
+        if is_segwit(buf, start):
+            io_start = start + btc_constants.TX_VERSION_LEN + btc_constants.TX_SEGWIT_FLAG_LEN
+            io_size, txin_count, _ = get_tx_io_count_and_size(buf, io_start, -1)
+            io_end = io_start + io_size
+
+            off = io_end
+            for _ in range(txin_count):
+                witness_count, size = btc_varint_to_int(buf, off)
+                off += size
+                for _ in range(witness_count):
+                    witness_len, size = btc_varint_to_int(buf, off)
+                    off += size + witness_len
+            end = off + btc_constants.TX_LOCK_TIME_LEN
+
+            tx_hash = sha256(buf[start:start + btc_constants.TX_VERSION_LEN])
+            tx_hash.update(buf[io_start:io_end])
+            tx_hash.update(buf[off:end])
+        else:
+            io_size, _, _ = get_tx_io_count_and_size(buf, start + btc_constants.TX_VERSION_LEN, -1)
+            end = start + btc_constants.TX_VERSION_LEN + io_size + btc_constants.TX_LOCK_TIME_LEN
+            tx_hash = sha256(buf[start:end])
+
+        txns.append(buf[start:end])
+        tx_hashes.append(BtcObjectHash(buf=sha256(tx_hash.digest()).digest(), length=BTC_SHA_HASH_LEN))
+        off = end
+
+    return txns, tx_hashes
+
+
 def pack_block_header(buffer: bytearray, version: int, prev_block: BtcObjectHash, merkle_root: BtcObjectHash,
                       timestamp: int, bits: int, block_nonce: int) -> int:
     """
@@ -155,14 +155,18 @@ class BtcNormalMessageConverter(AbstractBtcMessageConverter):
 
         max_timestamp_for_compression = time.time() - min_tx_age_seconds
 
-        for tx in block_msg.txns():
-            tx_hash = btc_common_utils.get_txid(tx)
-            transaction_key = tx_service.get_transaction_key(tx_hash)
-            short_id = tx_service.get_short_id_by_key(transaction_key)
+        # transactions and hashes are indexed in one pass, and the lookups below are bound once per block
+        tx_hashes = block_msg.tx_hashes()
+        get_transaction_key = tx_service.get_transaction_key
+        get_short_id_by_key = tx_service.get_short_id_by_key
+        get_short_id_assign_time = tx_service.get_short_id_assign_time
+
+        for tx, tx_hash in zip(block_msg.txns(), tx_hashes):
+            short_id = get_short_id_by_key(get_transaction_key(tx_hash))
 
             short_id_assign_time = 0
             if short_id != constants.NULL_TX_SID:
-                short_id_assign_time = tx_service.get_short_id_assign_time(short_id)
+                short_id_assign_time = get_short_id_assign_time(short_id)
 
             if short_id == constants.NULL_TX_SID or \
                     not enable_block_compression or \
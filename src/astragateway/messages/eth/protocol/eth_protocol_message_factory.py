@@ -55,6 +55,7 @@ from astragateway.messages.eth.protocol.transactions_eth_protocol_message import
 from astragateway.utils.eth.framed_input_buffer import FramedInputBuffer
 from astragateway.utils.eth.rlpx_cipher import RLPxCipher
 from astragateway.utils.stats.eth.eth_gateway_stats_service import eth_gateway_stats_service
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 
 
 class EthProtocolMessageFactory(AbstractMessageFactory):
@@ -134,7 +135,9 @@ class EthProtocolMessageFactory(AbstractMessageFactory):
         elif self._expected_msg_type is None:
             decryption_start_time = time.time()
             is_full_msg, command = self._framed_input_buffer.peek_message(input_buffer)
-            eth_gateway_stats_service.log_decrypted_message(time.time() - decryption_start_time)
+            decryption_time = time.time() - decryption_start_time
+            eth_gateway_stats_service.log_decrypted_message(decryption_time)
+            latency_histograms.record(LatencyOperation.DECRYPTION, "rlpx", decryption_time)
 
             if is_full_msg:
                 return MessagePreview(True, command, 0)
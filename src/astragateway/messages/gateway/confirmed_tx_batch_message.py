@@ -0,0 +1,91 @@
+import struct
+from typing import List, Optional, Tuple, Union
+
+from astracommon import constants
+from astracommon.messages.astra.abstract_astra_message import AbstractBloxrouteMessage
+from astracommon.messages.astra.tx_message import TxMessage
+from astracommon.utils import crypto
+from astracommon.utils.object_hash import Sha256Hash
+from astragateway.messages.gateway.gateway_message_type import GatewayMessageType
+
+ConfirmedTransaction = Tuple[Sha256Hash, Union[bytes, bytearray, memoryview]]
+
+
+class ConfirmedTxBatchMessage(AbstractBloxrouteMessage):
+    """
+    Confirmation message that a batch of transactions has been accepted into the
+    blockchain node's mempool. Only sent to/from streaming gateways that support
+    gateway protocol version `MIN_PROTOCOL_VERSION`.
+
+    Each transaction is encoded as its hash, the length of its contents and its
+    contents, which are empty if the receiving gateway is to look them up.
+    """
+
+    MESSAGE_TYPE = GatewayMessageType.CONFIRMED_TX_BATCH
+    MIN_PROTOCOL_VERSION = 3
+    ENTRY_HEADER_LENGTH = crypto.SHA256_HASH_LEN + constants.UL_INT_SIZE_IN_BYTES
+    EMPTY_TX_VAL = TxMessage.EMPTY_TX_VAL
+
+    buf: bytearray
+    _transactions: Optional[List[Tuple[Sha256Hash, memoryview]]] = None
+
+    def __init__(
+        self,
+        transactions: Optional[List[ConfirmedTransaction]] = None,
+        buf: Optional[bytearray] = None,
+    ) -> None:
+        if buf is None:
+            assert transactions is not None
+            payload_length = (
+                constants.UL_INT_SIZE_IN_BYTES
+                + sum(self.ENTRY_HEADER_LENGTH + len(tx_val) for _, tx_val in transactions)
+                + constants.CONTROL_FLAGS_LEN
+            )
+            buf = bytearray(AbstractBloxrouteMessage.HEADER_LENGTH + payload_length)
+
+            off = AbstractBloxrouteMessage.HEADER_LENGTH
+            struct.pack_into("<L", buf, off, len(transactions))
+            off += constants.UL_INT_SIZE_IN_BYTES
+
+            for tx_hash, tx_val in transactions:
+                buf[off:off + crypto.SHA256_HASH_LEN] = tx_hash.binary
+                off += crypto.SHA256_HASH_LEN
+                struct.pack_into("<L", buf, off, len(tx_val))
+                off += constants.UL_INT_SIZE_IN_BYTES
+                buf[off:off + len(tx_val)] = tx_val
+                off += len(tx_val)
+        else:
+            payload_length = len(buf) - AbstractBloxrouteMessage.HEADER_LENGTH
+
+        self.buf = buf
+        super().__init__(self.MESSAGE_TYPE, payload_length, buf)
+
+    def count(self) -> int:
+        count, = struct.unpack_from("<L", self.buf, AbstractBloxrouteMessage.HEADER_LENGTH)
+        return count
+
+    def transactions(self) -> List[Tuple[Sha256Hash, memoryview]]:
+        """
+        :return: the hashes and contents of the confirmed transactions, with `EMPTY_TX_VAL` as the contents of
+                 transactions sent without them
+        """
+        if self._transactions is None:
+            mem_view = self._memoryview
+            off = AbstractBloxrouteMessage.HEADER_LENGTH + constants.UL_INT_SIZE_IN_BYTES
+            transactions = []
+            for _ in range(self.count()):
+                tx_hash = Sha256Hash(mem_view[off:off + crypto.SHA256_HASH_LEN])
+                off += crypto.SHA256_HASH_LEN
+                tx_val_length, = struct.unpack_from("<L", mem_view, off)
+                off += constants.UL_INT_SIZE_IN_BYTES
+                if tx_val_length:
+                    tx_val = mem_view[off:off + tx_val_length]
+                    off += tx_val_length
+                else:
+                    tx_val = self.EMPTY_TX_VAL
+                transactions.append((tx_hash, tx_val))
+            self._transactions = transactions
+
+        transactions = self._transactions
+        assert transactions is not None
+        return transactions
@@ -1,5 +1,6 @@
 from astragateway.messages.gateway.gateway_message_type import GatewayMessageType
 from astragateway.messages.gateway.v1.gateway_hello_message_converter_v1 import gateway_hello_message_converter_v1
+from astragateway.messages.gateway.v2.gateway_message_converter_v2 import gateway_message_converter_v2
 from astracommon.messages.versioning.abstract_version_converter_factory import AbstractMessageConverterFactory
 
 
@@ -20,3 +21,23 @@ class _GatewayMessageConverterFactoryV1(AbstractMessageConverterFactory):
 
 
 gateway_message_converter_factory_v1 = _GatewayMessageConverterFactoryV1()
+
+
+class _GatewayMessageConverterFactoryV2(AbstractMessageConverterFactory):
+
+    # message types added after version 2, which cannot be sent to gateways on version 2
+    _NEWER_MESSAGE_TYPES = {
+        GatewayMessageType.CONFIRMED_TX_BATCH,
+    }
+
+    def get_message_converter(self, msg_type):
+        if not msg_type:
+            raise ValueError("msg_type is required.")
+
+        if msg_type in self._NEWER_MESSAGE_TYPES:
+            raise ValueError("Message type '{}' is not supported by version 2.".format(msg_type))
+
+        return gateway_message_converter_v2
+
+
+gateway_message_converter_factory_v2 = _GatewayMessageConverterFactoryV2()
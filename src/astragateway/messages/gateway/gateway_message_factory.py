@@ -8,6 +8,7 @@ from astragateway.messages.gateway.block_received_message import BlockReceivedMe
 from astragateway.messages.gateway.blockchain_sync_request_message import BlockchainSyncRequestMessage
 from astragateway.messages.gateway.blockchain_sync_response_message import BlockchainSyncResponseMessage
 from astragateway.messages.gateway.confirmed_block_message import ConfirmedBlockMessage
+from astragateway.messages.gateway.confirmed_tx_batch_message import ConfirmedTxBatchMessage
 from astragateway.messages.gateway.confirmed_tx_message import ConfirmedTxMessage
 from astragateway.messages.gateway.gateway_hello_message import GatewayHelloMessage
 from astragateway.messages.gateway.gateway_message_type import GatewayMessageType
@@ -23,6 +24,7 @@ class _GatewayMessageFactory(_BloxrouteMessageFactory):
         GatewayMessageType.BLOCK_PROPAGATION_REQUEST: BlockPropagationRequestMessage,
         BloxrouteMessageType.KEY: KeyMessage,
         GatewayMessageType.CONFIRMED_TX: ConfirmedTxMessage,
+        GatewayMessageType.CONFIRMED_TX_BATCH: ConfirmedTxBatchMessage,
         GatewayMessageType.REQUEST_TX_STREAM: RequestTxStreamMessage,
         GatewayMessageType.CONFIRMED_BLOCK: ConfirmedBlockMessage,
 
@@ -9,4 +9,5 @@ class GatewayMessageType:
 
     REQUEST_TX_STREAM = b"rqtx"
     CONFIRMED_TX = b"cnfrmtx"
+    CONFIRMED_TX_BATCH = b"cnfrmtxs"
     CONFIRMED_BLOCK = b"cnfrmbk"
@@ -1,19 +1,25 @@
 from astracommon.messages.versioning.abstract_version_manager import AbstractVersionManager
 from astragateway.messages.gateway.v1.gateway_message_factory_v1 import gateway_message_factory_v1
-from astragateway.messages.gateway.gateway_message_factory import gateway_message_factory as gateway_message_factory_v2
+from astragateway.messages.gateway.v2.gateway_message_factory_v2 import gateway_message_factory_v2
+from astragateway.messages.gateway.gateway_message_factory import gateway_message_factory as gateway_message_factory_v3
 from astragateway.messages.gateway.gateway_message_type import GatewayMessageType
-from astragateway.messages.gateway.gateway_message_convertor_factory import gateway_message_converter_factory_v1
+from astragateway.messages.gateway.gateway_message_convertor_factory import (
+    gateway_message_converter_factory_v1,
+    gateway_message_converter_factory_v2,
+)
 
 
 class _GatewayVersionManager(AbstractVersionManager):
-    CURRENT_PROTOCOL_VERSION = 2
+    CURRENT_PROTOCOL_VERSION = 3
     _PROTOCOL_TO_CONVERTER_FACTORY_MAPPING = {
-        1: gateway_message_converter_factory_v1
+        1: gateway_message_converter_factory_v1,
+        2: gateway_message_converter_factory_v2,
     }
 
     _PROTOCOL_TO_FACTORY_MAPPING = {
         1: gateway_message_factory_v1,
         2: gateway_message_factory_v2,
+        3: gateway_message_factory_v3,
     }
 
     def __init__(self):
@@ -0,0 +1,30 @@
+from astracommon.messages.abstract_internal_message import AbstractInternalMessage
+from astracommon.messages.versioning.abstract_message_converter import AbstractMessageConverter
+
+
+class GatewayMessageConverterV2(AbstractMessageConverter):
+    """
+    Converts the messages version 2 of the gateway protocol shares with the current version, which are unchanged.
+    """
+
+    def convert_to_older_version(self, msg: AbstractInternalMessage) -> AbstractInternalMessage:
+        return msg
+
+    def convert_from_older_version(self, msg: AbstractInternalMessage) -> AbstractInternalMessage:
+        return msg
+
+    def convert_first_bytes_to_older_version(self, first_msg_bytes):
+        return first_msg_bytes
+
+    def convert_first_bytes_from_older_version(self, first_msg_bytes):
+        return first_msg_bytes
+
+    def get_message_size_change_to_older_version(self):
+        return 0
+
+    def get_message_size_change_from_older_version(self):
+        return 0
+
+
+# pyre-fixme[45]: Cannot instantiate abstract class `GatewayMessageConverterV2`.
+gateway_message_converter_v2 = GatewayMessageConverterV2()
@@ -1,8 +1,9 @@
 import base64
+import binascii
 import json
 import struct
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 from astracommon.messages.abstract_block_message import AbstractBlockMessage
 from astracommon.utils import crypto, model_loader
@@ -13,6 +14,12 @@ from astragateway.messages.ont.ont_message import OntMessage
 from astragateway.messages.ont.ont_message_type import OntMessageType
 
 
+_JSON_WHITESPACE = b" \t\r\n"
+_CONSENSUS_DATA_TYPE_FIELD = b'"type"'
+_CONSENSUS_DATA_LEN_FIELD = b'"len"'
+_CONSENSUS_DATA_PAYLOAD_FIELD = b'"payload"'
+
+
 @dataclass
 class ConsensusMsgPayload:
     type: int
@@ -20,6 +27,63 @@ class ConsensusMsgPayload:
     payload: str
 
 
+def _find_json_value(buf: Union[bytes, bytearray], field: bytes, start: int, end: int) -> int:
+    """
+    Returns the offset of the value of a top level `field` of the JSON object in `buf[start:end]`, or -1.
+
+    Only valid for objects whose string values cannot contain `field` followed by a colon, which holds for the
+    consensus data: its only string value is base64 encoded.
+    """
+    off = buf.find(field, start, end)
+    if off == -1:
+        return -1
+    off += len(field)
+    while off < end and buf[off] in _JSON_WHITESPACE:
+        off += 1
+    if off == end or buf[off] != ord(":"):
+        return -1
+    off += 1
+    while off < end and buf[off] in _JSON_WHITESPACE:
+        off += 1
+    return off
+
+
+def _find_json_int(buf: Union[bytes, bytearray], field: bytes, start: int, end: int) -> Optional[int]:
+    off = _find_json_value(buf, field, start, end)
+    if off == -1:
+        return None
+    value_end = off
+    while value_end < end and 0x30 <= buf[value_end] <= 0x39:
+        value_end += 1
+    if value_end == off:
+        return None
+    return int(buf[off:value_end])
+
+
+def scan_consensus_data(buf: Union[bytes, bytearray], start: int, end: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Locates the fields of the consensus data JSON object in `buf[start:end]` without decoding it.
+
+    :return: the consensus data type and length, and the start and end offsets of the base64 encoded payload
+             (`None` if it is not a block proposal), or `None` if the object could not be scanned
+    """
+    consensus_data_type = _find_json_int(buf, _CONSENSUS_DATA_TYPE_FIELD, start, end)
+    if consensus_data_type is None:
+        return None
+    if consensus_data_type != ont_constants.BLOCK_PROPOSAL_CONSENSUS_MESSAGE_TYPE:
+        return consensus_data_type, -1, -1, -1
+
+    consensus_data_len = _find_json_int(buf, _CONSENSUS_DATA_LEN_FIELD, start, end)
+    payload_start = _find_json_value(buf, _CONSENSUS_DATA_PAYLOAD_FIELD, start, end)
+    if consensus_data_len is None or payload_start == -1 or buf[payload_start] != ord('"'):
+        return None
+    payload_start += 1
+    payload_end = buf.find(b'"', payload_start, end)
+    if payload_end == -1:
+        return None
+    return consensus_data_type, consensus_data_len, payload_start, payload_end
+
+
 class OntConsensusMessage(OntMessage, AbstractBlockMessage):
     MESSAGE_TYPE = OntMessageType.CONSENSUS
 
@@ -59,6 +123,7 @@ class OntConsensusMessage(OntMessage, AbstractBlockMessage):
         self._block_start_txns = self._block_start_len_memoryview = self._empty_block_offset = None
         self._prev_block = self._decoded_payload = self._payload_tail = self._message_tail = None
         self._tx_offset = self._txn_header = self._txn_count = self._hash_val = self._header_offset = None
+        self._tx_hashes = None
         self._parsed = False
 
     def __repr__(self):
@@ -77,11 +142,28 @@ class OntConsensusMessage(OntMessage, AbstractBlockMessage):
         self._consensus_data_full_len, size = ont_varint_to_int(self.buf, off)
         off += size
         self._consensus_payload_header = self._memoryview[:off]
-        self._consensus_data = self._memoryview[off:off + self._consensus_data_full_len]
+        consensus_data_end = off + self._consensus_data_full_len
+        self._consensus_data = self._memoryview[off:consensus_data_end]
+        self._owner_and_signature = self._memoryview[consensus_data_end:]
+
+        # the consensus data is a JSON object, whose payload is the base64 encoded block. Scan it for the payload
+        # and decode it from the message buffer, instead of decoding the JSON and copying the payload string.
+        buf = self.buf
+        consensus_data_fields = None
+        if isinstance(buf, (bytes, bytearray)):
+            consensus_data_fields = scan_consensus_data(buf, off, consensus_data_end)
+        if consensus_data_fields is None:
+            self._parse_consensus_data_json()
+            return
+
+        self._consensus_data_type, self._consensus_data_len, payload_start, payload_end = consensus_data_fields
+        if self._consensus_data_type == ont_constants.BLOCK_PROPOSAL_CONSENSUS_MESSAGE_TYPE:
+            self._decoded_payload = memoryview(binascii.a2b_base64(self._memoryview[payload_start:payload_end]))
+            self.parse_block_vbft_type()
+
+    def _parse_consensus_data_json(self):
         self._consensus_data_str = bytearray(self._consensus_data).decode()
         self._consensus_data_json = json.loads(self._consensus_data_str)
-        off += self._consensus_data_full_len
-        self._owner_and_signature = self._memoryview[off:]
         self._consensus_data_type = self._consensus_data_json["type"]
         if self._consensus_data_type == ont_constants.BLOCK_PROPOSAL_CONSENSUS_MESSAGE_TYPE:
             encoded_payload = model_loader.load_model(ConsensusMsgPayload, self._consensus_data_json)
@@ -126,21 +208,25 @@ class OntConsensusMessage(OntMessage, AbstractBlockMessage):
         self._tx_offset = off
         self._txn_header = buf[:off]
         txns = []
+        tx_hashes = []
         start = self._tx_offset
         txn_count = self._txn_count
         assert isinstance(txn_count, int)
         for _ in range(txn_count):
-            _, off = get_txid(buf[start:])
-            sig_length, size = ont_varint_to_int(buf[start:], off)
+            tx_hash, off = get_txid(buf[start:])
+            off += start
+            sig_length, size = ont_varint_to_int(buf, off)
             off += size
-            for i in range(sig_length):
-                invoke_length, size = ont_varint_to_int(buf[start:], off)
+            for _ in range(sig_length):
+                invoke_length, size = ont_varint_to_int(buf, off)
                 off += size + invoke_length
-                verify_length, size = ont_varint_to_int(buf[start:], off)
+                verify_length, size = ont_varint_to_int(buf, off)
                 off += size + verify_length
-            txns.append(buf[start:start + off])
-            start += off
+            txns.append(buf[start:off])
+            tx_hashes.append(tx_hash)
+            start = off
 
+        self._tx_hashes = tx_hashes
         return txns
 
     def block_start_len_memoryview(self) -> memoryview:
@@ -192,6 +278,16 @@ class OntConsensusMessage(OntMessage, AbstractBlockMessage):
         assert isinstance(block_start_txns, list)
         return block_start_txns
 
+    def tx_hashes(self) -> List[OntObjectHash]:
+        """
+        Hashes of `txns()`, computed while locating the transactions.
+        """
+        if not self._parsed:
+            self.parse_message()
+        tx_hashes = self._tx_hashes
+        assert isinstance(tx_hashes, list)
+        return tx_hashes
+
     def payload_tail(self) -> memoryview:
         if self._payload_tail is None:
             self.parse_message()
@@ -175,8 +175,7 @@ class OntNormalConsensusMessageConverter(AbstractOntMessageConverter):
         buf.append(txn_header)
         max_timestamp_for_compression = time.time() - min_tx_age_seconds
 
-        for tx in consensus_msg.txns():
-            tx_hash, _ = ont_messages_util.get_txid(tx)
+        for tx, tx_hash in zip(consensus_msg.txns(), consensus_msg.tx_hashes()):
             transaction_key = tx_service.get_transaction_key(tx_hash)
             short_id = tx_service.get_short_id_by_key(transaction_key)
             short_id_assign_time = 0
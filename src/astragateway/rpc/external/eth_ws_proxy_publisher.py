@@ -2,6 +2,7 @@ import asyncio
 from asyncio import Future
 from typing import Optional, cast, List, Dict, Any, TYPE_CHECKING
 
+from astracommon import constants
 from astracommon.connections.connection_type import ConnectionType
 from astracommon.exceptions import FeedSubscriptionTimeoutError
 from astracommon.feed.feed import FeedKey
@@ -14,10 +15,11 @@ from astracommon.utils import convert
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon.feed.feed_manager import FeedManager
 from astracommon.feed.feed_source import FeedSource
-from astragateway import log_messages
+from astragateway import gateway_constants, log_messages
 from astracommon.feed.eth.eth_raw_transaction import EthRawTransaction
 from astracommon.feed.eth.eth_pending_transaction_feed import EthPendingTransactionFeed
 from astragateway.connections.gateway_connection import GatewayConnection
+from astragateway.messages.gateway.confirmed_tx_batch_message import ConfirmedTxBatchMessage
 from astragateway.messages.gateway.confirmed_tx_message import ConfirmedTxMessage
 from astragateway.utils.stats.transaction_feed_stats_service import transaction_feed_stats_service
 from astrautils import logging
@@ -50,6 +52,7 @@ class EthWsProxyPublisher(EthWsSubscriber):
         super().__init__(ws_uri)
         self.receiving_tasks: List[Future] = []
         self.stream_confirmation_messages = node.opts.stream_to_peer_gateway is not None
+        self._pending_confirmations: List[Sha256Hash] = []
 
     async def revive(self) -> None:
         """
@@ -158,7 +161,7 @@ class EthWsProxyPublisher(EthWsSubscriber):
             )
         )
         if self.stream_confirmation_messages:
-            self.broadcast_confirmation_message(ConfirmedTxMessage(transaction_key.transaction_hash))
+            self.queue_confirmation(transaction_key.transaction_hash)
 
     async def fetch_missing_transaction(self, transaction_key: TransactionKey) -> None:
         try:
@@ -201,16 +204,53 @@ class EthWsProxyPublisher(EthWsSubscriber):
                 )
 
             if self.stream_confirmation_messages:
-                self.broadcast_confirmation_message(ConfirmedTxMessage(transaction_key.transaction_hash))
+                self.queue_confirmation(transaction_key.transaction_hash)
+
+    def queue_confirmation(self, transaction_hash: Sha256Hash) -> None:
+        """
+        Queues the confirmation of a transaction accepted to the mempool for the streaming peer gateways.
+        Confirmations are flushed every `CONFIRMED_TX_BATCH_INTERVAL_S`, or once `CONFIRMED_TX_BATCH_MAX_COUNT`
+        are queued.
+        """
+        pending_confirmations = self._pending_confirmations
+        pending_confirmations.append(transaction_hash)
+        if len(pending_confirmations) >= gateway_constants.CONFIRMED_TX_BATCH_MAX_COUNT:
+            self.flush_confirmations()
+        elif len(pending_confirmations) == 1:
+            self.node.alarm_queue.register_alarm(
+                gateway_constants.CONFIRMED_TX_BATCH_INTERVAL_S, self.flush_confirmations
+            )
+
+    def flush_confirmations(self) -> int:
+        pending_confirmations = self._pending_confirmations
+        if not pending_confirmations:
+            return constants.CANCEL_ALARMS
+        self._pending_confirmations = []
+
+        batch_message = None
+        for connection in self._get_streaming_connections():
+            if connection.supports_confirmed_tx_batches():
+                if batch_message is None:
+                    batch_message = ConfirmedTxBatchMessage(
+                        [(transaction_hash, ConfirmedTxBatchMessage.EMPTY_TX_VAL)
+                         for transaction_hash in pending_confirmations]
+                    )
+                connection.enqueue_msg(batch_message)
+            else:
+                for transaction_hash in pending_confirmations:
+                    connection.enqueue_msg(ConfirmedTxMessage(transaction_hash))
+        return constants.CANCEL_ALARMS
 
     def broadcast_confirmation_message(self, message: AbstractBloxrouteMessage) -> None:
+        for connection in self._get_streaming_connections():
+            connection.enqueue_msg(message)
+
+    def _get_streaming_connections(self) -> List[GatewayConnection]:
         gateway_connections = cast(
             List[GatewayConnection],
             self.node.connection_pool.get_by_connection_types((ConnectionType.EXTERNAL_GATEWAY,))
         )
-        for connection in gateway_connections:
-            if connection.stream_confirmation_messages:
-                connection.enqueue_msg(message)
+        return [connection for connection in gateway_connections if connection.stream_confirmation_messages]
 
     async def stop(self) -> None:
         await self.close()
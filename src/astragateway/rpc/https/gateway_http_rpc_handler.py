@@ -1,5 +1,8 @@
+import time
 from typing import TYPE_CHECKING
 
+from aiohttp.web import Request, Response
+
 from astracommon.rpc.https.http_rpc_handler import HttpRpcHandler
 from astracommon.rpc.requests.transaction_status_rpc_request import TransactionStatusRpcRequest
 from astracommon.rpc.rpc_request_type import RpcRequestType
@@ -15,6 +18,7 @@ from astragateway.rpc.requests.gateway_transaction_service_rpc_request import Ga
 from astragateway.rpc.requests.quota_usage_rpc_request import QuotaUsageRpcRequest
 from astragateway.rpc.requests.gateway_blxr_call_rpc_request import GatewayBlxrCallRpcRequest
 from astragateway.rpc.requests.remove_blockchain_peer_rpc_request import RemoveBlockchainPeerRpcRequest
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 
 from astrautils import logging
 
@@ -46,3 +50,10 @@ class GatewayHttpRpcHandler(HttpRpcHandler["AbstractGatewayNode"]):
             RpcRequestType.ADD_BLOCKCHAIN_PEER: AddBlockchainPeerRpcRequest,
             RpcRequestType.REMOVE_BLOCKCHAIN_PEER: RemoveBlockchainPeerRpcRequest
         }
+
+    async def handle_request(self, request: Request) -> Response:
+        start_time = time.time()
+        try:
+            return await super().handle_request(request)
+        finally:
+            latency_histograms.record(LatencyOperation.RPC_REQUEST, "http", time.time() - start_time)
@@ -1,9 +1,11 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Dict, Any
+import asyncio
 import base64
+import os
 
 from aiohttp import web
 from aiohttp.web import Request, Response
-from aiohttp.web_exceptions import HTTPClientError
+from aiohttp.web_exceptions import HTTPClientError, HTTPUnauthorized, HTTPBadRequest, HTTPConflict
 from prometheus_client import REGISTRY
 from prometheus_client import exposition as prometheus_client
 
@@ -13,8 +15,12 @@ from astracommon.rpc.https import abstract_http_rpc_server
 from astracommon.rpc.https.abstract_http_rpc_server import AbstractHttpRpcServer
 from astracommon.rpc.https.http_rpc_handler import HttpRpcHandler
 from astracommon.rpc.rpc_errors import RpcAccountIdError
+from astragateway import gateway_constants
 from astragateway.rpc.https.gateway_http_rpc_handler import GatewayHttpRpcHandler
 from astragateway.rpc.https.gateway_ws_handler import GatewayWsHandler
+from astragateway.utils.sampling_profiler import SamplingProfiler, ProfilerBusyError, ProfilerUnavailableError
+from astragateway.utils.stats.event_loop_stats_service import event_loop_stats_service
+from astragateway.utils.stats.stat_event_pipeline import stat_event_pipeline
 
 from astrautils import logging
 from astrautils.encoding.json_encoder import Case
@@ -26,14 +32,38 @@ if TYPE_CHECKING:
 logger = logging.get_logger(__name__)
 
 
+def _is_valid_file_name(file_name: str) -> bool:
+    return (
+        file_name not in (os.curdir, os.pardir)
+        and ".." not in file_name
+        and "/" not in file_name
+        and "\\" not in file_name
+        and "\0" not in file_name
+    )
+
+
+def _write_collapsed_stacks(output_file: str, collapsed_stacks: str) -> None:
+    with open(output_file, "w") as profile_file:
+        profile_file.write(collapsed_stacks)
+
+
 class GatewayHttpRpcServer(AbstractHttpRpcServer["AbstractGatewayNode"]):
     def __init__(self, node: "AbstractGatewayNode") -> None:
         super().__init__(node)
         self._app.add_routes(
             [
                 web.get("/metrics", self.handle_metrics),
+                web.get("/event_loop", self.handle_event_loop_report),
+                web.post("/profiler/start", self.handle_profiler_start),
+                web.post("/profiler/stop", self.handle_profiler_stop),
+                web.get("/stat_events/sampling", self.handle_stat_event_sampling),
+                web.post("/stat_events/sampling", self.handle_stat_event_sampling_update),
             ]
         )
+        self._profiler = SamplingProfiler(
+            gateway_constants.PROFILER_MAX_STACKS, gateway_constants.PROFILER_MAX_STACK_DEPTH
+        )
+        self._profiler_stop_event: Optional[asyncio.Event] = None
 
     async def authenticate_request(self, request: Request) -> None:
         is_authenticated = True
@@ -74,6 +104,162 @@ class GatewayHttpRpcServer(AbstractHttpRpcServer["AbstractGatewayNode"]):
         except HTTPClientError as e:
             return abstract_http_rpc_server.format_http_error(e, self._handler.content_type)
 
+    async def handle_event_loop_report(self, request: Request) -> Response:
+        """
+        Endpoint for the event loop health report: scheduling lag and the message handlers and alarms
+        that blocked the event loop for the longest, over the last stats intervals.
+
+        Request can specify `top` to set the number of blockers returned.
+        :param request:
+        :return response:
+        """
+        error_response = await self._authenticate(request)
+        if error_response is not None:
+            return error_response
+        try:
+            # pyre-fixme[16]: Callable `query` has no attribute `get`.
+            top_blockers_count = int(request.query.get("top", gateway_constants.EVENT_LOOP_TOP_BLOCKERS_COUNT))
+        except ValueError:
+            return self._format_error(HTTPBadRequest(text="top must be an integer"))
+        return web.json_response(event_loop_stats_service.get_report(top_blockers_count))
+
+    async def handle_profiler_start(self, request: Request) -> Response:
+        """
+        Endpoint running the sampling profiler for `duration_s` seconds, or until `/profiler/stop` is requested,
+        and returning the sampled stacks in collapsed format. Concurrent sessions are refused.
+
+        Request can specify `interval_s` to set the sampling interval, and `file` to write the collapsed stacks
+        to a file of that name in `opts.profiler_dir` instead of returning them.
+        :param request:
+        :return response:
+        """
+        error_response = await self._authenticate(request)
+        if error_response is not None:
+            return error_response
+        try:
+            # pyre-fixme[16]: Callable `query` has no attribute `__getitem__`.
+            duration_s = float(request.query["duration_s"])
+            # pyre-fixme[16]: Callable `query` has no attribute `get`.
+            interval_s = float(request.query.get("interval_s", gateway_constants.PROFILER_DEFAULT_INTERVAL_S))
+        except (KeyError, ValueError):
+            return self._format_error(HTTPBadRequest(text="duration_s and interval_s must be numbers"))
+        if not 0 < duration_s <= gateway_constants.PROFILER_MAX_DURATION_S:
+            return self._format_error(
+                HTTPBadRequest(text=f"duration_s must be at most {gateway_constants.PROFILER_MAX_DURATION_S}")
+            )
+        if interval_s < gateway_constants.PROFILER_MIN_INTERVAL_S:
+            return self._format_error(
+                HTTPBadRequest(text=f"interval_s must be at least {gateway_constants.PROFILER_MIN_INTERVAL_S}")
+            )
+        # pyre-fixme[16]: Callable `query` has no attribute `get`.
+        output_file_name = request.query.get("file")
+        output_file = None
+        if output_file_name:
+            profiler_dir = self.node.opts.profiler_dir
+            if not profiler_dir:
+                return self._format_error(HTTPBadRequest(text="file requires the gateway to set --profiler-dir"))
+            if not _is_valid_file_name(output_file_name):
+                return self._format_error(HTTPBadRequest(text="file must be a file name, without directories"))
+            output_file = os.path.join(profiler_dir, output_file_name)
+
+        try:
+            self._profiler.start(interval_s)
+        except ProfilerBusyError as e:
+            return self._format_error(HTTPConflict(text=str(e)))
+        except ProfilerUnavailableError as e:
+            return self._format_error(HTTPBadRequest(text=str(e)))
+        logger.info("Started sampling profiler for {}s, sampling every {}s.", duration_s, interval_s)
+
+        stop_event = asyncio.Event()
+        self._profiler_stop_event = stop_event
+        try:
+            await asyncio.wait_for(stop_event.wait(), duration_s)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._profiler_stop_event = None
+            collapsed_stacks = self._profiler.stop()
+        sample_count = self._profiler.sample_count
+        logger.info("Stopped sampling profiler after {} samples.", sample_count)
+
+        if output_file:
+            try:
+                await asyncio.get_event_loop().run_in_executor(
+                    None, _write_collapsed_stacks, output_file, collapsed_stacks
+                )
+            except OSError as e:
+                return self._format_error(HTTPBadRequest(text=f"Could not write {output_file_name}: {e}"))
+            return web.json_response({"file": output_file, "samples": sample_count})
+        return Response(text=collapsed_stacks, content_type="text/plain")
+
+    async def handle_profiler_stop(self, request: Request) -> Response:
+        """
+        Endpoint stopping the running profiling session early. The pending `/profiler/start` request
+        returns the stacks sampled so far.
+        :param request:
+        :return response:
+        """
+        error_response = await self._authenticate(request)
+        if error_response is not None:
+            return error_response
+        stop_event = self._profiler_stop_event
+        if stop_event is not None:
+            stop_event.set()
+        return web.json_response({"stopped": stop_event is not None})
+
+    async def handle_stat_event_sampling(self, request: Request) -> Response:
+        """
+        Endpoint returning the sampling rates of block and transaction stat events, by event type name.
+        :param request:
+        :return response:
+        """
+        error_response = await self._authenticate(request)
+        if error_response is not None:
+            return error_response
+        return web.json_response(self._get_stat_event_sampling())
+
+    async def handle_stat_event_sampling_update(self, request: Request) -> Response:
+        """
+        Endpoint updating sampling rates of stat events, from a JSON object of event type names to rates
+        between 0 and 1. A rate of 1 logs every event of the type.
+        :param request:
+        :return response:
+        """
+        error_response = await self._authenticate(request)
+        if error_response is not None:
+            return error_response
+        try:
+            sampling_rates = await request.json()
+            if not isinstance(sampling_rates, dict):
+                raise ValueError("Expected a JSON object of event type names to sampling rates.")
+            for rate in sampling_rates.values():
+                if not isinstance(rate, (int, float)) or isinstance(rate, bool) or not 0 <= rate <= 1:
+                    raise ValueError(f"Stat event sampling rate must be between 0 and 1, not {rate}.")
+        except ValueError as e:
+            return self._format_error(HTTPBadRequest(text=str(e)))
+        for event_name, rate in sampling_rates.items():
+            stat_event_pipeline.set_sampling_rate(event_name, rate)
+        logger.info("Updated stat event sampling rates: {}", stat_event_pipeline.sampling_rates)
+        return web.json_response(self._get_stat_event_sampling())
+
+    def _get_stat_event_sampling(self) -> Dict[str, Any]:
+        return {
+            "sampling_rates": stat_event_pipeline.sampling_rates,
+            "queued_events": len(stat_event_pipeline),
+            "submitted_events": stat_event_pipeline.submitted_events,
+            "sampled_out_events": stat_event_pipeline.sampled_out_events,
+        }
+
+    async def _authenticate(self, request: Request) -> Optional[Response]:
+        try:
+            await self.authenticate_request(request)
+        except RpcAccountIdError as e:
+            return self._format_error(HTTPUnauthorized(text=str(e)))
+        return None
+
+    def _format_error(self, error: HTTPClientError) -> Response:
+        return abstract_http_rpc_server.format_http_error(error, self._handler.content_type)
+
     def set_encoded_auth(self):
         encoded_auth = \
             base64.b64encode(f"{self.node.opts.rpc_user}:{self.node.opts.rpc_password}".encode("utf-8")).decode("utf-8")
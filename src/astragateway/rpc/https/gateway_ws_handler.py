@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING, cast
+import time
+from typing import TYPE_CHECKING, cast, Union
 
 from astracommon.feed.feed_manager import FeedManager
 from astracommon.rpc.abstract_ws_rpc_handler import AbstractWsRpcHandler
@@ -18,6 +19,7 @@ from astragateway.rpc.requests.gateway_blxr_call_rpc_request import GatewayBlxrC
 from astragateway.rpc.requests.remove_blockchain_peer_rpc_request import RemoveBlockchainPeerRpcRequest
 from astracommon.rpc.requests.subscribe_rpc_request import SubscribeRpcRequest
 from astracommon.rpc.requests.unsubscribe_rpc_request import UnsubscribeRpcRequest
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 
 from astrautils import logging
 from astrautils.encoding.json_encoder import Case
@@ -52,3 +54,10 @@ class GatewayWsHandler(AbstractWsRpcHandler):
             RpcRequestType.SUBSCRIBE: SubscribeRpcRequest,
             RpcRequestType.UNSUBSCRIBE: UnsubscribeRpcRequest,
         }
+
+    async def handle_request(self, request: Union[bytes, str]) -> Union[bytes, str]:
+        start_time = time.time()
+        try:
+            return await super().handle_request(request)
+        finally:
+            latency_histograms.record(LatencyOperation.RPC_REQUEST, "ws", time.time() - start_time)
@@ -1,6 +1,6 @@
 import asyncio
 import os
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Type, TYPE_CHECKING
 from astracommon.feed.feed_manager import FeedManager
 from astragateway.rpc.ws.ws_connection import WsConnection
 from astragateway.rpc.subscription_rpc_handler import SubscriptionRpcHandler
@@ -25,12 +25,14 @@ class IpcServer:
         ipc_file: str,
         feed_manager: FeedManager,
         node: "AbstractGatewayNode",
-        case: Case = Case.CAMEL
+        case: Case = Case.CAMEL,
+        rpc_handler_type: Type[SubscriptionRpcHandler] = SubscriptionRpcHandler,
     ):
         self.ipc_path = config.get_data_file(ipc_file)
         self.node = node
         self.feed_manager = feed_manager
         self.case = case
+        self.rpc_handler_type = rpc_handler_type
         self._server: Optional[WebSocketServer] = None
         self._connections: List[WsConnection] = []
         self._started: bool = False
@@ -62,7 +64,7 @@ class IpcServer:
         connection = WsConnection(
             websocket,
             path,
-            SubscriptionRpcHandler(self.node, self.feed_manager, self.case)
+            self.rpc_handler_type(self.node, self.feed_manager, self.case)
         )
         self._connections.append(connection)
         await connection.handle()
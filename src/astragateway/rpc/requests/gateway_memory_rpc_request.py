@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 TOTAL_MEM_USAGE = "total_mem_usage"
 TOTAL_CACHED_TX = "total_cached_transactions"
 TOTAL_CACHED_TX_SIZE = "total_cached_transactions_size"
+COMPONENTS = "components"
+TOTAL_ACCOUNTED = "total_accounted"
 
 
 class GatewayMemoryRpcRequest(AbstractRpcRequest["AbstractGatewayNode"]):
@@ -28,9 +30,14 @@ class GatewayMemoryRpcRequest(AbstractRpcRequest["AbstractGatewayNode"]):
     async def process_request(self) -> JsonRpcResponse:
         tx_service = self.node.get_tx_service()
         cache_state = tx_service.get_cache_state_json()
+        memory_breakdown = self.node.get_memory_breakdown()
         return self.ok({
             TOTAL_MEM_USAGE: stats_format.byte_count(memory_utils.get_app_memory_usage()),
             TOTAL_CACHED_TX: cache_state["tx_hash_to_contents_len"],
-            TOTAL_CACHED_TX_SIZE: stats_format.byte_count(cache_state["total_tx_contents_size"])
+            TOTAL_CACHED_TX_SIZE: stats_format.byte_count(cache_state["total_tx_contents_size"]),
+            TOTAL_ACCOUNTED: stats_format.byte_count(sum(memory_breakdown.values())),
+            COMPONENTS: {
+                component: stats_format.byte_count(size) for component, size in memory_breakdown.items()
+            }
         })
 
@@ -1,4 +1,3 @@
-import asyncio
 from typing import TYPE_CHECKING
 
 from astracommon.rpc import rpc_constants
@@ -46,11 +45,8 @@ class GatewayStatusRpcRequest(AbstractRpcRequest["AbstractGatewayNode"]):
         self._details_level = params[rpc_constants.DETAILS_LEVEL_PARAMS_KEY].lower()
 
     async def process_request(self) -> JsonRpcResponse:
-        loop = asyncio.get_event_loop()
         opts = self.node.opts
-        diagnostics = await loop.run_in_executor(
-            self.node.requester.thread_pool,
-            status_log.get_diagnostics,
+        diagnostics = status_log.get_diagnostics(
             opts.use_extensions,
             opts.source_version,
             opts.external_ip,
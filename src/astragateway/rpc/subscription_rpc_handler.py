@@ -1,5 +1,6 @@
 import asyncio
 import json
+import time
 from typing import TYPE_CHECKING, Dict, Any, Optional, Union, cast, Type, Tuple
 
 from astracommon.feed.feed import FeedKey
@@ -27,6 +28,7 @@ from astragateway.rpc.requests.gateway_subscribe_rpc_request import GatewaySubsc
 from astragateway.rpc.requests.gateway_transaction_service_rpc_request import GatewayTransactionServiceRpcRequest
 from astragateway.rpc.requests.quota_usage_rpc_request import QuotaUsageRpcRequest
 from astragateway.rpc.requests.remove_blockchain_peer_rpc_request import RemoveBlockchainPeerRpcRequest
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 from astracommon.rpc.requests.subscribe_rpc_request import SubscribeRpcRequest
 from astracommon.rpc.requests.unsubscribe_rpc_request import UnsubscribeRpcRequest
 from astragateway.rpc.requests.gateway_blxr_call_rpc_request import GatewayBlxrCallRpcRequest
@@ -74,6 +76,13 @@ class SubscriptionRpcHandler(AbstractRpcHandler["AbstractGatewayNode", Union[byt
         )
         self.disconnect_event = asyncio.Event()
 
+    async def handle_request(self, request: Union[bytes, str]) -> Union[bytes, str]:
+        start_time = time.time()
+        try:
+            return await super().handle_request(request)
+        finally:
+            latency_histograms.record(LatencyOperation.RPC_REQUEST, "subscription", time.time() - start_time)
+
     async def parse_request(self, request: Union[bytes, str]) -> Dict[str, Any]:
         return json.loads(request)
 
@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, List, TYPE_CHECKING
+from typing import Optional, List, Type, TYPE_CHECKING
 
 import websockets
 from websockets import WebSocketServerProtocol
@@ -25,12 +25,14 @@ class WsServer:
         feed_manager: FeedManager,
         node: "AbstractGatewayNode",
         case: Case = Case.CAMEL,
+        rpc_handler_type: Type[SubscriptionRpcHandler] = SubscriptionRpcHandler,
     ) -> None:
         self.host = host
         self.port = port
         self.feed_manager = feed_manager
         self.node = node
         self.case = case
+        self.rpc_handler_type = rpc_handler_type
         self._started: bool = False
 
         self._server: Optional[WebSocketServer] = None
@@ -60,7 +62,7 @@ class WsServer:
         connection = WsConnection(
             websocket,
             path,
-            SubscriptionRpcHandler(self.node, self.feed_manager, self.case)
+            self.rpc_handler_type(self.node, self.feed_manager, self.case)
         )
         self._connections.append(connection)
         await connection.handle()
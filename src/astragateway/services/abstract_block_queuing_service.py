@@ -21,6 +21,7 @@ from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
 from astracommon.utils.stats.block_statistics_service import block_stats
 from astragateway import gateway_constants
 from astragateway.connections.abstract_gateway_blockchain_connection import AbstractGatewayBlockchainConnection
+from astragateway.utils.block_trace import block_trace, BlockTraceStage
 from astrautils import logging
 
 if TYPE_CHECKING:
@@ -159,6 +160,7 @@ class AbstractBlockQueuingService(
         if self.can_add_block_to_queuing_service(block_hash):
             self._block_queue.append(BlockQueueEntry(block_hash, time.time()))
             self._blocks.add(block_hash)
+            block_trace.record(BlockTraceStage.QUEUED, block_hash, value=len(self._block_queue) - 1)
             self._blocks_waiting_for_recovery[block_hash] = waiting_for_recovery
             if block_msg is not None:
                 self.store_block_data(block_hash, block_msg)
@@ -197,6 +199,7 @@ class AbstractBlockQueuingService(
 
         assert block_msg is not None
         self.connection.enqueue_msg(block_msg)
+        block_trace.record(BlockTraceStage.SENT_TO_NODE, block_hash)
 
         # TODO: revisit this metric for multi-node gateway
         (handling_time, relay_desc) = self.node.track_block_from_bdn_handling_ended(block_hash)
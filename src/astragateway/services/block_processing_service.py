@@ -1,6 +1,10 @@
+import asyncio
 import datetime
+import functools
 import time
-from typing import Iterable, Optional, TYPE_CHECKING, Union
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, TYPE_CHECKING, Union, Set, List, Tuple, Dict, Deque
 
 from astracommon import constants
 from astracommon.connections.connection_type import ConnectionType
@@ -10,6 +14,7 @@ from astracommon.messages.astra.block_holding_message import BlockHoldingMessage
 from astracommon.messages.astra.get_txs_message import GetTxsMessage
 from astracommon.messages.eth.validation.abstract_block_validator import AbstractBlockValidator, \
     BlockValidationResult
+from astracommon.network.ip_endpoint import IpEndpoint
 from astracommon.utils import convert, crypto, block_content_debug_utils
 from astracommon.utils.blockchain_utils.eth import eth_common_utils
 from astracommon.utils.expiring_dict import ExpiringDict
@@ -26,9 +31,14 @@ from astragateway import log_messages
 from astragateway.connections.abstract_gateway_blockchain_connection import AbstractGatewayBlockchainConnection
 from astragateway.connections.abstract_relay_connection import AbstractRelayConnection
 from astragateway.messages.gateway.block_received_message import BlockReceivedMessage
+from astragateway.services import block_queuing_service_manager
 from astragateway.services.block_recovery_service import BlockRecoveryInfo, RecoveredTxsSource
+from astragateway.utils.block_info import BlockInfo
+from astragateway.utils.block_trace import block_trace, BlockTraceStage
 from astragateway.utils.errors.message_conversion_error import MessageConversionError
 from astragateway.utils.stats.gateway_bdn_performance_stats_service import gateway_bdn_performance_stats_service
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
+from astragateway.utils.stats.stat_event_pipeline import stat_event_pipeline
 from astrautils import logging
 
 if TYPE_CHECKING:
@@ -37,6 +47,28 @@ if TYPE_CHECKING:
 logger = logging.get_logger(__name__)
 
 
+def _format_compression_info(
+    original_size: int, compressed_size: int, compression_rate: float, duration_ms: float, txn_count: int
+) -> str:
+    return "Compression: {}->{} bytes, {}, {}; Tx count: {}".format(
+        original_size,
+        compressed_size,
+        stats_format.percentage(compression_rate),
+        stats_format.duration(duration_ms),
+        txn_count
+    )
+
+
+def _format_decompression_info(
+    compression_rate: float, duration_ms: float, queue_lengths: List[Tuple[IpEndpoint, int]]
+) -> str:
+    return "Compression rate {}, Decompression time {}, Queued behind {} blocks".format(
+        stats_format.percentage(compression_rate),
+        stats_format.duration(duration_ms),
+        block_queuing_service_manager.format_queue_lengths(queue_lengths)
+    )
+
+
 class BlockHold:
     """
     Data class for holds on block messages.
@@ -60,6 +92,48 @@ class BlockHold:
         self.connection = None
 
 
+class CompressionTxServiceView:
+    """
+    Short id lookups of the transaction service for block compression on a compression thread. Records the short ids
+    used, so the event loop can check that they still map to the same transactions before broadcasting the block.
+    """
+
+    def __init__(self, tx_service) -> None:
+        self._tx_service = tx_service
+        self.used_short_ids: Dict[int, Sha256Hash] = {}
+
+    def get_transaction_key(self, transaction_hash: Sha256Hash):
+        return self._tx_service.get_transaction_key(transaction_hash)
+
+    def get_short_id_by_key(self, transaction_key) -> int:
+        short_id = self._tx_service.get_short_id_by_key(transaction_key)
+        if short_id != constants.NULL_TX_SID:
+            self.used_short_ids[short_id] = transaction_key.transaction_hash
+        return short_id
+
+    def get_short_id_assign_time(self, short_id: int) -> float:
+        return self._tx_service.get_short_id_assign_time(short_id)
+
+    def short_ids_unchanged(self) -> bool:
+        tx_service = self._tx_service
+        for short_id, transaction_hash in self.used_short_ids.items():
+            if tx_service.get_transaction(short_id).hash != transaction_hash:
+                return False
+        return True
+
+
+class PendingCompression:
+    """
+    Block being compressed on a compression thread.
+    """
+
+    def __init__(self, block_message, connection, tx_service_view: CompressionTxServiceView) -> None:
+        self.block_message = block_message
+        self.connection = connection
+        self.tx_service_view = tx_service_view
+        self.future: Optional[asyncio.Future] = None
+
+
 class BlockProcessingService:
     """
     Service class that process blocks.
@@ -80,6 +154,25 @@ class BlockProcessingService:
         self._last_confirmed_block_difficulty: Optional[int] = None
         self._blocks_failed_validation_history: LimitedSizeSet[Sha256Hash] = LimitedSizeSet(
             constants.BLOCKS_FAILED_VALIDATION_HISTORY_SIZE)
+        # blocks that already have a recovery retry scheduled
+        self._pending_recovery_retries: Set[Sha256Hash] = set()
+
+        self._compression_executor: Optional[ThreadPoolExecutor] = None
+        # blocks being compressed by receiving connection, completed in the order they were received
+        self._pending_compressions: Dict[AbstractGatewayBlockchainConnection, Deque[PendingCompression]] = \
+            defaultdict(deque)
+        if node.opts.block_compression_threads > 0:
+            if node.opts.use_extensions:
+                logger.info("Block compression threads are not supported with extensions, "
+                            "compressing blocks on the event loop.")
+            else:
+                self._compression_executor = ThreadPoolExecutor(
+                    max_workers=node.opts.block_compression_threads, thread_name_prefix="block_compression"
+                )
+
+    def close(self) -> None:
+        if self._compression_executor is not None:
+            self._compression_executor.shutdown(wait=False)
 
     def place_hold(self, block_hash, connection) -> None:
         """
@@ -120,6 +213,7 @@ class BlockProcessingService:
         """
 
         block_hash = block_message.block_hash()
+        block_trace.record(BlockTraceStage.RECEIVED_FROM_NODE, block_hash)
         connection.log_info(
             "Processing block {} from local blockchain node.",
             block_hash
@@ -204,7 +298,14 @@ class BlockProcessingService:
         )
 
         block_hash = msg.block_hash()
+        relay_quality_service = self._node.relay_quality_service
+        if relay_quality_service is not None:
+            relay_quality_service.on_block_received(block_hash, connection.peer_ip, connection.peer_port)
         is_encrypted = msg.is_encrypted()
+        if is_encrypted:
+            block_trace.record(BlockTraceStage.RECEIVED_FROM_BDN, cipher_hash=block_hash)
+        else:
+            block_trace.record(BlockTraceStage.RECEIVED_FROM_BDN, block_hash)
         self._node.track_block_from_bdn_handling_started(block_hash, connection.peer_desc)
 
         if not is_encrypted:
@@ -224,6 +325,7 @@ class BlockProcessingService:
             decrypt_start_timestamp = time.time()
             decrypt_start_datetime = datetime.datetime.utcnow()
             block = self._node.in_progress_blocks.decrypt_ciphertext(block_hash, cipherblob)
+            latency_histograms.record(LatencyOperation.DECRYPTION, "block", time.time() - decrypt_start_timestamp)
 
             if block is not None:
                 block_stats.add_block_event(
@@ -283,6 +385,7 @@ class BlockProcessingService:
             decrypt_start_timestamp = time.time()
             decrypt_start_datetime = datetime.datetime.utcnow()
             block = self._node.in_progress_blocks.decrypt_and_get_payload(block_hash, key)
+            latency_histograms.record(LatencyOperation.DECRYPTION, "block", time.time() - decrypt_start_timestamp)
 
             if block is not None:
                 block_stats.add_block_event_by_block_hash(
@@ -373,28 +476,110 @@ class BlockProcessingService:
     def _process_and_broadcast_block(self, block_message, connection: AbstractGatewayBlockchainConnection) -> None:
         """
         Compresses and propagates block message if enabled, else return.
+        With compression threads, the block is compressed off the event loop and propagated once it and the blocks
+        received before it from the same connection are compressed.
         :param block_message: block message to propagate
         :param connection: receiving connection (AbstractBlockchainConnection)
         """
-        block_hash = block_message.block_hash()
+        executor = self._compression_executor
+        if executor is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                pending = PendingCompression(
+                    block_message, connection, CompressionTxServiceView(self._node.get_tx_service())
+                )
+                self._pending_compressions[connection].append(pending)
+                compression_future = loop.run_in_executor(
+                    executor, self._convert_block, block_message, pending.tx_service_view
+                )
+                compression_future.add_done_callback(functools.partial(self._on_block_compressed, pending))
+                return
+
+        try:
+            astra_block, block_info = self._convert_block(block_message, self._node.get_tx_service())
+        except MessageConversionError as e:
+            self._on_block_conversion_failed(connection, e)
+            return
+        self._broadcast_converted_block(block_message, connection, astra_block, block_info)
+
+    def _convert_block(self, block_message, tx_service) -> Tuple[memoryview, BlockInfo]:
         message_converter = self._node.message_converter
         assert message_converter is not None
+        return message_converter.block_to_astra_block(
+            block_message,
+            tx_service,
+            self._node.opts.enable_block_compression,
+            self._node.network.min_tx_age_seconds
+        )
+
+    def _on_block_conversion_failed(
+        self, connection: AbstractGatewayBlockchainConnection, e: MessageConversionError
+    ) -> None:
+        block_stats.add_block_event_by_block_hash(
+            e.msg_hash,
+            BlockStatEventType.BLOCK_CONVERSION_FAILED,
+            network_num=connection.network_num,
+            conversion_type=e.conversion_type.value
+        )
+        connection.log_error(log_messages.BLOCK_COMPRESSION_FAIL, e.msg_hash, e)
+
+    def _on_block_compressed(self, pending: PendingCompression, compression_future: asyncio.Future) -> None:
+        pending.future = compression_future
+        connection = pending.connection
+        pending_compressions = self._pending_compressions[connection]
+        while pending_compressions and pending_compressions[0].future is not None:
+            self._complete_compression(pending_compressions.popleft())
+        if not pending_compressions:
+            del self._pending_compressions[connection]
+
+    def _complete_compression(self, pending: PendingCompression) -> None:
+        block_message = pending.block_message
+        connection = pending.connection
+        compression_future = pending.future
+        assert compression_future is not None
         try:
-            astra_block, block_info = message_converter.block_to_astra_block(
-                block_message,
-                self._node.get_tx_service(),
-                self._node.opts.enable_block_compression,
-                self._node.network.min_tx_age_seconds
-            )
+            astra_block, block_info = compression_future.result()
         except MessageConversionError as e:
-            block_stats.add_block_event_by_block_hash(
-                e.msg_hash,
-                BlockStatEventType.BLOCK_CONVERSION_FAILED,
-                network_num=connection.network_num,
-                conversion_type=e.conversion_type.value
-            )
-            connection.log_error(log_messages.BLOCK_COMPRESSION_FAIL, e.msg_hash, e)
+            self._on_block_conversion_failed(connection, e)
             return
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Compressing block {} off the event loop failed: {}. Compressing it on the event loop.",
+                         block_message.block_hash(), e)
+            converted_off_loop = False
+        else:
+            converted_off_loop = pending.tx_service_view.short_ids_unchanged()
+            if not converted_off_loop:
+                logger.debug("Short ids of block {} changed during compression. Compressing it on the event loop.",
+                             block_message.block_hash())
+
+        if converted_off_loop:
+            logger.debug("Compressed block {} off the event loop, saving {} of event loop time.",
+                         block_info.block_hash, stats_format.duration(block_info.duration_ms))
+        else:
+            try:
+                astra_block, block_info = self._convert_block(block_message, self._node.get_tx_service())
+            except MessageConversionError as e:
+                self._on_block_conversion_failed(connection, e)
+                return
+        self._broadcast_converted_block(block_message, connection, astra_block, block_info, converted_off_loop)
+
+    def _broadcast_converted_block(
+        self,
+        block_message,
+        connection: AbstractGatewayBlockchainConnection,
+        astra_block: memoryview,
+        block_info: BlockInfo,
+        converted_off_loop: bool = False
+    ) -> None:
+        block_hash = block_message.block_hash()
+        latency_histograms.record(
+            LatencyOperation.COMPRESSION, "block_off_loop" if converted_off_loop else "block",
+            block_info.duration_ms / 1000
+        )
+        block_trace.record(BlockTraceStage.COMPRESSED, block_hash, value=block_info.compressed_size)
 
         if block_info.ignored_short_ids:
             assert block_info.ignored_short_ids is not None
@@ -405,7 +590,7 @@ class BlockProcessingService:
 
         compression_rate = block_info.compression_rate
         assert compression_rate is not None
-        block_stats.add_block_event_by_block_hash(
+        stat_event_pipeline.add_block_event_by_block_hash(
             block_hash,
             BlockStatEventType.BLOCK_COMPRESSED,
             start_date_time=block_info.start_datetime,
@@ -418,11 +603,12 @@ class BlockProcessingService:
             blockchain_protocol=self._node.opts.blockchain_protocol,
             matching_block_hash=block_info.compressed_block_hash,
             matching_block_type=StatBlockType.COMPRESSED.value,
-            more_info="Compression: {}->{} bytes, {}, {}; Tx count: {}".format(
+            more_info=_format_compression_info,
+            more_info_args=(
                 block_info.original_size,
                 block_info.compressed_size,
-                stats_format.percentage(compression_rate),
-                stats_format.duration(block_info.duration_ms),
+                compression_rate,
+                block_info.duration_ms,
                 block_info.txn_count
             )
         )
@@ -487,6 +673,7 @@ class BlockProcessingService:
                 (
                     block_message, block_info, unknown_sids, unknown_hashes
                 ) = message_converter.astra_block_to_block(astra_block, transaction_service)
+                latency_histograms.record(LatencyOperation.DECOMPRESSION, "block", block_info.duration_ms / 1000)
                 block_content_debug_utils.log_compressed_block_debug_info(transaction_service, astra_block)
             except MessageConversionError as e:
                 block_stats.add_block_event_by_block_hash(
@@ -504,6 +691,14 @@ class BlockProcessingService:
 
         block_hash = block_info.block_hash
         all_sids = block_info.short_ids
+        if block_trace.is_open():
+            cipher_hash = None
+            if encrypted_block_hash_hex is not None:
+                cipher_hash = Sha256Hash(convert.hex_to_bytes(encrypted_block_hash_hex))
+            # blocks with unknown short ids or hashes are traced again once recovered
+            block_trace.record(
+                BlockTraceStage.DECOMPRESSED, block_hash, cipher_hash, len(unknown_sids) + len(unknown_hashes)
+            )
 
         if encrypted_block_hash_hex is not None:
             block_stats.add_block_event_by_block_hash(
@@ -525,7 +720,7 @@ class BlockProcessingService:
             )
 
         if block_hash in self._node.blocks_seen.contents:
-            block_stats.add_block_event_by_block_hash(
+            stat_event_pipeline.add_block_event_by_block_hash(
                 block_hash,
                 BlockStatEventType.BLOCK_DECOMPRESSED_IGNORE_SEEN,
                 start_date_time=block_info.start_datetime,
@@ -539,7 +734,8 @@ class BlockProcessingService:
                 blockchain_protocol=self._node.opts.blockchain_protocol,
                 matching_block_hash=block_info.compressed_block_hash,
                 matching_block_type=StatBlockType.COMPRESSED.value,
-                more_info=stats_format.duration(block_info.duration_ms)
+                more_info=stats_format.duration,
+                more_info_args=(block_info.duration_ms,)
             )
             self._node.track_block_from_bdn_handling_ended(block_hash)
             transaction_service.track_seen_short_ids(block_hash, all_sids)
@@ -561,7 +757,7 @@ class BlockProcessingService:
         if block_message is not None:
             compression_rate = block_info.compression_rate
             assert compression_rate is not None
-            block_stats.add_block_event_by_block_hash(
+            stat_event_pipeline.add_block_event_by_block_hash(
                 block_hash,
                 BlockStatEventType.BLOCK_DECOMPRESSED_SUCCESS,
                 start_date_time=block_info.start_datetime,
@@ -575,11 +771,11 @@ class BlockProcessingService:
                 blockchain_protocol=self._node.opts.blockchain_protocol,
                 matching_block_hash=block_info.compressed_block_hash,
                 matching_block_type=StatBlockType.COMPRESSED.value,
-                more_info="Compression rate {}, Decompression time {}, "
-                          "Queued behind {} blocks".format(
-                    stats_format.percentage(compression_rate),
-                    stats_format.duration(block_info.duration_ms),
-                    self._node.block_queuing_service_manager.get_length_of_each_queuing_service_stats_format()
+                more_info=_format_decompression_info,
+                more_info_args=(
+                    compression_rate,
+                    block_info.duration_ms,
+                    self._node.block_queuing_service_manager.get_length_of_each_queuing_service()
                 )
             )
 
@@ -602,7 +798,7 @@ class BlockProcessingService:
                 return
 
             self._node.block_recovery_service.add_block(astra_block, block_hash, unknown_sids, unknown_hashes)
-            block_stats.add_block_event_by_block_hash(
+            stat_event_pipeline.add_block_event_by_block_hash(
                 block_hash,
                 BlockStatEventType.BLOCK_DECOMPRESSED_WITH_UNKNOWN_TXS,
                 start_date_time=block_info.start_datetime,
@@ -616,8 +812,8 @@ class BlockProcessingService:
                 blockchain_protocol=self._node.opts.blockchain_protocol,
                 matching_block_hash=block_info.compressed_block_hash,
                 matching_block_type=StatBlockType.COMPRESSED.value,
-                more_info="{} sids, {} hashes, [{},...]".format(len(unknown_sids), len(unknown_hashes),
-                                                                unknown_sids[:5])
+                more_info="{} sids, {} hashes, [{},...]".format,
+                more_info_args=(len(unknown_sids), len(unknown_hashes), unknown_sids[:5])
             )
 
             connection.log_info("Block {} requires short id recovery. Querying BDN...", block_hash)
@@ -699,10 +895,14 @@ class BlockProcessingService:
         """
         Schedules a block recovery attempt. Repeated block recovery attempts result in longer timeouts,
         following `gateway_constants.BLOCK_RECOVERY_INTERVAL_S`'s pattern, until giving up.
+        A block has at most one recovery attempt scheduled at a time.
         :param block_awaiting_recovery: info about recovering block
         :return:
         """
         block_hash = block_awaiting_recovery.block_hash
+        if block_hash in self._pending_recovery_retries:
+            return
+
         recovery_attempts = self._node.block_recovery_service.recovery_attempts_by_block[block_hash]
         recovery_timed_out = time.time() - block_awaiting_recovery.recovery_start_time >= \
                              self._node.opts.blockchain_block_recovery_timeout_s
@@ -712,11 +912,13 @@ class BlockProcessingService:
             self._node.block_queuing_service_manager.remove(block_hash)
         else:
             delay = gateway_constants.BLOCK_RECOVERY_RECOVERY_INTERVAL_S[recovery_attempts]
+            self._pending_recovery_retries.add(block_hash)
             self._node.alarm_queue.register_approx_alarm(delay, delay / 2, self._trigger_recovery_retry,
                                                          block_awaiting_recovery)
 
     def _trigger_recovery_retry(self, block_awaiting_recovery: BlockRecoveryInfo) -> None:
         block_hash = block_awaiting_recovery.block_hash
+        self._pending_recovery_retries.discard(block_hash)
         if self._node.block_recovery_service.awaiting_recovery(block_hash):
             self._node.block_recovery_service.recovery_attempts_by_block[block_hash] += 1
             self.start_transaction_recovery(
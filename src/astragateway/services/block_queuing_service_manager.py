@@ -2,24 +2,24 @@ from typing import Optional, Dict, List, Tuple
 
 from astracommon.messages.abstract_block_message import AbstractBlockMessage
 from astracommon.network.ip_endpoint import IpEndpoint
-from astracommon.utils.expiring_dict import ExpiringDict
 from astracommon.utils.object_hash import Sha256Hash
 from astragateway import log_messages
 from astragateway.connections.abstract_gateway_blockchain_connection import AbstractGatewayBlockchainConnection
 from astragateway.services.abstract_block_queuing_service import AbstractBlockQueuingService
+from astragateway.utils.generational_expiring import GenerationalExpiringDict
 from astrautils import logging
 
 logger = logging.get_logger(__name__)
 
 
 class BlockQueuingServiceManager:
-    block_storage: ExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]]
+    block_storage: GenerationalExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]]
     blockchain_peer_to_block_queuing_service: Dict[AbstractGatewayBlockchainConnection, AbstractBlockQueuingService]
     designated_queuing_service: Optional[AbstractBlockQueuingService] = None
 
     def __init__(
         self,
-        block_storage: ExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]],
+        block_storage: GenerationalExpiringDict[Sha256Hash, Optional[AbstractBlockMessage]],
         blockchain_peer_to_block_queuing_service: Dict[AbstractGatewayBlockchainConnection, AbstractBlockQueuingService]
     ) -> None:
         self.block_storage = block_storage
@@ -133,10 +133,17 @@ class BlockQueuingServiceManager:
             queuing_service.update_recovered_block(block_hash, block_message)
 
     def get_length_of_each_queuing_service_stats_format(self) -> str:
+        return format_queue_lengths(self.get_length_of_each_queuing_service())
+
+    def get_length_of_each_queuing_service(self) -> List[Tuple[IpEndpoint, int]]:
         queue_lengths_and_endpoints: List[Tuple[IpEndpoint, int]] = []
         for queuing_service in self:
             queue_lengths_and_endpoints.append((queuing_service.connection.endpoint, (len(queuing_service))))
-        queue_lengths_str = ', '.join(
-            [f"{str(ip_endpoint)}: {str(queue_length)}" for ip_endpoint, queue_length in queue_lengths_and_endpoints]
-        )
-        return f"[{queue_lengths_str}]"
+        return queue_lengths_and_endpoints
+
+
+def format_queue_lengths(queue_lengths_and_endpoints: List[Tuple[IpEndpoint, int]]) -> str:
+    queue_lengths_str = ', '.join(
+        [f"{str(ip_endpoint)}: {str(queue_length)}" for ip_endpoint, queue_length in queue_lengths_and_endpoints]
+    )
+    return f"[{queue_lengths_str}]"
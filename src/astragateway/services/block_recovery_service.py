@@ -1,7 +1,7 @@
 import time
 from collections import defaultdict
 from enum import Enum
-from typing import Dict, Set, List, NamedTuple
+from typing import Dict, Set, List, NamedTuple, Iterable, Tuple
 
 from astracommon.utils import crypto
 from astracommon.utils.alarm_queue import AlarmQueue
@@ -62,6 +62,8 @@ class BlockRecoveryService:
     _tx_hash_to_astra_block_hashes: Dict[Sha256Hash, Set[Sha256Hash]]
     _blocks_expiration_queue: ExpirationQueue
     _cleanup_scheduled: bool = False
+    # running total of the sizes of compressed blocks awaiting recovery
+    total_block_bytes: int
 
     recovery_attempts_by_block: Dict[Sha256Hash, int]
 
@@ -79,6 +81,7 @@ class BlockRecoveryService:
         self._sid_to_astra_block_hashes = defaultdict(set)
         self._tx_hash_to_astra_block_hashes: Dict[Sha256Hash, Set[Sha256Hash]] = defaultdict(set)
         self._blocks_expiration_queue = ExpirationQueue(gateway_constants.BLOCK_RECOVERY_MAX_QUEUE_TIME)
+        self.total_block_bytes = 0
 
     def add_block(self, astra_block: memoryview, block_hash: Sha256Hash, unknown_tx_sids: List[int],
                   unknown_tx_hashes: List[Sha256Hash]):
@@ -93,7 +96,11 @@ class BlockRecoveryService:
                      len(unknown_tx_hashes), block_hash)
         astra_block_hash = Sha256Hash(crypto.double_sha256(astra_block))
 
+        previous_astra_block = self._astra_block_hash_to_block.get(astra_block_hash)
+        if previous_astra_block is not None:
+            self.total_block_bytes -= len(previous_astra_block)
         self._astra_block_hash_to_block[astra_block_hash] = astra_block
+        self.total_block_bytes += len(astra_block)
         self._astra_block_hash_to_block_hash[astra_block_hash] = block_hash
         self._astra_block_hash_to_sids[astra_block_hash] = set(unknown_tx_sids)
         self._astra_block_hash_to_tx_hashes[astra_block_hash] = set(unknown_tx_hashes)
@@ -164,6 +171,50 @@ class BlockRecoveryService:
         else:
             return False
 
+    def check_missing_transactions(
+        self,
+        transactions: Iterable[Tuple[int, Sha256Hash]],
+        recovered_txs_source: RecoveredTxsSource
+    ) -> Set[Sha256Hash]:
+        """
+        Resolves recovering blocks depending on a batch of short ids and transaction hashes.
+
+        All short ids and hashes of the batch are applied to the recovering blocks first, and each affected block
+        is then checked for completion only once, so a block is recovered at most once per batch.
+        :param transactions: pairs of short id and transaction hash that have been processed
+        :param recovered_txs_source: source of recovered transactions
+        :return: hashes of the compressed blocks that were waiting for any of the transactions
+        """
+        sid_to_astra_block_hashes = self._sid_to_astra_block_hashes
+        tx_hash_to_astra_block_hashes = self._tx_hash_to_astra_block_hashes
+        astra_block_hash_to_sids = self._astra_block_hash_to_sids
+        astra_block_hash_to_tx_hashes = self._astra_block_hash_to_tx_hashes
+        affected_astra_block_hashes = set()
+
+        for sid, tx_hash in transactions:
+            if sid in sid_to_astra_block_hashes:
+                for astra_block_hash in sid_to_astra_block_hashes.pop(sid):
+                    if astra_block_hash in astra_block_hash_to_sids:
+                        astra_block_hash_to_sids[astra_block_hash].discard(sid)
+                        affected_astra_block_hashes.add(astra_block_hash)
+
+            if tx_hash in tx_hash_to_astra_block_hashes:
+                for astra_block_hash in tx_hash_to_astra_block_hashes.pop(tx_hash):
+                    if astra_block_hash in astra_block_hash_to_tx_hashes:
+                        astra_block_hash_to_tx_hashes[astra_block_hash].discard(tx_hash)
+                        affected_astra_block_hashes.add(astra_block_hash)
+
+        if affected_astra_block_hashes:
+            logger.trace("Resolved previously unknown transactions for {} recovering blocks.",
+                         len(affected_astra_block_hashes))
+
+        for astra_block_hash in affected_astra_block_hashes:
+            # a block may have been recovered through another compressed version of it in this batch
+            if astra_block_hash in self._astra_block_hash_to_block:
+                self._check_if_recovered(astra_block_hash, recovered_txs_source)
+
+        return affected_astra_block_hashes
+
     def cancel_recovery_for_block(self, block_hash: Sha256Hash) -> bool:
         """
         Cancels recovery for all compressed blocks matching a block hash
@@ -244,7 +295,7 @@ class BlockRecoveryService:
             for astra_block_hash in self._block_hash_to_astra_block_hashes[block_hash]:
                 if astra_block_hash in self._astra_block_hash_to_block:
                     self._remove_sid_and_tx_mapping_for_astra_block_hash(astra_block_hash)
-                    del self._astra_block_hash_to_block[astra_block_hash]
+                    self.total_block_bytes -= len(self._astra_block_hash_to_block.pop(astra_block_hash))
                     del self._astra_block_hash_to_block_hash[astra_block_hash]
             del self._block_hash_to_astra_block_hashes[block_hash]
 
@@ -280,7 +331,7 @@ class BlockRecoveryService:
             logger.trace("Block has failed recovery: {}", astra_block_hash)
 
             self._remove_sid_and_tx_mapping_for_astra_block_hash(astra_block_hash)
-            del self._astra_block_hash_to_block[astra_block_hash]
+            self.total_block_bytes -= len(self._astra_block_hash_to_block.pop(astra_block_hash))
 
             block_hash = self._astra_block_hash_to_block_hash.pop(astra_block_hash)
             self._block_hash_to_astra_block_hashes[block_hash].discard(astra_block_hash)
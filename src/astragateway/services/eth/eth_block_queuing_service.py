@@ -8,7 +8,6 @@ from astracommon.messages.eth.serializers.block_header import BlockHeader
 from astracommon.utils.blockchain_utils.eth import eth_common_constants, eth_common_utils
 from astracommon.utils import memory_utils, crypto
 from astracommon.utils.alarm_queue import AlarmId
-from astracommon.utils.expiring_dict import ExpiringDict
 from astracommon.utils.memory_utils import ObjectSize
 from astracommon.utils.object_hash import Sha256Hash, NULL_SHA256_HASH
 from astracommon.utils.stats import hooks
@@ -40,6 +39,8 @@ from astragateway.messages.eth.protocol.new_block_hashes_eth_protocol_message im
 from astragateway.messages.eth.serializers.transient_block_body import TransientBlockBody
 from astragateway.services.abstract_block_queuing_service import AbstractBlockQueuingService, \
     BlockQueueEntry
+from astragateway.utils.generational_expiring import GenerationalExpiringDict
+from astragateway.utils.block_trace import block_trace, BlockTraceStage
 from astrautils import logging
 
 if TYPE_CHECKING:
@@ -82,16 +83,16 @@ class EthBlockQueuingService(
     block_checking_alarms: Dict[Sha256Hash, AlarmId]
     block_check_repeat_count: Dict[Sha256Hash, int]
 
-    accepted_block_hash_at_height: ExpiringDict[int, Sha256Hash]
-    sent_block_at_height: ExpiringDict[int, Sha256Hash]
+    accepted_block_hash_at_height: GenerationalExpiringDict[int, Sha256Hash]
+    sent_block_at_height: GenerationalExpiringDict[int, Sha256Hash]
 
     # best block sent to the Ethereum node
     best_sent_block: SentEthBlockInfo
     # best block accepted by Ethereum node
     best_accepted_block: EthBlockInfo
 
-    _block_hashes_by_height: ExpiringDict[int, Set[Sha256Hash]]
-    _height_by_block_hash: ExpiringDict[Sha256Hash, int]
+    _block_hashes_by_height: GenerationalExpiringDict[int, Set[Sha256Hash]]
+    _height_by_block_hash: GenerationalExpiringDict[Sha256Hash, int]
     _highest_block_number: int = 0
     _recovery_alarms_by_block_hash: Dict[Sha256Hash, AlarmId]
     _next_push_alarm_id: Optional[AlarmId] = None
@@ -109,12 +110,12 @@ class EthBlockQueuingService(
         self.block_checking_alarms = {}
         self.block_check_repeat_count = defaultdict(int)
 
-        self.accepted_block_hash_at_height = ExpiringDict(
+        self.accepted_block_hash_at_height = GenerationalExpiringDict(
             node.alarm_queue,
             gateway_constants.MAX_BLOCK_CACHE_TIME_S,
             f"eth_block_queue_accepted_block_by_height_{self.connection.endpoint}"
         )
-        self.sent_block_at_height = ExpiringDict(
+        self.sent_block_at_height = GenerationalExpiringDict(
             node.alarm_queue,
             gateway_constants.MAX_BLOCK_CACHE_TIME_S,
             f"eth_block_queue_sent_block_at_height_{self.connection.endpoint}"
@@ -122,12 +123,12 @@ class EthBlockQueuingService(
         self.best_sent_block = SentEthBlockInfo(INITIAL_BLOCK_HEIGHT, NULL_SHA256_HASH, 0)
         self.best_accepted_block = EthBlockInfo(INITIAL_BLOCK_HEIGHT, NULL_SHA256_HASH)
 
-        self._block_hashes_by_height = ExpiringDict(
+        self._block_hashes_by_height = GenerationalExpiringDict(
             node.alarm_queue,
             gateway_constants.MAX_BLOCK_CACHE_TIME_S,
             f"eth_block_queue_hashes_by_heights_{self.connection.endpoint}",
         )
-        self._height_by_block_hash = ExpiringDict(
+        self._height_by_block_hash = GenerationalExpiringDict(
             node.alarm_queue,
             gateway_constants.MAX_BLOCK_CACHE_TIME_S,
             f"eth_block_queue_height_by_hash_{self.connection.endpoint}"
@@ -295,7 +296,7 @@ class EthBlockQueuingService(
     def remove(self, block_hash: Sha256Hash) -> int:
         index = super().remove(block_hash)
         if block_hash in self._height_by_block_hash:
-            height = self._height_by_block_hash.contents.pop(block_hash, None)
+            height = self._height_by_block_hash.remove_item(block_hash)
             self.connection.log_trace(
                 "Removing block {} at height {} in queuing service",
                 block_hash, height
@@ -955,13 +956,15 @@ class EthBlockQueuingService(
 
         if block_msg is not None:
             self.store_block_data(block_hash, block_msg)
-            return self._ordered_insert(block_hash, block_msg.block_number(), timestamp)
+            position = self._ordered_insert(block_hash, block_msg.block_number(), timestamp)
         else:
             # blocks with no number go to the end of the queue
             self.ordered_block_queue.append(
                 OrderedQueuedBlock(block_hash, timestamp, None)
             )
-            return len(self.ordered_block_queue) - 1
+            position = len(self.ordered_block_queue) - 1
+        block_trace.record(BlockTraceStage.QUEUED, block_hash, value=position)
+        return position
 
     def _ordered_insert(
         self,
@@ -1,23 +1,48 @@
+import functools
 import time
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import Iterable, List
 
 from astrautils import logging
 from astrautils.logging.log_record_type import LogRecordType
 
+from astracommon import constants
 from astracommon.services import normal_cleanup_service_helpers
 from astracommon.messages.astra.block_confirmation_message import BlockConfirmationMessage
 from astracommon.services.transaction_service import TransactionService
 from astracommon.utils.object_hash import Sha256Hash
 
+from astragateway import gateway_constants
 from astragateway.services.eth.abstract_eth_block_cleanup_service import AbstractEthBlockCleanupService
+from astragateway.services.gateway_transaction_service import GatewayTransactionService, \
+    remove_transactions_one_by_one
 
 logger = logging.get_logger(LogRecordType.BlockCleanup, __name__)
 
 
+@dataclass
+class _BlockCleanupProgress:
+    block_hash: Sha256Hash
+    transactions_list: List[Sha256Hash]
+    transaction_service: TransactionService
+    tx_hash_to_contents_len_before_cleanup: int
+    short_id_count_before_cleanup: int
+    start_time: float
+    next_index: int = 0
+    slice_count: int = 0
+    processing_time_s: float = 0
+    block_short_ids: List[int] = field(default_factory=list)
+    block_unknown_tx_hashes: List[Sha256Hash] = field(default_factory=list)
+
+
 class EthNormalBlockCleanupService(AbstractEthBlockCleanupService):
 
     """
     Service for managing block cleanup.
+
+    Transactions of large blocks are removed in slices. Once a slice exceeds
+    `BLOCK_CLEANUP_SLICE_TIME_BUDGET_S`, the rest of the block is rescheduled on the alarm queue
+    so other event loop callbacks can run in between.
     """
 
     def clean_block_transactions_by_block_components(
@@ -27,56 +52,92 @@ class EthNormalBlockCleanupService(AbstractEthBlockCleanupService):
             transaction_service: TransactionService
          ) -> None:
         logger.debug("Processing block for cleanup: {}", block_hash)
-        tx_hash_to_contents_len_before_cleanup = transaction_service.get_tx_hash_to_contents_len()
-        short_id_count_before_cleanup = transaction_service.get_short_id_count()
-
-        block_short_ids = []
-        block_unknown_tx_hashes = []
-
-        short_ids_count = 0
-        unknown_tx_hashes_count = 0
-        transactions_processed = 0
-
-        start_time = time.time()
-        for tx_hash in transactions_list:
-            short_ids = transaction_service.remove_transaction_by_tx_hash(tx_hash, force=True)
-            if short_ids is None:
-                unknown_tx_hashes_count += 1
-                block_unknown_tx_hashes.append(tx_hash)
-            else:
-                short_ids_count += len(short_ids)
-                block_short_ids.extend(short_ids)
-            transactions_processed += 1
+        if not isinstance(transactions_list, list):
+            transactions_list = list(transactions_list)
+
+        cleanup_progress = _BlockCleanupProgress(
+            block_hash,
+            transactions_list,
+            transaction_service,
+            transaction_service.get_tx_hash_to_contents_len(),
+            transaction_service.get_short_id_count(),
+            time.time()
+        )
+        self._clean_block_transactions_slice(cleanup_progress)
+
+    # pyre-fixme[14]: `contents_cleanup` overrides method defined in
+    #  `AbstractBlockCleanupService` inconsistently.
+    def contents_cleanup(self,
+                         transaction_service: TransactionService,
+                         block_confirmation_message: BlockConfirmationMessage
+                         ):
+        normal_cleanup_service_helpers.contents_cleanup(transaction_service, block_confirmation_message)
+
+    def _clean_block_transactions_slice(self, cleanup_progress: _BlockCleanupProgress) -> None:
+        slice_start_time = time.time()
+        transactions_list = cleanup_progress.transactions_list
+        transactions_count = len(transactions_list)
+        slice_size = gateway_constants.BLOCK_CLEANUP_TX_SLICE_SIZE
+        cleanup_progress.slice_count += 1
+
+        transaction_service = cleanup_progress.transaction_service
+        if isinstance(transaction_service, GatewayTransactionService):
+            remove_transactions = transaction_service.remove_transactions_by_tx_hashes
+        else:
+            remove_transactions = functools.partial(remove_transactions_one_by_one, transaction_service)
+        while cleanup_progress.next_index < transactions_count:
+            next_index = cleanup_progress.next_index + slice_size
+            short_ids, unknown_tx_hashes = remove_transactions(
+                transactions_list[cleanup_progress.next_index:next_index]
+            )
+            cleanup_progress.block_short_ids.extend(short_ids)
+            cleanup_progress.block_unknown_tx_hashes.extend(unknown_tx_hashes)
+            cleanup_progress.next_index = next_index
+
+            slice_duration = time.time() - slice_start_time
+            if (
+                cleanup_progress.next_index < transactions_count
+                and slice_duration >= gateway_constants.BLOCK_CLEANUP_SLICE_TIME_BUDGET_S
+            ):
+                cleanup_progress.processing_time_s += slice_duration
+                logger.trace(
+                    "Deferring cleanup of block {} after {} of {} transactions.",
+                    cleanup_progress.block_hash, cleanup_progress.next_index, transactions_count
+                )
+                self.node.alarm_queue.register_alarm(
+                    constants.MIN_SLEEP_TIMEOUT, self._clean_block_transactions_slice, cleanup_progress
+                )
+                return
+
+        cleanup_progress.processing_time_s += time.time() - slice_start_time
+        self._finish_block_cleanup(cleanup_progress)
+
+    def _finish_block_cleanup(self, cleanup_progress: _BlockCleanupProgress) -> None:
+        block_hash = cleanup_progress.block_hash
+        transaction_service = cleanup_progress.transaction_service
         transaction_service.on_block_cleaned_up(block_hash)
 
-        end_time = time.time()
-        duration = end_time - start_time
+        transactions_processed = len(cleanup_progress.transactions_list)
         tx_hash_to_contents_len_after_cleanup = transaction_service.get_tx_hash_to_contents_len()
         short_id_count_after_cleanup = transaction_service.get_short_id_count()
 
         logger.debug(
             "Finished cleaning up block {}. Processed {} hashes, {} of which were unknown, and cleaned up {} "
-            "short ids. Took {:.3f}s.",
-            block_hash, transactions_processed, unknown_tx_hashes_count, short_ids_count, duration
+            "short ids. Took {:.3f}s in {} slices over {:.3f}s.",
+            block_hash, transactions_processed, len(cleanup_progress.block_unknown_tx_hashes),
+            len(cleanup_progress.block_short_ids), cleanup_progress.processing_time_s, cleanup_progress.slice_count,
+            time.time() - cleanup_progress.start_time
         )
 
         transaction_service.log_block_transaction_cleanup_stats(block_hash, transactions_processed,
-                                                                tx_hash_to_contents_len_before_cleanup,
+                                                                cleanup_progress.tx_hash_to_contents_len_before_cleanup,
                                                                 tx_hash_to_contents_len_after_cleanup,
-                                                                short_id_count_before_cleanup,
+                                                                cleanup_progress.short_id_count_before_cleanup,
                                                                 short_id_count_after_cleanup)
 
         self._block_hash_marked_for_cleanup.discard(block_hash)
         self.node.post_block_cleanup_tasks(
             block_hash,
-            block_short_ids,
-            block_unknown_tx_hashes
+            cleanup_progress.block_short_ids,
+            cleanup_progress.block_unknown_tx_hashes
         )
-
-    # pyre-fixme[14]: `contents_cleanup` overrides method defined in
-    #  `AbstractBlockCleanupService` inconsistently.
-    def contents_cleanup(self,
-                         transaction_service: TransactionService,
-                         block_confirmation_message: BlockConfirmationMessage
-                         ):
-        normal_cleanup_service_helpers.contents_cleanup(transaction_service, block_confirmation_message)
@@ -1,5 +1,5 @@
 import struct
-from typing import List, Set, Union
+from typing import Iterable, List, Set, Tuple, Union
 
 import task_pool_executor as tpe
 
@@ -11,14 +11,18 @@ from astracommon.services.extension_transaction_service import ExtensionTransact
 from astracommon.services.transaction_service import TransactionFromBdnGatewayProcessingResult
 from astracommon.utils import crypto
 from astracommon.utils.object_hash import Sha256Hash
-from astragateway.connections.eth.eth_gateway_node import EthGatewayNode
-from astragateway.connections.ont.ont_gateway_node import OntGatewayNode
 from astragateway.services.gateway_transaction_service import GatewayTransactionService, \
-    ProcessTransactionMessageFromNodeResult, MissingTransactions
+    ProcessTransactionMessageFromNodeResult, MissingTransactions, remove_transactions_one_by_one
 
 
 class ExtensionGatewayTransactionService(ExtensionTransactionService, GatewayTransactionService):
 
+    def remove_transactions_by_tx_hashes(
+        self, transaction_hashes: Iterable[Sha256Hash]
+    ) -> Tuple[List[int], List[Sha256Hash]]:
+        # contents and short ids are kept by the extension, which removes transactions one by one
+        return remove_transactions_one_by_one(self, transaction_hashes)
+
     def process_gateway_transaction_from_bdn(
         self,
         transaction_hash: Sha256Hash,
@@ -81,8 +85,7 @@ class ExtensionGatewayTransactionService(ExtensionTransactionService, GatewayTra
         if msg_bytes == b'\xc0':
             return result
 
-        if (isinstance(self.node, OntGatewayNode) or isinstance(self.node, EthGatewayNode)) and \
-                opts.process_node_txs_in_extension:
+        if self.node.EXTENSION_PROCESSES_NODE_TXS and opts.process_node_txs_in_extension:
             ext_processing_results = memoryview(self.proxy.process_gateway_transaction_from_node(
                 tpe.InputBytes(msg_bytes),
                 min_tx_network_fee,
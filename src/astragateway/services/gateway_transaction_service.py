@@ -1,4 +1,4 @@
-from typing import Union, cast, List, NamedTuple, Set, Optional, TYPE_CHECKING
+from typing import Union, cast, List, NamedTuple, Set, Optional, TYPE_CHECKING, Iterable, Tuple
 
 from astracommon.messages.astra.tx_message import TxMessage
 from astracommon.messages.astra.txs_message import TxsMessage
@@ -11,11 +11,11 @@ from astracommon.utils.blockchain_utils import transaction_validation
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon import constants
 from astragateway.abstract_message_converter import AbstractMessageConverter
-from astragateway.messages.btc.tx_btc_message import TxBtcMessage
-from astragateway.messages.eth.protocol.transactions_eth_protocol_message import TransactionsEthProtocolMessage
 from astragateway.services.block_recovery_service import RecoveredTxsSource
 
 if TYPE_CHECKING:
+    from astragateway.messages.btc.tx_btc_message import TxBtcMessage
+    from astragateway.messages.eth.protocol.transactions_eth_protocol_message import TransactionsEthProtocolMessage
     from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
 
 
@@ -36,9 +36,30 @@ class MissingTransactions(NamedTuple):
     transaction_hash: Sha256Hash
 
 
+def remove_transactions_one_by_one(
+    transaction_service: TransactionService, transaction_hashes: Iterable[Sha256Hash]
+) -> Tuple[List[int], List[Sha256Hash]]:
+    """
+    Removes a batch of transactions through `remove_transaction_by_tx_hash`, for transaction services without bulk
+    removal. See `GatewayTransactionService.remove_transactions_by_tx_hashes`.
+    """
+    remove_transaction_by_tx_hash = transaction_service.remove_transaction_by_tx_hash
+    removed_short_ids = []
+    unknown_transaction_hashes = []
+    for transaction_hash in transaction_hashes:
+        short_ids = remove_transaction_by_tx_hash(transaction_hash, force=True)
+        if short_ids is None:
+            unknown_transaction_hashes.append(transaction_hash)
+        else:
+            removed_short_ids.extend(short_ids)
+    return removed_short_ids, unknown_transaction_hashes
+
+
 class GatewayTransactionService(TransactionService):
 
     node: "AbstractGatewayNode"
+    # set while a batch of transactions is processed whose block recovery is resolved by the caller at once
+    _recovery_checks_deferred: bool = False
 
     def process_gateway_transaction_from_bdn(
         self,
@@ -84,7 +105,7 @@ class GatewayTransactionService(TransactionService):
 
     def process_transactions_message_from_node(
         self,
-        msg: Union[TxBtcMessage, TransactionsEthProtocolMessage, OntTxMessage],
+        msg: Union["TxBtcMessage", "TransactionsEthProtocolMessage", OntTxMessage],
         min_tx_network_fee: int,
         enable_transaction_validation: bool
     ) -> List[ProcessTransactionMessageFromNodeResult]:
@@ -127,6 +148,22 @@ class GatewayTransactionService(TransactionService):
     def process_txs_message(
         self,
         msg: TxsMessage
+    ) -> Set[MissingTransactions]:
+        """
+        Stores short ids and contents of a txs message.
+
+        Recovering blocks are not checked for each transaction; callers are expected to pass the returned
+        missing transactions to `BlockRecoveryService.check_missing_transactions`.
+        """
+        self._recovery_checks_deferred = True
+        try:
+            return self._process_txs_message(msg)
+        finally:
+            self._recovery_checks_deferred = False
+
+    def _process_txs_message(
+        self,
+        msg: TxsMessage
     ) -> Set[MissingTransactions]:
         missing_transactions: Set[MissingTransactions] = set()
         transactions = msg.get_txs()
@@ -155,6 +192,55 @@ class GatewayTransactionService(TransactionService):
 
         return missing_transactions
 
+    def remove_transactions_by_tx_hashes(
+        self, transaction_hashes: Iterable[Sha256Hash]
+    ) -> Tuple[List[int], List[Sha256Hash]]:
+        """
+        Removes a batch of transactions (e.g. the transactions of a confirmed block) from the service, even if they
+        are still referenced by a tracked block.
+
+        Keys, contents and short ids of the batch are resolved in a single pass, the contents are dropped and the
+        contents size is adjusted once for the batch. The removal of the short id mappings and the tracking of
+        removed transactions are left to `remove_transaction_by_key`, which then has no contents to account for.
+
+        :param transaction_hashes: hashes of transactions to remove
+        :return: tuple of removed short ids and hashes of the transactions that were not found
+        """
+        get_transaction_key = self.get_transaction_key
+        tx_cache_key_to_contents = self._tx_cache_key_to_contents
+        tx_cache_key_to_short_ids = self._tx_cache_key_to_short_ids
+
+        transaction_keys = []
+        removed_short_ids = []
+        unknown_transaction_hashes = []
+        removed_contents_size = 0
+        for transaction_hash in transaction_hashes:
+            transaction_key = get_transaction_key(transaction_hash)
+            transaction_cache_key = transaction_key.transaction_cache_key
+            short_ids = tx_cache_key_to_short_ids.get(transaction_cache_key)
+            contents = tx_cache_key_to_contents.pop(transaction_cache_key, None)
+            if contents is None and short_ids is None:
+                unknown_transaction_hashes.append(transaction_hash)
+                continue
+            if contents is not None:
+                removed_contents_size += len(contents)
+            if short_ids:
+                removed_short_ids.extend(short_ids)
+            transaction_keys.append(transaction_key)
+        self._total_tx_contents_size -= removed_contents_size
+
+        remove_transaction_by_key = self.remove_transaction_by_key
+        for transaction_key in transaction_keys:
+            remove_transaction_by_key(transaction_key, True)
+
+        return removed_short_ids, unknown_transaction_hashes
+
+    def get_total_tx_contents_size(self) -> int:
+        """
+        :return: bytes of transaction contents held by the service, kept up to date as contents are added and removed
+        """
+        return self._total_tx_contents_size
+
     def set_transaction_contents_base_by_key(
         self,
         transaction_key: TransactionKey,
@@ -184,7 +270,7 @@ class GatewayTransactionService(TransactionService):
         )
         if transaction_contents is not None:
             self.node.log_txs_network_content(self.network_num, transaction_key.transaction_hash, transaction_contents)
-            if call_set_contents:
+            if call_set_contents and not self._recovery_checks_deferred:
                 self.node.block_recovery_service.check_missing_tx_hash(
                     transaction_key.transaction_hash, RecoveredTxsSource.TXS_RECEIVED_FROM_NODE
                 )
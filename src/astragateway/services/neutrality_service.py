@@ -1,5 +1,9 @@
+import asyncio
 import datetime
+import functools
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 from astracommon import constants
 from astracommon.connections.abstract_connection import AbstractConnection
@@ -12,14 +16,25 @@ from astracommon.utils.stats import stats_format
 from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
 from astracommon.utils.stats.block_statistics_service import block_stats
 from astracommon.utils.stats.stat_block_type import StatBlockType
-from astragateway import gateway_constants
+from astragateway import gateway_constants, log_messages
 from astragateway.gateway_constants import NeutralityPolicy
 from astragateway.messages.gateway.block_propagation_request import BlockPropagationRequestMessage
+from astragateway.utils.block_trace import block_trace, BlockTraceStage
+from astragateway.utils.stats.latency_histograms import latency_histograms, LatencyOperation
 from astrautils import logging
 
 logger = logging.get_logger(__name__)
 
 
+def _encrypt_block(astra_block: bytes) -> Tuple[bytes, bytes, bytes]:
+    """
+    Encrypts a compressed block on an encryption thread, the AES and SHA256 implementations release the GIL.
+    :return: encryption key, encrypted block, cipher hash
+    """
+    encryption_key, encrypted_block = crypto.symmetric_encrypt(astra_block)
+    return encryption_key, encrypted_block, crypto.double_sha256(encrypted_block)
+
+
 class NeutralityService(object):
     """
     Service to manage block encryption and ensure network is neutral to Gateway Node's requests.
@@ -29,6 +44,11 @@ class NeutralityService(object):
         self._node = node
         self._receipt_tracker = {}
         self._alarms = {}
+        self._encryption_executor: Optional[ThreadPoolExecutor] = None
+        if node.opts.block_encryption_threads > 0:
+            self._encryption_executor = ThreadPoolExecutor(
+                max_workers=node.opts.block_encryption_threads, thread_name_prefix="block_encryption"
+            )
 
     def register_for_block_receipts(self, cipher_hash, astra_block):
         """
@@ -82,7 +102,7 @@ class NeutralityService(object):
         :param connection: connection initiating propagation
         :param block_info: original block hash, only provided if this is the original block
         :param from_peer: true if this message comes from another gateway. That means it is supposed to be encrypted
-        :return: broadcast message
+        :return: broadcast message, or None if the block is being encrypted on the encryption threads
         """
         if self._node.opts.encrypt_blocks or from_peer:
             broadcast_msg = self._propagate_encrypted_block_to_network(astra_block, connection, block_info)
@@ -91,7 +111,51 @@ class NeutralityService(object):
         return broadcast_msg
 
     def _propagate_encrypted_block_to_network(self, astra_block, connection, block_info):
+        encrypt_start_datetime = datetime.datetime.utcnow()
+        encrypt_start_timestamp = time.time()
+
+        if self._encryption_executor is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                encryption_future = loop.run_in_executor(
+                    self._encryption_executor, _encrypt_block, bytes(astra_block)
+                )
+                encryption_future.add_done_callback(functools.partial(
+                    self._on_block_encrypted, astra_block, connection, block_info, encrypt_start_datetime,
+                    encrypt_start_timestamp
+                ))
+                return None
+
+        encrypted_block, raw_cipher_hash = self._node.in_progress_blocks.encrypt_and_add_payload(astra_block)
+        return self._broadcast_encrypted_block(
+            astra_block, connection, block_info, encrypted_block, raw_cipher_hash, encrypt_start_datetime,
+            encrypt_start_timestamp
+        )
 
+    def _on_block_encrypted(
+        self, astra_block, connection, block_info, encrypt_start_datetime, encrypt_start_timestamp,
+        encryption_future: asyncio.Future
+    ) -> None:
+        try:
+            encryption_key, encrypted_block, raw_cipher_hash = encryption_future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error(log_messages.BLOCK_ENCRYPTION_FAIL, e, exc_info=True)
+            encrypted_block, raw_cipher_hash = self._node.in_progress_blocks.encrypt_and_add_payload(astra_block)
+        else:
+            self._node.in_progress_blocks.add_ciphertext(raw_cipher_hash, encrypted_block)
+            self._node.in_progress_blocks.add_key(raw_cipher_hash, encryption_key)
+        self._broadcast_encrypted_block(
+            astra_block, connection, block_info, encrypted_block, raw_cipher_hash, encrypt_start_datetime,
+            encrypt_start_timestamp
+        )
+
+    def _broadcast_encrypted_block(
+        self, astra_block, connection, block_info, encrypted_block, raw_cipher_hash, encrypt_start_datetime,
+        encrypt_start_timestamp
+    ):
         if block_info is None or block_info.block_hash is None:
             block_hash = b"Unknown"
             requested_by_peer = True
@@ -99,9 +163,7 @@ class NeutralityService(object):
             block_hash = block_info.block_hash
             requested_by_peer = False
 
-        encrypt_start_datetime = datetime.datetime.utcnow()
-        encrypt_start_timestamp = time.time()
-        encrypted_block, raw_cipher_hash = self._node.in_progress_blocks.encrypt_and_add_payload(astra_block)
+        latency_histograms.record(LatencyOperation.ENCRYPTION, "block", time.time() - encrypt_start_timestamp)
 
         compressed_size = len(astra_block)
         encrypted_size = len(encrypted_block)
@@ -121,6 +183,9 @@ class NeutralityService(object):
                                                   more_info=encryption_details)
 
         cipher_hash = Sha256Hash(raw_cipher_hash)
+        block_trace.record(
+            BlockTraceStage.ENCRYPTED, None if requested_by_peer else block_hash, cipher_hash, encrypted_size
+        )
         broadcast_message = BroadcastMessage(cipher_hash, self._node.network_num, is_encrypted=True,
                                              blob=encrypted_block)
 
@@ -129,8 +194,10 @@ class NeutralityService(object):
             connection,
             connection_types=(ConnectionType.RELAY_BLOCK,)
         )
+        block_trace.record(BlockTraceStage.BROADCAST, cipher_hash=cipher_hash, value=len(conns))
 
         handling_duration = self._node.track_block_from_node_handling_ended(block_hash)
+        self._record_time_to_broadcast("encrypted", handling_duration)
         block_stats.add_block_event_by_block_hash(cipher_hash,
                                                   BlockStatEventType.ENC_BLOCK_SENT_FROM_GATEWAY_TO_NETWORK,
                                                   network_num=self._node.network_num,
@@ -155,7 +222,9 @@ class NeutralityService(object):
             connection,
             connection_types=(ConnectionType.RELAY_BLOCK,)
         )
+        block_trace.record(BlockTraceStage.BROADCAST, block_info.block_hash, value=len(conns))
         handling_duration = self._node.track_block_from_node_handling_ended(block_info.block_hash)
+        self._record_time_to_broadcast("unencrypted", handling_duration)
         block_stats.add_block_event_by_block_hash(block_info.block_hash,
                                                   BlockStatEventType.ENC_BLOCK_SENT_FROM_GATEWAY_TO_NETWORK,
                                                   network_num=self._node.network_num,
@@ -168,6 +237,18 @@ class NeutralityService(object):
         logger.info("Propagating block {} to the BDN.", block_info.block_hash)
         return broadcast_message
 
+    def close(self) -> None:
+        if self._encryption_executor is not None:
+            self._encryption_executor.shutdown(wait=False)
+
+    def _record_time_to_broadcast(self, label: str, handling_duration_ms: float) -> None:
+        """
+        Records the time from receiving a block from the blockchain node until its broadcast message is queued
+        on the relay connections, i.e. the time to first byte of the block on the BDN.
+        """
+        if handling_duration_ms > 0:
+            latency_histograms.record(LatencyOperation.BLOCK_BROADCAST, label, handling_duration_ms / 1000)
+
     def _format_block_info_stats(self, block_info):
         if block_info is None:
             return ""
@@ -244,6 +325,7 @@ class NeutralityService(object):
             None,
             connection_types=(ConnectionType.RELAY_BLOCK, ConnectionType.GATEWAY)
         )
+        block_trace.record(BlockTraceStage.KEY_SENT, cipher_hash=cipher_hash, value=len(conns))
         block_stats.add_block_event_by_block_hash(
             cipher_hash,
             BlockStatEventType.ENC_BLOCK_KEY_SENT_FROM_GATEWAY_TO_NETWORK,
@@ -7,6 +7,7 @@ from astracommon.utils.stats import stats_format
 from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
 from astracommon.utils.stats.block_statistics_service import block_stats
 from astragateway.services.neutrality_service import NeutralityService
+from astragateway.utils.block_trace import block_trace, BlockTraceStage
 from astrautils import logging
 
 logger = logging.get_logger(__name__)
@@ -28,6 +29,7 @@ class OntNeutralityService(NeutralityService):
             connection,
             connection_types=(ConnectionType.RELAY_BLOCK,)
         )
+        block_trace.record(BlockTraceStage.BROADCAST, block_info.block_hash, value=len(conns))
         handling_duration = self._node.track_block_from_node_handling_ended(block_info.block_hash)
         block_stats.add_block_event_by_block_hash(block_info.block_hash,
                                                   BlockStatEventType.ENC_BLOCK_SENT_FROM_GATEWAY_TO_NETWORK,
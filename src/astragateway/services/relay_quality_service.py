@@ -0,0 +1,242 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from astracommon import constants
+from astracommon.models.node_type import NodeType
+from astracommon.models.outbound_peer_model import OutboundPeerModel
+from astracommon.services import sdn_http_service
+from astracommon.utils import network_latency
+from astracommon.utils.object_hash import Sha256Hash
+from astragateway import gateway_constants
+from astrautils import logging
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports,cyclic-import
+    from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
+
+logger = logging.get_logger(__name__)
+
+RelayKey = Tuple[str, int]
+
+
+def _relay_key(relay: OutboundPeerModel) -> RelayKey:
+    return relay.ip, relay.port
+
+
+class RelayQuality:
+    """
+    Exponentially weighted moving averages of a relay's ping latency, ping jitter (the change between consecutive
+    latencies) and, for connected relays, how far behind the first relay each block broadcast arrived.
+    """
+    relay: OutboundPeerModel
+    latency_ms: Optional[float]
+    jitter_ms: float
+    block_lag_ms: float
+    probe_count: int
+    better_probe_count: int
+    _last_latency_ms: Optional[float]
+
+    def __init__(self, relay: OutboundPeerModel) -> None:
+        self.relay = relay
+        self.latency_ms = None
+        self.jitter_ms = 0
+        self.block_lag_ms = 0
+        self.probe_count = 0
+        self.better_probe_count = 0
+        self._last_latency_ms = None
+
+    def add_latency(self, latency_ms: float) -> None:
+        alpha = gateway_constants.RELAY_QUALITY_EWMA_ALPHA
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += alpha * (latency_ms - self.latency_ms)
+        if self._last_latency_ms is not None:
+            self.jitter_ms += alpha * (abs(latency_ms - self._last_latency_ms) - self.jitter_ms)
+        self._last_latency_ms = latency_ms
+        self.probe_count += 1
+
+    def add_block_lag(self, block_lag_ms: float) -> None:
+        self.block_lag_ms += gateway_constants.RELAY_QUALITY_EWMA_ALPHA * (block_lag_ms - self.block_lag_ms)
+
+    def score(self) -> float:
+        """
+        Ping-derived delay in milliseconds of the relay, lower is better. Comparable between connected and candidate
+        relays, since candidates have no block lag.
+        """
+        assert self.latency_ms is not None
+        return self.latency_ms + self.jitter_ms
+
+    def connected_score(self) -> float:
+        """
+        Expected delay in milliseconds of receiving blocks through a connected relay, only comparable between
+        connected relays.
+        """
+        return self.score() + self.block_lag_ms
+
+
+class RelayQualityService:
+    """
+    Periodically pings the connected relays and the candidate relays received from the SDN, and replaces a
+    connected relay with a candidate whose ping-derived score is lower by `opts.relay_switch_margin` (a fraction)
+    for `RELAY_SWITCH_CONSECUTIVE_PROBES` consecutive probes. The replaced relay is the connected relay with the
+    worst score including block lag.
+
+    Switches are make-before-break: the candidate is connected first, and the replaced relay is only
+    disconnected once the candidate connection is active. The switch is abandoned if it does not become
+    active within `RELAY_SWITCH_TIMEOUT_S`.
+    """
+    qualities: Dict[RelayKey, RelayQuality]
+    pending_switch: Optional[Tuple[OutboundPeerModel, OutboundPeerModel]]
+    switch_count: int
+    _candidates: Set[OutboundPeerModel]
+    _block_arrival_times: "OrderedDict[Sha256Hash, float]"
+    _pending_switch_start_time: float
+
+    def __init__(self, node: "AbstractGatewayNode") -> None:
+        self._node = node
+        self.qualities = {}
+        self.pending_switch = None
+        self.switch_count = 0
+        self._candidates = set()
+        self._block_arrival_times = OrderedDict()
+        self._pending_switch_start_time = 0
+
+    def start(self) -> None:
+        self._node.alarm_queue.register_alarm(
+            self._node.opts.relay_probe_interval_s, self._probe, alarm_name="probe_relays"
+        )
+
+    def update_candidates(self, candidates: List[OutboundPeerModel]) -> None:
+        self._candidates = set(candidates)
+        candidate_keys = {_relay_key(candidate) for candidate in candidates}
+        active_keys = {_relay_key(relay) for relay in self._node.peer_relays}
+        for key in list(self.qualities):
+            if key not in candidate_keys and key not in active_keys:
+                del self.qualities[key]
+
+    def on_block_received(self, block_hash: Sha256Hash, ip: str, port: int) -> None:
+        """
+        Records the arrival of a block broadcast from a connected relay.
+        """
+        now = time.time()
+        block_arrival_times = self._block_arrival_times
+        first_arrival_time = block_arrival_times.get(block_hash)
+        if first_arrival_time is None:
+            block_arrival_times[block_hash] = now
+            if len(block_arrival_times) > gateway_constants.RELAY_QUALITY_MAX_TRACKED_BLOCKS:
+                block_arrival_times.popitem(last=False)
+            block_lag_ms = 0.0
+        else:
+            block_lag_ms = (now - first_arrival_time) * 1000
+
+        quality = self.qualities.get((ip, port))
+        if quality is not None:
+            quality.add_block_lag(block_lag_ms)
+
+    def on_probe_results(self, latencies: Dict[OutboundPeerModel, float]) -> None:
+        for relay, latency_ms in latencies.items():
+            key = _relay_key(relay)
+            quality = self.qualities.get(key)
+            if quality is None:
+                quality = RelayQuality(relay)
+                self.qualities[key] = quality
+            quality.add_latency(latency_ms)
+
+        if self.pending_switch is None:
+            self._evaluate_switch()
+
+    def _probe(self) -> float:
+        relays = self._candidates.union(self._node.peer_relays)
+        if relays:
+            self._node.requester.send_threaded_request(
+                network_latency.get_ping_latencies,
+                list(relays),
+                done_callback=self._on_probe_future
+            )
+        return self._node.opts.relay_probe_interval_s
+
+    def _on_probe_future(self, ping_latencies_future: Future) -> None:
+        try:
+            ping_latencies = ping_latencies_future.result()
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Failed to probe relays: {}", e)
+            return
+        self.on_probe_results({
+            latency_info.node: latency_info.latency for latency_info in ping_latencies
+        })
+
+    def _evaluate_switch(self) -> None:
+        active_keys = {_relay_key(relay) for relay in self._node.peer_relays}
+        active_qualities = [
+            self.qualities[key] for key in active_keys
+            if key in self.qualities and self.qualities[key].latency_ms is not None
+        ]
+        candidate_qualities = [
+            self.qualities[_relay_key(candidate)] for candidate in self._candidates
+            if _relay_key(candidate) not in active_keys and _relay_key(candidate) in self.qualities
+        ]
+        if not active_qualities or not candidate_qualities:
+            return
+
+        # block lag only tells connected relays apart, candidates are compared on ping-derived scores
+        worst_active = max(active_qualities, key=RelayQuality.connected_score)
+        best_candidate = min(candidate_qualities, key=RelayQuality.score)
+        threshold = worst_active.score() * (1 - self._node.opts.relay_switch_margin)
+        for candidate_quality in candidate_qualities:
+            if candidate_quality is best_candidate and candidate_quality.score() < threshold:
+                candidate_quality.better_probe_count += 1
+            else:
+                candidate_quality.better_probe_count = 0
+
+        if best_candidate.better_probe_count >= gateway_constants.RELAY_SWITCH_CONSECUTIVE_PROBES:
+            best_candidate.better_probe_count = 0
+            self._start_switch(best_candidate.relay, worst_active.relay)
+
+    def _start_switch(self, new_relay: OutboundPeerModel, old_relay: OutboundPeerModel) -> None:
+        logger.info(
+            "Switching from relay {} ({}) to better relay {} ({}).",
+            old_relay, self._format_quality(old_relay), new_relay, self._format_quality(new_relay)
+        )
+        if new_relay.node_type == NodeType.RELAY_TRANSACTION or new_relay.node_type == NodeType.RELAY_BLOCK:
+            new_relay.node_type = NodeType.RELAY
+        self.pending_switch = (new_relay, old_relay)
+        self._pending_switch_start_time = time.time()
+        self._node.peer_relays.add(new_relay)
+        self._node.on_updated_peers(self._node._get_all_peers())
+        self._node.alarm_queue.register_alarm(
+            gateway_constants.RELAY_SWITCH_CHECK_INTERVAL_S, self._check_pending_switch, alarm_name="switch_relay"
+        )
+
+    def _check_pending_switch(self) -> float:
+        pending_switch = self.pending_switch
+        if pending_switch is None:
+            return constants.CANCEL_ALARMS
+        new_relay, old_relay = pending_switch
+        node = self._node
+
+        if node.connection_pool.has_connection(new_relay.ip, new_relay.port) and \
+                node.connection_pool.get_by_ipport(new_relay.ip, new_relay.port).is_active():
+            logger.info("Connected to relay {}, disconnecting from relay {}.", new_relay, old_relay)
+            node.peer_relays.discard(old_relay)
+            node.requester.send_threaded_request(
+                sdn_http_service.submit_gateway_switching_relays_event, node.opts.node_id
+            )
+            self.switch_count += 1
+        elif time.time() - self._pending_switch_start_time > gateway_constants.RELAY_SWITCH_TIMEOUT_S:
+            logger.info("Could not connect to relay {}, keeping relay {}.", new_relay, old_relay)
+            node.peer_relays.discard(new_relay)
+        else:
+            return gateway_constants.RELAY_SWITCH_CHECK_INTERVAL_S
+
+        self.pending_switch = None
+        node.on_updated_peers(node._get_all_peers())
+        return constants.CANCEL_ALARMS
+
+    def _format_quality(self, relay: OutboundPeerModel) -> str:
+        quality = self.qualities[_relay_key(relay)]
+        return "latency: {:.1f}ms, jitter: {:.1f}ms, block lag: {:.1f}ms".format(
+            quality.latency_ms, quality.jitter_ms, quality.block_lag_ms
+        )
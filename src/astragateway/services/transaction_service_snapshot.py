@@ -0,0 +1,195 @@
+"""
+On-disk snapshots of the gateway transaction service, used to warm start the gateway after a restart.
+
+The snapshot is a flat little-endian binary file that is read back through `mmap`:
+
+    header: magic (4s), version (B), network number (I), creation time (d), entry count (I)
+    entry:  transaction hash (32s), short id count (H), contents length (I),
+            short id count * [short id (I), assign time (d)],
+            contents (contents length bytes)
+"""
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+from astracommon.utils import crypto
+from astracommon.utils.object_hash import Sha256Hash
+from astrautils import logging
+
+if TYPE_CHECKING:
+    # noinspection PyUnresolvedReferences
+    # pylint: disable=ungrouped-imports,cyclic-import
+    from astragateway.services.gateway_transaction_service import GatewayTransactionService
+
+logger = logging.get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"ATXS"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sBIdI")
+_ENTRY_HEADER = struct.Struct(f"<{crypto.SHA256_HASH_LEN}sHI")
+_SHORT_ID = struct.Struct("<Id")
+
+
+class TransactionServiceSnapshotError(Exception):
+    pass
+
+
+# transaction hash, short ids with their assign times, contents
+SnapshotEntry = Tuple[bytes, List[Tuple[int, float]], Union[bytearray, memoryview, bytes]]
+
+
+def save_snapshot(tx_service: "GatewayTransactionService", path: str) -> int:
+    """
+    Writes transaction hashes, contents, short ids and short id assign times to `path`.
+
+    :return: number of transactions written
+    """
+    return write_snapshot(collect_snapshot_entries(tx_service), tx_service.network_num, path)
+
+
+def collect_snapshot_entries(tx_service: "GatewayTransactionService") -> List[SnapshotEntry]:
+    """
+    Reads all snapshot entries through the public transaction service API at once. Must run on the event loop, the
+    entries can then be encoded and written by `write_snapshot` on another thread.
+    """
+    collection = SnapshotCollection(tx_service)
+    collection.collect(tx_service, len(collection.tx_hashes))
+    return collection.entries
+
+
+class SnapshotCollection:
+    """
+    Snapshot entries read from the transaction service in slices, so the event loop is not blocked for the whole
+    mempool.
+
+    Only the transaction hashes are listed up front. Transactions removed before their slice is read are skipped,
+    and transactions added after the listing are left for the next snapshot.
+    """
+    tx_hashes: List[Sha256Hash]
+    next_index: int
+    entries: List[SnapshotEntry]
+
+    def __init__(self, tx_service: "GatewayTransactionService") -> None:
+        self.tx_hashes = list(tx_service.iter_transaction_hashes())
+        self.next_index = 0
+        self.entries = []
+
+    def is_complete(self) -> bool:
+        return self.next_index >= len(self.tx_hashes)
+
+    def collect(self, tx_service: "GatewayTransactionService", max_count: int) -> bool:
+        """
+        Reads the entries of up to `max_count` more transactions. Must run on the event loop.
+
+        :return: whether all entries have been read
+        """
+        end_index = min(self.next_index + max_count, len(self.tx_hashes))
+        for tx_hash in self.tx_hashes[self.next_index:end_index]:
+            transaction_key = tx_service.get_transaction_key(tx_hash)
+            contents = tx_service.get_transaction_by_key(transaction_key)
+            if contents is None:
+                contents = b""
+            short_ids = [
+                (short_id, tx_service.get_short_id_assign_time(short_id))
+                for short_id in tx_service.get_short_ids_by_key(transaction_key)
+            ]
+            if not contents and not short_ids:
+                continue
+            self.entries.append((bytes(tx_hash.binary), short_ids, contents))
+        self.next_index = end_index
+        return self.is_complete()
+
+
+def write_snapshot(entries: List[SnapshotEntry], network_num: int, path: str) -> int:
+    """
+    Encodes and writes snapshot entries to `path`.
+
+    The snapshot is written to a uniquely named temporary file that replaces `path` once complete, so a crash
+    during the write never leaves a truncated snapshot behind.
+
+    :return: number of transactions written
+    """
+    snapshot_file = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path) or None, prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False
+    )
+    try:
+        with snapshot_file:
+            snapshot_file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, network_num, time.time(), len(entries)))
+            for tx_hash, short_ids, contents in entries:
+                snapshot_file.write(_ENTRY_HEADER.pack(tx_hash, len(short_ids), len(contents)))
+                for short_id, assign_time in short_ids:
+                    snapshot_file.write(_SHORT_ID.pack(short_id, assign_time))
+                snapshot_file.write(contents)
+        os.replace(snapshot_file.name, path)
+    except BaseException:
+        os.unlink(snapshot_file.name)
+        raise
+
+    logger.debug("Saved {} transactions to transaction service snapshot {}.", len(entries), path)
+    return len(entries)
+
+
+def load_snapshot(tx_service: "GatewayTransactionService", path: str, expiration_time_s: float) -> int:
+    """
+    Restores a snapshot written by `save_snapshot` into `tx_service`.
+
+    Short ids assigned more than `expiration_time_s` ago are dropped, as are transactions left
+    without short ids in a snapshot older than `expiration_time_s`. Restored short ids are
+    treated as freshly assigned by the transaction service.
+
+    :return: number of transactions restored
+    """
+    with open(path, "rb") as snapshot_file:
+        if os.fstat(snapshot_file.fileno()).st_size < _HEADER.size:
+            raise TransactionServiceSnapshotError("snapshot file is truncated")
+        with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _load_entries(tx_service, buffer, expiration_time_s)
+
+
+def _load_entries(tx_service: "GatewayTransactionService", buffer: mmap.mmap, expiration_time_s: float) -> int:
+    magic, version, network_num, created_at, entry_count = _HEADER.unpack_from(buffer, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise TransactionServiceSnapshotError(f"unsupported snapshot format {magic!r} v{version}")
+    if network_num != tx_service.network_num:
+        raise TransactionServiceSnapshotError(
+            f"snapshot is for network {network_num}, expected {tx_service.network_num}"
+        )
+
+    min_assign_time = time.time() - expiration_time_s
+    snapshot_expired = created_at < min_assign_time
+    buffer_length = len(buffer)
+    offset = _HEADER.size
+    restored_count = 0
+
+    for _ in range(entry_count):
+        tx_hash, short_id_count, contents_length = _ENTRY_HEADER.unpack_from(buffer, offset)
+        offset += _ENTRY_HEADER.size
+
+        short_ids: List[Tuple[int, float]] = []
+        for _ in range(short_id_count):
+            short_ids.append(_SHORT_ID.unpack_from(buffer, offset))
+            offset += _SHORT_ID.size
+
+        if offset + contents_length > buffer_length:
+            raise TransactionServiceSnapshotError("snapshot file is truncated")
+        contents_start = offset
+        offset += contents_length
+
+        live_short_ids = [short_id for short_id, assign_time in short_ids if assign_time >= min_assign_time]
+        if not live_short_ids and snapshot_expired:
+            continue
+
+        transaction_key = tx_service.get_transaction_key(Sha256Hash(bytearray(tx_hash)))
+        for short_id in live_short_ids:
+            tx_service.assign_short_id_by_key(transaction_key, short_id)
+        if contents_length:
+            tx_service.set_transaction_contents_by_key(
+                transaction_key, bytearray(buffer[contents_start:offset])
+            )
+        restored_count += 1
+
+    return restored_count
@@ -0,0 +1,3 @@
+from astragateway.testing.benchmarks import benchmark_runner
+
+benchmark_runner.main()
@@ -0,0 +1,189 @@
+"""
+Runs the gateway micro-benchmarks and compares the results against a previous run.
+
+Run with `python -m astragateway.testing.benchmarks`, e.g.:
+
+    python -m astragateway.testing.benchmarks --output baseline.json
+    python -m astragateway.testing.benchmarks --baseline baseline.json --threshold-pct 15
+
+The process exits with a non-zero status if any benchmark regressed past the threshold.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Any, List, Optional, NamedTuple
+
+DEFAULT_REPEAT = 5
+DEFAULT_REGRESSION_THRESHOLD_PCT = 10.0
+
+
+class BenchmarkCase(NamedTuple):
+    name: str
+    # builds the benchmark fixtures for the given number of iterations and returns the timed operation
+    setup: Callable[[int], Callable[[], Any]]
+    iterations: int
+    # items processed by a single call of the operation, e.g. transactions in a block
+    items_per_iteration: int = 1
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    items_per_iteration: int
+    min_us_per_item: float
+    median_us_per_item: float
+    mean_us_per_item: float
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline_us_per_item: float
+    current_us_per_item: float
+    change_pct: float
+
+
+def run_case(case: BenchmarkCase, repeat: int = DEFAULT_REPEAT) -> BenchmarkResult:
+    """
+    Times `repeat` runs of `case`, each on freshly built fixtures.
+
+    Garbage collection is disabled while the operation is timed so collections triggered by fixture
+    setup do not land on a random benchmark.
+    """
+    run_times_us = []
+    item_count = case.iterations * case.items_per_iteration
+    for _ in range(repeat):
+        operation = case.setup(case.iterations)
+        gc.collect()
+        gc.disable()
+        try:
+            start_time = time.perf_counter()
+            for _ in range(case.iterations):
+                operation()
+            run_times_us.append((time.perf_counter() - start_time) * 1000000 / item_count)
+        finally:
+            gc.enable()
+
+    return BenchmarkResult(
+        case.name,
+        case.iterations,
+        case.items_per_iteration,
+        min(run_times_us),
+        statistics.median(run_times_us),
+        statistics.mean(run_times_us),
+    )
+
+
+def run(cases: List[BenchmarkCase], repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    results = {}
+    for case in cases:
+        results[case.name] = asdict(run_case(case, repeat))
+    return {
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def find_regressions(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold_pct: float = DEFAULT_REGRESSION_THRESHOLD_PCT
+) -> List[Regression]:
+    """
+    Compares median times per item of `report` with `baseline`.
+
+    Benchmarks missing from either report are ignored.
+    """
+    regressions = []
+    baseline_results = baseline["results"]
+    for name, result in report["results"].items():
+        if name not in baseline_results:
+            continue
+        baseline_us = baseline_results[name]["median_us_per_item"]
+        current_us = result["median_us_per_item"]
+        if baseline_us <= 0:
+            continue
+        change_pct = (current_us - baseline_us) * 100 / baseline_us
+        if change_pct > threshold_pct:
+            regressions.append(Regression(name, baseline_us, current_us, change_pct))
+    return regressions
+
+
+def _select_cases(cases: List[BenchmarkCase], names: Optional[str]) -> List[BenchmarkCase]:
+    if not names:
+        return cases
+    prefixes = [name.strip() for name in names.split(",") if name.strip()]
+    return [case for case in cases if any(case.name.startswith(prefix) for prefix in prefixes)]
+
+
+def get_argument_parser() -> argparse.ArgumentParser:
+    arg_parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    arg_parser.add_argument(
+        "--benchmarks",
+        help="Comma separated benchmark name prefixes to run, e.g. eth_,tx_service_. Runs all if unset",
+        type=str,
+        default=None,
+    )
+    arg_parser.add_argument("--list", help="List available benchmarks and exit", action="store_true")
+    arg_parser.add_argument("--repeat", help="Number of timed runs per benchmark", type=int, default=DEFAULT_REPEAT)
+    arg_parser.add_argument(
+        "--use-extensions",
+        help="Run the benchmarks against the C++ extensions instead of the Python implementations",
+        action="store_true",
+    )
+    arg_parser.add_argument("--output", help="File to write the JSON report to", type=str, default=None)
+    arg_parser.add_argument("--baseline", help="JSON report of a previous run to compare with", type=str, default=None)
+    arg_parser.add_argument(
+        "--threshold-pct",
+        help="Maximum allowed slowdown of the median time per item compared to the baseline",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD_PCT,
+    )
+    return arg_parser
+
+
+def main() -> None:
+    # pylint: disable=import-outside-toplevel
+    from astragateway.testing.benchmarks import gateway_benchmarks
+
+    args = get_argument_parser().parse_args()
+    cases = _select_cases(gateway_benchmarks.get_benchmark_cases(args.use_extensions), args.benchmarks)
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return
+
+    report = run(cases, args.repeat)
+    report["use_extensions"] = args.use_extensions
+    report_json = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            output_file.write(report_json)
+    else:
+        print(report_json)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(report, baseline, args.threshold_pct)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name}: {regression.baseline_us_per_item:.3f}us -> "
+                f"{regression.current_us_per_item:.3f}us per item (+{regression.change_pct:.1f}%)",
+                file=sys.stderr
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compares the generational expiring containers with the astracommon per-key expiring containers.
+
+Run with `python -m astragateway.testing.benchmarks.expiring_containers_benchmark`.
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from typing import Dict, Any, Callable
+from unittest import mock
+
+from astracommon.utils.alarm_queue import AlarmQueue
+from astracommon.utils.expiring_dict import ExpiringDict
+from astracommon.utils.expiring_set import ExpiringSet
+from astragateway import gateway_constants
+from astragateway.utils.generational_expiring import GenerationalExpiringDict, GenerationalExpiringSet
+
+EXPIRATION_TIME_S = gateway_constants.MAX_BLOCK_CACHE_TIME_S
+DEFAULT_ENTRY_COUNT = 200000
+# number of clock steps entries are spread over, to simulate a steady insertion rate
+INSERTION_STEPS = 100
+
+CONTAINER_FACTORIES: Dict[str, Callable[[AlarmQueue], Any]] = {
+    "ExpiringDict": lambda alarm_queue: ExpiringDict(alarm_queue, EXPIRATION_TIME_S, "benchmark_dict"),
+    "GenerationalExpiringDict": lambda alarm_queue: GenerationalExpiringDict(
+        alarm_queue, EXPIRATION_TIME_S, "benchmark_generational_dict"
+    ),
+    "ExpiringSet": lambda alarm_queue: ExpiringSet(alarm_queue, EXPIRATION_TIME_S, "benchmark_set"),
+    "GenerationalExpiringSet": lambda alarm_queue: GenerationalExpiringSet(
+        alarm_queue, EXPIRATION_TIME_S, "benchmark_generational_set"
+    ),
+}
+
+
+def _run_container(name: str, entry_count: int) -> Dict[str, Any]:
+    keys = [os.urandom(32) for _ in range(entry_count)]
+    current_time = [time.time()]
+    step_s = EXPIRATION_TIME_S / INSERTION_STEPS
+    per_step = max(1, entry_count // INSERTION_STEPS)
+
+    with mock.patch("time.time", lambda: current_time[0]):
+        alarm_queue = AlarmQueue()
+        tracemalloc.start()
+        container = CONTAINER_FACTORIES[name](alarm_queue)
+        is_set = isinstance(container, (ExpiringSet, GenerationalExpiringSet))
+
+        insert_start = time.perf_counter()
+        for index, key in enumerate(keys):
+            if is_set:
+                container.add(key)
+            else:
+                container[key] = index
+            if index % per_step == per_step - 1:
+                current_time[0] += step_s
+                alarm_queue.fire_alarms()
+        insert_time_s = time.perf_counter() - insert_start
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        lookup_start = time.perf_counter()
+        for key in keys:
+            _ = key in container
+        lookup_time_s = time.perf_counter() - lookup_start
+
+        expire_start = time.perf_counter()
+        while len(container) > 0:
+            current_time[0] += step_s
+            alarm_queue.fire_alarms()
+        expire_time_s = time.perf_counter() - expire_start
+
+    return {
+        "container": name,
+        "entries": entry_count,
+        "insert_us_per_entry": insert_time_s * 1000000 / entry_count,
+        "lookup_us_per_entry": lookup_time_s * 1000000 / entry_count,
+        "expire_us_per_entry": expire_time_s * 1000000 / entry_count,
+        "peak_memory_bytes_per_entry": peak_memory / entry_count,
+    }
+
+
+def run(entry_count: int = DEFAULT_ENTRY_COUNT) -> Dict[str, Dict[str, Any]]:
+    return {name: _run_container(name, entry_count) for name in CONTAINER_FACTORIES}
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--entries", type=int, default=DEFAULT_ENTRY_COUNT)
+    args = arg_parser.parse_args()
+    print(json.dumps(run(args.entries), indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""
+Micro-benchmarks of the gateway protocol hot paths, run by `benchmark_runner`.
+
+Fixtures are synthetic blocks and mempools built from the `testing` mocks, so no network access
+or blockchain node is required.
+"""
+from typing import Callable, Any, List, Tuple, Iterator
+
+import blxr_rlp as rlp
+from mock import MagicMock
+
+from astracommon import constants
+from astracommon.messages.eth.serializers.block import Block
+from astracommon.messages.eth.serializers.transaction import Transaction
+from astracommon.test_utils import helpers
+from astracommon.test_utils.mocks.mock_connection import MockConnection
+from astracommon.test_utils.mocks.mock_socket_connection import MockSocketConnection
+from astracommon.utils import crypto
+from astracommon.utils.blockchain_utils.btc import btc_common_utils
+from astracommon.utils.blockchain_utils.eth import crypto_utils, eth_common_constants
+from astracommon.utils.blockchain_utils.ont.ont_object_hash import OntObjectHash
+from astracommon.utils.buffers.input_buffer import InputBuffer
+from astracommon.utils.expiring_dict import ExpiringDict
+from astracommon.utils.object_hash import Sha256Hash
+from astragateway import gateway_constants
+from astragateway.feed.eth.eth_block_feed_entry import EthBlockFeedEntry
+from astragateway.messages.btc import btc_message_converter_factory
+from astragateway.messages.btc.block_btc_message import BlockBtcMessage
+from astragateway.messages.eth import eth_message_converter_factory
+from astragateway.messages.eth.internal_eth_block_info import InternalEthBlockInfo
+from astragateway.messages.eth.protocol.new_block_eth_protocol_message import NewBlockEthProtocolMessage
+from astragateway.messages.ont import ont_message_converter_factory, ont_consensus_message_converter_factory
+from astragateway.messages.ont.block_ont_message import BlockOntMessage
+from astragateway.messages.ont.consensus_ont_message import OntConsensusMessage
+from astragateway.services.eth.eth_block_processing_service import EthBlockProcessingService
+from astragateway.services.eth.eth_block_queuing_service import EthBlockQueuingService
+from astragateway.testing import gateway_helpers
+from astragateway.testing.benchmarks.benchmark_runner import BenchmarkCase
+from astragateway.testing.mocks import mock_eth_messages, mock_btc_messages, mock_ont_messages
+from astragateway.testing.mocks.mock_btc_messages import RealBtcBlocks
+from astragateway.testing.mocks.mock_gateway_node import MockGatewayNode
+from astragateway.utils.eth import frame_utils
+from astragateway.utils.eth.framed_input_buffer import FramedInputBuffer
+from astragateway.utils.eth.rlpx_cipher import RLPxCipher
+
+ETH_BLOCK_TX_COUNT = 200
+ETH_FEED_BLOCK_TX_COUNT = 100
+ETH_FRAME_PAYLOAD_SIZE = 1024
+ETH_CHUNKED_MESSAGE_FRAME_COUNT = 8
+ETH_CHUNKED_MESSAGE_FRAME_SIZE = 8192
+ETH_QUEUED_BLOCKS_PER_ITERATION = 10
+TX_SERVICE_TXS_PER_ITERATION = 100
+TX_SERVICE_TX_SIZE = 250
+ONT_MAGIC = 12345
+ONT_VERSION = 23456
+ONT_CONSENSUS_BLOCK_TX_COUNT = 100
+# copies of the sample block transactions in a ~3MB block
+BTC_LARGE_BLOCK_SAMPLE_COPIES = 160
+
+
+def _build_node(use_extensions: bool) -> MockGatewayNode:
+    node = MockGatewayNode(
+        gateway_helpers.get_gateway_opts(8000, include_default_eth_args=True, use_extensions=use_extensions)
+    )
+    node.block_recovery_service = MagicMock()
+    return node
+
+
+def _next_of(items: List[Any], operation: Callable[[Any], Any]) -> Callable[[], Any]:
+    item_iterator: Iterator[Any] = iter(items)
+    return lambda: operation(next(item_iterator))
+
+
+def _eth_block(node: MockGatewayNode, nonce: int, tx_count: int) -> InternalEthBlockInfo:
+    """
+    Builds a block with `tx_count` transactions, every other one of which is known to the transaction service.
+    """
+    tx_service = node.get_tx_service()
+    transactions = []
+    for i in range(tx_count):
+        transaction = mock_eth_messages.get_dummy_transaction(nonce * tx_count + i + 1)
+        transactions.append(transaction)
+        if i % 2 == 0:
+            transaction_hash = transaction.hash()
+            tx_service.set_transaction_contents(transaction_hash, bytearray(rlp.encode(transaction, Transaction)))
+            tx_service.assign_short_id(transaction_hash, nonce * tx_count + i + 1)
+
+    block = Block(mock_eth_messages.get_dummy_block_header(nonce), transactions, [])
+    return InternalEthBlockInfo.from_new_block_msg(NewBlockEthProtocolMessage(None, block, nonce * 5 + 10))
+
+
+def _setup_eth_block_to_astra_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        node = _build_node(use_extensions)
+        converter = eth_message_converter_factory.create_eth_message_converter(node.opts)
+        block = _eth_block(node, 1, ETH_BLOCK_TX_COUNT)
+        tx_service = node.get_tx_service()
+        return lambda: converter.block_to_astra_block(block, tx_service, True, 0)
+    return setup
+
+
+def _setup_eth_astra_block_to_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        node = _build_node(use_extensions)
+        converter = eth_message_converter_factory.create_eth_message_converter(node.opts)
+        tx_service = node.get_tx_service()
+        astra_block, _ = converter.block_to_astra_block(_eth_block(node, 1, ETH_BLOCK_TX_COUNT), tx_service, True, 0)
+        return lambda: converter.astra_block_to_block(astra_block, tx_service)
+    return setup
+
+
+def _btc_fixtures(use_extensions: bool) -> Tuple[Any, Any, Any]:
+    node = _build_node(use_extensions)
+    block = mock_btc_messages.btc_block(real_block=RealBtcBlocks.BLOCK1)
+    converter = btc_message_converter_factory.create_btc_message_converter(block.magic(), node.opts)
+    tx_service = node.get_tx_service()
+    for short_id, transaction in enumerate(block.txns()[::2], 1):
+        transaction_hash = btc_common_utils.get_txid(transaction)
+        tx_service.set_transaction_contents(transaction_hash, transaction)
+        tx_service.assign_short_id(transaction_hash, short_id)
+    return converter, tx_service, block
+
+
+def _setup_btc_block_to_astra_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        converter, tx_service, block = _btc_fixtures(use_extensions)
+        return lambda: converter.block_to_astra_block(block, tx_service, True, 0)
+    return setup
+
+
+def _setup_btc_astra_block_to_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        converter, tx_service, block = _btc_fixtures(use_extensions)
+        astra_block, _ = converter.block_to_astra_block(block, tx_service, True, 0)
+        return lambda: converter.astra_block_to_block(astra_block, tx_service)
+    return setup
+
+
+def _btc_large_block() -> BlockBtcMessage:
+    sample_blocks = [
+        mock_btc_messages.btc_block(real_block=RealBtcBlocks.BLOCK1),
+        mock_btc_messages.btc_block(real_block=RealBtcBlocks.BLOCK_WITNESS_REJECT)
+    ]
+    txns = [tx for sample_block in sample_blocks for tx in sample_block.txns()] * BTC_LARGE_BLOCK_SAMPLE_COPIES
+    block = sample_blocks[0]
+    return BlockBtcMessage(
+        block.magic(),
+        block.version(),
+        block.prev_block_hash(),
+        block.merkle_root(),
+        block.timestamp(),
+        block.bits(),
+        block.nonce(),
+        txns
+    )
+
+
+def _setup_btc_large_block_index(iterations: int) -> Callable[[], Any]:
+    block_bytes = _btc_large_block().rawbytes()
+    blocks = [BlockBtcMessage(buf=bytearray(block_bytes)) for _ in range(iterations)]
+    return _next_of(blocks, lambda block: block.tx_hashes())
+
+
+def _setup_btc_large_block_to_astra_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(iterations: int) -> Callable[[], Any]:
+        node = _build_node(use_extensions)
+        block = _btc_large_block()
+        converter = btc_message_converter_factory.create_btc_message_converter(block.magic(), node.opts)
+        tx_service = node.get_tx_service()
+        sample_transactions = list(dict(zip(block.tx_hashes(), block.txns())).items())
+        for short_id, (transaction_hash, transaction) in enumerate(sample_transactions[::2], 1):
+            tx_service.set_transaction_contents(transaction_hash, transaction)
+            tx_service.assign_short_id(transaction_hash, short_id)
+
+        block_bytes = block.rawbytes()
+        blocks = [BlockBtcMessage(buf=bytearray(block_bytes)) for _ in range(iterations)]
+        return _next_of(blocks, lambda next_block: converter.block_to_astra_block(next_block, tx_service, True, 0))
+    return setup
+
+
+def _ont_block(txns: List[bytearray]) -> BlockOntMessage:
+    return BlockOntMessage(
+        ONT_MAGIC,
+        ONT_VERSION,
+        OntObjectHash(bytearray(crypto.bitcoin_hash(b"123")), length=crypto.SHA256_HASH_LEN),
+        OntObjectHash(bytearray(crypto.bitcoin_hash(b"345")), length=crypto.SHA256_HASH_LEN),
+        OntObjectHash(bytearray(crypto.bitcoin_hash(b"456")), length=crypto.SHA256_HASH_LEN),
+        1,
+        2,
+        3,
+        bytes(b"111"),
+        bytes(b"222"),
+        [bytes(33)] * 5,
+        [bytes(2)] * 3,
+        txns,
+        OntObjectHash(bytearray(crypto.bitcoin_hash(b"234")), length=crypto.SHA256_HASH_LEN),
+    )
+
+
+def _ont_fixtures(use_extensions: bool) -> Tuple[Any, Any, BlockOntMessage]:
+    node = _build_node(use_extensions)
+    converter = ont_message_converter_factory.create_ont_message_converter(ONT_MAGIC, node.opts)
+    return converter, node.get_tx_service(), _ont_block([])
+
+
+def _setup_ont_block_to_astra_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        converter, tx_service, block = _ont_fixtures(use_extensions)
+        return lambda: converter.block_to_astra_block(block, tx_service, True, 0)
+    return setup
+
+
+def _setup_ont_astra_block_to_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        converter, tx_service, block = _ont_fixtures(use_extensions)
+        astra_block, _ = converter.block_to_astra_block(block, tx_service, True, 0)
+        return lambda: converter.astra_block_to_block(astra_block, tx_service)
+    return setup
+
+
+def _ont_consensus_message() -> OntConsensusMessage:
+    txns = [mock_ont_messages.ont_transaction(nonce) for nonce in range(ONT_CONSENSUS_BLOCK_TX_COUNT)]
+    return mock_ont_messages.consensus_ont_message(_ont_block(txns))
+
+
+def _setup_ont_consensus_parse(iterations: int) -> Callable[[], Any]:
+    consensus_message = _ont_consensus_message().rawbytes()
+    messages = [OntConsensusMessage(buf=bytearray(consensus_message)) for _ in range(iterations)]
+    return _next_of(messages, lambda message: message.parse_message())
+
+
+def _setup_ont_consensus_block_to_astra_block(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        node = _build_node(use_extensions)
+        converter = ont_consensus_message_converter_factory.create_ont_consensus_message_converter(
+            ONT_MAGIC, node.opts
+        )
+        tx_service = node.get_tx_service()
+        consensus_message = _ont_consensus_message()
+        for short_id, (tx, tx_hash) in enumerate(
+            zip(consensus_message.txns()[::2], consensus_message.tx_hashes()[::2]), 1
+        ):
+            tx_service.set_transaction_contents(tx_hash, tx)
+            tx_service.assign_short_id(tx_hash, short_id)
+        return lambda: converter.block_to_astra_block(consensus_message, tx_service, True, 0)
+    return setup
+
+
+def _rlpx_ciphers() -> Tuple[RLPxCipher, RLPxCipher]:
+    private_key_1 = crypto_utils.make_private_key(helpers.generate_bytearray(111))
+    private_key_2 = crypto_utils.make_private_key(helpers.generate_bytearray(111))
+    cipher_1 = RLPxCipher(True, private_key_1, crypto_utils.private_to_public_key(private_key_2))
+    cipher_2 = RLPxCipher(False, private_key_2, crypto_utils.private_to_public_key(private_key_1))
+
+    auth_message, _ = cipher_2.decrypt_auth_message(cipher_1.encrypt_auth_message(cipher_1.create_auth_message()))
+    cipher_2.parse_auth_message(auth_message)
+    cipher_1.decrypt_auth_ack_message(cipher_2.encrypt_auth_ack_message(cipher_2.create_auth_ack_message()))
+    cipher_1.setup_cipher()
+    cipher_2.setup_cipher()
+    return cipher_1, cipher_2
+
+
+def _setup_rlpx_encrypt_frame(_iterations: int) -> Callable[[], Any]:
+    cipher, _ = _rlpx_ciphers()
+    frame = frame_utils.get_frames(1, memoryview(helpers.generate_bytearray(ETH_FRAME_PAYLOAD_SIZE)))[0]
+    return lambda: cipher.encrypt_frame(frame)
+
+
+def _setup_rlpx_decrypt_frame(iterations: int) -> Callable[[], Any]:
+    encrypting_cipher, cipher = _rlpx_ciphers()
+    frame = frame_utils.get_frames(1, memoryview(helpers.generate_bytearray(ETH_FRAME_PAYLOAD_SIZE)))[0]
+    encrypted_frames = [bytes(encrypting_cipher.encrypt_frame(frame)) for _ in range(iterations)]
+
+    def decrypt_frame(encrypted_frame: bytes) -> Any:
+        header = cipher.decrypt_frame_header(encrypted_frame[:eth_common_constants.FRAME_HDR_TOTAL_LEN])
+        body_size = frame_utils.parse_frame_header(header)[0]
+        return cipher.decrypt_frame_body(encrypted_frame[eth_common_constants.FRAME_HDR_TOTAL_LEN:], body_size)
+
+    return _next_of(encrypted_frames, decrypt_frame)
+
+
+def _setup_framed_input_buffer(iterations: int) -> Callable[[], Any]:
+    encrypting_cipher, cipher = _rlpx_ciphers()
+    payload = memoryview(
+        helpers.generate_bytearray(ETH_CHUNKED_MESSAGE_FRAME_SIZE * (ETH_CHUNKED_MESSAGE_FRAME_COUNT - 1))
+    )
+    messages = []
+    for _ in range(iterations):
+        message = bytearray()
+        for frame in frame_utils.get_frames(10, payload, 0, ETH_CHUNKED_MESSAGE_FRAME_SIZE):
+            message.extend(encrypting_cipher.encrypt_frame(frame))
+        messages.append(message)
+
+    framed_input_buffer = FramedInputBuffer(cipher)
+    input_buffer = InputBuffer()
+
+    def parse_message(message: bytearray) -> Any:
+        input_buffer.add_bytes(message)
+        is_full_message, _ = framed_input_buffer.peek_message(input_buffer)
+        while not is_full_message:
+            is_full_message, _ = framed_input_buffer.peek_message(input_buffer)
+        return framed_input_buffer.get_full_message()
+
+    return _next_of(messages, parse_message)
+
+
+def _setup_eth_block_queuing_push_pop(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(iterations: int) -> Callable[[], Any]:
+        node = _build_node(use_extensions)
+        node.block_parts_storage = ExpiringDict(
+            node.alarm_queue, gateway_constants.MAX_BLOCK_CACHE_TIME_S, "eth_block_queue_parts"
+        )
+        node.set_known_total_difficulty = MagicMock()
+        node.block_processing_service = EthBlockProcessingService(node)
+        connection = MockConnection(
+            MockSocketConnection(1, node, ip_address=constants.LOCALHOST, port=8002), node
+        )
+        connection.is_active = MagicMock(return_value=True)
+        connection.enqueue_msg = MagicMock()
+        block_queuing_service = EthBlockQueuingService(node, connection)
+
+        batches = []
+        prev_block_hash = None
+        for iteration in range(iterations):
+            batch = []
+            for i in range(ETH_QUEUED_BLOCKS_PER_ITERATION):
+                block_number = iteration * ETH_QUEUED_BLOCKS_PER_ITERATION + i + 1
+                block = InternalEthBlockInfo.from_new_block_msg(
+                    mock_eth_messages.new_block_eth_protocol_message(block_number, block_number, prev_block_hash)
+                )
+                prev_block_hash = block.block_hash()
+                batch.append((prev_block_hash, block))
+            batches.append(batch)
+
+        def push_pop(batch: List[Tuple[Sha256Hash, InternalEthBlockInfo]]) -> None:
+            for block_hash, block in batch:
+                block_queuing_service.push(block_hash, block)
+            for block_hash, _ in batch:
+                block_queuing_service.remove_from_queue(block_hash)
+
+        return _next_of(batches, push_pop)
+    return setup
+
+
+def _setup_tx_service_add_remove(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(iterations: int) -> Callable[[], Any]:
+        tx_service = _build_node(use_extensions).get_tx_service()
+        contents = helpers.generate_bytearray(TX_SERVICE_TX_SIZE)
+        batches = [
+            [
+                Sha256Hash(helpers.generate_bytearray(crypto.SHA256_HASH_LEN))
+                for _ in range(TX_SERVICE_TXS_PER_ITERATION)
+            ]
+            for _ in range(iterations)
+        ]
+        short_ids = iter(range(1, iterations * TX_SERVICE_TXS_PER_ITERATION + 1))
+
+        def add_remove(transaction_hashes: List[Sha256Hash]) -> None:
+            for transaction_hash in transaction_hashes:
+                tx_service.set_transaction_contents(transaction_hash, contents)
+                tx_service.assign_short_id(transaction_hash, next(short_ids))
+            tx_service.remove_transactions_by_tx_hashes(transaction_hashes)
+
+        return _next_of(batches, add_remove)
+    return setup
+
+
+def _setup_eth_block_feed_serialization(use_extensions: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(_iterations: int) -> Callable[[], Any]:
+        block = _eth_block(_build_node(use_extensions), 1, ETH_FEED_BLOCK_TX_COUNT)
+        block_hash = block.block_hash()
+        return lambda: EthBlockFeedEntry(block_hash, block)
+    return setup
+
+
+def get_benchmark_cases(use_extensions: bool = False) -> List[BenchmarkCase]:
+    return [
+        BenchmarkCase(
+            "eth_block_to_astra_block", _setup_eth_block_to_astra_block(use_extensions), 50, ETH_BLOCK_TX_COUNT
+        ),
+        BenchmarkCase(
+            "eth_astra_block_to_block", _setup_eth_astra_block_to_block(use_extensions), 50, ETH_BLOCK_TX_COUNT
+        ),
+        BenchmarkCase("btc_block_to_astra_block", _setup_btc_block_to_astra_block(use_extensions), 200),
+        BenchmarkCase("btc_astra_block_to_block", _setup_btc_astra_block_to_block(use_extensions), 200),
+        BenchmarkCase("btc_large_block_index", _setup_btc_large_block_index, 10),
+        BenchmarkCase(
+            "btc_large_block_to_astra_block", _setup_btc_large_block_to_astra_block(use_extensions), 10
+        ),
+        BenchmarkCase("ont_block_to_astra_block", _setup_ont_block_to_astra_block(use_extensions), 1000),
+        BenchmarkCase("ont_astra_block_to_block", _setup_ont_astra_block_to_block(use_extensions), 1000),
+        BenchmarkCase("ont_consensus_parse", _setup_ont_consensus_parse, 200, ONT_CONSENSUS_BLOCK_TX_COUNT),
+        BenchmarkCase(
+            "ont_consensus_block_to_astra_block",
+            _setup_ont_consensus_block_to_astra_block(use_extensions),
+            200,
+            ONT_CONSENSUS_BLOCK_TX_COUNT
+        ),
+        BenchmarkCase("eth_rlpx_encrypt_frame", _setup_rlpx_encrypt_frame, 2000),
+        BenchmarkCase("eth_rlpx_decrypt_frame", _setup_rlpx_decrypt_frame, 2000),
+        BenchmarkCase(
+            "eth_framed_input_buffer_parse", _setup_framed_input_buffer, 200, ETH_CHUNKED_MESSAGE_FRAME_COUNT
+        ),
+        BenchmarkCase(
+            "eth_block_queuing_push_pop",
+            _setup_eth_block_queuing_push_pop(use_extensions),
+            50,
+            ETH_QUEUED_BLOCKS_PER_ITERATION
+        ),
+        BenchmarkCase(
+            "tx_service_add_remove",
+            _setup_tx_service_add_remove(use_extensions),
+            100,
+            TX_SERVICE_TXS_PER_ITERATION
+        ),
+        BenchmarkCase(
+            "eth_block_feed_serialization",
+            _setup_eth_block_feed_serialization(use_extensions),
+            100,
+            ETH_FEED_BLOCK_TX_COUNT
+        ),
+    ]
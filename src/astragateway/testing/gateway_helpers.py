@@ -149,12 +149,30 @@ def get_gateway_opts(
             "enable_network_content_logs": False,
             "enable_node_cache": True,
             "dump_short_id_mapping_compression_path": "",
+            "tx_service_snapshot_file": None,
+            "tx_service_snapshot_interval_s": 0,
+            "capture_traffic_file": None,
+            "block_trace_file": None,
+            "block_trace_capacity": 64 * 1024,
+            "block_compression_threads": 0,
+            "block_encryption_threads": 0,
+            "relay_probe_interval_s": 0,
+            "relay_switch_margin": 0.2,
+            "stat_event_sampling_rates": {},
+            "enable_stats_sketches": False,
+            "enable_latency_histograms": True,
+            "event_loop_lag_sample_interval_s": 0,
+            "event_loop_slow_callback_threshold_s": 0.005,
+            "profiler_dir": None,
             "ws": ws,
             "ws_host": constants.LOCALHOST,
             "ws_port": 28333,
             "account_id": account_id,
             "ipc": False,
             "ipc_file": "astragateway.ipc",
+            "feed_worker": False,
+            "feed_worker_ws_port": 28335,
+            "feed_worker_ipc_file": "astragateway_feed_worker.ipc",
             "request_remote_transaction_streaming": request_remote_transaction_streaming,
             "process_node_txs_in_extension": True,
             "enable_eth_extensions": True,   # TODO remove,
@@ -0,0 +1,70 @@
+import base64
+import json
+import struct
+from typing import Union
+
+from astracommon import constants
+from astracommon.test_utils import helpers
+from astracommon.utils import crypto
+from astragateway import ont_constants
+from astragateway.messages.ont.block_ont_message import BlockOntMessage
+from astragateway.messages.ont.consensus_ont_message import OntConsensusMessage
+from astragateway.messages.ont.ont_messages_util import pack_int_to_ont_varint
+
+ONT_TX_PAYER_LEN = 20
+
+
+def ont_transaction(nonce: int, code_size: int = 100) -> bytearray:
+    """
+    Builds a signed invoke transaction with a `code_size` byte contract invocation.
+    """
+    tx = bytearray(2 + ont_constants.ONT_INT_LEN + 2 * ont_constants.ONT_LONG_LONG_LEN + ONT_TX_PAYER_LEN)
+    struct.pack_into("<BBIQQ", tx, 0, 0, ont_constants.ONT_TX_INVOKE_TYPE_INDICATOR, nonce, 500, 20000)
+    tx += _varbytes(helpers.generate_bytearray(code_size))
+    # no attributes, one signature
+    tx += b"\x00\x01"
+    tx += _varbytes(bytes(67))
+    tx += _varbytes(bytes(35))
+    return tx
+
+
+def consensus_ont_message(
+    block: BlockOntMessage,
+    payload_tail: bytes = bytes(8),
+    owner_and_signature: bytes = bytes(66),
+    indent: bool = False
+) -> OntConsensusMessage:
+    """
+    Builds a block proposal consensus message for `block`.
+
+    :param indent: whether to pretty print the consensus data JSON, as opposed to the compact encoding of the
+                   Ontology nodes
+    """
+    block_start = block.rawbytes()[ont_constants.ONT_HDR_COMMON_OFF:]
+    payload = bytearray(ont_constants.ONT_VARINT_MAX_LEN)
+    off = pack_int_to_ont_varint(len(block_start), payload, 0)
+    payload = payload[:off] + block_start + payload_tail
+
+    consensus_data = json.dumps(
+        {
+            "type": ont_constants.BLOCK_PROPOSAL_CONSENSUS_MESSAGE_TYPE,
+            "len": len(payload),
+            "payload": base64.b64encode(bytes(payload)).decode(constants.DEFAULT_TEXT_ENCODING),
+        },
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":")
+    ).encode(constants.DEFAULT_TEXT_ENCODING)
+
+    header_len = ont_constants.ONT_HASH_LEN + 2 * ont_constants.ONT_INT_LEN + ont_constants.ONT_SHORT_LEN
+    consensus_payload = bytearray(header_len + ont_constants.ONT_VARINT_MAX_LEN)
+    consensus_payload[:ont_constants.ONT_HASH_LEN] = crypto.double_sha256(block_start)
+    off = header_len + pack_int_to_ont_varint(len(consensus_data), consensus_payload, header_len)
+    consensus_payload = consensus_payload[:off] + consensus_data + owner_and_signature
+
+    return OntConsensusMessage(block.magic(), block.version(), bytes(consensus_payload))
+
+
+def _varbytes(value: Union[bytes, bytearray]) -> bytearray:
+    buf = bytearray(ont_constants.ONT_VARINT_MAX_LEN)
+    off = pack_int_to_ont_varint(len(value), buf, 0)
+    return buf[:off] + value
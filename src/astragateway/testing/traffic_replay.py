@@ -0,0 +1,202 @@
+"""
+Replays traffic captured with `--capture-traffic-file` through a gateway built on mock connections,
+and reports how long the gateway took to process it.
+
+Run with `python -m astragateway.testing.traffic_replay <capture file> [--speed N]`. A speed of 1 replays
+messages at their captured pace, higher values replay proportionally faster and 0 replays as fast as possible.
+"""
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Callable
+
+from astracommon.connections.abstract_connection import AbstractConnection
+from astracommon.messages.abstract_block_message import AbstractBlockMessage
+from astracommon.messages.abstract_message import AbstractMessage
+from astracommon.messages.astra.tx_message import TxMessage
+from astracommon.models.blockchain_protocol import BlockchainProtocol
+from astragateway.connections import gateway_node_factory
+from astragateway.gateway_opts import GatewayOpts
+from astragateway.messages.eth.protocol.new_block_eth_protocol_message import NewBlockEthProtocolMessage
+from astragateway.testing import gateway_helpers
+from astragateway.testing.mocks import full_gateway_node
+from astragateway.utils import traffic_capture
+from astragateway.utils.traffic_capture import CapturedMessage, TrafficSource
+from astrautils import logging
+
+logger = logging.get_logger(__name__)
+
+
+def _summarize(samples_s: List[float]) -> Dict[str, Any]:
+    if not samples_s:
+        return {"count": 0}
+    samples_s = sorted(samples_s)
+    count = len(samples_s)
+    return {
+        "count": count,
+        "mean_us": sum(samples_s) * 1000000 / count,
+        "p50_us": samples_s[count // 2] * 1000000,
+        "p99_us": samples_s[min(count - 1, int(count * 0.99))] * 1000000,
+        "max_us": samples_s[-1] * 1000000,
+    }
+
+
+def _message_type_name(message_type: traffic_capture.MessageType) -> str:
+    if isinstance(message_type, bytes):
+        return message_type.rstrip(b"\x00").decode("utf-8", errors="replace")
+    return str(message_type)
+
+
+def get_replay_gateway_opts(blockchain_protocol: str) -> GatewayOpts:
+    is_ethereum = blockchain_protocol == BlockchainProtocol.ETHEREUM.value
+    is_ontology = blockchain_protocol == BlockchainProtocol.ONTOLOGY.value
+    return gateway_helpers.get_gateway_opts(
+        8000,
+        sync_tx_service=False,
+        include_default_btc_args=not is_ethereum and not is_ontology,
+        include_default_eth_args=is_ethereum,
+        include_default_ont_args=is_ontology,
+        blockchain_protocol=blockchain_protocol,
+    )
+
+
+class TrafficReplay:
+    """
+    Feeds captured messages into the handlers of a gateway's blockchain node and relay connections.
+
+    Measured per message type is the time spent in the connection's message handler. Blocks sent to the
+    blockchain node and transactions sent to the relay are timed from the receipt of the most recent relay
+    or blockchain node message respectively, which for blocks held by the block queuing service includes
+    the hold time. Event loop lag is how late each message was dispatched compared to its captured pace.
+    """
+    speed: float
+    blockchain_connection: AbstractConnection
+    relay_connection: AbstractConnection
+
+    def __init__(self, blockchain_protocol: str, speed: float = 1, opts: Optional[GatewayOpts] = None) -> None:
+        if opts is None:
+            opts = get_replay_gateway_opts(blockchain_protocol)
+        gateway_info = full_gateway_node.of_type(gateway_node_factory.get_gateway_node_type(blockchain_protocol), opts)
+        self.gateway = gateway_info.gateway
+        self.gateway.opts.has_fully_updated_tx_service = True
+        self.blockchain_connection = gateway_info.blockchain_connection
+        self.relay_connection = gateway_info.relay_connection
+        self.speed = speed
+
+        self._handling_times: Dict[str, List[float]] = defaultdict(list)
+        self._failures: Dict[str, int] = defaultdict(int)
+        self._block_to_node_times: List[float] = []
+        self._tx_to_relay_times: List[float] = []
+        self._event_loop_lags: List[float] = []
+        self._last_relay_message_time: Optional[float] = None
+        self._last_node_message_time: Optional[float] = None
+
+        self.blockchain_connection.enqueue_msg = self._timed_enqueue(
+            self.blockchain_connection.enqueue_msg, self._on_message_to_node
+        )
+        self.relay_connection.enqueue_msg = self._timed_enqueue(
+            self.relay_connection.enqueue_msg, self._on_message_to_relay
+        )
+
+    def replay(self, messages: List[CapturedMessage]) -> Dict[str, Any]:
+        if not messages:
+            return self.report(0, 0)
+
+        first_timestamp = messages[0].timestamp
+        start_time = time.time()
+        for message in messages:
+            if self.speed > 0:
+                scheduled_time = start_time + (message.timestamp - first_timestamp) / self.speed
+                delay = scheduled_time - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                self._event_loop_lags.append(max(0.0, time.time() - scheduled_time))
+            self._dispatch(message)
+            self.gateway.alarm_queue.fire_alarms()
+            for connection in (self.blockchain_connection, self.relay_connection):
+                if connection.outputbuf.length:
+                    connection.advance_sent_bytes(connection.outputbuf.length)
+
+        return self.report(len(messages), time.time() - start_time)
+
+    def report(self, message_count: int, duration_s: float) -> Dict[str, Any]:
+        return {
+            "messages": message_count,
+            "duration_s": duration_s,
+            "messages_per_s": message_count / duration_s if duration_s > 0 else None,
+            "processing": {
+                message_type: _summarize(handling_times)
+                for message_type, handling_times in self._handling_times.items()
+            },
+            "failures": dict(self._failures),
+            "block_to_node": _summarize(self._block_to_node_times),
+            "tx_to_relay": _summarize(self._tx_to_relay_times),
+            "event_loop_lag": _summarize(self._event_loop_lags),
+        }
+
+    def _dispatch(self, captured_message: CapturedMessage) -> None:
+        if captured_message.source == TrafficSource.RELAY:
+            connection = self.relay_connection
+        else:
+            connection = self.blockchain_connection
+        message_type_name = _message_type_name(captured_message.message_type)
+
+        handler = connection.message_handlers.get(captured_message.message_type)
+        if handler is None:
+            self._failures[message_type_name] += 1
+            return
+
+        start_time = time.time()
+        if captured_message.source == TrafficSource.RELAY:
+            self._last_relay_message_time = start_time
+        else:
+            self._last_node_message_time = start_time
+        try:
+            message = connection.message_factory.create_message(
+                captured_message.message_type, bytearray(captured_message.message_bytes)
+            )
+            handler(message)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Failed to replay {} message: {}", message_type_name, e)
+            self._failures[message_type_name] += 1
+            return
+        self._handling_times[message_type_name].append(time.time() - start_time)
+
+    def _timed_enqueue(
+        self, enqueue_msg: Callable[..., Any], on_message: Callable[[AbstractMessage], None]
+    ) -> Callable[..., Any]:
+        def timed_enqueue_msg(msg, *args, **kwargs):
+            on_message(msg)
+            return enqueue_msg(msg, *args, **kwargs)
+        return timed_enqueue_msg
+
+    def _on_message_to_node(self, msg: AbstractMessage) -> None:
+        if (
+            isinstance(msg, (AbstractBlockMessage, NewBlockEthProtocolMessage))
+            and self._last_relay_message_time is not None
+        ):
+            self._block_to_node_times.append(time.time() - self._last_relay_message_time)
+
+    def _on_message_to_relay(self, msg: AbstractMessage) -> None:
+        if isinstance(msg, TxMessage) and self._last_node_message_time is not None:
+            self._tx_to_relay_times.append(time.time() - self._last_node_message_time)
+
+
+def replay_capture(path: str, speed: float = 1) -> Dict[str, Any]:
+    with open(path, "rb") as capture_file:
+        blockchain_protocol = traffic_capture.read_capture_protocol(capture_file)
+        messages = list(traffic_capture.iter_captured_messages(capture_file))
+    return TrafficReplay(blockchain_protocol, speed).replay(messages)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("capture_file", help="File written by a gateway run with --capture-traffic-file")
+    arg_parser.add_argument("--speed", help="Replay speed multiplier, 0 for as fast as possible", type=float, default=1)
+    args = arg_parser.parse_args()
+    print(json.dumps(replay_capture(args.capture_file, args.speed), indent=4))
+
+
+if __name__ == "__main__":
+    main()
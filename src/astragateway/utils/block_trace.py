@@ -0,0 +1,164 @@
+"""
+Binary trace of block lifecycle stages, for per-block timelines with `astra_cli/block_trace_report.py`.
+
+The trace file is a ring of fixed size records that is preallocated and memory mapped, so recording a stage
+is a struct pack into the mapping, with no formatting and no system call. Once the ring is full, the oldest
+records are overwritten. All fields are little-endian:
+
+    header: magic (4s), version (B), padding (x), record size (H), capacity (I)
+    record: sequence (Q), timestamp (d), stage (B), padding (3x), value (I), block hash (32s), cipher hash (32s)
+
+Sequence numbers start at 1, so zeroed records are unused slots. Hashes that are unknown at a stage are
+stored as zeros. Stages of encrypted blocks that are only known by their cipher hash are matched to the
+block by records that store both hashes.
+"""
+import mmap
+import struct
+import time
+from enum import IntEnum
+from typing import Optional, List, NamedTuple, Union
+
+from astracommon.utils.object_hash import Sha256Hash
+from astrautils import logging
+
+logger = logging.get_logger(__name__)
+
+TRACE_MAGIC = b"ABTR"
+TRACE_VERSION = 1
+HASH_SIZE = 32
+
+_HEADER = struct.Struct("<4sBxHI")
+_RECORD_FIELDS = struct.Struct("<QdB3xI")
+RECORD_SIZE = _RECORD_FIELDS.size + 2 * HASH_SIZE
+_EMPTY_HASH = bytes(HASH_SIZE)
+
+
+class BlockTraceStage(IntEnum):
+    RECEIVED_FROM_NODE = 1
+    COMPRESSED = 2
+    ENCRYPTED = 3
+    BROADCAST = 4
+    KEY_SENT = 5
+    RECEIVED_FROM_BDN = 6
+    DECOMPRESSED = 7
+    QUEUED = 8
+    SENT_TO_NODE = 9
+
+
+class BlockTraceRecord(NamedTuple):
+    sequence: int
+    timestamp: float
+    stage: Union[BlockTraceStage, int]
+    value: int
+    block_hash: Optional[bytes]
+    cipher_hash: Optional[bytes]
+
+
+class BlockTraceError(Exception):
+    pass
+
+
+class BlockTrace:
+    """
+    Records block stages to the trace file, if one has been opened. `value` is a stage specific number,
+    such as a size in bytes or a peer count.
+    """
+    path: Optional[str]
+    capacity: int
+    sequence: int
+    _buffer: Optional[mmap.mmap]
+
+    def __init__(self) -> None:
+        self.path = None
+        self.capacity = 0
+        self.sequence = 0
+        self._buffer = None
+
+    def is_open(self) -> bool:
+        return self._buffer is not None
+
+    def open(self, path: str, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError(f"Block trace capacity must be positive, not {capacity}.")
+        self.close()
+        with open(path, "w+b") as trace_file:
+            trace_file.truncate(_HEADER.size + capacity * RECORD_SIZE)
+            buffer = mmap.mmap(trace_file.fileno(), 0)
+        _HEADER.pack_into(buffer, 0, TRACE_MAGIC, TRACE_VERSION, RECORD_SIZE, capacity)
+        self.path = path
+        self.capacity = capacity
+        self.sequence = 0
+        self._buffer = buffer
+        logger.info("Tracing block stages to {} ({} records).", path, capacity)
+
+    def record(
+        self,
+        stage: BlockTraceStage,
+        block_hash: Optional[Sha256Hash] = None,
+        cipher_hash: Optional[Sha256Hash] = None,
+        value: int = 0
+    ) -> None:
+        buffer = self._buffer
+        if buffer is None:
+            return
+        sequence = self.sequence + 1
+        self.sequence = sequence
+        offset = _HEADER.size + (sequence % self.capacity) * RECORD_SIZE
+        _RECORD_FIELDS.pack_into(buffer, offset, sequence, time.time(), stage, value & 0xffffffff)
+        offset += _RECORD_FIELDS.size
+        buffer[offset:offset + HASH_SIZE] = _EMPTY_HASH if block_hash is None else block_hash.binary
+        offset += HASH_SIZE
+        buffer[offset:offset + HASH_SIZE] = _EMPTY_HASH if cipher_hash is None else cipher_hash.binary
+
+    def close(self) -> None:
+        buffer = self._buffer
+        if buffer is not None:
+            self._buffer = None
+            buffer.close()
+            logger.info("Traced {} block stages to {}.", self.sequence, self.path)
+
+
+def _optional_hash(hash_bytes: bytes) -> Optional[bytes]:
+    return None if hash_bytes == _EMPTY_HASH else hash_bytes
+
+
+def _stage(stage: int) -> Union[BlockTraceStage, int]:
+    try:
+        return BlockTraceStage(stage)
+    except ValueError:
+        return stage
+
+
+def read_block_trace(path: str) -> List[BlockTraceRecord]:
+    """
+    Reads the records of a trace file in the order they were recorded.
+    """
+    with open(path, "rb") as trace_file:
+        contents = trace_file.read()
+    if len(contents) < _HEADER.size:
+        raise BlockTraceError("block trace file is truncated")
+    magic, version, record_size, capacity = _HEADER.unpack_from(contents, 0)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION or record_size != RECORD_SIZE:
+        raise BlockTraceError(f"unsupported block trace format {magic!r} v{version}")
+    if len(contents) < _HEADER.size + capacity * RECORD_SIZE:
+        raise BlockTraceError("block trace file is truncated")
+
+    records = []
+    for offset in range(_HEADER.size, _HEADER.size + capacity * RECORD_SIZE, RECORD_SIZE):
+        sequence, timestamp, stage, value = _RECORD_FIELDS.unpack_from(contents, offset)
+        if sequence == 0:
+            continue
+        hash_offset = offset + _RECORD_FIELDS.size
+        records.append(BlockTraceRecord(
+            sequence,
+            timestamp,
+            _stage(stage),
+            value,
+            _optional_hash(contents[hash_offset:hash_offset + HASH_SIZE]),
+            _optional_hash(contents[hash_offset + HASH_SIZE:hash_offset + 2 * HASH_SIZE]),
+        ))
+    records.sort(key=lambda record: record.sequence)
+    return records
+
+
+block_trace = BlockTrace()
@@ -0,0 +1,219 @@
+from collections import deque
+from typing import Generic, TypeVar, Deque, Set, Dict, Optional, Iterator, Callable
+
+from astracommon.utils.alarm_queue import AlarmQueue, AlarmId
+from astragateway import gateway_constants
+from astrautils import logging
+
+logger = logging.get_logger(__name__)
+
+KT = TypeVar("KT")
+VT = TypeVar("VT")
+
+
+class _GenerationalExpiry(Generic[KT]):
+    """
+    Tracks key expiration in whole generations instead of per key timestamps.
+
+    Keys are placed into the newest bucket on insertion. Every `expiration_time_s / generations`
+    seconds a new bucket is started, and the oldest bucket is dropped once it is older than the
+    expiration time. Keys therefore live between `expiration_time_s` and
+    `expiration_time_s + expiration_time_s / generations` seconds, and no timestamp is stored per key.
+    Like `ExpiringDict`, updating an existing key does not extend its lifetime.
+
+    The rotation alarm is only registered while there are tracked keys.
+    """
+    name: str
+    _alarm_queue: AlarmQueue
+    _generations: int
+    _rotation_interval_s: float
+    _buckets: Deque[Set[KT]]
+    _rotation_alarm_id: Optional[AlarmId]
+
+    def __init__(
+        self,
+        alarm_queue: AlarmQueue,
+        expiration_time_s: float,
+        name: str,
+        generations: int = gateway_constants.EXPIRY_GENERATIONS_COUNT
+    ) -> None:
+        if generations < 1:
+            raise ValueError(f"Generational container {name} needs at least one generation, got {generations}.")
+
+        self.name = name
+        self._alarm_queue = alarm_queue
+        self._generations = generations
+        self._rotation_interval_s = expiration_time_s / generations
+        self._buckets = deque([set()])
+        self._rotation_alarm_id = None
+
+    def cleanup(self) -> None:
+        """
+        Forces a generation rotation, expiring the oldest bucket if it is due.
+        """
+        self._rotate()
+
+    def _track(self, key: KT) -> None:
+        self._buckets[-1].add(key)
+        if self._rotation_alarm_id is None:
+            self._rotation_alarm_id = self._alarm_queue.register_alarm(
+                self._rotation_interval_s, self._on_rotation_alarm
+            )
+
+    def _untrack(self, key: KT) -> None:
+        for bucket in self._buckets:
+            if key in bucket:
+                bucket.discard(key)
+                return
+
+    def _on_rotation_alarm(self) -> float:
+        self._rotate()
+        if any(self._buckets):
+            return self._rotation_interval_s
+
+        self._rotation_alarm_id = None
+        return 0
+
+    def _rotate(self) -> None:
+        buckets = self._buckets
+        buckets.append(set())
+        expired_count = 0
+        while len(buckets) > self._generations + 1:
+            expired_bucket = buckets.popleft()
+            expired_count += len(expired_bucket)
+            self._expire_bucket(expired_bucket)
+
+        if expired_count:
+            logger.trace("Expired {} entries from {}.", expired_count, self.name)
+
+    def _expire_bucket(self, bucket: Set[KT]) -> None:
+        raise NotImplementedError
+
+
+class GenerationalExpiringDict(_GenerationalExpiry[KT], Generic[KT, VT]):
+    """
+    Drop-in replacement for `ExpiringDict` that expires entries in generational buckets.
+
+    If `size_of` is provided, `total_bytes` keeps the running total of `size_of` over all values,
+    updated as entries are added, replaced, removed and expired.
+    """
+    contents: Dict[KT, VT]
+    total_bytes: int
+    _size_of: Optional[Callable[[VT], int]]
+
+    def __init__(
+        self,
+        alarm_queue: AlarmQueue,
+        expiration_time_s: float,
+        name: str,
+        generations: int = gateway_constants.EXPIRY_GENERATIONS_COUNT,
+        size_of: Optional[Callable[[VT], int]] = None
+    ) -> None:
+        super().__init__(alarm_queue, expiration_time_s, name, generations)
+        self.contents = {}
+        self.total_bytes = 0
+        self._size_of = size_of
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self.contents
+
+    def __getitem__(self, key: KT) -> VT:
+        return self.contents[key]
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        if key in self.contents:
+            size_of = self._size_of
+            if size_of is not None:
+                self.total_bytes += size_of(value) - size_of(self.contents[key])
+            self.contents[key] = value
+        else:
+            self.add(key, value)
+
+    def __delitem__(self, key: KT) -> None:
+        value = self.contents.pop(key)
+        if self._size_of is not None:
+            self.total_bytes -= self._size_of(value)
+        self._untrack(key)
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __iter__(self) -> Iterator[KT]:
+        return iter(self.contents)
+
+    def get(self, key: KT, default: Optional[VT] = None) -> Optional[VT]:
+        return self.contents.get(key, default)
+
+    def add(self, key: KT, value: VT) -> None:
+        if key in self.contents:
+            self[key] = value
+            return
+        self._track(key)
+        self.contents[key] = value
+        if self._size_of is not None:
+            self.total_bytes += self._size_of(value)
+
+    def remove_item(self, key: KT) -> Optional[VT]:
+        if key not in self.contents:
+            return None
+        self._untrack(key)
+        value = self.contents.pop(key)
+        if self._size_of is not None:
+            self.total_bytes -= self._size_of(value)
+        return value
+
+    def _expire_bucket(self, bucket: Set[KT]) -> None:
+        contents = self.contents
+        size_of = self._size_of
+        if size_of is None:
+            for key in bucket:
+                contents.pop(key, None)
+            return
+
+        expired_bytes = 0
+        for key in bucket:
+            if key in contents:
+                expired_bytes += size_of(contents.pop(key))
+        self.total_bytes -= expired_bytes
+
+
+class GenerationalExpiringSet(_GenerationalExpiry[KT]):
+    """
+    Drop-in replacement for `ExpiringSet` that expires entries in generational buckets.
+    """
+    contents: Set[KT]
+
+    def __init__(
+        self,
+        alarm_queue: AlarmQueue,
+        expiration_time_s: float,
+        name: str,
+        generations: int = gateway_constants.EXPIRY_GENERATIONS_COUNT
+    ) -> None:
+        super().__init__(alarm_queue, expiration_time_s, name, generations)
+        self.contents = set()
+
+    def __contains__(self, item: KT) -> bool:
+        return item in self.contents
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def __iter__(self) -> Iterator[KT]:
+        return iter(self.contents)
+
+    def add(self, item: KT) -> None:
+        if item not in self.contents:
+            self.contents.add(item)
+            self._track(item)
+
+    def remove(self, item: KT) -> None:
+        self.contents.remove(item)
+        self._untrack(item)
+
+    def discard(self, item: KT) -> None:
+        if item in self.contents:
+            self.remove(item)
+
+    def _expire_bucket(self, bucket: Set[KT]) -> None:
+        self.contents.difference_update(bucket)
@@ -1,7 +1,10 @@
+import asyncio
 import json
 import os
 import platform
 import sys
+import tempfile
+import threading
 from datetime import datetime
 from json.decoder import JSONDecodeError
 from typing import List, Optional, Set
@@ -15,6 +18,7 @@ from astracommon.models.blockchain_peer_info import BlockchainPeerInfo
 from astracommon.network.ip_endpoint import IpEndpoint
 from astracommon.utils import config
 from astracommon.utils import model_loader
+from astragateway import gateway_constants
 from astragateway.utils.logging.status.analysis import Analysis
 from astragateway.utils.logging.status.connection_state import ConnectionState
 from astragateway.utils.logging.status.diagnostics import Diagnostics
@@ -40,6 +44,15 @@ gateway_status = Enum(
     states=[status.value for status in GatewayStatus]
 )
 
+# the status is kept in memory, and written to the status file after changes settle
+_diagnostics: Optional[Diagnostics] = None
+_flush_handle: Optional[asyncio.TimerHandle] = None
+_flush_future: Optional["asyncio.Future[None]"] = None
+# writes are numbered so that a slow write from the executor does not replace a newer status written by flush()
+_write_sequence = 0
+_written_sequence = 0
+_write_lock = threading.Lock()
+
 
 def initialize(use_ext: bool, src_ver: str, ip_address: str, continent: str, country: str,
                update_required: bool, account_id: Optional[str], quota_level: Optional[int]) -> Diagnostics:
@@ -62,22 +75,26 @@ def initialize(use_ext: bool, src_ver: str, ip_address: str, continent: str, cou
                         environment, network, _get_installed_python_modules())
     diagnostics = Diagnostics(summary, analysis)
 
-    _save_status_to_file(diagnostics)
+    _set_diagnostics(diagnostics)
+    flush()
     return diagnostics
 
 
 def get_diagnostics(use_ext: bool, src_ver: str, ip_address: str, continent: str, country: str,
                     update_required: bool, account_id: Optional[str], quota_level: Optional[int]) -> Diagnostics:
+    if _diagnostics is not None:
+        return _diagnostics
     return _load_status_from_file(use_ext, src_ver, ip_address, continent, country, update_required, account_id, quota_level)
 
 
 def update(conn_pool: ConnectionPool, use_ext: bool, src_ver: str, ip_address: str, continent: str, country: str,
            update_required: bool, blockchain_peers: Set[BlockchainPeerInfo], account_id: Optional[str],
            quota_level: Optional[int]) -> Diagnostics:
-    path = config.get_data_file(STATUS_FILE_NAME)
-    if not os.path.exists(path):
-        initialize(use_ext, src_ver, ip_address, continent, country, update_required, account_id, quota_level)
-    diagnostics = _load_status_from_file(use_ext, src_ver, ip_address, continent, country, update_required, account_id, quota_level)
+    diagnostics = _diagnostics
+    if diagnostics is None:
+        diagnostics = initialize(
+            use_ext, src_ver, ip_address, continent, country, update_required, account_id, quota_level
+        )
     analysis = diagnostics.analysis
     network = analysis.network
 
@@ -108,7 +125,8 @@ def update(conn_pool: ConnectionPool, use_ext: bool, src_ver: str, ip_address: s
     gateway_status.state(summary.gateway_status.value)
     diagnostics = Diagnostics(summary, analysis)
 
-    _save_status_to_file(diagnostics)
+    _set_diagnostics(diagnostics)
+    _schedule_flush()
     return diagnostics
 
 
@@ -171,7 +189,86 @@ def _load_status_from_file(use_ext: bool, src_ver: str, ip_address: str, contine
     return diagnostics
 
 
-def _save_status_to_file(diagnostics: Diagnostics) -> None:
+def flush() -> None:
+    """
+    Writes the in-memory status to the status file immediately, e.g. on startup and shutdown.
+    """
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    if _diagnostics is not None:
+        _save_status_to_file(_serialize_status(_diagnostics), _next_write_sequence())
+
+
+def _set_diagnostics(diagnostics: Diagnostics) -> None:
+    global _diagnostics
+    _diagnostics = diagnostics
+
+
+def _schedule_flush() -> None:
+    """
+    Debounces writes of the status file: changes within STATUS_FILE_FLUSH_DELAY_S of each other are written once,
+    off the event loop. Without a running event loop, the status file is written immediately.
+    """
+    global _flush_handle
+    if _flush_handle is not None:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        flush()
+        return
+    _flush_handle = loop.call_later(gateway_constants.STATUS_FILE_FLUSH_DELAY_S, _flush_in_executor, loop)
+
+
+def _flush_in_executor(loop: asyncio.AbstractEventLoop) -> None:
+    global _flush_handle, _flush_future
+    _flush_handle = None
+    if _flush_future is not None and not _flush_future.done():
+        # the previous write has not finished, retry later so that writes stay ordered
+        _schedule_flush()
+        return
+    if _diagnostics is None:
+        return
+    _flush_future = loop.run_in_executor(
+        None, _save_status_to_file, _serialize_status(_diagnostics), _next_write_sequence()
+    )
+
+
+def _serialize_status(diagnostics: Diagnostics) -> str:
+    return json.dumps(diagnostics, cls=EnhancedJSONEncoder, indent=2)
+
+
+def _next_write_sequence() -> int:
+    global _write_sequence
+    _write_sequence += 1
+    return _write_sequence
+
+
+def _save_status_to_file(status_json: str, write_sequence: int) -> None:
+    global _written_sequence
     path = config.get_data_file(STATUS_FILE_NAME)
-    with open(path, "w", encoding="utf-8") as outfile:
-        json.dump(diagnostics, outfile, cls=EnhancedJSONEncoder, indent=2)
+    temp_path = None
+    try:
+        # each write has its own temporary file, since flush() can write while a write runs in the executor
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=os.path.dirname(path) or None, prefix=f"{STATUS_FILE_NAME}.",
+            suffix=".tmp", delete=False
+        ) as outfile:
+            temp_path = outfile.name
+            outfile.write(status_json)
+        with _write_lock:
+            if write_sequence > _written_sequence:
+                # rename is atomic, so readers never see a partially written status file
+                os.replace(temp_path, path)
+                _written_sequence = write_sequence
+                temp_path = None
+    except OSError as e:
+        logger.warning(log_messages.STATUS_FILE_WRITE_FAIL, path, e)
+    finally:
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
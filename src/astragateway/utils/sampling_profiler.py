@@ -0,0 +1,97 @@
+"""
+In-process statistical profiler that samples the main thread's stack on SIGPROF.
+
+Samples are aggregated as collapsed stacks (`outer;inner;innermost count` per line), the input format of
+flamegraph tools. Only one profiling session can run at a time, since the process has a single profiling timer.
+"""
+import signal
+import threading
+from types import FrameType
+from typing import Dict, Optional, Any
+
+DROPPED_STACK = "[dropped]"
+TRUNCATED_FRAMES = "[truncated]"
+
+
+class ProfilerBusyError(Exception):
+    pass
+
+
+class ProfilerUnavailableError(Exception):
+    pass
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of the main thread every `interval_s` of process CPU time.
+
+    Memory is bounded by `max_stacks` distinct stacks of at most `max_depth` frames each. Samples of stacks
+    beyond the limit are counted under `[dropped]`, and frames beyond the depth limit are replaced
+    by a `[truncated]` root frame.
+    """
+    max_stacks: int
+    max_depth: int
+    sample_count: int
+    _stack_counts: Dict[str, int]
+    _previous_handler: Any
+    _running: bool
+
+    def __init__(self, max_stacks: int, max_depth: int) -> None:
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.sample_count = 0
+        self._stack_counts = {}
+        self._previous_handler = None
+        self._running = False
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self, interval_s: float) -> None:
+        if not hasattr(signal, "setitimer"):
+            raise ProfilerUnavailableError("Sampling profiler requires signal.setitimer, which is unavailable.")
+        if threading.current_thread() is not threading.main_thread():
+            raise ProfilerUnavailableError("Sampling profiler can only be started from the main thread.")
+        # the profiling timer is process-wide, so it is also checked for sessions of other profilers
+        if self._running or signal.getitimer(signal.ITIMER_PROF) != (0.0, 0.0):
+            raise ProfilerBusyError("A profiling session is already running.")
+
+        self._running = True
+        self.sample_count = 0
+        self._stack_counts = {}
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, interval_s, interval_s)
+
+    def stop(self) -> str:
+        """
+        Stops the session and returns the collapsed stacks sampled during it.
+        """
+        if self._running:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            self._previous_handler = None
+            self._running = False
+        return self.get_collapsed_stacks()
+
+    def get_collapsed_stacks(self) -> str:
+        return "\n".join(
+            f"{stack} {count}"
+            for stack, count in sorted(self._stack_counts.items(), key=lambda item: item[1], reverse=True)
+        )
+
+    def _sample(self, _signum: int, frame: Optional[FrameType]) -> None:
+        frames = []
+        while frame is not None and len(frames) < self.max_depth:
+            code = frame.f_code
+            frames.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        if frame is not None:
+            frames.append(TRUNCATED_FRAMES)
+        frames.reverse()
+        stack = ";".join(frames)
+
+        stack_counts = self._stack_counts
+        if stack not in stack_counts and len(stack_counts) >= self.max_stacks:
+            stack = DROPPED_STACK
+        stack_counts[stack] = stack_counts.get(stack, 0) + 1
+        self.sample_count += 1
@@ -0,0 +1,246 @@
+import functools
+import time
+import dataclasses
+import weakref
+
+from dataclasses import dataclass
+from typing import Dict, Any, TYPE_CHECKING, List, Type, Callable, Optional, Tuple
+
+from astracommon.utils.alarm_queue import AlarmQueue
+from astracommon.utils.stats.statistics_service import StatisticsService, StatsIntervalData
+from astragateway import gateway_constants
+from astragateway.utils.stats.latency_histograms import message_type_label
+from astrautils import logging
+from astrautils.logging import LogRecordType
+
+if TYPE_CHECKING:
+    # noinspection PyUnresolvedReferences
+    from astracommon.connections.abstract_connection import AbstractConnection
+    # noinspection PyUnresolvedReferences
+    from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
+
+OTHER_BLOCKERS = "other"
+
+
+@dataclass
+class BlockerStats:
+    count: int = 0
+    total_s: float = 0
+    max_s: float = 0
+
+    def add(self, duration_s: float) -> None:
+        self.count += 1
+        self.total_s += duration_s
+        if duration_s > self.max_s:
+            self.max_s = duration_s
+
+    def merge(self, other: "BlockerStats") -> None:
+        self.count += other.count
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+
+
+@dataclass
+class EventLoopStatInterval(StatsIntervalData):
+    lag_samples: int = 0
+    total_lag_s: float = 0
+    max_lag_s: float = 0
+    blockers: Dict[str, BlockerStats] = dataclasses.field(default_factory=dict)
+
+
+class EventLoopStatsService(
+    StatisticsService[EventLoopStatInterval, "AbstractGatewayNode"]
+):
+    """
+    Monitors the health of the gateway event loop.
+
+    Scheduling lag is sampled by an alarm that measures how late it fires. Message handlers and alarms
+    that run for at least `slow_callback_threshold_s` are recorded as blockers, attributed to their owner
+    (connection and message type, or alarm name). Nothing is measured unless the service is enabled.
+    """
+    enabled: bool
+    sample_interval_s: float
+    slow_callback_threshold_s: float
+    _next_sample_time: Optional[float]
+    _previous_interval_data: Optional[EventLoopStatInterval]
+
+    def __init__(
+        self,
+        interval: int = gateway_constants.EVENT_LOOP_STATS_INTERVAL_S,
+        look_back: int = gateway_constants.EVENT_LOOP_STATS_LOOKBACK
+    ) -> None:
+        self.enabled = False
+        self.sample_interval_s = 0
+        self.slow_callback_threshold_s = gateway_constants.EVENT_LOOP_SLOW_CALLBACK_THRESHOLD_S
+        self._next_sample_time = None
+        self._previous_interval_data = None
+        super().__init__(
+            "EventLoopStats",
+            interval,
+            look_back,
+            reset=True,
+            stat_logger=logging.get_logger(LogRecordType.MessageHandlingTroubleshooting, __name__)
+        )
+
+    def get_interval_data_class(self) -> Type[EventLoopStatInterval]:
+        return EventLoopStatInterval
+
+    def create_interval_data_object(self) -> None:
+        self._previous_interval_data = getattr(self, "interval_data", None)
+        super().create_interval_data_object()
+
+    def configure(self, sample_interval_s: float, slow_callback_threshold_s: float) -> None:
+        self.enabled = sample_interval_s > 0
+        self.sample_interval_s = sample_interval_s
+        self.slow_callback_threshold_s = slow_callback_threshold_s
+
+    def sample_lag(self) -> float:
+        """
+        Alarm function that records how late it was fired, compared to when it was scheduled.
+        """
+        current_time = time.time()
+        next_sample_time = self._next_sample_time
+        if next_sample_time is not None:
+            lag_s = max(0.0, current_time - next_sample_time)
+            interval_data = self.interval_data
+            interval_data.lag_samples += 1
+            interval_data.total_lag_s += lag_s
+            if lag_s > interval_data.max_lag_s:
+                interval_data.max_lag_s = lag_s
+        self._next_sample_time = current_time + self.sample_interval_s
+        return self.sample_interval_s
+
+    def log_callback(self, owner: str, duration_s: float) -> None:
+        if duration_s < self.slow_callback_threshold_s:
+            return
+        blockers = self.interval_data.blockers
+        blocker = blockers.get(owner)
+        if blocker is None:
+            if len(blockers) >= gateway_constants.EVENT_LOOP_MAX_TRACKED_BLOCKERS:
+                owner = OTHER_BLOCKERS
+                blocker = blockers.get(owner)
+            if blocker is None:
+                blocker = BlockerStats()
+                blockers[owner] = blocker
+        blocker.add(duration_s)
+
+    def timed(self, owner: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def timed_call(*args, **kwargs):
+            start_time = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.log_callback(owner, time.time() - start_time)
+        return timed_call
+
+    def instrument_message_handlers(self, connection: "AbstractConnection") -> None:
+        connection_type = connection.CONNECTION_TYPE.name or str(connection.CONNECTION_TYPE)
+        connection.message_handlers = {
+            message_type: self.timed(f"{connection_type}:{message_type_label(message_type)}", handler)
+            for message_type, handler in connection.message_handlers.items()
+        }
+
+    def instrument_alarm_queue(self, alarm_queue: AlarmQueue) -> None:
+        """
+        Times exact and approximate alarms registered from now on, attributed to their alarm name or function.
+        """
+        register_alarm = alarm_queue.register_alarm
+        register_approx_alarm = alarm_queue.register_approx_alarm
+        # approximate alarms are deduplicated by function, so a function is timed by the same wrapper for as long as
+        # an alarm holds it
+        timed_fns: "weakref.WeakValueDictionary[Tuple[Callable[..., Any], str], Callable[..., Any]]" = \
+            weakref.WeakValueDictionary()
+        # alarms registered by the alarm queue itself with functions that are already timed
+        timed_fn_set: "weakref.WeakSet[Callable[..., Any]]" = weakref.WeakSet()
+
+        def timed_alarm_fn(fn: Callable[..., Any], alarm_name: Optional[str]) -> Callable[..., Any]:
+            if fn in timed_fn_set:
+                return fn
+            owner = f"alarm:{alarm_name or getattr(fn, '__qualname__', None) or repr(fn)}"
+            key = (fn, owner)
+            timed_fn = timed_fns.get(key)
+            if timed_fn is None:
+                timed_fn = self.timed(owner, fn)
+                timed_fns[key] = timed_fn
+                timed_fn_set.add(timed_fn)
+            return timed_fn
+
+        def timed_register_alarm(fire_delay, fn, *args, **kwargs):
+            return register_alarm(fire_delay, timed_alarm_fn(fn, kwargs.get("alarm_name")), *args, **kwargs)
+
+        def timed_register_approx_alarm(fire_delay, slop, fn, *args, **kwargs):
+            return register_approx_alarm(
+                fire_delay, slop, timed_alarm_fn(fn, kwargs.get("alarm_name")), *args, **kwargs
+            )
+
+        alarm_queue.register_alarm = timed_register_alarm
+        alarm_queue.register_approx_alarm = timed_register_approx_alarm
+
+    def get_top_blockers(
+        self, count: int = gateway_constants.EVENT_LOOP_TOP_BLOCKERS_COUNT
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the owners that blocked the event loop for the longest in total, over the current and
+        the previous stats interval.
+        """
+        blockers: Dict[str, BlockerStats] = {}
+        for interval_data in (self._previous_interval_data, self.interval_data):
+            if interval_data is None:
+                continue
+            for owner, blocker in interval_data.blockers.items():
+                if owner not in blockers:
+                    blockers[owner] = BlockerStats()
+                blockers[owner].merge(blocker)
+        return [
+            _blocker_info(owner, blocker)
+            for owner, blocker in sorted(blockers.items(), key=lambda item: item[1].total_s, reverse=True)[:count]
+        ]
+
+    def get_report(self, top_blockers_count: int = gateway_constants.EVENT_LOOP_TOP_BLOCKERS_COUNT) -> Dict[str, Any]:
+        lag_samples = 0
+        total_lag_s = 0.0
+        max_lag_s = 0.0
+        for interval_data in (self._previous_interval_data, self.interval_data):
+            if interval_data is None:
+                continue
+            lag_samples += interval_data.lag_samples
+            total_lag_s += interval_data.total_lag_s
+            max_lag_s = max(max_lag_s, interval_data.max_lag_s)
+        return {
+            "enabled": self.enabled,
+            "sample_interval_s": self.sample_interval_s,
+            "slow_callback_threshold_s": self.slow_callback_threshold_s,
+            "lag_samples": lag_samples,
+            "avg_lag_s": total_lag_s / lag_samples if lag_samples else 0,
+            "max_lag_s": max_lag_s,
+            "top_blockers": self.get_top_blockers(top_blockers_count),
+        }
+
+    def get_info(self) -> Dict[str, Any]:
+        interval_data = self.interval_data
+        blockers = sorted(interval_data.blockers.items(), key=lambda item: item[1].total_s, reverse=True)
+        return {
+            "start_time": interval_data.start_time,
+            "end_time": interval_data.end_time,
+            "lag_samples": interval_data.lag_samples,
+            "avg_lag_s": interval_data.total_lag_s / interval_data.lag_samples if interval_data.lag_samples else 0,
+            "max_lag_s": interval_data.max_lag_s,
+            "blocked_s": sum(blocker.total_s for blocker in interval_data.blockers.values()),
+            "top_blockers": [
+                _blocker_info(owner, blocker)
+                for owner, blocker in blockers[:gateway_constants.EVENT_LOOP_TOP_BLOCKERS_COUNT]
+            ],
+        }
+
+
+def _blocker_info(owner: str, blocker: BlockerStats) -> Dict[str, Any]:
+    return {
+        "owner": owner,
+        "count": blocker.count,
+        "total_s": blocker.total_s,
+        "max_s": blocker.max_s,
+    }
+
+
+event_loop_stats_service = EventLoopStatsService()
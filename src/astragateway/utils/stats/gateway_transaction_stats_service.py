@@ -3,11 +3,12 @@ import time
 
 from dataclasses import dataclass
 from collections import deque
-from typing import Type, Dict, Deque, Any, TYPE_CHECKING
+from typing import Type, Dict, Deque, Any, TYPE_CHECKING, Optional
 
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon.utils.stats.statistics_service import StatisticsService, StatsIntervalData
 from astragateway import gateway_constants
+from astragateway.utils.stats.sketches import HyperLogLog, CountMinSketch, TDigest, sketch_hash
 from astrautils import logging, utils
 from astrautils.logging.log_record_type import LogRecordType
 
@@ -49,17 +50,26 @@ class GatewayTransactionStatInterval(StatsIntervalData):
 
     transactions_bytes_skipped: int = 0
 
+    # only set when sketches are enabled, replacing the unbounded transaction tracking
+    unique_transactions_from_blockchain: Optional[HyperLogLog] = None
+    duplicate_transactions_from_blockchain_counts: Optional[CountMinSketch] = None
+    max_duplicates_per_transaction_from_blockchain: int = 0
+    transaction_interval_digest: Optional[TDigest] = None
+
 
 class _GatewayTransactionStatsService(
     StatisticsService[GatewayTransactionStatInterval, "AbstractGatewayNode"]
 ):
     TRANSACTION_SHORT_ID_ASSIGNED_DONE = -1
 
+    sketches_enabled: bool
+
     def __init__(
         self,
         interval: int = gateway_constants.GATEWAY_TRANSACTION_STATS_INTERVAL_S,
         look_back: int = gateway_constants.GATEWAY_TRANSACTION_STATS_LOOKBACK,
     ) -> None:
+        self.sketches_enabled = False
         super(_GatewayTransactionStatsService, self).__init__(
             "GatewayTransactionStats",
             interval,
@@ -71,13 +81,49 @@ class _GatewayTransactionStatsService(
     def get_interval_data_class(self) -> Type[GatewayTransactionStatInterval]:
         return GatewayTransactionStatInterval
 
-    def log_transaction_from_blockchain(self, transaction_hash: Sha256Hash) -> None:
-        self.interval_data.new_transactions_received_from_blockchain += 1
-        if transaction_hash not in self.interval_data.transaction_tracker:
-            self.interval_data.transaction_tracker[transaction_hash] = time.time()
+    def create_interval_data_object(self) -> None:
+        super().create_interval_data_object()
+        if self.sketches_enabled:
+            interval_data = self.interval_data
+            interval_data.unique_transactions_from_blockchain = HyperLogLog(
+                gateway_constants.STATS_SKETCH_HYPERLOGLOG_PRECISION
+            )
+            interval_data.duplicate_transactions_from_blockchain_counts = CountMinSketch(
+                gateway_constants.STATS_SKETCH_COUNT_MIN_WIDTH, gateway_constants.STATS_SKETCH_COUNT_MIN_DEPTH
+            )
+            interval_data.transaction_interval_digest = TDigest(gateway_constants.STATS_SKETCH_TDIGEST_COMPRESSION)
 
-    def log_duplicate_transaction_from_blockchain(self) -> None:
-        self.interval_data.duplicate_transactions_received_from_blockchain += 1
+    def configure_sketches(self, enabled: bool) -> None:
+        """
+        If enabled, stats are kept in fixed-size sketches instead of per transaction, and short id assignment
+        times are only measured for a bounded sample of transactions.
+        """
+        self.sketches_enabled = enabled
+        self.create_interval_data_object()
+
+    def log_transaction_from_blockchain(self, transaction_hash: Sha256Hash) -> None:
+        interval_data = self.interval_data
+        interval_data.new_transactions_received_from_blockchain += 1
+        unique_transactions = interval_data.unique_transactions_from_blockchain
+        if unique_transactions is not None:
+            transaction_sketch_hash = sketch_hash(transaction_hash)
+            unique_transactions.add(transaction_sketch_hash)
+            if (
+                transaction_sketch_hash % gateway_constants.STATS_SKETCH_SAMPLE_RATE
+                or len(interval_data.transaction_tracker) >= gateway_constants.STATS_SKETCH_MAX_SAMPLED_TRANSACTIONS
+            ):
+                return
+        if transaction_hash not in interval_data.transaction_tracker:
+            interval_data.transaction_tracker[transaction_hash] = time.time()
+
+    def log_duplicate_transaction_from_blockchain(self, transaction_hash: Optional[Sha256Hash] = None) -> None:
+        interval_data = self.interval_data
+        interval_data.duplicate_transactions_received_from_blockchain += 1
+        duplicate_counts = interval_data.duplicate_transactions_from_blockchain_counts
+        if duplicate_counts is not None and transaction_hash is not None:
+            duplicates = duplicate_counts.add(sketch_hash(transaction_hash))
+            if duplicates > interval_data.max_duplicates_per_transaction_from_blockchain:
+                interval_data.max_duplicates_per_transaction_from_blockchain = duplicates
 
     def log_transaction_from_relay(
         self, transaction_hash: Sha256Hash, has_short_id: bool, is_compact: bool = False
@@ -85,7 +131,11 @@ class _GatewayTransactionStatsService(
         if has_short_id and transaction_hash in self.interval_data.transaction_tracker:
             start_time = self.interval_data.transaction_tracker[transaction_hash]
             if start_time != self.TRANSACTION_SHORT_ID_ASSIGNED_DONE:
-                self.interval_data.transaction_intervals.append(time.time() - start_time)
+                transaction_interval_digest = self.interval_data.transaction_interval_digest
+                if transaction_interval_digest is None:
+                    self.interval_data.transaction_intervals.append(time.time() - start_time)
+                else:
+                    transaction_interval_digest.add(time.time() - start_time)
                 self.interval_data.transaction_tracker[
                     transaction_hash
                 ] = self.TRANSACTION_SHORT_ID_ASSIGNED_DONE
@@ -154,7 +204,12 @@ class _GatewayTransactionStatsService(
         node = self.node
         assert node is not None
 
-        if len(self.interval_data.transaction_intervals) > 0:
+        transaction_interval_digest = self.interval_data.transaction_interval_digest
+        if transaction_interval_digest is not None and transaction_interval_digest.count > 0:
+            min_short_id_assign_time = transaction_interval_digest.min
+            max_short_id_assign_time = transaction_interval_digest.max
+            avg_short_id_assign_time = transaction_interval_digest.mean()
+        elif len(self.interval_data.transaction_intervals) > 0:
             min_short_id_assign_time = min(self.interval_data.transaction_intervals)
             max_short_id_assign_time = max(self.interval_data.transaction_intervals)
             avg_short_id_assign_time = sum(self.interval_data.transaction_intervals) / len(
@@ -226,6 +281,22 @@ class _GatewayTransactionStatsService(
             "rejected_gas_price": interval_data.tx_validation_failed_gas_price,
             "transaction_bytes_skipped": interval_data.transactions_bytes_skipped,
             **node._tx_service.get_aggregate_stats(),
+            **self._get_sketch_info(),
+        }
+
+    def _get_sketch_info(self) -> Dict[str, Any]:
+        interval_data = self.interval_data
+        unique_transactions = interval_data.unique_transactions_from_blockchain
+        transaction_interval_digest = interval_data.transaction_interval_digest
+        if unique_transactions is None or transaction_interval_digest is None:
+            return {}
+        return {
+            "unique_transactions_received_from_blockchain": unique_transactions.count(),
+            "max_duplicates_per_transaction_from_blockchain":
+                interval_data.max_duplicates_per_transaction_from_blockchain,
+            "sampled_short_id_assign_times": transaction_interval_digest.count,
+            "p50_short_id_assign_time": transaction_interval_digest.quantile(0.5),
+            "p99_short_id_assign_time": transaction_interval_digest.quantile(0.99),
         }
 
 
@@ -0,0 +1,228 @@
+"""
+Latency histograms for gateway hot paths, exported as p50/p99/p999 gauges on the Prometheus `/metrics` endpoint.
+
+Durations are recorded into HDR-style log-linear buckets: values below 2 * SUB_BUCKET_COUNT microseconds have
+their own bucket, and each following power of two is split into SUB_BUCKET_COUNT buckets, so percentiles are
+accurate to within 1 / SUB_BUCKET_COUNT of the true value. Recording a sample is a few integer operations,
+with no allocation and no sorting.
+
+Percentiles cover the current and the previous rotation interval, so a scrape reflects recent latency
+instead of everything since startup.
+"""
+import math
+import time
+from enum import Enum
+from typing import Dict, List, Tuple, Iterator, Callable, Any, TYPE_CHECKING
+
+from prometheus_client import REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+
+if TYPE_CHECKING:
+    # pylint: disable=ungrouped-imports
+    from astracommon.connections.abstract_connection import AbstractConnection
+    from astracommon.feed.feed import FeedKey
+    from astracommon.feed.feed_manager import FeedManager
+
+
+class LatencyOperation(Enum):
+    MESSAGE_HANDLING = "message_handling"
+    COMPRESSION = "compression"
+    DECOMPRESSION = "decompression"
+    ENCRYPTION = "encryption"
+    DECRYPTION = "decryption"
+    FEED_PUBLISH = "feed_publish"
+    RPC_REQUEST = "rpc_request"
+    BLOCK_BROADCAST = "block_broadcast"
+
+
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+# values are clamped to ~67 seconds
+MAX_VALUE_US = (1 << 26) - 1
+EXPORTED_QUANTILES = (0.5, 0.99, 0.999)
+
+
+def _bucket_index(value_us: int) -> int:
+    shift = value_us.bit_length() - SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return value_us
+    return shift * SUB_BUCKET_COUNT + (value_us >> shift)
+
+
+def _bucket_upper_bound_us(index: int) -> int:
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index
+    shift = index // SUB_BUCKET_COUNT - 1
+    sub_bucket = index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT
+    return ((sub_bucket + 1) << shift) - 1
+
+
+BUCKET_COUNT = _bucket_index(MAX_VALUE_US) + 1
+
+
+class LatencyHistogram:
+    counts: List[int]
+    total_count: int
+    total_us: int
+    max_us: int
+
+    def __init__(self) -> None:
+        self.counts = [0] * BUCKET_COUNT
+        self.total_count = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, duration_s: float) -> None:
+        value_us = int(duration_s * 1000000)
+        if value_us > MAX_VALUE_US:
+            value_us = MAX_VALUE_US
+        elif value_us < 0:
+            value_us = 0
+        self.counts[_bucket_index(value_us)] += 1
+        self.total_count += 1
+        self.total_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.total_count += other.total_count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentiles_us(self, quantiles: Tuple[float, ...]) -> List[int]:
+        """
+        Returns the highest value equivalent to each quantile's bucket, for quantiles in ascending order.
+        """
+        results = []
+        if self.total_count == 0:
+            return [0] * len(quantiles)
+        quantile_index = 0
+        targets = [max(1, math.ceil(quantile * self.total_count)) for quantile in quantiles]
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while quantile_index < len(targets) and seen >= targets[quantile_index]:
+                results.append(min(_bucket_upper_bound_us(index), self.max_us))
+                quantile_index += 1
+            if quantile_index == len(targets):
+                break
+        return results
+
+
+class LatencyHistograms:
+    """
+    Latency histograms keyed by operation (e.g. `message_handling`) and a per-operation label (e.g. message type).
+    """
+    enabled: bool
+    _current: Dict[Tuple[LatencyOperation, str], LatencyHistogram]
+    _previous: Dict[Tuple[LatencyOperation, str], LatencyHistogram]
+
+    def __init__(self) -> None:
+        self.enabled = True
+        self._current = {}
+        self._previous = {}
+
+    def record(self, operation: LatencyOperation, label: str, duration_s: float) -> None:
+        if not self.enabled:
+            return
+        key = (operation, label)
+        histogram = self._current.get(key)
+        if histogram is None:
+            histogram = LatencyHistogram()
+            self._current[key] = histogram
+        histogram.record(duration_s)
+
+    def rotate(self) -> None:
+        self._previous = self._current
+        self._current = {}
+
+    def clear(self) -> None:
+        self._current = {}
+        self._previous = {}
+
+    def get_histograms(self) -> Iterator[Tuple[LatencyOperation, str, LatencyHistogram]]:
+        """
+        Yields histograms merged over the current and the previous rotation interval.
+        """
+        for key in set(self._current) | set(self._previous):
+            histogram = LatencyHistogram()
+            for histograms in (self._previous, self._current):
+                if key in histograms:
+                    histogram.merge(histograms[key])
+            operation, label = key
+            yield operation, label, histogram
+
+    def timed(self, operation: LatencyOperation, label: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Wraps `func` so that each call is recorded under `operation` and `label`.
+        """
+        def timed_call(*args, **kwargs):
+            start_time = time.time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(operation, label, time.time() - start_time)
+        return timed_call
+
+    def instrument_message_handlers(self, connection: "AbstractConnection") -> None:
+        """
+        Records the time spent in each of `connection`'s message handlers, per message type.
+        """
+        connection_type = connection.CONNECTION_TYPE.name or str(connection.CONNECTION_TYPE)
+        connection.message_handlers = {
+            message_type: self.timed(
+                LatencyOperation.MESSAGE_HANDLING, f"{connection_type}:{message_type_label(message_type)}", handler
+            )
+            for message_type, handler in connection.message_handlers.items()
+        }
+
+    def instrument_feed_manager(self, feed_manager: "FeedManager") -> None:
+        """
+        Records the time spent publishing to each feed, per feed name.
+        """
+        publish_to_feed = feed_manager.publish_to_feed
+
+        def timed_publish_to_feed(name: "FeedKey", message: Any) -> None:
+            start_time = time.time()
+            try:
+                publish_to_feed(name, message)
+            finally:
+                self.record(LatencyOperation.FEED_PUBLISH, name.name, time.time() - start_time)
+
+        feed_manager.publish_to_feed = timed_publish_to_feed
+
+    def collect(self) -> Iterator[Any]:
+        latency = GaugeMetricFamily(
+            "gateway_latency_seconds",
+            "Gateway hot path latency percentiles over the last histogram interval",
+            labels=["operation", "label", "quantile"]
+        )
+        count = GaugeMetricFamily(
+            "gateway_latency_sample_count",
+            "Number of gateway hot path latency samples over the last histogram interval",
+            labels=["operation", "label"]
+        )
+        for operation, label, histogram in self.get_histograms():
+            percentiles_us = histogram.percentiles_us(EXPORTED_QUANTILES)
+            for quantile, percentile_us in zip(EXPORTED_QUANTILES, percentiles_us):
+                latency.add_metric([operation.value, label, str(quantile)], percentile_us / 1000000)
+            count.add_metric([operation.value, label], histogram.total_count)
+        yield latency
+        yield count
+
+
+def message_type_label(message_type: Any) -> str:
+    if isinstance(message_type, (bytes, bytearray)):
+        return bytes(message_type).rstrip(b"\x00").decode("utf-8", errors="replace")
+    return str(message_type)
+
+
+latency_histograms = LatencyHistograms()
+REGISTRY.register(latency_histograms)
+
@@ -0,0 +1,202 @@
+"""
+Fixed-size probabilistic data structures for statistics over high volume streams, such as transaction hashes.
+
+Memory used by each structure depends only on its configuration, not on the number of items added to it.
+Items are added by their 64-bit `sketch_hash`, so that a hash computed once can be shared between structures.
+"""
+import hashlib
+import heapq
+import math
+from array import array
+from typing import Union, List
+
+from astracommon.utils.object_hash import Sha256Hash
+
+HASH_BITS = 64
+
+
+def sketch_hash(key: Union[Sha256Hash, bytes, bytearray, memoryview]) -> int:
+    if isinstance(key, Sha256Hash):
+        key = key.binary
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """
+    Estimates the number of distinct items added, with a standard error of about 1.04 / sqrt(2 ** precision),
+    using 2 ** precision bytes.
+    """
+    precision: int
+    registers: bytearray
+
+    def __init__(self, precision: int) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError(f"HyperLogLog precision must be between 4 and 16, not {precision}.")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._remaining_bits = HASH_BITS - precision
+        self._remaining_mask = (1 << self._remaining_bits) - 1
+
+    def add(self, item_hash: int) -> None:
+        index = item_hash >> self._remaining_bits
+        rank = self._remaining_bits - (item_hash & self._remaining_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precisions.")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        register_count = len(self.registers)
+        if register_count == 16:
+            alpha = 0.673
+        elif register_count == 32:
+            alpha = 0.697
+        elif register_count == 64:
+            alpha = 0.709
+        else:
+            alpha = 0.7213 / (1 + 1.079 / register_count)
+
+        estimate = alpha * register_count * register_count / sum(2.0 ** -register for register in self.registers)
+        if estimate <= 2.5 * register_count:
+            # linear counting is more accurate for small cardinalities
+            empty_registers = self.registers.count(0)
+            if empty_registers:
+                estimate = register_count * math.log(register_count / empty_registers)
+        return int(round(estimate))
+
+
+class CountMinSketch:
+    """
+    Estimates how many times each item was added. Estimates never undercount, and overcount by at most
+    `e / width` of the total count with probability `1 - exp(-depth)`.
+    """
+    width: int
+    depth: int
+    total_count: int
+    _rows: List[array]
+
+    def __init__(self, width: int, depth: int) -> None:
+        self.width = width
+        self.depth = depth
+        self.total_count = 0
+        self._rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _indexes(self, item_hash: int) -> List[int]:
+        # double hashing derives `depth` independent-enough indexes from the two halves of one hash
+        low = item_hash & 0xffffffff
+        high = item_hash >> 32
+        width = self.width
+        return [(low + row * high) % width for row in range(self.depth)]
+
+    def add(self, item_hash: int, count: int = 1) -> int:
+        """
+        Adds `count` occurrences of the item and returns its estimated count, including them.
+        """
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(item_hash)):
+            value = row[index] + count
+            row[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self.total_count += count
+        assert estimate is not None
+        return estimate
+
+    def estimate(self, item_hash: int) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(item_hash)))
+
+
+class TDigest:
+    """
+    Estimates quantiles of a stream of values, merging them into a number of weighted centroids proportional
+    to `compression`. Centroids near the tails are kept small, so extreme quantiles stay accurate.
+    """
+    compression: int
+    count: int
+    total: float
+    min: float
+    max: float
+    _means: List[float]
+    _weights: List[float]
+    _buffer: List[float]
+
+    def __init__(self, compression: int) -> None:
+        self.compression = compression
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means = []
+        self._weights = []
+        self._buffer = []
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, quantile: float) -> float:
+        if self.count == 0:
+            return 0
+        self._compress()
+        means = self._means
+        weights = self._weights
+        if len(means) == 1:
+            return means[0]
+
+        target = quantile * self.count
+        cumulative = 0.0
+        previous_center = 0.0
+        previous_mean = self.min
+        for mean, weight in zip(means, weights):
+            center = cumulative + weight / 2
+            if target < center:
+                return previous_mean + (mean - previous_mean) * (target - previous_center) / (center - previous_center)
+            cumulative += weight
+            previous_center = center
+            previous_mean = mean
+        if self.count <= previous_center:
+            return self.max
+        return previous_mean + (self.max - previous_mean) * (target - previous_center) / (self.count - previous_center)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort()
+        centroids = list(heapq.merge(
+            zip(self._means, self._weights), ((value, 1.0) for value in self._buffer)
+        ))
+        self._buffer = []
+
+        total_weight = self.count
+        means = []
+        weights = []
+        weight_before = 0.0
+        current_mean, current_weight = centroids[0]
+        for mean, weight in centroids[1:]:
+            merged_weight = current_weight + weight
+            quantile = (weight_before + merged_weight / 2) / total_weight
+            if merged_weight <= 4 * total_weight * quantile * (1 - quantile) / self.compression:
+                current_mean += (mean - current_mean) * weight / merged_weight
+                current_weight = merged_weight
+            else:
+                means.append(current_mean)
+                weights.append(current_weight)
+                weight_before += current_weight
+                current_mean, current_weight = mean, weight
+        means.append(current_mean)
+        weights.append(current_weight)
+        self._means = means
+        self._weights = weights
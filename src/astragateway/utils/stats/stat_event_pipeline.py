@@ -0,0 +1,170 @@
+"""
+Deferred submission of block and transaction stat events.
+
+Hot paths pass event descriptions (`more_info`) as a formatting function and its arguments instead of a
+formatted string. These events are queued with their raw fields and only formatted when the queue is flushed, off
+the message handling path. Events without a deferred description are submitted right away, so that the statistics
+services filter them before anything is queued. Events can be sampled per event type, at rates adjustable at
+runtime, so that sampled out events cost a dictionary lookup.
+"""
+import datetime
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+from astracommon.utils.object_hash import Sha256Hash
+from astracommon.utils.stats.block_statistics_service import block_stats
+from astracommon.utils.stats.transaction_statistics_service import tx_stats
+from astragateway import gateway_constants
+from astrautils import logging
+
+logger = logging.get_logger(__name__)
+
+MoreInfo = Union[str, Callable[..., str], None]
+
+
+# (is block event, object hash, event type, network number, short id, timestamp, more info, more info arguments,
+#  keyword arguments)
+QueuedStatEvent = Tuple[
+    bool, Sha256Hash, Any, int, Optional[int], float, MoreInfo, Tuple[Any, ...], Dict[str, Any]
+]
+
+
+def event_type_name(event_type: Any) -> str:
+    return getattr(event_type, "name", None) or str(event_type)
+
+
+def parse_sampling_rates(sampling_rates: str) -> Dict[str, float]:
+    """
+    Parses comma separated `EventTypeName=rate` pairs, with rates between 0 and 1.
+    """
+    rates = {}
+    for pair in filter(None, (pair.strip() for pair in sampling_rates.split(","))):
+        name, separator, rate = pair.partition("=")
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid stat event sampling rate {pair!r}, expected EventTypeName=rate.")
+        rates[name.strip()] = _validate_rate(float(rate))
+    return rates
+
+
+def _validate_rate(rate: float) -> float:
+    if not 0 <= rate <= 1:
+        raise ValueError(f"Stat event sampling rate must be between 0 and 1, not {rate}.")
+    return rate
+
+
+class StatEventPipeline:
+    sampling_rates: Dict[str, float]
+    _events: Deque[QueuedStatEvent]
+    submitted_events: int
+    sampled_out_events: int
+
+    def __init__(self) -> None:
+        self.sampling_rates = {}
+        self._events = deque()
+        self.submitted_events = 0
+        self.sampled_out_events = 0
+
+    def set_sampling_rate(self, event_name: str, rate: float) -> None:
+        rate = _validate_rate(rate)
+        if rate == 1:
+            self.sampling_rates.pop(event_name, None)
+        else:
+            self.sampling_rates[event_name] = rate
+
+    def add_block_event_by_block_hash(
+        self,
+        block_hash: Sha256Hash,
+        event_type: Any,
+        network_num: int,
+        more_info: MoreInfo = None,
+        more_info_args: Tuple[Any, ...] = (),
+        **kwargs
+    ) -> None:
+        """
+        Queues a `block_stats.add_block_event_by_block_hash` call if `more_info` is a function, which is called
+        with `more_info_args` at flush time to format the event description. Submits the event right away otherwise.
+        """
+        if self.sampling_rates and not self._sample(event_type):
+            return
+        if callable(more_info):
+            self._queue(
+                (True, block_hash, event_type, network_num, None, time.time(), more_info, more_info_args, kwargs)
+            )
+        else:
+            if more_info is not None:
+                kwargs["more_info"] = more_info
+            block_stats.add_block_event_by_block_hash(block_hash, event_type, network_num, **kwargs)
+            self.submitted_events += 1
+
+    def add_tx_by_hash_event(
+        self,
+        tx_hash: Sha256Hash,
+        event_type: Any,
+        network_num: int,
+        short_id: Optional[int] = None,
+        more_info: MoreInfo = None,
+        more_info_args: Tuple[Any, ...] = (),
+        **kwargs
+    ) -> None:
+        """
+        Queues a `tx_stats.add_tx_by_hash_event` call, see `add_block_event_by_block_hash`.
+        """
+        if self.sampling_rates and not self._sample(event_type):
+            return
+        if callable(more_info):
+            self._queue(
+                (False, tx_hash, event_type, network_num, short_id, time.time(), more_info, more_info_args, kwargs)
+            )
+        else:
+            if more_info is not None:
+                kwargs["more_info"] = more_info
+            tx_stats.add_tx_by_hash_event(tx_hash, event_type, network_num, short_id, **kwargs)
+            self.submitted_events += 1
+
+    def flush(self) -> float:
+        """
+        Formats and submits all queued events. Scheduled as an alarm.
+        """
+        events = self._events
+        while events:
+            event = events.popleft()
+            try:
+                self._submit(event)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.debug("Failed to submit stat event {}: {}", event_type_name(event[2]), e)
+        return gateway_constants.STAT_EVENTS_FLUSH_INTERVAL_S
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _sample(self, event_type: Any) -> bool:
+        rate = self.sampling_rates.get(event_type_name(event_type))
+        if rate is None or random.random() < rate:
+            return True
+        self.sampled_out_events += 1
+        return False
+
+    def _queue(self, event: QueuedStatEvent) -> None:
+        self._events.append(event)
+        if len(self._events) >= gateway_constants.STAT_EVENTS_MAX_QUEUED:
+            self.flush()
+
+    def _submit(self, event: QueuedStatEvent) -> None:
+        is_block_event, object_hash, event_type, network_num, short_id, timestamp, more_info, more_info_args, \
+            kwargs = event
+        kwargs["more_info"] = more_info(*more_info_args)
+        if "start_date_time" not in kwargs:
+            event_datetime = datetime.datetime.utcfromtimestamp(timestamp)
+            kwargs["start_date_time"] = event_datetime
+            kwargs["end_date_time"] = event_datetime
+
+        if is_block_event:
+            block_stats.add_block_event_by_block_hash(object_hash, event_type, network_num, **kwargs)
+        else:
+            tx_stats.add_tx_by_hash_event(object_hash, event_type, network_num, short_id, **kwargs)
+        self.submitted_events += 1
+
+
+stat_event_pipeline = StatEventPipeline()
@@ -2,12 +2,13 @@ import time
 import dataclasses
 
 from dataclasses import dataclass
-from typing import Dict, Any, TYPE_CHECKING, List, Type
+from typing import Dict, Any, TYPE_CHECKING, List, Type, Optional
 
 from astracommon.feed.feed import FeedKey
 from astracommon.utils.object_hash import Sha256Hash
 from astracommon.utils.stats.statistics_service import StatisticsService, StatsIntervalData
 from astragateway import gateway_constants
+from astragateway.utils.stats.sketches import HyperLogLog, sketch_hash
 from astracommon.feed.eth.eth_new_transaction_feed import EthNewTransactionFeed
 from astrautils import logging
 from astrautils.logging import LogRecordType
@@ -32,16 +33,25 @@ class TransactionFeedStatInterval(StatsIntervalData):
 
     pending_transactions_missing_contents: int = 0
 
+    # only set when sketches are enabled, in which case the received times above are kept for a sample of
+    # transactions, and transaction counts are estimated by these
+    new_transactions_sketch: Optional[HyperLogLog] = None
+    pending_transactions_sketch: Optional[HyperLogLog] = None
+    pending_transactions_from_internal_sketch: Optional[HyperLogLog] = None
+    pending_transactions_from_local_sketch: Optional[HyperLogLog] = None
+
 
 class TransactionFeedStatsService(
     StatisticsService[TransactionFeedStatInterval, "AbstractGatewayNode"]
 ):
+    sketches_enabled: bool
 
     def __init__(
         self,
         interval: int = gateway_constants.GATEWAY_TRANSACTION_FEED_STATS_INTERVAL_S,
         look_back: int = gateway_constants.GATEWAY_TRANSACTION_FEED_STATS_LOOKBACK
     ) -> None:
+        self.sketches_enabled = False
         super().__init__(
             "TransactionFeedStats",
             interval,
@@ -53,6 +63,24 @@ class TransactionFeedStatsService(
     def get_interval_data_class(self) -> Type[TransactionFeedStatInterval]:
         return TransactionFeedStatInterval
 
+    def create_interval_data_object(self) -> None:
+        super().create_interval_data_object()
+        if self.sketches_enabled:
+            interval_data = self.interval_data
+            precision = gateway_constants.STATS_SKETCH_HYPERLOGLOG_PRECISION
+            interval_data.new_transactions_sketch = HyperLogLog(precision)
+            interval_data.pending_transactions_sketch = HyperLogLog(precision)
+            interval_data.pending_transactions_from_internal_sketch = HyperLogLog(precision)
+            interval_data.pending_transactions_from_local_sketch = HyperLogLog(precision)
+
+    def configure_sketches(self, enabled: bool) -> None:
+        """
+        If enabled, transactions are counted with fixed-size sketches, and feed timing comparisons are only
+        made for a bounded sample of transactions.
+        """
+        self.sketches_enabled = enabled
+        self.create_interval_data_object()
+
     def get_info(self) -> Dict[str, Any]:
         interval_data = self.interval_data
 
@@ -98,12 +126,18 @@ class TransactionFeedStatsService(
         return {
             "start_time": self.interval_data.start_time,
             "end_time": self.interval_data.end_time,
-            "new_transactions": len(interval_data.new_transaction_received_times),
-            "pending_transactions": len(interval_data.pending_transaction_received_times),
-            "pending_transactions_from_internal": len(
+            "new_transactions": _count(
+                interval_data.new_transactions_sketch, interval_data.new_transaction_received_times
+            ),
+            "pending_transactions": _count(
+                interval_data.pending_transactions_sketch, interval_data.pending_transaction_received_times
+            ),
+            "pending_transactions_from_internal": _count(
+                interval_data.pending_transactions_from_internal_sketch,
                 interval_data.pending_transaction_from_internal_received_times
             ),
-            "pending_transactions_from_local": len(
+            "pending_transactions_from_local": _count(
+                interval_data.pending_transactions_from_local_sketch,
                 interval_data.pending_transaction_from_local_blockchain_received_times
             ),
             "avg_new_transactions_faster_by_s": avg_new_transactions_faster_by_s,
@@ -118,6 +152,12 @@ class TransactionFeedStatsService(
 
     def log_new_transaction(self, tx_hash: Sha256Hash) -> None:
         interval_data = self.interval_data
+        new_transactions_sketch = interval_data.new_transactions_sketch
+        if new_transactions_sketch is not None:
+            tx_sketch_hash = sketch_hash(tx_hash)
+            new_transactions_sketch.add(tx_sketch_hash)
+            if not _is_sampled(tx_hash, tx_sketch_hash, interval_data.new_transaction_received_times):
+                return
         current_time = time.time()
 
         interval_data.new_transaction_received_times[tx_hash] = current_time
@@ -129,6 +169,16 @@ class TransactionFeedStatsService(
 
     def log_pending_transaction_from_internal(self, tx_hash: Sha256Hash) -> None:
         interval_data = self.interval_data
+        pending_transactions_from_internal_sketch = interval_data.pending_transactions_from_internal_sketch
+        pending_transactions_sketch = interval_data.pending_transactions_sketch
+        if pending_transactions_from_internal_sketch is not None and pending_transactions_sketch is not None:
+            tx_sketch_hash = sketch_hash(tx_hash)
+            pending_transactions_from_internal_sketch.add(tx_sketch_hash)
+            pending_transactions_sketch.add(tx_sketch_hash)
+            if not _is_sampled(
+                tx_hash, tx_sketch_hash, interval_data.pending_transaction_from_internal_received_times
+            ):
+                return
 
         if tx_hash in interval_data.pending_transaction_from_internal_received_times:
             return
@@ -154,6 +204,16 @@ class TransactionFeedStatsService(
 
     def log_pending_transaction_from_local(self, tx_hash: Sha256Hash) -> None:
         interval_data = self.interval_data
+        pending_transactions_from_local_sketch = interval_data.pending_transactions_from_local_sketch
+        pending_transactions_sketch = interval_data.pending_transactions_sketch
+        if pending_transactions_from_local_sketch is not None and pending_transactions_sketch is not None:
+            tx_sketch_hash = sketch_hash(tx_hash)
+            pending_transactions_from_local_sketch.add(tx_sketch_hash)
+            pending_transactions_sketch.add(tx_sketch_hash)
+            if not _is_sampled(
+                tx_hash, tx_sketch_hash, interval_data.pending_transaction_from_local_blockchain_received_times
+            ):
+                return
 
         if tx_hash in interval_data.pending_transaction_from_local_blockchain_received_times:
             return
@@ -175,4 +235,23 @@ class TransactionFeedStatsService(
         self.interval_data.pending_transactions_missing_contents += 1
 
 
+def _is_sampled(tx_hash: Sha256Hash, tx_sketch_hash: int, received_times: Dict[Sha256Hash, float]) -> bool:
+    """
+    Sampling by hash keeps the same transactions across feeds, so that their received times can be compared.
+    """
+    return (
+        tx_sketch_hash % gateway_constants.STATS_SKETCH_SAMPLE_RATE == 0
+        and (
+            tx_hash in received_times
+            or len(received_times) < gateway_constants.STATS_SKETCH_MAX_SAMPLED_TRANSACTIONS
+        )
+    )
+
+
+def _count(sketch: Optional[HyperLogLog], received_times: Dict[Sha256Hash, float]) -> int:
+    if sketch is None:
+        return len(received_times)
+    return sketch.count()
+
+
 transaction_feed_stats_service = TransactionFeedStatsService()
@@ -0,0 +1,152 @@
+"""
+Captures inbound blockchain node and relay messages to a file, for offline replay with
+`astragateway.testing.traffic_replay`.
+
+The capture file starts with a header followed by one record per message, all little-endian:
+
+    header: magic (4s), version (B), blockchain protocol length (B), blockchain protocol
+    record: timestamp (d), source (B), message type length (B), message length (I), message type, message bytes
+
+Message types are stored as their raw command bytes, or as `#<number>` for numeric (Ethereum) message types.
+"""
+import struct
+import time
+from enum import IntEnum
+from typing import BinaryIO, Union, Iterator, NamedTuple, Callable, Any
+
+from astracommon.connections.abstract_connection import AbstractConnection
+from astracommon.connections.connection_type import ConnectionType
+from astracommon.messages.abstract_message import AbstractMessage
+from astrautils import logging
+
+logger = logging.get_logger(__name__)
+
+CAPTURE_MAGIC = b"ATRC"
+CAPTURE_VERSION = 1
+
+_HEADER = struct.Struct("<4sBB")
+_RECORD_HEADER = struct.Struct("<dBBI")
+_NUMERIC_MESSAGE_TYPE_PREFIX = b"#"
+
+MessageType = Union[bytes, int]
+
+
+class TrafficSource(IntEnum):
+    BLOCKCHAIN_NODE = 0
+    RELAY = 1
+
+
+class CapturedMessage(NamedTuple):
+    timestamp: float
+    source: TrafficSource
+    message_type: MessageType
+    message_bytes: bytes
+
+
+class TrafficCaptureError(Exception):
+    pass
+
+
+def _encode_message_type(message_type: MessageType) -> bytes:
+    if isinstance(message_type, int):
+        return _NUMERIC_MESSAGE_TYPE_PREFIX + str(message_type).encode("ascii")
+    return bytes(message_type)
+
+
+def _decode_message_type(encoded_message_type: bytes) -> MessageType:
+    if encoded_message_type.startswith(_NUMERIC_MESSAGE_TYPE_PREFIX):
+        return int(encoded_message_type[len(_NUMERIC_MESSAGE_TYPE_PREFIX):])
+    return encoded_message_type
+
+
+class TrafficRecorder:
+    """
+    Records messages handled by blockchain node and relay connections.
+
+    Connections are instrumented by wrapping their message handlers, so messages are recorded after
+    parsing (and decryption, for Ethereum) but before the gateway processes them.
+    """
+    path: str
+    _capture_file: BinaryIO
+    recorded_count: int
+
+    def __init__(self, path: str, blockchain_protocol: str) -> None:
+        self.path = path
+        self.recorded_count = 0
+        encoded_protocol = blockchain_protocol.encode("utf-8")
+        # pylint: disable=consider-using-with
+        self._capture_file = open(path, "wb")
+        self._capture_file.write(_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, len(encoded_protocol)))
+        self._capture_file.write(encoded_protocol)
+        logger.info("Capturing blockchain node and relay traffic to {}.", path)
+
+    def attach(self, connection: AbstractConnection) -> None:
+        """
+        Starts recording messages of `connection`, if it is a blockchain node or relay connection.
+        """
+        if connection.CONNECTION_TYPE == ConnectionType.BLOCKCHAIN_NODE:
+            source = TrafficSource.BLOCKCHAIN_NODE
+        elif connection.CONNECTION_TYPE in ConnectionType.RELAY_ALL:
+            source = TrafficSource.RELAY
+        else:
+            return
+
+        connection.message_handlers = {
+            message_type: self._recording_handler(source, message_type, handler)
+            for message_type, handler in connection.message_handlers.items()
+        }
+
+    def record(self, source: TrafficSource, message_type: MessageType, message: AbstractMessage) -> None:
+        if self._capture_file.closed:
+            return
+        encoded_message_type = _encode_message_type(message_type)
+        message_bytes = message.rawbytes()
+        self._capture_file.write(
+            _RECORD_HEADER.pack(time.time(), source, len(encoded_message_type), len(message_bytes))
+        )
+        self._capture_file.write(encoded_message_type)
+        self._capture_file.write(message_bytes)
+        self.recorded_count += 1
+
+    def close(self) -> None:
+        if not self._capture_file.closed:
+            self._capture_file.close()
+            logger.info("Captured {} messages to {}.", self.recorded_count, self.path)
+
+    def _recording_handler(
+        self, source: TrafficSource, message_type: MessageType, handler: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        def record_and_handle(msg, *args, **kwargs):
+            self.record(source, message_type, msg)
+            return handler(msg, *args, **kwargs)
+        return record_and_handle
+
+
+def read_capture_protocol(capture_file: BinaryIO) -> str:
+    header = capture_file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise TrafficCaptureError("capture file is truncated")
+    magic, version, protocol_length = _HEADER.unpack(header)
+    if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+        raise TrafficCaptureError(f"unsupported capture format {magic!r} v{version}")
+    return capture_file.read(protocol_length).decode("utf-8")
+
+
+def iter_captured_messages(capture_file: BinaryIO) -> Iterator[CapturedMessage]:
+    """
+    Yields captured messages, to be called after `read_capture_protocol`.
+
+    A record cut short by a crash of the capturing gateway ends the iteration.
+    """
+    while True:
+        record_header = capture_file.read(_RECORD_HEADER.size)
+        if len(record_header) < _RECORD_HEADER.size:
+            return
+        timestamp, source, message_type_length, message_length = _RECORD_HEADER.unpack(record_header)
+        encoded_message_type = capture_file.read(message_type_length)
+        message_bytes = capture_file.read(message_length)
+        if len(message_bytes) < message_length:
+            return
+        yield CapturedMessage(
+            timestamp, TrafficSource(source), _decode_message_type(encoded_message_type), message_bytes
+        )
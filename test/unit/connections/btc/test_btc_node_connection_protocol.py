@@ -1,7 +1,10 @@
+import time
+
 from mock import MagicMock
 
 from astragateway.testing import gateway_helpers
 from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon import constants
 from astracommon.constants import LOCALHOST
 from astracommon.test_utils import helpers
 from astracommon.test_utils.mocks.mock_socket_connection import MockSocketConnection
@@ -69,6 +72,69 @@ class BtcNodeConnectionProtocolTest(AbstractTestCase):
         self.assertIn((InventoryType.MSG_TX, seen_block_hash), get_data_msg)
         self.assertIn((InventoryType.MSG_BLOCK, not_seen_block_hash), get_data_msg)
 
+    def test_inv_dedupes_known_transactions(self):
+        known_tx_hash = BtcObjectHash(buf=helpers.generate_bytearray(BTC_SHA_HASH_LEN), length=BTC_SHA_HASH_LEN)
+        self.node.get_tx_service().set_transaction_contents(known_tx_hash, helpers.generate_bytearray(250))
+
+        inv_message = InvBtcMessage(magic=123, inv_vects=[
+            (InventoryType.MSG_TX, self.tx_hash),
+            (InventoryType.MSG_TX, known_tx_hash),
+            (InventoryType.MSG_TX, self.tx_hash),
+            (InventoryType.MSG_BLOCK, self.block_hash),
+            (InventoryType.MSG_BLOCK, self.block_hash),
+        ])
+        self.sut.msg_inv(inv_message)
+
+        get_data_msg = GetDataBtcMessage(buf=self.sut.connection.get_bytes_to_send())
+        self.assertEqual(
+            [(InventoryType.MSG_TX, self.tx_hash), (InventoryType.MSG_BLOCK, self.block_hash)], list(get_data_msg)
+        )
+
+    def test_inv_transaction_requests_rate_limited(self):
+        time.time = MagicMock(return_value=time.time())
+        self.sut._tx_request_allowance = 1
+        self.sut._tx_request_allowance_time = time.time()
+        other_tx_hash = BtcObjectHash(buf=helpers.generate_bytearray(BTC_SHA_HASH_LEN), length=BTC_SHA_HASH_LEN)
+
+        inv_message = InvBtcMessage(magic=123, inv_vects=[
+            (InventoryType.MSG_TX, self.tx_hash),
+            (InventoryType.MSG_TX, other_tx_hash),
+            (InventoryType.MSG_BLOCK, self.block_hash),
+        ])
+        self.sut.msg_inv(inv_message)
+
+        get_data_msg_bytes = self.sut.connection.get_bytes_to_send()
+        get_data_msg = GetDataBtcMessage(buf=get_data_msg_bytes)
+        self.assertEqual(
+            [(InventoryType.MSG_TX, self.tx_hash), (InventoryType.MSG_BLOCK, self.block_hash)], list(get_data_msg)
+        )
+        self.assertEqual(0, self.sut._tx_request_allowance)
+        self.sut.connection.advance_sent_bytes(len(get_data_msg_bytes))
+
+        # announced again while queued, requested once
+        self.sut.msg_inv(InvBtcMessage(magic=123, inv_vects=[(InventoryType.MSG_TX, other_tx_hash)]))
+        self.assertEqual(1, len(self.sut._queued_tx_requests))
+
+        time.time = MagicMock(return_value=time.time() + 1)
+        self.assertEqual(constants.CANCEL_ALARMS, self.sut._request_queued_transactions())
+        get_data_msg = GetDataBtcMessage(buf=self.sut.connection.get_bytes_to_send())
+        self.assertEqual([(InventoryType.MSG_TX, other_tx_hash)], list(get_data_msg))
+        self.assertEqual(0, len(self.sut._queued_tx_requests))
+
+    def test_get_data_answered_with_single_inv(self):
+        self.sut.msg_proxy_request = MagicMock()
+        get_data_message = GetDataBtcMessage(magic=123, inv_vects=[
+            (InventoryType.MSG_TX, self.tx_hash),
+            (InventoryType.MSG_BLOCK, self.block_hash),
+        ])
+        self.sut.msg_get_data(get_data_message)
+
+        inv_msg = InvBtcMessage(buf=self.sut.connection.get_bytes_to_send())
+        self.assertEqual(
+            [(InventoryType.MSG_BLOCK, self.tx_hash), (InventoryType.MSG_BLOCK, self.block_hash)], list(inv_msg)
+        )
+        self.sut.msg_proxy_request.assert_called_once_with(get_data_message, self.connection)
+
     def test_get_data_segwit(self):
         self._test_get_data(True)
 
@@ -1,8 +1,9 @@
 import time
 from asyncio import Future
+from concurrent import futures
 from typing import Optional, List
 from unittest import skip
-from mock import MagicMock, call
+from mock import MagicMock, call, patch
 
 from astracommon.messages.abstract_block_message import AbstractBlockMessage
 from astracommon.messages.abstract_message import AbstractMessage
@@ -28,6 +29,7 @@ from astracommon.utils.alarm_queue import AlarmQueue
 from astracommon.utils.buffers.output_buffer import OutputBuffer
 from astragateway import gateway_constants
 from astragateway.connections.abstract_gateway_blockchain_connection import AbstractGatewayBlockchainConnection
+from astragateway.connections import abstract_gateway_node
 from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
 from astragateway.connections.abstract_relay_connection import AbstractRelayConnection
 from astragateway.connections.btc.btc_node_connection import BtcNodeConnection
@@ -589,6 +591,31 @@ class AbstractGatewayNodeTest(AbstractTestCase):
         self.assertEqual(relay1.ip, next(iter(node.peer_transaction_relays)).ip)
         self.assertEqual(relay1.port + 1, next(iter(node.peer_transaction_relays)).port)
 
+    @patch(f"{abstract_gateway_node.__name__}.node_cache")
+    def test_revalidated_account_model_applied(self, node_cache):
+        node = GatewayNode(gateway_helpers.get_gateway_opts(8000))
+        node.opts.set_account_options = MagicMock()
+        node.feed_worker_client = MagicMock()
+        account_model = MagicMock(account_id="account-1")
+        account_model.is_account_valid.return_value = True
+
+        revalidation = futures.Future()
+        revalidation.set_result(account_model)
+        node._on_account_model_revalidated(revalidation)
+
+        self.assertEqual(account_model, node.account_model)
+        node.opts.set_account_options.assert_called_once_with(account_model)
+        node.feed_worker_client.set_account_model.assert_called_once_with(account_model)
+        node_cache.update_cache_file.assert_called_with(node.opts, accounts={"account-1": account_model})
+
+        # the cached account is kept if the revalidation failed
+        node_cache.update_cache_file.reset_mock()
+        failed_revalidation = futures.Future()
+        failed_revalidation.set_result(None)
+        node._on_account_model_revalidated(failed_revalidation)
+        self.assertEqual(account_model, node.account_model)
+        node_cache.update_cache_file.assert_not_called()
+
     def _check_connection_pool(self, node, all, relay_block, relay_tx, relay_all):
         self.assertEqual(all, len(node.connection_pool))
         self.assertEqual(relay_block, len(list(node.connection_pool.get_by_connection_types([ConnectionType.RELAY_BLOCK]))))
@@ -12,6 +12,7 @@ from astracommon.utils.object_hash import Sha256Hash
 from astragateway.connections.abstract_gateway_node import AbstractGatewayNode
 from astragateway.connections.gateway_connection import GatewayConnection
 from astragateway.messages.gateway.block_propagation_request import BlockPropagationRequestMessage
+from astragateway.messages.gateway.confirmed_tx_batch_message import ConfirmedTxBatchMessage
 from astragateway.messages.gateway.confirmed_tx_message import ConfirmedTxMessage
 from astragateway.messages.gateway.gateway_hello_message import GatewayHelloMessage
 from astragateway.messages.gateway.gateway_version_manager import gateway_version_manager
@@ -339,3 +340,32 @@ class GatewayConnectionTest(AbstractTestCase):
         )
         self.connection.msg_confirmed_tx(message)
         self.node.feed_manager.publish_to_feed.assert_called_once()
+
+    def test_msg_confirmed_tx_batch(self):
+        self.node.feed_manager.publish_to_feed = MagicMock()
+
+        unknown_tx_hash = helpers.generate_object_hash()
+        known_tx_hash = helpers.generate_object_hash()
+        known_tx_contents = rlp.encode(mock_eth_messages.get_dummy_transaction(2))
+        self.node.get_tx_service().set_transaction_contents(known_tx_hash, known_tx_contents)
+        tx_hash = helpers.generate_object_hash()
+        tx_contents = rlp.encode(mock_eth_messages.get_dummy_transaction(1))
+
+        message = ConfirmedTxBatchMessage([
+            (unknown_tx_hash, ConfirmedTxBatchMessage.EMPTY_TX_VAL),
+            (known_tx_hash, ConfirmedTxBatchMessage.EMPTY_TX_VAL),
+            (tx_hash, tx_contents),
+        ])
+        self.connection.msg_confirmed_tx_batch(message)
+
+        self.assertEqual(2, self.node.feed_manager.publish_to_feed.call_count)
+        published_transactions = [
+            call[0][1] for call in self.node.feed_manager.publish_to_feed.call_args_list
+        ]
+        self.assertEqual(known_tx_hash, published_transactions[0].tx_hash)
+        self.assertEqual(tx_hash, published_transactions[1].tx_hash)
+
+    def test_supports_confirmed_tx_batches(self):
+        self.assertTrue(self.connection.supports_confirmed_tx_batches())
+        self.connection.protocol_version = 2
+        self.assertFalse(self.connection.supports_confirmed_tx_batches())
@@ -0,0 +1,17 @@
+from unittest import TestCase
+
+from astracommon.models.blockchain_protocol import BlockchainProtocol
+from astragateway.connections import gateway_node_factory
+
+
+class GatewayNodeFactoryTest(TestCase):
+
+    def test_get_gateway_node_type(self):
+        eth_node_class = gateway_node_factory.get_gateway_node_type(BlockchainProtocol.ETHEREUM.value)
+        ont_node_class = gateway_node_factory.get_gateway_node_type(BlockchainProtocol.ONTOLOGY.value)
+        btc_node_class = gateway_node_factory.get_gateway_node_type(BlockchainProtocol.BITCOIN.value)
+
+        self.assertEqual("EthGatewayNode", eth_node_class.__name__)
+        self.assertEqual("OntGatewayNode", ont_node_class.__name__)
+        self.assertEqual("BtcGatewayNode", btc_node_class.__name__)
+        self.assertIs(eth_node_class, gateway_node_factory.get_gateway_node_type(BlockchainProtocol.ETHEREUM.value))
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import socket
+import tempfile
+import time
+from typing import Tuple
+
+from mock import MagicMock, patch
+
+from astracommon.feed.eth.eth_raw_transaction import EthRawTransaction
+from astracommon.feed.feed import FeedKey
+from astracommon.feed.feed_manager import FeedManager
+from astracommon.feed.feed_source import FeedSource
+from astracommon.feed.new_transaction_feed import RawTransactionFeedEntry
+from astracommon.test_utils import helpers
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon.test_utils.helpers import async_test
+from astracommon.utils.object_hash import Sha256Hash
+
+from astragateway.feed import feed_worker_protocol
+from astragateway.feed.feed_worker_client import FeedWorkerClient, FeedWorkerFeedManager
+from astragateway.feed.feed_worker_protocol import FeedWorkerFrameType, FrameReader
+
+
+class FeedWorkerTest(AbstractTestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, "feed_worker.sock")
+        self.tx_hash = Sha256Hash(helpers.generate_hash())
+        self.tx_contents = memoryview(helpers.generate_bytearray(250))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_feed_entries_round_trip(self):
+        raw_entry = RawTransactionFeedEntry(self.tx_hash, self.tx_contents, local_region=True)
+        eth_entry = EthRawTransaction(self.tx_hash, self.tx_contents, FeedSource.BDN_SOCKET, local_region=False)
+        frames = feed_worker_protocol.encode_feed_entry(FeedKey("newTxs", 5), raw_entry)
+        frames += feed_worker_protocol.encode_feed_entry(FeedKey("pendingTxs", 5), eth_entry)
+
+        reader = FrameReader()
+        # frames split at arbitrary points are only returned once complete
+        decoded = reader.feed(frames[:10]) + reader.feed(frames[10:-3]) + reader.feed(frames[-3:])
+
+        self.assertEqual(2, len(decoded))
+        (first_type, first_payload), (second_type, second_payload) = decoded
+        self.assertEqual(FeedWorkerFrameType.FEED_ENTRY, first_type)
+        self.assertEqual(FeedWorkerFrameType.FEED_ENTRY, second_type)
+
+        feed_key, entry = feed_worker_protocol.decode_feed_entry(first_payload)
+        self.assertEqual(FeedKey("newTxs", 5), feed_key)
+        self.assertIsInstance(entry, RawTransactionFeedEntry)
+        self.assertEqual(self.tx_hash, entry.tx_hash)
+        self.assertEqual(self.tx_contents, entry.tx_contents)
+        self.assertTrue(entry.local_region)
+
+        feed_key, entry = feed_worker_protocol.decode_feed_entry(second_payload)
+        self.assertEqual(FeedKey("pendingTxs", 5), feed_key)
+        self.assertIsInstance(entry, EthRawTransaction)
+        self.assertEqual(FeedSource.BDN_SOCKET, entry.source)
+        self.assertFalse(entry.local_region)
+
+    def test_client_forwards_entries_and_subscriber_updates(self):
+        on_subscribers_changed = MagicMock()
+        client = FeedWorkerClient(self.socket_path, on_subscribers_changed)
+        entry = RawTransactionFeedEntry(self.tx_hash, self.tx_contents, local_region=True)
+
+        client.poll()
+        client.publish(FeedKey("newTxs"), entry)
+        self.assertFalse(client.is_connected())
+
+        server, worker_socket = self._connect_worker(client)
+        self.assertTrue(client.is_connected())
+
+        # not forwarded without subscribers
+        unsubscribed_entry = RawTransactionFeedEntry(Sha256Hash(helpers.generate_hash()), self.tx_contents)
+        client.publish(FeedKey("newTxs"), unsubscribed_entry)
+
+        worker_socket.sendall(feed_worker_protocol.encode_frame(FeedWorkerFrameType.SUBSCRIBERS, b"\x01"))
+        time.sleep(0.01)
+        client.poll()
+        self.assertTrue(client.has_subscribers)
+        on_subscribers_changed.assert_called_once()
+
+        client.publish(FeedKey("newTxs"), entry)
+        frames = FrameReader().feed(worker_socket.recv(4096))
+        self.assertEqual(1, len(frames))
+        _feed_key, received_entry = feed_worker_protocol.decode_feed_entry(frames[0][1])
+        self.assertEqual(self.tx_hash, received_entry.tx_hash)
+
+        worker_socket.close()
+        time.sleep(0.01)
+        client.poll()
+        self.assertFalse(client.is_connected())
+        self.assertFalse(client.has_subscribers)
+        self.assertEqual(2, on_subscribers_changed.call_count)
+        server.close()
+
+    @async_test
+    async def test_client_coalesces_entries_published_in_loop_iteration(self):
+        client = FeedWorkerClient(self.socket_path, MagicMock())
+        server, worker_socket = self._connect_worker(client)
+        worker_socket.sendall(feed_worker_protocol.encode_frame(FeedWorkerFrameType.SUBSCRIBERS, b"\x01"))
+        time.sleep(0.01)
+        client.poll()
+
+        entry = RawTransactionFeedEntry(self.tx_hash, self.tx_contents, local_region=True)
+        for _ in range(3):
+            client.publish(FeedKey("newTxs"), entry)
+        worker_socket.setblocking(False)
+        with self.assertRaises(BlockingIOError):
+            worker_socket.recv(4096)
+
+        await asyncio.sleep(0)
+        worker_socket.settimeout(1)
+        self.assertEqual(3, len(FrameReader().feed(worker_socket.recv(4096))))
+
+        client.close()
+        worker_socket.close()
+        server.close()
+
+    def test_feed_manager_publishes_in_process_to_subscribed_feeds(self):
+        client = MagicMock()
+        feed_manager = FeedWorkerFeedManager(MagicMock(), client)
+        feed = MagicMock()
+        feed_manager.get_feed = MagicMock(return_value=feed)
+        entry = RawTransactionFeedEntry(self.tx_hash, self.tx_contents, local_region=True)
+
+        with patch.object(FeedManager, "publish_to_feed") as in_process_publish:
+            feed.subscriber_count.return_value = 0
+            feed_manager.publish_to_feed(FeedKey("newTxs"), entry)
+            client.publish.assert_called_once_with(FeedKey("newTxs"), entry)
+            in_process_publish.assert_not_called()
+
+            feed.subscriber_count.return_value = 1
+            feed_manager.publish_to_feed(FeedKey("newTxs"), entry)
+            self.assertEqual(2, client.publish.call_count)
+            in_process_publish.assert_called_once_with(FeedKey("newTxs"), entry)
+
+            # feeds not served by the worker are always published in process
+            feed.subscriber_count.return_value = 0
+            feed_manager.publish_to_feed(FeedKey("newBlocks"), entry)
+            self.assertEqual(2, client.publish.call_count)
+            in_process_publish.assert_called_with(FeedKey("newBlocks"), entry)
+
+    def _connect_worker(self, client: FeedWorkerClient) -> Tuple[socket.socket, socket.socket]:
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(1)
+        client.poll()
+        worker_socket, _ = server.accept()
+        worker_socket.settimeout(1)
+        return server, worker_socket
@@ -16,6 +16,7 @@ from astragateway.messages.gateway.blockchain_sync_response_message import (
     BlockchainSyncResponseMessage,
 )
 from astragateway.messages.gateway.confirmed_block_message import ConfirmedBlockMessage
+from astragateway.messages.gateway.confirmed_tx_batch_message import ConfirmedTxBatchMessage
 from astragateway.messages.gateway.confirmed_tx_message import ConfirmedTxMessage
 from astragateway.messages.gateway.gateway_hello_message import GatewayHelloMessage
 from astragateway.messages.gateway.gateway_message_factory import gateway_message_factory
@@ -58,6 +59,12 @@ class GatewayMessageFactoryTest(MessageFactoryTestCase):
             GatewayMessageType.CONFIRMED_TX,
             ConfirmedTxMessage.PAYLOAD_LENGTH + len(self.TX_VAL),
         )
+        self.get_message_preview_successfully(
+            ConfirmedTxBatchMessage([(self.HASH, self.TX_VAL)]),
+            GatewayMessageType.CONFIRMED_TX_BATCH,
+            constants.UL_INT_SIZE_IN_BYTES + ConfirmedTxBatchMessage.ENTRY_HEADER_LENGTH + len(self.TX_VAL)
+            + constants.CONTROL_FLAGS_LEN,
+        )
         self.get_message_preview_successfully(
             ConfirmedBlockMessage(self.HASH, self.BLOCK_VAL),
             GatewayMessageType.CONFIRMED_BLOCK,
@@ -142,6 +149,16 @@ class GatewayMessageFactoryTest(MessageFactoryTestCase):
         self.assertEqual(self.HASH, confirmed_tx_no_content.tx_hash())
         self.assertEqual(TxMessage.EMPTY_TX_VAL, confirmed_tx_no_content.tx_val())
 
+        other_hash = Sha256Hash(crypto.double_sha256(b"234"))
+        confirmed_tx_batch: ConfirmedTxBatchMessage = self.create_message_successfully(
+            ConfirmedTxBatchMessage([(self.HASH, self.TX_VAL), (other_hash, TxMessage.EMPTY_TX_VAL)]),
+            ConfirmedTxBatchMessage
+        )
+        self.assertEqual(2, confirmed_tx_batch.count())
+        self.assertEqual(
+            [(self.HASH, self.TX_VAL), (other_hash, TxMessage.EMPTY_TX_VAL)], confirmed_tx_batch.transactions()
+        )
+
         confirmed_block: ConfirmedBlockMessage = self.create_message_successfully(
             ConfirmedBlockMessage(self.HASH, self.BLOCK_VAL), ConfirmedBlockMessage
         )
@@ -15,7 +15,7 @@ class GatewayVersionManagerTest(AbstractTestCase):
 
         hello_msg_v1 = gateway_version_manager.convert_message_to_older_version(1, hello_msg)
         self.assertIsInstance(hello_msg_v1, GatewayHelloMessageV1)
-        self.assertEqual(2, hello_msg.protocol_version())
+        self.assertEqual(gateway_version_manager.CURRENT_PROTOCOL_VERSION, hello_msg.protocol_version())
         self.assertEqual(hello_msg_v1.network_num(), hello_msg.network_num())
         self.assertEqual(hello_msg_v1.ip(), hello_msg.ip())
         self.assertEqual(hello_msg_v1.port(), hello_msg.port())
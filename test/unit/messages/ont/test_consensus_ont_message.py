@@ -0,0 +1,74 @@
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon.utils import crypto
+from astracommon.utils.blockchain_utils.ont.ont_object_hash import OntObjectHash
+
+from astragateway import ont_constants
+from astragateway.messages.ont import ont_messages_util
+from astragateway.messages.ont.block_ont_message import BlockOntMessage
+from astragateway.messages.ont.consensus_ont_message import OntConsensusMessage, scan_consensus_data
+from astragateway.testing.mocks import mock_ont_messages
+
+
+class OntConsensusMessageTest(AbstractTestCase):
+    MAGIC = 12345
+    VERSION = 111
+
+    def setUp(self) -> None:
+        self.txns = [mock_ont_messages.ont_transaction(nonce, 50 + nonce) for nonce in range(5)]
+        self.block = BlockOntMessage(
+            self.MAGIC,
+            self.VERSION,
+            OntObjectHash(bytearray(crypto.double_sha256(b"123")), length=ont_constants.ONT_HASH_LEN),
+            OntObjectHash(bytearray(crypto.double_sha256(b"234")), length=ont_constants.ONT_HASH_LEN),
+            OntObjectHash(bytearray(crypto.double_sha256(b"345")), length=ont_constants.ONT_HASH_LEN),
+            1,
+            2,
+            3,
+            bytes(b"111"),
+            bytes(20),
+            [bytes(33)] * 3,
+            [bytes(2)] * 2,
+            self.txns,
+            OntObjectHash(bytearray(crypto.double_sha256(b"456")), length=ont_constants.ONT_HASH_LEN),
+        )
+
+    def test_parse_block_proposal(self):
+        message = mock_ont_messages.consensus_ont_message(self.block, payload_tail=b"tail")
+        message = OntConsensusMessage(buf=bytearray(message.rawbytes()))
+
+        self.assertEqual(ont_constants.BLOCK_PROPOSAL_CONSENSUS_MESSAGE_TYPE, message.consensus_data_type())
+        self.assertEqual(self.block.block_hash(), message.block_hash())
+        self.assertEqual(self.block.prev_block_hash(), message.prev_block_hash())
+        self.assertEqual(len(self.txns), message.txn_count())
+        self.assertEqual(self.txns, [bytearray(tx) for tx in message.txns()])
+        self.assertEqual(
+            [ont_messages_util.get_txid(tx)[0] for tx in self.txns], message.tx_hashes()
+        )
+        self.assertEqual(b"tail", message.payload_tail().tobytes())
+        self.assertEqual(bytes(66), message.owner_and_signature().tobytes())
+
+    def test_parse_matches_json_decoding(self):
+        compact_message = mock_ont_messages.consensus_ont_message(self.block)
+        indented_message = mock_ont_messages.consensus_ont_message(self.block, indent=True)
+        # buffers other than bytearrays are not scanned, and take the JSON decoding path
+        decoded_message = OntConsensusMessage(buf=memoryview(bytearray(compact_message.rawbytes())))
+
+        for message in [OntConsensusMessage(buf=bytearray(compact_message.rawbytes())),
+                        OntConsensusMessage(buf=bytearray(indented_message.rawbytes()))]:
+            self.assertEqual(decoded_message.consensus_data_len(), message.consensus_data_len())
+            self.assertEqual(decoded_message.block_hash(), message.block_hash())
+            self.assertEqual(decoded_message.txns(), message.txns())
+            self.assertEqual(decoded_message.tx_hashes(), message.tx_hashes())
+            self.assertEqual(decoded_message.txn_header(), message.txn_header())
+            self.assertEqual(decoded_message.payload_tail(), message.payload_tail())
+
+    def test_scan_consensus_data(self):
+        data = b'{"type":0,"len":3,"payload":"YWJj"}'
+        self.assertEqual((0, 3, 29, 33), scan_consensus_data(data, 0, len(data)))
+        self.assertEqual(b"YWJj", data[29:33])
+
+        data = b'{"type":1,"len":3}'
+        self.assertEqual((1, -1, -1, -1), scan_consensus_data(data, 0, len(data)))
+
+        data = b'{"type":0,"len":3}'
+        self.assertIsNone(scan_consensus_data(data, 0, len(data)))
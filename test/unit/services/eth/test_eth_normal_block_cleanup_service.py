@@ -6,6 +6,7 @@ from astracommon.services.transaction_service import TransactionService
 from astracommon.test_utils import helpers
 from astracommon.utils import convert
 from astracommon.utils.object_hash import Sha256Hash, SHA256_HASH_LEN
+from astragateway import gateway_constants
 from astragateway.messages.eth.protocol.new_block_eth_protocol_message import NewBlockEthProtocolMessage
 from astragateway.testing.abstract_block_cleanup_service_test import AbstractBlockCleanupServiceTest
 from astragateway.services.eth.abstract_eth_block_cleanup_service import AbstractEthBlockCleanupService
@@ -16,6 +17,8 @@ from astragateway.services.eth.eth_block_queuing_service import EthBlockQueuingS
 class EthBlockCleanupServiceTests(AbstractBlockCleanupServiceTest):
     def setUp(self) -> None:
         super().setUp()
+        self._original_slice_size = gateway_constants.BLOCK_CLEANUP_TX_SLICE_SIZE
+        self._original_slice_time_budget = gateway_constants.BLOCK_CLEANUP_SLICE_TIME_BUDGET_S
         node_conn = MagicMock()
         self.node.block_queuing_service = EthBlockQueuingService(self.node, node_conn)
         self.node.connection_pool.add(1, "127.0.0.0", 8002, node_conn)
@@ -93,6 +96,39 @@ class EthBlockCleanupServiceTests(AbstractBlockCleanupServiceTest):
     def test_block_confirmation_cleanup(self):
         self._test_block_confirmation_cleanup()
 
+    def test_block_cleanup_over_time_budget_is_sliced(self):
+        gateway_constants.BLOCK_CLEANUP_TX_SLICE_SIZE = 10
+        gateway_constants.BLOCK_CLEANUP_SLICE_TIME_BUDGET_S = 0
+        self.node.alarm_queue.register_alarm = MagicMock()
+
+        block_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        tx_hashes = [Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN)) for _ in range(25)]
+        for short_id, tx_hash in enumerate(tx_hashes, 1):
+            self.transaction_service.set_transaction_contents(tx_hash, helpers.generate_bytearray(100))
+            self.transaction_service.assign_short_id(tx_hash, short_id)
+        self.cleanup_service._block_hash_marked_for_cleanup.add(block_hash)
+
+        self.cleanup_service.clean_block_transactions_by_block_components(
+            block_hash, iter(tx_hashes), self.transaction_service
+        )
+        for _ in range(2):
+            self.node.post_block_cleanup_tasks.assert_not_called()
+            self.assertTrue(self.cleanup_service.is_marked_for_cleanup(block_hash))
+            self.node.alarm_queue.register_alarm.assert_called_once()
+            _, callback, cleanup_progress = self.node.alarm_queue.register_alarm.call_args[0]
+            self.node.alarm_queue.register_alarm.reset_mock()
+            callback(cleanup_progress)
+
+        self.node.alarm_queue.register_alarm.assert_not_called()
+        self.assertFalse(self.cleanup_service.is_marked_for_cleanup(block_hash))
+        self.assertEqual(0, self.transaction_service._total_tx_contents_size)
+        self.node.post_block_cleanup_tasks.assert_called_once_with(block_hash, list(range(1, 26)), [])
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        gateway_constants.BLOCK_CLEANUP_TX_SLICE_SIZE = self._original_slice_size
+        gateway_constants.BLOCK_CLEANUP_SLICE_TIME_BUDGET_S = self._original_slice_time_budget
+
     def _get_transaction_service(self) -> TransactionService:
         return TransactionService(self.node, 1)
 
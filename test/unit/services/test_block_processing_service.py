@@ -1,3 +1,4 @@
+import asyncio
 import time
 
 from mock import MagicMock
@@ -7,12 +8,13 @@ from astracommon.test_utils.abstract_test_case import AbstractTestCase
 from astracommon.constants import LOCALHOST
 from astracommon.messages.astra.block_holding_message import BlockHoldingMessage
 from astracommon.test_utils import helpers
+from astracommon.test_utils.helpers import async_test
 from astracommon.test_utils.mocks.mock_connection import MockConnection
 from astracommon.test_utils.mocks.mock_socket_connection import MockSocketConnection
 from astracommon.utils import crypto
 from astracommon.utils.object_hash import Sha256Hash
 
-from astragateway.services.block_processing_service import BlockProcessingService
+from astragateway.services.block_processing_service import BlockProcessingService, CompressionTxServiceView
 from astragateway.services.push_block_queuing_service import PushBlockQueuingService
 from astragateway.services.block_recovery_service import BlockRecoveryService
 from astragateway.services.neutrality_service import NeutralityService
@@ -143,5 +145,80 @@ class BlockHoldingServiceTest(AbstractTestCase):
 
         self.assertEqual(0, len(self.sut._holds.contents))
 
+    @async_test
+    async def test_blocks_compressed_off_loop_propagated_in_order(self):
+        self.node.opts.block_compression_threads = 2
+        self.node.opts.use_extensions = False
+        self.sut = BlockProcessingService(self.node)
+        connection = MockBlockchainConnection(
+            MockSocketConnection(1, node=self.node, ip_address=LOCALHOST, port=8000), self.node
+        )
+        block_hashes = [Sha256Hash(helpers.generate_bytearray(crypto.SHA256_HASH_LEN)) for _ in range(2)]
+        converted_blocks = {
+            block_hash: (memoryview(helpers.generate_bytearray(10)), MagicMock(block_hash=block_hash, duration_ms=1))
+            for block_hash in block_hashes
+        }
+
+        def block_to_astra_block(block_message, *_args):
+            if block_message.block_hash() == block_hashes[0]:
+                # the first block finishes compressing last
+                time.sleep(0.05)
+            return converted_blocks[block_message.block_hash()]
+
+        self.node.message_converter = MagicMock()
+        self.node.message_converter.block_to_astra_block = MagicMock(side_effect=block_to_astra_block)
+        self.sut._broadcast_converted_block = MagicMock()
+
+        for block_hash in block_hashes:
+            self.sut._process_and_broadcast_block(MockBlockMessage(block_hash), connection)
+        await self._wait_for(lambda: self.sut._broadcast_converted_block.call_count == 2)
+
+        propagated_hashes = [call[0][0].block_hash() for call in self.sut._broadcast_converted_block.call_args_list]
+        self.assertEqual(block_hashes, propagated_hashes)
+        # off-loop conversions are recorded as such, and not as on-loop conversions
+        self.assertEqual(
+            [True, True], [call[0][4] for call in self.sut._broadcast_converted_block.call_args_list]
+        )
+        self.assertEqual({}, self.sut._pending_compressions)
+        self.sut.close()
+
+    @async_test
+    async def test_block_recompressed_on_loop_if_short_ids_changed(self):
+        self.node.opts.block_compression_threads = 1
+        self.node.opts.use_extensions = False
+        self.sut = BlockProcessingService(self.node)
+        connection = MockBlockchainConnection(
+            MockSocketConnection(1, node=self.node, ip_address=LOCALHOST, port=8000), self.node
+        )
+        block_hash = Sha256Hash(helpers.generate_bytearray(crypto.SHA256_HASH_LEN))
+        tx_hash = Sha256Hash(helpers.generate_bytearray(crypto.SHA256_HASH_LEN))
+        converted_block = (memoryview(helpers.generate_bytearray(10)), MagicMock(block_hash=block_hash, duration_ms=1))
+
+        def block_to_astra_block(_block_message, tx_service, *_args):
+            if isinstance(tx_service, CompressionTxServiceView):
+                tx_service.used_short_ids[1] = tx_hash
+            return converted_block
+
+        self.node.message_converter = MagicMock()
+        self.node.message_converter.block_to_astra_block = MagicMock(side_effect=block_to_astra_block)
+        self.sut._broadcast_converted_block = MagicMock()
+        # short id 1 was reassigned to another transaction while the block was compressed
+        self.node.get_tx_service().get_transaction = MagicMock(return_value=MagicMock(hash=None))
+
+        self.sut._process_and_broadcast_block(MockBlockMessage(block_hash), connection)
+        await self._wait_for(lambda: self.sut._broadcast_converted_block.call_count == 1)
+
+        self.assertEqual(2, self.node.message_converter.block_to_astra_block.call_count)
+        self.assertIs(self.node.get_tx_service(), self.node.message_converter.block_to_astra_block.call_args[0][1])
+        self.assertFalse(self.sut._broadcast_converted_block.call_args[0][4])
+        self.sut.close()
+
+    async def _wait_for(self, condition):
+        for _ in range(200):
+            if condition():
+                return
+            await asyncio.sleep(0.01)
+        self.fail("Condition not met in time")
+
     def _assert_block_propagated(self, block_hash):
         self.node.neutrality_service.propagate_block_to_network.assert_called_once()
@@ -35,6 +35,19 @@ class BlockRecoveryManagerTest(AbstractTestCase):
         self._add_block(1)
         self._add_block(2)
 
+    def test_add_block_tracks_total_block_bytes(self):
+        self._add_block()
+        self._add_block(1)
+        self.assertEqual(
+            len(self.blocks[0]) + len(self.blocks[1]), self.block_recovery_service.total_block_bytes
+        )
+
+        self.block_recovery_service.cancel_recovery_for_block(self.block_hashes[0])
+        self.assertEqual(len(self.blocks[1]), self.block_recovery_service.total_block_bytes)
+
+        self.block_recovery_service.cleanup_old_blocks(time.time() + gateway_constants.BLOCK_RECOVERY_MAX_QUEUE_TIME + 1)
+        self.assertEqual(0, self.block_recovery_service.total_block_bytes)
+
     def test_check_missing_sid(self):
         self._add_block()
 
@@ -93,6 +106,32 @@ class BlockRecoveryManagerTest(AbstractTestCase):
         self.assertEqual(self.block_recovery_service.recovered_blocks[0][0], self.blocks[0])
         self.assertEqual(self.block_recovery_service.recovered_blocks[0][1], RecoveredTxsSource.TXS_RECEIVED_FROM_BDN)
 
+    def test_check_missing_transactions__batch(self):
+        self._add_block()
+        self._add_block(1)
+
+        sids = self.unknown_tx_sids[0]
+        tx_hashes = self.unknown_tx_hashes[0] + [Sha256Hash(os.urandom(32))]
+        batch = list(zip(sids, tx_hashes))
+        batch.append((self.unknown_tx_sids[1][0], Sha256Hash(os.urandom(32))))
+
+        affected_blocks = self.block_recovery_service.check_missing_transactions(
+            batch, RecoveredTxsSource.COMPRESSED_BLOCK_TXS_RECEIVED
+        )
+
+        self.assertEqual(set(self.astra_block_hashes), affected_blocks)
+        self.assertEqual(1, len(self.block_recovery_service.recovered_blocks))
+        self.assertEqual(self.blocks[0], self.block_recovery_service.recovered_blocks[0][0])
+        self.assertEqual(
+            RecoveredTxsSource.COMPRESSED_BLOCK_TXS_RECEIVED, self.block_recovery_service.recovered_blocks[0][1]
+        )
+        self.assertFalse(self.block_recovery_service.awaiting_recovery(self.block_hashes[0]))
+        self.assertTrue(self.block_recovery_service.awaiting_recovery(self.block_hashes[1]))
+        self.assertEqual(
+            set(self.unknown_tx_sids[1][1:]),
+            self.block_recovery_service._astra_block_hash_to_sids[self.astra_block_hashes[1]]
+        )
+
     def test_clean_up_old_blocks__single_block(self):
         self.assertFalse(self.block_recovery_service._cleanup_scheduled)
         self.assertEqual(len(self.alarm_queue.alarms), 0)
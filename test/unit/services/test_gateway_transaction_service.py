@@ -1,6 +1,9 @@
 from mock import MagicMock
 
-from astragateway.services.gateway_transaction_service import GatewayTransactionService
+from astracommon.test_utils import helpers
+from astracommon.utils.object_hash import Sha256Hash, SHA256_HASH_LEN
+from astragateway.services.gateway_transaction_service import GatewayTransactionService, \
+    remove_transactions_one_by_one
 from astracommon.test_utils.abstract_transaction_service_test_case import AbstractTransactionServiceTestCase
 
 
@@ -65,5 +68,54 @@ class GatewayTransactionServiceTest(AbstractTransactionServiceTestCase):
     def test_get_transactions(self):
         self._test_get_transactions()
 
+    def test_remove_transactions_by_tx_hashes_matches_one_by_one_removal(self):
+        tx_hashes = [Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN)) for _ in range(8)]
+        bulk_transaction_service = self._get_transaction_service()
+        transaction_service = self._get_transaction_service()
+        for service in [bulk_transaction_service, transaction_service]:
+            # transactions with contents and short ids, contents only and short ids only, and unknown transactions
+            for short_id, tx_hash in enumerate(tx_hashes[:3], 1):
+                service.set_transaction_contents(tx_hash, bytearray(100 + short_id))
+                service.assign_short_id(tx_hash, short_id)
+            service.assign_short_id(tx_hashes[0], 10)
+            service.set_transaction_contents(tx_hashes[3], bytearray(200))
+            service.assign_short_id(tx_hashes[4], 11)
+            service.set_transaction_contents(tx_hashes[5], bytearray(300))
+
+        removed_tx_hashes = tx_hashes[:5] + tx_hashes[6:]
+        bulk_result = bulk_transaction_service.remove_transactions_by_tx_hashes(removed_tx_hashes)
+        result = remove_transactions_one_by_one(transaction_service, removed_tx_hashes)
+
+        self.assertEqual(sorted(result[0]), sorted(bulk_result[0]))
+        self.assertEqual([1, 2, 3, 10, 11], sorted(bulk_result[0]))
+        self.assertEqual(result[1], bulk_result[1])
+        self.assertEqual(tx_hashes[6:], bulk_result[1])
+        self.assertEqual(300, bulk_transaction_service._total_tx_contents_size)
+        self.assertEqual(transaction_service._total_tx_contents_size, bulk_transaction_service._total_tx_contents_size)
+        self.assertEqual(transaction_service.get_short_id_count(), bulk_transaction_service.get_short_id_count())
+        self.assertEqual(
+            transaction_service.get_tx_hash_to_contents_len(), bulk_transaction_service.get_tx_hash_to_contents_len()
+        )
+        for tx_hash in removed_tx_hashes:
+            self.assertFalse(bulk_transaction_service.has_transaction_contents(tx_hash))
+            self.assertFalse(bulk_transaction_service.has_transaction_short_id_by_key(
+                bulk_transaction_service.get_transaction_key(tx_hash)
+            ))
+        self.assertTrue(bulk_transaction_service.has_transaction_contents(tx_hashes[5]))
+
+    def test_get_total_tx_contents_size(self):
+        transaction_service = self._get_transaction_service()
+        tx_hashes = [Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN)) for _ in range(3)]
+        for size, tx_hash in enumerate(tx_hashes, 100):
+            transaction_service.set_transaction_contents(tx_hash, bytearray(size))
+        self.assertEqual(303, transaction_service.get_total_tx_contents_size())
+
+        transaction_service.remove_transactions_by_tx_hashes(tx_hashes[:2])
+        self.assertEqual(102, transaction_service.get_total_tx_contents_size())
+        self.assertEqual(
+            transaction_service.get_cache_state_json()["total_tx_contents_size"],
+            transaction_service.get_total_tx_contents_size()
+        )
+
     def _get_transaction_service(self) -> GatewayTransactionService:
         return GatewayTransactionService(self.mock_node, 0)
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import time
 
@@ -9,6 +10,7 @@ from astracommon.connections.connection_type import ConnectionType
 from astracommon.constants import LOCALHOST
 from astracommon.messages.astra.astra_message_type import BloxrouteMessageType
 from astracommon.test_utils import helpers
+from astracommon.test_utils.helpers import async_test
 from astracommon.test_utils.mocks.mock_connection import MockConnection
 from astracommon.test_utils.mocks.mock_socket_connection import MockSocketConnection
 from astracommon.utils import crypto
@@ -140,6 +142,33 @@ class NeutralityServiceTest(AbstractTestCase):
                          crypto.symmetric_decrypt(cache_item.key, broadcast_message.blob().tobytes()))
         self.assertIn(broadcast_message.block_hash(), self.neutrality_service._receipt_tracker)
 
+    @async_test
+    async def test_propagate_block_to_network_encrypted_on_encryption_threads(self):
+        self.node.opts.encrypt_blocks = True
+        self.node.opts.block_encryption_threads = 1
+        self.neutrality_service = NeutralityService(self.node)
+
+        block_message = helpers.generate_bytearray(50)
+        connection = MockConnection(
+            MockSocketConnection(1, self.node, ip_address=LOCALHOST, port=9000), self.node
+        )
+        self.assertIsNone(self.neutrality_service.propagate_block_to_network(block_message, connection))
+
+        for _ in range(100):
+            if self.node.broadcast_messages:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(1, len(self.node.broadcast_messages))
+        broadcast_message, connection_types = self.node.broadcast_messages[0]
+        self.assertTrue(ConnectionType.RELAY_BLOCK in connection_types[0])
+
+        raw_block_hash = bytes(broadcast_message.block_hash().binary)
+        self.assertEqual(raw_block_hash, crypto.double_sha256(broadcast_message.blob().tobytes()))
+        encryption_key = self.node.in_progress_blocks.get_encryption_key(raw_block_hash)
+        self.assertEqual(block_message, crypto.symmetric_decrypt(encryption_key, broadcast_message.blob().tobytes()))
+        self.assertIn(broadcast_message.block_hash(), self.neutrality_service._receipt_tracker)
+        self.neutrality_service.close()
+
     def test_propagate_block_to_network_unencrypted_block(self):
         self.node.opts.encrypt_blocks = False
 
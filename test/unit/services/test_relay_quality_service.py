@@ -0,0 +1,134 @@
+from mock import MagicMock, patch
+
+from astracommon import constants
+from astracommon.models.node_type import NodeType
+from astracommon.models.outbound_peer_model import OutboundPeerModel
+from astracommon.test_utils import helpers
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon.utils.object_hash import Sha256Hash
+
+from astragateway import gateway_constants
+from astragateway.services import relay_quality_service
+from astragateway.services.relay_quality_service import RelayQualityService
+from astragateway.testing import gateway_helpers
+
+
+class RelayQualityServiceTest(AbstractTestCase):
+    ACTIVE_RELAY = OutboundPeerModel("127.0.0.1", 8001, node_type=NodeType.RELAY)
+    CANDIDATE_RELAY = OutboundPeerModel("127.0.0.2", 8001, node_type=NodeType.RELAY)
+
+    def setUp(self) -> None:
+        self.node = MagicMock()
+        self.node.opts = gateway_helpers.get_gateway_opts(8000, relay_probe_interval_s=60)
+        self.node.peer_relays = {self.ACTIVE_RELAY}
+        self.candidate_connection = MagicMock()
+        self.candidate_connection.is_active = MagicMock(return_value=False)
+        self.node.connection_pool.has_connection = MagicMock(return_value=True)
+        self.node.connection_pool.get_by_ipport = MagicMock(return_value=self.candidate_connection)
+        self.relay_quality_service = RelayQualityService(self.node)
+        self.relay_quality_service.update_candidates([self.ACTIVE_RELAY, self.CANDIDATE_RELAY])
+
+    def test_latency_and_jitter_averages(self):
+        for latency in [10, 20, 10]:
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: latency})
+
+        quality = self.relay_quality_service.qualities[("127.0.0.1", 8001)]
+        alpha = gateway_constants.RELAY_QUALITY_EWMA_ALPHA
+        expected_latency = 10 + alpha * (20 - 10)
+        expected_latency += alpha * (10 - expected_latency)
+        expected_jitter = alpha * 10
+        expected_jitter += alpha * (10 - expected_jitter)
+        self.assertAlmostEqual(expected_latency, quality.latency_ms)
+        self.assertAlmostEqual(expected_jitter, quality.jitter_ms)
+        self.assertEqual(3, quality.probe_count)
+
+    def test_block_lag_measured_against_first_relay(self):
+        self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 10, self.CANDIDATE_RELAY: 10})
+        block_hash = Sha256Hash(helpers.generate_hash())
+
+        with patch(f"{relay_quality_service.__name__}.time.time", return_value=100):
+            self.relay_quality_service.on_block_received(block_hash, "127.0.0.2", 8001)
+        with patch(f"{relay_quality_service.__name__}.time.time", return_value=100.05):
+            self.relay_quality_service.on_block_received(block_hash, "127.0.0.1", 8001)
+
+        self.assertEqual(0, self.relay_quality_service.qualities[("127.0.0.2", 8001)].block_lag_ms)
+        self.assertAlmostEqual(
+            gateway_constants.RELAY_QUALITY_EWMA_ALPHA * 50,
+            self.relay_quality_service.qualities[("127.0.0.1", 8001)].block_lag_ms
+        )
+
+    def test_switch_only_after_consistently_better_probes(self):
+        for _ in range(gateway_constants.RELAY_SWITCH_CONSECUTIVE_PROBES - 1):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 50})
+        # a latency spike of the candidate resets its count of better probes
+        self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 300})
+        self.assertEqual(0, self.relay_quality_service.qualities[("127.0.0.2", 8001)].better_probe_count)
+        self.assertIsNone(self.relay_quality_service.pending_switch)
+
+        for _ in range(20):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 10})
+        self.assertEqual((self.CANDIDATE_RELAY, self.ACTIVE_RELAY), self.relay_quality_service.pending_switch)
+
+    def test_no_switch_within_margin(self):
+        for _ in range(10):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 90})
+
+        self.assertIsNone(self.relay_quality_service.pending_switch)
+        self.assertEqual({self.ACTIVE_RELAY}, self.node.peer_relays)
+
+    def test_block_lag_does_not_bias_switch(self):
+        self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 90})
+        self.relay_quality_service.qualities[("127.0.0.1", 8001)].block_lag_ms = 1000
+
+        for _ in range(10):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 90})
+
+        self.assertIsNone(self.relay_quality_service.pending_switch)
+
+    def test_switch_replaces_connected_relay_with_most_block_lag(self):
+        other_active_relay = OutboundPeerModel("127.0.0.3", 8001, node_type=NodeType.RELAY)
+        self.node.peer_relays.add(other_active_relay)
+        self.relay_quality_service.on_probe_results(
+            {self.ACTIVE_RELAY: 100, other_active_relay: 100, self.CANDIDATE_RELAY: 10}
+        )
+        self.relay_quality_service.qualities[("127.0.0.3", 8001)].block_lag_ms = 50
+
+        for _ in range(gateway_constants.RELAY_SWITCH_CONSECUTIVE_PROBES):
+            self.relay_quality_service.on_probe_results(
+                {self.ACTIVE_RELAY: 100, other_active_relay: 100, self.CANDIDATE_RELAY: 10}
+            )
+
+        self.assertEqual((self.CANDIDATE_RELAY, other_active_relay), self.relay_quality_service.pending_switch)
+
+    def test_switch_connects_new_relay_before_disconnecting_old(self):
+        for _ in range(gateway_constants.RELAY_SWITCH_CONSECUTIVE_PROBES):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 10})
+
+        self.assertEqual({self.ACTIVE_RELAY, self.CANDIDATE_RELAY}, self.node.peer_relays)
+        self.node.on_updated_peers.assert_called_once()
+
+        self.assertEqual(
+            gateway_constants.RELAY_SWITCH_CHECK_INTERVAL_S, self.relay_quality_service._check_pending_switch()
+        )
+        self.assertEqual({self.ACTIVE_RELAY, self.CANDIDATE_RELAY}, self.node.peer_relays)
+
+        self.candidate_connection.is_active.return_value = True
+        self.assertEqual(constants.CANCEL_ALARMS, self.relay_quality_service._check_pending_switch())
+        self.assertEqual({self.CANDIDATE_RELAY}, self.node.peer_relays)
+        self.assertIsNone(self.relay_quality_service.pending_switch)
+        self.assertEqual(1, self.relay_quality_service.switch_count)
+        self.node.requester.send_threaded_request.assert_called_once()
+
+    def test_switch_abandoned_if_new_relay_does_not_connect(self):
+        for _ in range(gateway_constants.RELAY_SWITCH_CONSECUTIVE_PROBES):
+            self.relay_quality_service.on_probe_results({self.ACTIVE_RELAY: 100, self.CANDIDATE_RELAY: 10})
+
+        with patch(
+            f"{relay_quality_service.__name__}.time.time",
+            return_value=self.relay_quality_service._pending_switch_start_time
+            + gateway_constants.RELAY_SWITCH_TIMEOUT_S + 1
+        ):
+            self.assertEqual(constants.CANCEL_ALARMS, self.relay_quality_service._check_pending_switch())
+
+        self.assertEqual({self.ACTIVE_RELAY}, self.node.peer_relays)
+        self.assertEqual(0, self.relay_quality_service.switch_count)
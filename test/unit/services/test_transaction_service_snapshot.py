@@ -0,0 +1,157 @@
+import os
+import tempfile
+import time
+
+from mock import MagicMock
+
+from astracommon.test_utils import helpers
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon.test_utils.helpers import async_test
+from astracommon.utils.object_hash import Sha256Hash, SHA256_HASH_LEN
+from astragateway import gateway_constants
+from astragateway.services import transaction_service_snapshot
+from astragateway.services.gateway_transaction_service import GatewayTransactionService
+from astragateway.services.transaction_service_snapshot import TransactionServiceSnapshotError
+from astragateway.testing import gateway_helpers
+from astragateway.testing.mocks.mock_gateway_node import MockGatewayNode
+
+EXPIRATION_TIME_S = 60
+
+
+class TransactionServiceSnapshotTest(AbstractTestCase):
+
+    def setUp(self) -> None:
+        self.node = MockGatewayNode(gateway_helpers.get_gateway_opts(8000))
+        self.node.block_recovery_service = MagicMock()
+        self.tx_service = self.node.get_tx_service()
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.snapshot_dir.name, "tx_service.snapshot")
+        self._original_slice_size = gateway_constants.TX_SERVICE_SNAPSHOT_SLICE_SIZE
+
+    def tearDown(self) -> None:
+        gateway_constants.TX_SERVICE_SNAPSHOT_SLICE_SIZE = self._original_slice_size
+        self.snapshot_dir.cleanup()
+
+    def _restored_tx_service(self) -> GatewayTransactionService:
+        restored_tx_service = GatewayTransactionService(self.node, self.tx_service.network_num)
+        transaction_service_snapshot.load_snapshot(restored_tx_service, self.path, EXPIRATION_TIME_S)
+        return restored_tx_service
+
+    def test_save_and_load(self):
+        tx_hashes = [Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN)) for _ in range(3)]
+        tx_contents = [helpers.generate_bytearray(100 + i) for i in range(3)]
+        for tx_hash, contents in zip(tx_hashes, tx_contents):
+            self.tx_service.set_transaction_contents(tx_hash, contents)
+        self.tx_service.assign_short_id(tx_hashes[0], 1)
+        self.tx_service.assign_short_id(tx_hashes[0], 2)
+        self.tx_service.assign_short_id(tx_hashes[1], 3)
+
+        self.assertEqual(3, transaction_service_snapshot.save_snapshot(self.tx_service, self.path))
+        # the temporary file is renamed over the snapshot
+        self.assertEqual([os.path.basename(self.path)], os.listdir(self.snapshot_dir.name))
+
+        restored_tx_service = self._restored_tx_service()
+        self.assertEqual(tx_contents[0], restored_tx_service.get_transaction(1).contents)
+        self.assertEqual(tx_contents[1], restored_tx_service.get_transaction(3).contents)
+        self.assertTrue(restored_tx_service.has_transaction_contents(tx_hashes[2]))
+        self.assertEqual(tx_hashes[0], restored_tx_service.get_transaction(1).hash)
+        self.assertEqual(tx_hashes[0], restored_tx_service.get_transaction(2).hash)
+        self.assertEqual(tx_hashes[1], restored_tx_service.get_transaction(3).hash)
+        self.assertFalse(restored_tx_service.has_short_id(4))
+
+    def test_load_drops_expired_short_ids(self):
+        old_tx_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        new_tx_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        self.tx_service.set_transaction_contents(old_tx_hash, helpers.generate_bytearray(100))
+        self.tx_service.set_transaction_contents(new_tx_hash, helpers.generate_bytearray(100))
+
+        start_time = time.time()
+        time.time = MagicMock(return_value=start_time)
+        self.tx_service.assign_short_id(old_tx_hash, 1)
+        time.time = MagicMock(return_value=start_time + EXPIRATION_TIME_S)
+        self.tx_service.assign_short_id(new_tx_hash, 2)
+        transaction_service_snapshot.save_snapshot(self.tx_service, self.path)
+
+        time.time = MagicMock(return_value=start_time + EXPIRATION_TIME_S + 1)
+        restored_tx_service = self._restored_tx_service()
+
+        self.assertFalse(restored_tx_service.has_short_id(1))
+        self.assertTrue(restored_tx_service.has_short_id(2))
+        # contents are kept while the snapshot itself is still within the expiration window
+        self.assertTrue(restored_tx_service.has_transaction_contents(old_tx_hash))
+
+        time.time = MagicMock(return_value=start_time + 3 * EXPIRATION_TIME_S)
+        restored_tx_service = self._restored_tx_service()
+
+        self.assertFalse(restored_tx_service.has_short_id(2))
+        self.assertFalse(restored_tx_service.has_transaction_contents(old_tx_hash))
+        self.assertFalse(restored_tx_service.has_transaction_contents(new_tx_hash))
+
+    def test_load_rejects_other_network(self):
+        tx_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        self.tx_service.set_transaction_contents(tx_hash, helpers.generate_bytearray(100))
+        transaction_service_snapshot.save_snapshot(self.tx_service, self.path)
+
+        other_tx_service = GatewayTransactionService(self.node, self.tx_service.network_num + 1)
+        with self.assertRaises(TransactionServiceSnapshotError):
+            transaction_service_snapshot.load_snapshot(other_tx_service, self.path, EXPIRATION_TIME_S)
+
+    def test_load_rejects_truncated_snapshot(self):
+        tx_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        self.tx_service.set_transaction_contents(tx_hash, helpers.generate_bytearray(100))
+        transaction_service_snapshot.save_snapshot(self.tx_service, self.path)
+        with open(self.path, "r+b") as snapshot_file:
+            snapshot_file.truncate(os.path.getsize(self.path) - 10)
+
+        with self.assertRaises(TransactionServiceSnapshotError):
+            self._restored_tx_service()
+
+    def test_write_collected_entries(self):
+        tx_hash = Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN))
+        contents = helpers.generate_bytearray(100)
+        self.tx_service.set_transaction_contents(tx_hash, contents)
+        self.tx_service.assign_short_id(tx_hash, 1)
+
+        entries = transaction_service_snapshot.collect_snapshot_entries(self.tx_service)
+        # entries are detached from the transaction service, so they can be written on another thread
+        self.tx_service.clear()
+        self.assertEqual(
+            1, transaction_service_snapshot.write_snapshot(entries, self.tx_service.network_num, self.path)
+        )
+
+        restored_tx_service = self._restored_tx_service()
+        self.assertEqual(contents, restored_tx_service.get_transaction(1).contents)
+        self.assertEqual(tx_hash, restored_tx_service.get_transaction(1).hash)
+
+    @async_test
+    async def test_periodic_snapshot_is_collected_over_several_loop_iterations(self):
+        gateway_constants.TX_SERVICE_SNAPSHOT_SLICE_SIZE = 10
+        self.node.opts.tx_service_snapshot_file = self.path
+        self.node.alarm_queue.register_alarm = MagicMock()
+        tx_hashes = [Sha256Hash(helpers.generate_bytearray(SHA256_HASH_LEN)) for _ in range(25)]
+        for short_id, tx_hash in enumerate(tx_hashes, 1):
+            self.tx_service.set_transaction_contents(tx_hash, helpers.generate_bytearray(100))
+            self.tx_service.assign_short_id(tx_hash, short_id)
+
+        removed_tx_hashes = []
+        self.node._save_tx_service_snapshot()
+        slice_count = 1
+        while self.node.alarm_queue.register_alarm.called:
+            _delay, collect_slice, collection = self.node.alarm_queue.register_alarm.call_args[0]
+            self.assertFalse(collection.is_complete())
+            self.assertIsNone(self.node._tx_service_snapshot_future)
+            # transactions removed before their slice is read are skipped
+            removed_tx_hashes.append(collection.tx_hashes[-slice_count])
+            self.tx_service.remove_transaction_by_tx_hash(removed_tx_hashes[-1], force=True)
+            self.node.alarm_queue.register_alarm.reset_mock()
+            collect_slice(collection)
+            slice_count += 1
+
+        self.assertEqual(3, slice_count)
+        await self.node._tx_service_snapshot_future
+        restored_tx_service = self._restored_tx_service()
+        self.assertEqual(23, restored_tx_service.get_tx_hash_to_contents_len())
+        for tx_hash in tx_hashes:
+            self.assertEqual(
+                tx_hash not in removed_tx_hashes, restored_tx_service.has_transaction_contents(tx_hash)
+            )
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from astragateway.testing.benchmarks import benchmark_runner
+from astragateway.testing.benchmarks.benchmark_runner import BenchmarkCase
+
+
+def _report(**median_us_per_item: float):
+    return {
+        "results": {
+            name: {"median_us_per_item": median_us}
+            for name, median_us in median_us_per_item.items()
+        }
+    }
+
+
+class BenchmarkRunnerTest(TestCase):
+
+    def test_run_case(self):
+        setup_calls = []
+        operation_calls = []
+
+        def setup(iterations: int):
+            setup_calls.append(iterations)
+            return lambda: operation_calls.append(1)
+
+        result = benchmark_runner.run_case(BenchmarkCase("case", setup, 10, 5), repeat=3)
+
+        self.assertEqual([10, 10, 10], setup_calls)
+        self.assertEqual(30, len(operation_calls))
+        self.assertEqual("case", result.name)
+        self.assertEqual(5, result.items_per_iteration)
+        self.assertLessEqual(result.min_us_per_item, result.median_us_per_item)
+
+    def test_find_regressions(self):
+        baseline = _report(faster=10.0, same=10.0, slower=10.0, removed=10.0)
+        report = _report(faster=5.0, same=10.5, slower=12.0, added=100.0)
+
+        regressions = benchmark_runner.find_regressions(report, baseline, threshold_pct=10)
+
+        self.assertEqual(1, len(regressions))
+        self.assertEqual("slower", regressions[0].name)
+        self.assertAlmostEqual(20.0, regressions[0].change_pct)
+
+    def test_select_cases(self):
+        cases = [BenchmarkCase(name, lambda _: lambda: None, 1) for name in ["eth_a", "eth_b", "btc_a", "tx_a"]]
+
+        self.assertEqual(cases, benchmark_runner._select_cases(cases, None))
+        self.assertEqual(
+            ["eth_a", "eth_b", "tx_a"],
+            [case.name for case in benchmark_runner._select_cases(cases, "eth_, tx_")]
+        )
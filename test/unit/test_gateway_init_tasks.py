@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from mock import MagicMock, patch
+
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astragateway import gateway_constants
+from astragateway import gateway_init_tasks
+from astragateway.testing import gateway_helpers
+
+
+class _StandInSdn:
+    """
+    Serves account and gateway settings requests, each blocking until its release event is set.
+    """
+
+    def __init__(self):
+        self.account_model = MagicMock()
+        self.min_peer_relays_count = 3
+        self.release_account = threading.Event()
+        self.release_gateway_settings = threading.Event()
+        self.release_gateway_settings.set()
+
+    def fetch_account_model(self, _account_id):
+        self.release_account.wait(5)
+        return self.account_model
+
+    def fetch_gateway_settings(self, _node_id):
+        self.release_gateway_settings.wait(5)
+        return MagicMock(min_peer_relays_count=self.min_peer_relays_count)
+
+
+@patch(f"{gateway_init_tasks.__name__}.node_cache")
+@patch(f"{gateway_init_tasks.__name__}.common_init_tasks")
+class GatewayInitTasksTest(AbstractTestCase):
+
+    def setUp(self) -> None:
+        self.data_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.data_dir.name, gateway_constants.GATEWAY_SETTINGS_CACHE_FILE_NAME)
+        self.sdn = _StandInSdn()
+        self.opts = gateway_helpers.get_gateway_opts(8000, node_id="node-1")
+        self.opts.validate_network_opts = MagicMock()
+        self.opts.set_account_options = MagicMock()
+        self.node_ssl_service = MagicMock()
+        self.node_ssl_service.get_account_id = MagicMock(return_value="account-1")
+
+        patches = [
+            patch(f"{gateway_init_tasks.__name__}.sdn_http_service", self.sdn),
+            patch(f"{gateway_init_tasks.__name__}.config.get_data_file",
+                  lambda file_name: os.path.join(self.data_dir.name, file_name)),
+        ]
+        for sdn_patch in patches:
+            sdn_patch.start()
+            self.addCleanup(sdn_patch.stop)
+
+    def tearDown(self) -> None:
+        self.data_dir.cleanup()
+
+    def test_account_fetched_concurrently_with_network_tasks(self, common_init_tasks, node_cache):
+        node_cache.read = MagicMock(return_value=None)
+        # the account request only completes once the network tasks ran, so serial tasks would time out
+        common_init_tasks.set_node_model = MagicMock(side_effect=lambda *_args: self.sdn.release_account.set())
+
+        start_time = time.time()
+        gateway_init_tasks.run_init_tasks(self.opts, self.node_ssl_service)
+
+        self.assertLess(time.time() - start_time, 4)
+        self.opts.set_account_options.assert_called_once_with(self.sdn.account_model)
+        self.assertEqual(3, self.opts.min_peer_relays_count)
+        with open(self.cache_path) as cache_file:
+            self.assertEqual({"node_id": "node-1", "min_peer_relays_count": 3}, json.load(cache_file))
+
+    def test_tasks_serial_without_blockchain_protocol(self, common_init_tasks, node_cache):
+        node_cache.read = MagicMock(return_value=None)
+        self.opts.blockchain_protocol = None
+        self.sdn.release_account.set()
+        self.opts.validate_network_opts.side_effect = \
+            lambda: self.opts.set_account_options.assert_called_once_with(self.sdn.account_model)
+
+        gateway_init_tasks.run_init_tasks(self.opts, self.node_ssl_service)
+
+        self.opts.validate_network_opts.assert_called_once()
+        common_init_tasks.set_network_info.assert_called_once_with(self.opts, self.node_ssl_service)
+
+    def test_cached_responses_used_and_revalidated(self, _common_init_tasks, node_cache):
+        cached_account_model = MagicMock()
+        node_cache.read = MagicMock(return_value=MagicMock(accounts={"account-1": cached_account_model}))
+        with open(self.cache_path, "w") as cache_file:
+            json.dump({"node_id": "node-1", "min_peer_relays_count": 2}, cache_file)
+        self.sdn.release_gateway_settings.clear()
+
+        gateway_init_tasks.run_init_tasks(self.opts, self.node_ssl_service)
+
+        self.opts.set_account_options.assert_called_once_with(cached_account_model)
+        self.assertEqual(2, self.opts.min_peer_relays_count)
+
+        self.sdn.release_account.set()
+        self.sdn.release_gateway_settings.set()
+        # the revalidated account is applied and cached by the gateway node on its event loop
+        self.assertEqual(self.sdn.account_model, self.opts.account_model_revalidation.result(5))
+        for thread in threading.enumerate():
+            if thread.name.startswith("revalidate_"):
+                thread.join(5)
+        self.assertEqual(3, self.opts.min_peer_relays_count)
+        self.opts.set_account_options.assert_called_once_with(cached_account_model)
+        node_cache.update_cache_file.assert_not_called()
+        with open(self.cache_path) as cache_file:
+            self.assertEqual({"node_id": "node-1", "min_peer_relays_count": 3}, json.load(cache_file))
+        self.assertEqual([gateway_constants.GATEWAY_SETTINGS_CACHE_FILE_NAME], os.listdir(self.data_dir.name))
+
+    def test_cached_gateway_settings_of_other_node_ignored(self, _common_init_tasks, node_cache):
+        node_cache.read = MagicMock(return_value=None)
+        self.sdn.release_account.set()
+        with open(self.cache_path, "w") as cache_file:
+            json.dump({"node_id": "node-2", "min_peer_relays_count": 2}, cache_file)
+
+        gateway_init_tasks.run_init_tasks(self.opts, self.node_ssl_service)
+
+        self.assertEqual(3, self.opts.min_peer_relays_count)
@@ -1,9 +1,13 @@
+import asyncio
 import os
 import uuid
 from typing import Tuple, Set
 
+from mock import patch
+
 from astracommon.models.blockchain_peer_info import BlockchainPeerInfo
 from astracommon.test_utils import helpers
+from astracommon.test_utils.helpers import async_test
 from astracommon.test_utils.abstract_test_case import AbstractTestCase
 from astracommon.test_utils.mocks.mock_connection import MockConnection
 from astracommon.test_utils.mocks.mock_node import MockNode
@@ -16,7 +20,8 @@ from astragateway.utils.logging.status.blockchain_connection import BlockchainCo
 from astragateway.utils.logging.status.connection_state import ConnectionState
 from astragateway.utils.logging.status.status_log import initialize, update, Diagnostics, Summary, Analysis, Environment, \
     Network, STATUS_FILE_NAME, ExtensionModulesState, GatewayStatus, InstallationType
-from astragateway.utils.logging.status import summary
+from astragateway import gateway_constants
+from astragateway.utils.logging.status import summary, status_log
 
 
 class StatusLogTest(AbstractTestCase):
@@ -238,6 +243,45 @@ class StatusLogTest(AbstractTestCase):
             }
         )
 
+    @async_test
+    async def test_update_debounces_status_file_writes(self):
+        with patch.object(gateway_constants, "STATUS_FILE_FLUSH_DELAY_S", 0.01):
+            update(self.conn_pool, False, self.source_version, self.ip_address, self.continent, self.country, False,
+                   self.blockchain_peers, self.account_id, self.quota_level)
+            self._add_connections()
+            update(self.conn_pool, False, self.source_version, self.ip_address, self.continent, self.country, False,
+                   self.blockchain_peers, self.account_id, self.quota_level)
+
+        _, _, _, network_loaded = self._load_status_file()
+        self.assertEqual(0, len(network_loaded.relays))
+        diagnostics = status_log.get_diagnostics(False, self.source_version, self.ip_address, self.continent,
+                                                 self.country, False, self.account_id, self.quota_level)
+        self.assertEqual(GatewayStatus.ONLINE, diagnostics.summary.gateway_status)
+
+        await asyncio.sleep(0.05)
+        await status_log._flush_future
+        summary_loaded, _, _, network_loaded = self._load_status_file()
+        self.assertEqual(1, len(network_loaded.relays))
+        self.assertEqual(GatewayStatus.ONLINE, summary_loaded.gateway_status)
+        self._assert_no_temporary_files()
+
+    def test_older_write_does_not_replace_newer_status(self):
+        older_write_sequence = status_log._next_write_sequence()
+        newer_write_sequence = status_log._next_write_sequence()
+
+        status_log._save_status_to_file('{"write": "newer"}', newer_write_sequence)
+        status_log._save_status_to_file('{"write": "older"}', older_write_sequence)
+
+        with open(config.get_data_file(STATUS_FILE_NAME), "r", encoding="utf-8") as status_file:
+            self.assertEqual('{"write": "newer"}', status_file.read())
+        self._assert_no_temporary_files()
+
+    def _assert_no_temporary_files(self):
+        path = config.get_data_file(STATUS_FILE_NAME)
+        self.assertEqual(
+            [], [file_name for file_name in os.listdir(os.path.dirname(path) or ".") if file_name.endswith(".tmp")]
+        )
+
     def _add_connections(self):
         self.conn_pool.add(self.fileno1, self.ip1, self.port1, self.conn1)
         self.conn_pool.add(self.fileno2, self.ip2, self.port2, self.conn2)
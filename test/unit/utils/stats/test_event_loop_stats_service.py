@@ -0,0 +1,111 @@
+import time
+
+from mock import MagicMock
+
+from astracommon.connections.connection_type import ConnectionType
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astragateway import gateway_constants
+from astragateway.utils.stats.event_loop_stats_service import EventLoopStatsService, OTHER_BLOCKERS
+
+
+class EventLoopStatsServiceTest(AbstractTestCase):
+
+    def setUp(self) -> None:
+        self.service = EventLoopStatsService()
+        self.service.configure(0.1, 0.005)
+
+    def test_sample_lag(self):
+        time.time = MagicMock(return_value=100)
+        self.assertEqual(0.1, self.service.sample_lag())
+
+        time.time = MagicMock(return_value=100.1)
+        self.service.sample_lag()
+        time.time = MagicMock(return_value=100.5)
+        self.service.sample_lag()
+
+        report = self.service.get_report()
+        self.assertEqual(2, report["lag_samples"])
+        self.assertAlmostEqual(0.3, report["max_lag_s"])
+        self.assertAlmostEqual(0.15, report["avg_lag_s"])
+
+    def test_log_callback_ignores_fast_callbacks(self):
+        self.service.log_callback("alarm:fast", 0.001)
+        self.service.log_callback("alarm:slow", 0.01)
+        self.service.log_callback("alarm:slow", 0.03)
+
+        self.assertEqual(
+            [{"owner": "alarm:slow", "count": 2, "total_s": 0.04, "max_s": 0.03}],
+            self.service.get_top_blockers()
+        )
+
+    def test_log_callback_bounds_tracked_blockers(self):
+        for i in range(gateway_constants.EVENT_LOOP_MAX_TRACKED_BLOCKERS + 5):
+            self.service.log_callback(f"alarm:{i}", 0.01)
+
+        blockers = self.service.interval_data.blockers
+        self.assertEqual(gateway_constants.EVENT_LOOP_MAX_TRACKED_BLOCKERS + 1, len(blockers))
+        self.assertEqual(5, blockers[OTHER_BLOCKERS].count)
+
+    def test_instrument_alarm_queue(self):
+        alarm_queue = MagicMock()
+        register_alarm = alarm_queue.register_alarm
+        alarm_fn = MagicMock(return_value=5)
+        self.service.instrument_alarm_queue(alarm_queue)
+
+        alarm_queue.register_alarm(1, alarm_fn, "arg", alarm_name="slow_alarm")
+        fire_delay, timed_fn, arg = register_alarm.call_args[0]
+        self.assertEqual({"alarm_name": "slow_alarm"}, register_alarm.call_args[1])
+
+        time.time = MagicMock(side_effect=[10, 10.02])
+        self.assertEqual(5, timed_fn(arg))
+
+        alarm_fn.assert_called_once_with("arg")
+        self.assertEqual("alarm:slow_alarm", self.service.get_top_blockers()[0]["owner"])
+
+    def test_instrument_approx_alarm_queue(self):
+        alarm_queue = MagicMock()
+        register_alarm = alarm_queue.register_alarm
+        register_approx_alarm = alarm_queue.register_approx_alarm
+        alarm_fn = MagicMock(return_value=None)
+        self.service.instrument_alarm_queue(alarm_queue)
+
+        alarm_queue.register_approx_alarm(2, 1, alarm_fn, "arg", alarm_name="approx_alarm")
+        fire_delay, slop, timed_fn, arg = register_approx_alarm.call_args[0]
+        # approximate alarms are deduplicated by function, the same function is timed by the same wrapper
+        alarm_queue.register_approx_alarm(2, 1, alarm_fn, "arg", alarm_name="approx_alarm")
+        self.assertIs(timed_fn, register_approx_alarm.call_args[0][2])
+        # alarms registered with already timed functions are not timed twice
+        alarm_queue.register_alarm(2, timed_fn, "arg")
+        self.assertIs(timed_fn, register_alarm.call_args[0][1])
+
+        time.time = MagicMock(side_effect=[10, 10.02])
+        timed_fn(arg)
+
+        alarm_fn.assert_called_once_with("arg")
+        self.assertEqual("alarm:approx_alarm", self.service.get_top_blockers()[0]["owner"])
+
+    def test_instrument_message_handlers(self):
+        handler = MagicMock()
+        connection = MagicMock()
+        connection.CONNECTION_TYPE = ConnectionType.BLOCKCHAIN_NODE
+        connection.message_handlers = {b"tx": handler}
+        self.service.instrument_message_handlers(connection)
+
+        time.time = MagicMock(side_effect=[10, 10.01])
+        connection.message_handlers[b"tx"]("message")
+
+        handler.assert_called_once_with("message")
+        self.assertEqual("BLOCKCHAIN_NODE:tx", self.service.get_top_blockers()[0]["owner"])
+
+    def test_top_blockers_cover_previous_interval(self):
+        self.service.log_callback("alarm:a", 0.01)
+        self.service.log_callback("alarm:b", 0.05)
+        self.service.create_interval_data_object()
+        self.service.log_callback("alarm:a", 0.1)
+
+        top_blockers = self.service.get_top_blockers()
+        self.assertEqual(["alarm:a", "alarm:b"], [blocker["owner"] for blocker in top_blockers])
+        self.assertEqual(2, top_blockers[0]["count"])
+
+        self.service.create_interval_data_object()
+        self.assertEqual(["alarm:a"], [blocker["owner"] for blocker in self.service.get_top_blockers()])
@@ -198,6 +198,27 @@ class GatewayTransactionStatsServiceTest(AbstractTestCase):
         self.assertEqual(1, gateway_transaction_stats_service.interval_data.new_transactions_received_from_blockchain)
         self.assertEqual(0, gateway_transaction_stats_service.interval_data.duplicate_transactions_received_from_blockchain)
 
+    def test_tx_stats_from_blockchain_node_with_sketches(self):
+        gateway_transaction_stats_service.configure_sketches(True)
+        txs = [
+            mock_eth_messages.get_dummy_transaction(7),
+        ]
+        tx_msg = TransactionsEthProtocolMessage(None, txs)
+
+        self.blockchain_connection_protocol.msg_tx(tx_msg)
+        self.blockchain_connection_protocol.msg_tx(tx_msg)
+        self.blockchain_connection_protocol2.msg_tx(tx_msg)
+
+        interval_data = gateway_transaction_stats_service.interval_data
+        self.assertEqual(1, interval_data.new_transactions_received_from_blockchain)
+        self.assertEqual(2, interval_data.duplicate_transactions_received_from_blockchain)
+        self.assertEqual(1, interval_data.unique_transactions_from_blockchain.count())
+        self.assertEqual(2, interval_data.max_duplicates_per_transaction_from_blockchain)
+        self.assertLessEqual(len(interval_data.transaction_tracker), 1)
+
+        gateway_transaction_stats_service.configure_sketches(False)
+        self.assertIsNone(gateway_transaction_stats_service.interval_data.unique_transactions_from_blockchain)
+
     def test_tx_stats_duplicate_from_blockchain_node(self):
         txs = [
             mock_eth_messages.get_dummy_transaction(7),
@@ -0,0 +1,86 @@
+from unittest import TestCase
+
+from mock import MagicMock
+
+from astracommon.connections.connection_type import ConnectionType
+from astragateway.utils.stats import latency_histograms as latency_histograms_module
+from astragateway.utils.stats.latency_histograms import LatencyHistogram, LatencyHistograms, LatencyOperation
+
+
+class LatencyHistogramsTest(TestCase):
+
+    def setUp(self) -> None:
+        self.histograms = LatencyHistograms()
+
+    def test_percentiles_within_bucket_precision(self):
+        histogram = LatencyHistogram()
+        for duration_ms in range(1, 1001):
+            histogram.record(duration_ms / 1000)
+
+        p50, p99, p999 = histogram.percentiles_us((0.5, 0.99, 0.999))
+
+        self.assertAlmostEqual(500000, p50, delta=500000 / latency_histograms_module.SUB_BUCKET_COUNT)
+        self.assertAlmostEqual(990000, p99, delta=990000 / latency_histograms_module.SUB_BUCKET_COUNT)
+        self.assertAlmostEqual(999000, p999, delta=999000 / latency_histograms_module.SUB_BUCKET_COUNT)
+        self.assertEqual(1000, histogram.total_count)
+
+    def test_tail_outlier(self):
+        histogram = LatencyHistogram()
+        for _ in range(99):
+            histogram.record(0.00001)
+        histogram.record(2)
+
+        self.assertEqual([10, 10, 2000000], histogram.percentiles_us((0.5, 0.99, 0.999)))
+
+    def test_clamps_large_values(self):
+        histogram = LatencyHistogram()
+        histogram.record(1000)
+
+        self.assertEqual([latency_histograms_module.MAX_VALUE_US], histogram.percentiles_us((0.5,)))
+
+    def test_rotate_keeps_previous_interval(self):
+        self.histograms.record(LatencyOperation.COMPRESSION, "block", 0.001)
+        self.histograms.rotate()
+        self.histograms.record(LatencyOperation.COMPRESSION, "block", 0.002)
+
+        _, _, histogram = next(self.histograms.get_histograms())
+        self.assertEqual(2, histogram.total_count)
+
+        self.histograms.rotate()
+        self.histograms.rotate()
+        self.assertEqual([], list(self.histograms.get_histograms()))
+
+    def test_disabled(self):
+        self.histograms.enabled = False
+        self.histograms.record(LatencyOperation.RPC_REQUEST, "http", 0.001)
+
+        self.assertEqual([], list(self.histograms.get_histograms()))
+
+    def test_instrument_message_handlers(self):
+        handler = MagicMock(return_value="handled")
+        connection = MagicMock()
+        connection.CONNECTION_TYPE = ConnectionType.BLOCKCHAIN_NODE
+        connection.message_handlers = {b"block\x00\x00": handler}
+
+        self.histograms.instrument_message_handlers(connection)
+        message = MagicMock()
+        result = connection.message_handlers[b"block\x00\x00"](message)
+
+        self.assertEqual("handled", result)
+        handler.assert_called_once_with(message)
+        operation, label, histogram = next(self.histograms.get_histograms())
+        self.assertEqual(LatencyOperation.MESSAGE_HANDLING, operation)
+        self.assertEqual("BLOCKCHAIN_NODE:block", label)
+        self.assertEqual(1, histogram.total_count)
+
+    def test_collect(self):
+        self.histograms.record(LatencyOperation.FEED_PUBLISH, "newTxs", 0.001)
+
+        latency, count = list(self.histograms.collect())
+
+        self.assertEqual(3, len(latency.samples))
+        self.assertEqual(
+            {"operation": "feed_publish", "label": "newTxs", "quantile": "0.5"}, latency.samples[0].labels
+        )
+        self.assertAlmostEqual(0.001, latency.samples[0].value, delta=0.001 / 32)
+        self.assertEqual(1, count.samples[0].value)
@@ -0,0 +1,73 @@
+import os
+import random
+from unittest import TestCase
+
+from astragateway.utils.stats.sketches import HyperLogLog, CountMinSketch, TDigest, sketch_hash
+
+
+class SketchesTest(TestCase):
+
+    def test_hyperloglog_count(self):
+        hyperloglog = HyperLogLog(12)
+        for _ in range(20000):
+            item_hash = sketch_hash(os.urandom(32))
+            hyperloglog.add(item_hash)
+            hyperloglog.add(item_hash)
+
+        self.assertAlmostEqual(20000, hyperloglog.count(), delta=20000 * 0.05)
+        self.assertEqual(4096, len(hyperloglog.registers))
+
+    def test_hyperloglog_small_count(self):
+        hyperloglog = HyperLogLog(12)
+        for i in range(10):
+            hyperloglog.add(sketch_hash(bytes([i])))
+
+        self.assertEqual(10, hyperloglog.count())
+
+    def test_hyperloglog_merge(self):
+        first = HyperLogLog(10)
+        second = HyperLogLog(10)
+        for i in range(1000):
+            first.add(sketch_hash(i.to_bytes(4, "little")))
+            second.add(sketch_hash((i + 500).to_bytes(4, "little")))
+
+        first.merge(second)
+
+        self.assertAlmostEqual(1500, first.count(), delta=1500 * 0.1)
+        with self.assertRaises(ValueError):
+            first.merge(HyperLogLog(12))
+
+    def test_count_min_sketch(self):
+        count_min_sketch = CountMinSketch(1024, 4)
+        frequent_hash = sketch_hash(b"frequent")
+        for _ in range(50):
+            count_min_sketch.add(frequent_hash)
+        for _ in range(1000):
+            count_min_sketch.add(sketch_hash(os.urandom(32)))
+
+        self.assertGreaterEqual(count_min_sketch.estimate(frequent_hash), 50)
+        self.assertLessEqual(count_min_sketch.estimate(frequent_hash), 55)
+        self.assertEqual(count_min_sketch.estimate(frequent_hash) + 3, count_min_sketch.add(frequent_hash, 3))
+        self.assertEqual(1053, count_min_sketch.total_count)
+
+    def test_tdigest_quantiles(self):
+        tdigest = TDigest(100)
+        values = [random.expovariate(1) for _ in range(20000)]
+        for value in values:
+            tdigest.add(value)
+        values.sort()
+
+        for quantile in (0.01, 0.5, 0.99):
+            expected = values[int(quantile * len(values))]
+            self.assertAlmostEqual(expected, tdigest.quantile(quantile), delta=expected * 0.05)
+        self.assertEqual(values[0], tdigest.min)
+        self.assertEqual(values[-1], tdigest.max)
+        self.assertAlmostEqual(sum(values) / len(values), tdigest.mean())
+        self.assertLess(len(tdigest._means), 20000 / 10)
+
+    def test_tdigest_empty_and_single(self):
+        tdigest = TDigest(100)
+        self.assertEqual(0, tdigest.quantile(0.5))
+
+        tdigest.add(3)
+        self.assertEqual(3, tdigest.quantile(0.99))
@@ -0,0 +1,136 @@
+import datetime
+import time
+
+from mock import MagicMock, patch
+
+from astracommon.test_utils import helpers
+from astracommon.test_utils.abstract_test_case import AbstractTestCase
+from astracommon.utils.stats.block_stat_event_type import BlockStatEventType
+from astracommon.utils.stats.transaction_stat_event_type import TransactionStatEventType
+from astragateway import gateway_constants
+from astragateway.utils.stats import stat_event_pipeline as stat_event_pipeline_module
+from astragateway.utils.stats.stat_event_pipeline import StatEventPipeline, parse_sampling_rates, event_type_name
+
+
+@patch(f"{stat_event_pipeline_module.__name__}.tx_stats")
+@patch(f"{stat_event_pipeline_module.__name__}.block_stats")
+class StatEventPipelineTest(AbstractTestCase):
+
+    def setUp(self) -> None:
+        self.pipeline = StatEventPipeline()
+
+    def test_more_info_formatted_on_flush(self, block_stats, _tx_stats):
+        time.time = MagicMock(return_value=1000)
+        format_more_info = MagicMock(return_value="formatted")
+        block_hash = helpers.generate_object_hash()
+
+        self.pipeline.add_block_event_by_block_hash(
+            block_hash,
+            BlockStatEventType.BLOCK_COMPRESSED,
+            1,
+            more_info=format_more_info,
+            more_info_args=(1, 2),
+            txs_count=5
+        )
+
+        format_more_info.assert_not_called()
+        block_stats.add_block_event_by_block_hash.assert_not_called()
+
+        self.assertEqual(gateway_constants.STAT_EVENTS_FLUSH_INTERVAL_S, self.pipeline.flush())
+
+        format_more_info.assert_called_once_with(1, 2)
+        event_datetime = datetime.datetime.utcfromtimestamp(1000)
+        block_stats.add_block_event_by_block_hash.assert_called_once_with(
+            block_hash,
+            BlockStatEventType.BLOCK_COMPRESSED,
+            1,
+            txs_count=5,
+            more_info="formatted",
+            start_date_time=event_datetime,
+            end_date_time=event_datetime
+        )
+        self.assertEqual(0, len(self.pipeline))
+        self.assertEqual(1, self.pipeline.submitted_events)
+
+    def test_tx_event_keeps_short_id_and_dates(self, _block_stats, tx_stats):
+        tx_hash = helpers.generate_object_hash()
+        start_date_time = datetime.datetime.utcnow()
+
+        self.pipeline.add_tx_by_hash_event(
+            tx_hash,
+            TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER,
+            1,
+            123,
+            more_info=str,
+            more_info_args=(5,),
+            start_date_time=start_date_time
+        )
+        self.pipeline.flush()
+
+        tx_stats.add_tx_by_hash_event.assert_called_once_with(
+            tx_hash,
+            TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER,
+            1,
+            123,
+            more_info="5",
+            start_date_time=start_date_time
+        )
+
+    def test_events_without_deferred_more_info_submitted_right_away(self, block_stats, tx_stats):
+        tx_hash = helpers.generate_object_hash()
+        block_hash = helpers.generate_object_hash()
+
+        self.pipeline.add_tx_by_hash_event(tx_hash, TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER, 1, 123)
+        self.pipeline.add_block_event_by_block_hash(
+            block_hash, BlockStatEventType.BLOCK_COMPRESSED, 1, more_info="info"
+        )
+
+        self.assertEqual(0, len(self.pipeline))
+        tx_stats.add_tx_by_hash_event.assert_called_once_with(
+            tx_hash, TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER, 1, 123
+        )
+        block_stats.add_block_event_by_block_hash.assert_called_once_with(
+            block_hash, BlockStatEventType.BLOCK_COMPRESSED, 1, more_info="info"
+        )
+        self.assertEqual(2, self.pipeline.submitted_events)
+
+    def test_sampling_rates(self, _block_stats, tx_stats):
+        event_type = TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER
+        self.pipeline.set_sampling_rate(event_type_name(event_type), 0)
+
+        for _ in range(10):
+            self.pipeline.add_tx_by_hash_event(helpers.generate_object_hash(), event_type, 1)
+        self.pipeline.add_tx_by_hash_event(
+            helpers.generate_object_hash(), TransactionStatEventType.TX_SENT_FROM_GATEWAY_TO_BLOCKCHAIN_NODE, 1
+        )
+        self.pipeline.flush()
+
+        self.assertEqual(1, tx_stats.add_tx_by_hash_event.call_count)
+        self.assertEqual(10, self.pipeline.sampled_out_events)
+
+        self.pipeline.set_sampling_rate(event_type_name(event_type), 1)
+        self.assertEqual({}, self.pipeline.sampling_rates)
+        with self.assertRaises(ValueError):
+            self.pipeline.set_sampling_rate(event_type_name(event_type), 2)
+
+    def test_flushes_when_queue_full(self, _block_stats, tx_stats):
+        with patch.object(gateway_constants, "STAT_EVENTS_MAX_QUEUED", 3):
+            for i in range(3):
+                self.assertEqual(i, len(self.pipeline))
+                self.pipeline.add_tx_by_hash_event(
+                    helpers.generate_object_hash(),
+                    TransactionStatEventType.TX_RECEIVED_BY_GATEWAY_FROM_PEER,
+                    1,
+                    more_info=str
+                )
+
+        self.assertEqual(3, tx_stats.add_tx_by_hash_event.call_count)
+        self.assertEqual(0, len(self.pipeline))
+
+    def test_parse_sampling_rates(self, _block_stats, _tx_stats):
+        self.assertEqual({"EventA": 0.5, "EventB": 0}, parse_sampling_rates("EventA=0.5, EventB=0"))
+        self.assertEqual({}, parse_sampling_rates(""))
+        with self.assertRaises(ValueError):
+            parse_sampling_rates("EventA")
+        with self.assertRaises(ValueError):
+            parse_sampling_rates("EventA=1.5")
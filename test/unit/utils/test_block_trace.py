@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from astracommon.test_utils import helpers
+from astragateway.utils.block_trace import BlockTrace, BlockTraceStage, BlockTraceError, read_block_trace
+from astra_cli import block_trace_report
+
+
+class BlockTraceTest(TestCase):
+
+    def setUp(self) -> None:
+        self.trace_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.trace_dir.name, "blocks.trace")
+        self.block_trace = BlockTrace()
+
+    def tearDown(self) -> None:
+        self.block_trace.close()
+        self.trace_dir.cleanup()
+
+    def test_record_not_open(self):
+        self.block_trace.record(BlockTraceStage.RECEIVED_FROM_NODE, helpers.generate_object_hash())
+
+        self.assertFalse(self.block_trace.is_open())
+        self.assertEqual(0, self.block_trace.sequence)
+
+    def test_record_and_read(self):
+        self.block_trace.open(self.path, 10)
+        block_hash = helpers.generate_object_hash()
+        cipher_hash = helpers.generate_object_hash()
+
+        self.block_trace.record(BlockTraceStage.COMPRESSED, block_hash, value=1000)
+        self.block_trace.record(BlockTraceStage.ENCRYPTED, block_hash, cipher_hash, 1016)
+        self.block_trace.record(BlockTraceStage.KEY_SENT, cipher_hash=cipher_hash, value=3)
+        self.block_trace.close()
+
+        records = read_block_trace(self.path)
+        self.assertEqual(
+            [BlockTraceStage.COMPRESSED, BlockTraceStage.ENCRYPTED, BlockTraceStage.KEY_SENT],
+            [record.stage for record in records]
+        )
+        self.assertEqual([1000, 1016, 3], [record.value for record in records])
+        self.assertEqual(bytes(block_hash.binary), records[1].block_hash)
+        self.assertEqual(bytes(cipher_hash.binary), records[1].cipher_hash)
+        self.assertIsNone(records[0].cipher_hash)
+        self.assertIsNone(records[2].block_hash)
+        self.assertLessEqual(records[0].timestamp, records[2].timestamp)
+
+        timelines = block_trace_report.group_by_block(records)
+        self.assertEqual({bytes(block_hash.binary).hex(): records}, timelines)
+
+    def test_ring_overwrites_oldest(self):
+        self.block_trace.open(self.path, 4)
+        block_hashes = [helpers.generate_object_hash() for _ in range(6)]
+        for block_hash in block_hashes:
+            self.block_trace.record(BlockTraceStage.QUEUED, block_hash)
+        self.block_trace.close()
+
+        records = read_block_trace(self.path)
+        self.assertEqual([3, 4, 5, 6], [record.sequence for record in records])
+        self.assertEqual(
+            [bytes(block_hash.binary) for block_hash in block_hashes[2:]],
+            [record.block_hash for record in records]
+        )
+
+    def test_read_invalid_file(self):
+        with open(self.path, "wb") as trace_file:
+            trace_file.write(b"ATRC\x01")
+
+        with self.assertRaises(BlockTraceError):
+            read_block_trace(self.path)
+
+    def test_stage_deltas(self):
+        self.block_trace.open(self.path, 10)
+        block_hash = helpers.generate_object_hash()
+        for stage in (BlockTraceStage.RECEIVED_FROM_BDN, BlockTraceStage.DECOMPRESSED, BlockTraceStage.SENT_TO_NODE):
+            self.block_trace.record(stage, block_hash)
+        self.block_trace.close()
+
+        deltas = block_trace_report.stage_deltas(block_trace_report.group_by_block(read_block_trace(self.path)))
+
+        self.assertEqual(
+            {
+                ("RECEIVED_FROM_BDN", "DECOMPRESSED"),
+                ("DECOMPRESSED", "SENT_TO_NODE"),
+                ("RECEIVED_FROM_BDN", "SENT_TO_NODE"),
+            },
+            set(deltas.keys())
+        )
+        self.assertEqual(2, block_trace_report.percentile([1, 2, 3, 4], 50))
+        self.assertEqual(4, block_trace_report.percentile([1, 2, 3, 4], 99))
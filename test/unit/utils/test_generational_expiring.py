@@ -0,0 +1,113 @@
+import time
+from unittest import TestCase
+
+from mock import MagicMock
+
+from astracommon.utils.alarm_queue import AlarmQueue
+from astragateway.utils.generational_expiring import GenerationalExpiringDict, GenerationalExpiringSet
+
+EXPIRATION_TIME_S = 10
+GENERATIONS = 5
+
+
+class GenerationalExpiringTest(TestCase):
+
+    def setUp(self) -> None:
+        self.start_time = time.time()
+        time.time = MagicMock(return_value=self.start_time)
+        self.alarm_queue = AlarmQueue()
+        self.expiring_dict = GenerationalExpiringDict(
+            self.alarm_queue, EXPIRATION_TIME_S, "test_dict", GENERATIONS
+        )
+        self.expiring_set = GenerationalExpiringSet(
+            self.alarm_queue, EXPIRATION_TIME_S, "test_set", GENERATIONS
+        )
+
+    def _advance_generations(self, count: int) -> None:
+        for _ in range(count):
+            time.time = MagicMock(return_value=time.time() + EXPIRATION_TIME_S / GENERATIONS + 0.01)
+            self.alarm_queue.fire_alarms()
+
+    def test_dict_expires_whole_generation(self):
+        self.expiring_dict[1] = "a"
+        self.expiring_dict.add(2, "b")
+        self._advance_generations(1)
+        self.expiring_dict[3] = "c"
+
+        self._advance_generations(GENERATIONS - 1)
+        self.assertIn(1, self.expiring_dict)
+        self.assertIn(3, self.expiring_dict)
+
+        self._advance_generations(1)
+        self.assertNotIn(1, self.expiring_dict)
+        self.assertNotIn(2, self.expiring_dict)
+        self.assertEqual("c", self.expiring_dict[3])
+
+        self._advance_generations(1)
+        self.assertEqual(0, len(self.expiring_dict))
+
+    def test_dict_update_does_not_extend_lifetime(self):
+        self.expiring_dict[1] = "a"
+        self._advance_generations(2)
+        self.expiring_dict[1] = "b"
+        self.assertEqual("b", self.expiring_dict[1])
+
+        self._advance_generations(GENERATIONS - 1)
+        self.assertNotIn(1, self.expiring_dict)
+
+    def test_dict_remove_and_readd_gets_new_generation(self):
+        self.expiring_dict[1] = "a"
+        self._advance_generations(2)
+        self.assertEqual("a", self.expiring_dict.remove_item(1))
+        self.assertIsNone(self.expiring_dict.remove_item(1))
+        self.expiring_dict[1] = "b"
+
+        self._advance_generations(GENERATIONS - 1)
+        self.assertEqual("b", self.expiring_dict[1])
+
+    def test_dict_tracks_total_bytes(self):
+        sized_dict = GenerationalExpiringDict(
+            self.alarm_queue, EXPIRATION_TIME_S, "test_sized_dict", GENERATIONS, size_of=len
+        )
+        sized_dict[1] = b"aaaa"
+        sized_dict.add(2, b"bb")
+        self.assertEqual(6, sized_dict.total_bytes)
+
+        sized_dict[1] = b"a"
+        self.assertEqual(3, sized_dict.total_bytes)
+
+        del sized_dict[2]
+        self.assertEqual(1, sized_dict.total_bytes)
+
+        self._advance_generations(1)
+        sized_dict[3] = b"ccc"
+        self.assertEqual(b"ccc", sized_dict.remove_item(3))
+        sized_dict[4] = b"dddd"
+        self.assertEqual(5, sized_dict.total_bytes)
+
+        self._advance_generations(GENERATIONS)
+        self.assertNotIn(1, sized_dict)
+        self.assertEqual(4, sized_dict.total_bytes)
+
+        self._advance_generations(1)
+        self.assertEqual(0, sized_dict.total_bytes)
+
+    def test_set_expiration(self):
+        self.expiring_set.add(1)
+        self.expiring_set.add(2)
+        self.expiring_set.remove(2)
+        self.assertIn(1, self.expiring_set)
+        self.assertNotIn(2, self.expiring_set)
+
+        self._advance_generations(GENERATIONS + 1)
+        self.assertNotIn(1, self.expiring_set)
+        self.assertEqual(0, len(self.expiring_set))
+
+    def test_rotation_alarm_stops_when_empty(self):
+        self.expiring_set.add(1)
+        self.assertIsNotNone(self.expiring_set._rotation_alarm_id)
+
+        self._advance_generations(GENERATIONS + 1)
+
+        self.assertEqual(0, len(self.expiring_set))
+        self.assertIsNone(self.expiring_set._rotation_alarm_id)
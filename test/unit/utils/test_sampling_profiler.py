@@ -0,0 +1,67 @@
+import time
+from unittest import TestCase
+
+from astragateway.utils import sampling_profiler
+from astragateway.utils.sampling_profiler import SamplingProfiler, ProfilerBusyError
+
+
+def _burn_cpu(duration_s: float) -> int:
+    end_time = time.process_time() + duration_s
+    iterations = 0
+    while time.process_time() < end_time:
+        iterations += 1
+    return iterations
+
+
+def _recurse(depth: int) -> int:
+    if depth == 0:
+        return _burn_cpu(0.2)
+    return _recurse(depth - 1)
+
+
+class SamplingProfilerTest(TestCase):
+
+    def setUp(self) -> None:
+        self.profiler = SamplingProfiler(max_stacks=100, max_depth=50)
+
+    def tearDown(self) -> None:
+        self.profiler.stop()
+
+    def test_samples_collapsed_stacks(self):
+        self.profiler.start(0.001)
+        _burn_cpu(0.2)
+        collapsed_stacks = self.profiler.stop()
+
+        self.assertFalse(self.profiler.is_running())
+        self.assertGreater(self.profiler.sample_count, 0)
+        stack, count = collapsed_stacks.splitlines()[0].rsplit(" ", 1)
+        self.assertIn("test_samples_collapsed_stacks", stack)
+        self.assertIn(";_burn_cpu (", stack)
+        self.assertGreater(int(count), 0)
+
+    def test_refuses_concurrent_sessions(self):
+        self.profiler.start(0.01)
+
+        with self.assertRaises(ProfilerBusyError):
+            self.profiler.start(0.01)
+        with self.assertRaises(ProfilerBusyError):
+            SamplingProfiler(max_stacks=100, max_depth=50).start(0.01)
+
+    def test_truncates_deep_stacks(self):
+        self.profiler.max_depth = 5
+        self.profiler.start(0.001)
+        _recurse(20)
+        collapsed_stacks = self.profiler.stop()
+
+        for line in collapsed_stacks.splitlines():
+            stack, _ = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith(sampling_profiler.TRUNCATED_FRAMES))
+            self.assertEqual(6, len(stack.split(";")))
+
+    def test_bounds_distinct_stacks(self):
+        self.profiler.max_stacks = 0
+        self.profiler.start(0.001)
+        _burn_cpu(0.1)
+        collapsed_stacks = self.profiler.stop()
+
+        self.assertEqual(f"{sampling_profiler.DROPPED_STACK} {self.profiler.sample_count}", collapsed_stacks)
@@ -0,0 +1,85 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from mock import MagicMock
+
+from astracommon.connections.connection_type import ConnectionType
+from astragateway.utils import traffic_capture
+from astragateway.utils.traffic_capture import TrafficRecorder, TrafficSource, TrafficCaptureError
+
+
+def _mock_connection(connection_type: ConnectionType, message_types):
+    connection = MagicMock()
+    connection.CONNECTION_TYPE = connection_type
+    connection.message_handlers = {message_type: MagicMock() for message_type in message_types}
+    return connection
+
+
+def _mock_message(message_bytes: bytes):
+    message = MagicMock()
+    message.rawbytes = MagicMock(return_value=memoryview(message_bytes))
+    return message
+
+
+class TrafficCaptureTest(TestCase):
+
+    def setUp(self) -> None:
+        self.capture_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.capture_dir.name, "traffic.capture")
+        self.recorder = TrafficRecorder(self.path, "ethereum")
+
+    def tearDown(self) -> None:
+        self.recorder.close()
+        self.capture_dir.cleanup()
+
+    def _read_capture(self):
+        with open(self.path, "rb") as capture_file:
+            protocol = traffic_capture.read_capture_protocol(capture_file)
+            return protocol, list(traffic_capture.iter_captured_messages(capture_file))
+
+    def test_records_node_and_relay_messages(self):
+        node_connection = _mock_connection(ConnectionType.BLOCKCHAIN_NODE, [2, 7])
+        node_handler = node_connection.message_handlers[7]
+        relay_connection = _mock_connection(ConnectionType.RELAY_ALL, [b"broadcast"])
+        gateway_connection = _mock_connection(ConnectionType.EXTERNAL_GATEWAY, [b"hello"])
+        gateway_handlers = gateway_connection.message_handlers
+
+        for connection in (node_connection, relay_connection, gateway_connection):
+            self.recorder.attach(connection)
+
+        node_message = _mock_message(b"block")
+        node_connection.message_handlers[7](node_message)
+        relay_connection.message_handlers[b"broadcast"](_mock_message(b"astra block"))
+        self.recorder.close()
+
+        node_handler.assert_called_once_with(node_message)
+        self.assertIs(gateway_handlers, gateway_connection.message_handlers)
+
+        protocol, messages = self._read_capture()
+        self.assertEqual("ethereum", protocol)
+        self.assertEqual(2, len(messages))
+        self.assertEqual(TrafficSource.BLOCKCHAIN_NODE, messages[0].source)
+        self.assertEqual(7, messages[0].message_type)
+        self.assertEqual(b"block", messages[0].message_bytes)
+        self.assertEqual(TrafficSource.RELAY, messages[1].source)
+        self.assertEqual(b"broadcast", messages[1].message_type)
+        self.assertEqual(b"astra block", messages[1].message_bytes)
+        self.assertLessEqual(messages[0].timestamp, messages[1].timestamp)
+
+    def test_truncated_record_ends_capture(self):
+        self.recorder.record(TrafficSource.RELAY, b"tx", _mock_message(b"tx 1"))
+        self.recorder.record(TrafficSource.RELAY, b"tx", _mock_message(b"tx 2"))
+        self.recorder.close()
+        with open(self.path, "r+b") as capture_file:
+            capture_file.truncate(os.path.getsize(self.path) - 1)
+
+        _, messages = self._read_capture()
+        self.assertEqual([b"tx 1"], [message.message_bytes for message in messages])
+
+    def test_rejects_unknown_format(self):
+        with open(self.path, "wb") as capture_file:
+            capture_file.write(b"not a capture")
+
+        with self.assertRaises(TrafficCaptureError):
+            self._read_capture()